@@ -36,8 +36,91 @@ def detect_best_runner():
     return "unknown"  # 都不可用
 
 
-def main():
+def run_profiled(preset_name=None, days=30, mode='both'):
+    """剖析模式：在当前进程中运行一次模拟并写出剖析报告"""
+    src_path = Path(__file__).resolve().parent / 'src'
+    if str(src_path) not in sys.path:
+        sys.path.insert(0, str(src_path))
+
+    from interface.cli_interface import CLIInterface
+
+    interface = CLIInterface(profile=True, profile_mode=mode)
+    interface.run_simulation(preset_name=preset_name, days=days)
+
+
+def run_lint(verbose=False, strict=False):
+    """预设校验：打印每个预设的结论，有错误时返回非零退出码"""
+    import logging
+
+    src_path = Path(__file__).resolve().parent / 'src'
+    if str(src_path) not in sys.path:
+        sys.path.insert(0, str(src_path))
+    logging.getLogger('parameters').setLevel(logging.CRITICAL)
+
+    from parameters.preset_validation import lint_presets
+    return lint_presets(verbose=verbose, strict=strict)
+
+
+def run_scenarios(path, workers=1, output=None, resume=True):
+    """批量模式：按情景文件并行运行，汇总表写入 results/batch/"""
+    import logging
+
+    src_path = Path(__file__).resolve().parent / 'src'
+    if str(src_path) not in sys.path:
+        sys.path.insert(0, str(src_path))
+    logging.getLogger('parameters').setLevel(logging.WARNING)
+
+    from scenarios.batch_runner import run_batch
+
+    try:
+        result = run_batch(path, output, workers=workers, resume=resume)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"[ERROR] 情景文件无效: {e}")
+        return 1
+    print(f"[SUCCESS] 完成 {result.n_run} 个情景（跳过 {result.n_skipped} 个）, "
+          f"耗时 {result.elapsed:.1f} s")
+    if result.n_failed:
+        print(f"[WARNING] {result.n_failed} 个情景失败，详见汇总表")
+    print(f"[INFO] 汇总表: {result.summary_path}")
+    return 1 if result.n_failed else 0
+
+
+def parse_args(argv=None):
+    """命令行参数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ADM1智能启动器")
+    parser.add_argument('--profile', action='store_true',
+                        help="剖析单次模拟，排序报告和火焰图栈文件写入 results/")
+    parser.add_argument('--preset', default=None, help="剖析模式使用的预设（默认第一个）")
+    parser.add_argument('--days', type=float, default=30, help="剖析模式的模拟天数")
+    parser.add_argument('--profile-mode', choices=['both', 'sampling', 'cprofile'], default='both',
+                        help="剖析方式（sampling开销最小）")
+    parser.add_argument('--lint-presets', action='store_true',
+                        help="校验 config/ 下的全部预设（取值范围、单位、数值刚性）后退出")
+    parser.add_argument('--strict', action='store_true', help="校验时警告也视为失败")
+    parser.add_argument('--verbose', action='store_true', help="校验时显示提示信息")
+    parser.add_argument('--scenario', default=None,
+                        help="批量模式：情景文件（.json/.yaml/.csv），无交互运行后退出")
+    parser.add_argument('--workers', type=int, default=1, help="批量模式的并行进程数")
+    parser.add_argument('--output', default=None,
+                        help="批量模式的输出目录（默认 results/batch/<情景文件名>）")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="批量模式不续跑，清除已有进度重新运行全部情景")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """智能启动"""
+    args = parse_args(argv)
+    if args.lint_presets:
+        sys.exit(run_lint(args.verbose, args.strict))
+    if args.scenario:
+        sys.exit(run_scenarios(args.scenario, args.workers, args.output, not args.no_resume))
+    if args.profile:
+        run_profiled(args.preset, args.days, args.profile_mode)
+        return
+
     print("ADM1智能启动器")
     print("检测最佳运行方式...")
 
@@ -0,0 +1,64 @@
+"""
+基准测试运行脚本 - 记录历史并与基线比较
+
+用法:
+  python scripts/run_benchmarks.py                 # 完整运行
+  python scripts/run_benchmarks.py --quick         # 跳过365天求解
+  python scripts/run_benchmarks.py --save-baseline # 将本次结果保存为基线
+  python scripts/run_benchmarks.py --fail-on-regression
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tests.benchmarks.benchmark_suite import (
+    DEFAULT_OUTPUT_DIR, DEFAULT_THRESHOLD, append_history, compare_to_baseline,
+    format_report, load_baseline, run_suite, save_baseline
+)
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="ADM1性能基准测试")
+    parser.add_argument('--quick', action='store_true', help="快速模式，跳过耗时用例")
+    parser.add_argument('--repeat', type=int, default=3, help="每个用例重复次数")
+    parser.add_argument('--filter', default=None, help="只运行名称包含该字符串的用例")
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR), help="历史与基线目录")
+    parser.add_argument('--save-baseline', action='store_true', help="将本次结果保存为基线")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="回退判定阈值（相对变慢比例）")
+    parser.add_argument('--fail-on-regression', action='store_true', help="存在回退时返回非零退出码")
+    args = parser.parse_args()
+
+    # 参数管理器的加载日志对基准输出没有意义
+    logging.getLogger('parameters.parameter_manager').setLevel(logging.WARNING)
+
+    run = run_suite(quick=args.quick, repeat=args.repeat, pattern=args.filter)
+    history_path = append_history(run, args.output_dir)
+
+    baseline = load_baseline(args.output_dir)
+    comparisons = compare_to_baseline(run, baseline, args.threshold) if baseline else []
+    print(format_report(run, comparisons))
+    print(f"[INFO] 历史记录: {history_path}")
+
+    if args.save_baseline:
+        print(f"[INFO] 基线已保存: {save_baseline(run, args.output_dir)}")
+    elif baseline is None:
+        print("[INFO] 无基线，使用 --save-baseline 保存本次结果为基线")
+
+    regressions = [c for c in comparisons if c['regression']]
+    if regressions:
+        print(f"[WARNING] {len(regressions)} 项性能回退超过 {args.threshold * 100:.0f}%")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+蒙特卡洛不确定性传播脚本 - 预设参数分布 → 甲烷产量置信带
+
+用法:
+  python scripts/run_monte_carlo.py --preset food_waste --workers 4
+  python scripts/run_monte_carlo.py --config distributions.json --plot
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_root = project_root / 'src'
+if str(src_root) not in sys.path:
+    sys.path.insert(0, str(src_root))
+
+from uncertainty.monte_carlo import (DEFAULT_HORIZON, DEFAULT_TOLERANCE, MAX_MEMBERS,
+                                     MIN_MEMBERS, MonteCarlo)
+
+
+def plot_bands(result, path: Path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    low, high = result.bands[0], result.bands[-1]
+    ax.fill_between(result.times, low, high, alpha=0.3,
+                    label=f"P{100 * result.probabilities[0]:g}–P{100 * result.probabilities[-1]:g}")
+    ax.plot(result.times, result.band(0.5), label="Median")
+    ax.set_xlabel('Time (days)')
+    ax.set_ylabel('Cumulative methane (gCOD/m³)')
+    ax.set_title(f'Methane yield confidence band ({result.n_members} members)')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    logging.getLogger('parameters.parameter_manager').setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="ADM1蒙特卡洛不确定性传播")
+    parser.add_argument('--preset', default=None, help="预设（默认 food_waste 或配置中的预设）")
+    parser.add_argument('--config', default=None, help="参数分布配置文件（JSON）")
+    parser.add_argument('--distribution', default='lognormal',
+                        choices=['uniform', 'loguniform', 'triangular', 'normal', 'lognormal'])
+    parser.add_argument('--spread', type=float, default=0.2, help="默认范围：名义值 ×/÷ (1+spread)")
+    parser.add_argument('--method', choices=['sobol', 'lhs', 'random'], default='sobol')
+    parser.add_argument('--horizon', type=float, default=DEFAULT_HORIZON, help="模拟时域 [d]")
+    parser.add_argument('--workers', type=int, default=1, help="并行进程数")
+    parser.add_argument('--tol', type=float, default=DEFAULT_TOLERANCE, help="分位数收敛阈值")
+    parser.add_argument('--min-members', type=int, default=MIN_MEMBERS)
+    parser.add_argument('--max-members', type=int, default=MAX_MEMBERS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=str(project_root / 'results' / 'monte_carlo.json'))
+    parser.add_argument('--plot', action='store_true', help="保存置信带图（与结果同名 .png）")
+    args = parser.parse_args()
+
+    options = dict(horizon=args.horizon, method=args.method, seed=args.seed,
+                   workers=args.workers, tol=args.tol, min_members=args.min_members,
+                   max_members=args.max_members)
+    try:
+        if args.config:
+            mc = MonteCarlo.from_config(args.config, preset=args.preset, **options)
+        else:
+            mc = MonteCarlo.from_preset(args.preset or 'food_waste', spread=args.spread,
+                                        distribution=args.distribution, **options)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    print(f"[INFO] {mc.space.dim} 个不确定参数, {args.method} 采样, {args.workers} 个进程")
+    result = mc.run(verbose=True)
+    status = "已收敛" if result.converged else "达到成员数上限，未收敛"
+    print(f"[SUCCESS] {result.n_members} 个成员（{status}）, 耗时 {result.elapsed:.1f} s")
+    if result.n_failed:
+        print(f"[WARNING] {result.n_failed} 个成员积分失败，已排除")
+    for name, stats in result.summary.items():
+        quantiles = ", ".join(f"{k} {v:.4g}" for k, v in stats.items() if k.startswith('p'))
+        print(f"  {name}: 均值 {stats['mean']:.4g} ± {stats['std']:.3g} ({quantiles})")
+
+    path = result.save(args.output)
+    print(f"[INFO] 结果已保存: {path}")
+    if args.plot:
+        figure = path.with_suffix('.png')
+        plot_bands(result, figure)
+        print(f"[INFO] 置信带图已保存: {figure}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
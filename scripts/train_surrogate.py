@@ -0,0 +1,86 @@
+"""
+代理模型脚本 - 离线训练与即时查询
+
+用法:
+  python scripts/train_surrogate.py train --preset food_waste --samples 128
+  python scripts/train_surrogate.py query --preset food_waste k_m_ac=7.5 K_S_ac=0.2
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_root = project_root / 'src'
+if str(src_root) not in sys.path:
+    sys.path.insert(0, str(src_root))
+
+from surrogate.emulator import DEFAULT_HORIZON, DEFAULT_SURROGATE_DIR, SurrogateModel
+
+
+def train(args) -> int:
+    surrogate = SurrogateModel.train(args.preset, n_samples=args.samples,
+                                     n_validation=args.validation, method=args.method,
+                                     seed=args.seed, spread=args.spread, horizon=args.horizon,
+                                     verbose=True)
+    path = surrogate.save(args.output)
+    print(f"[SUCCESS] 代理模型已保存: {path}（{surrogate.space.dim} 个参数）")
+    report = surrogate.validation
+    if report:
+        print(f"[INFO] 验证集 {report.n_samples} 个样本:")
+        for name in surrogate.emulators:
+            print(f"  {name}: 相对RMSE {report.relative_rmse[name]:.2%}, "
+                  f"最大误差 {report.max_error[name]:.4g}, ±2σ覆盖率 {report.coverage[name]:.0%}")
+    return 0
+
+
+def query(args) -> int:
+    path = Path(args.output) if args.output else DEFAULT_SURROGATE_DIR / f"{args.preset}.npz"
+    if not path.exists():
+        print(f"[ERROR] 代理模型不存在: {path}（先运行 train）")
+        return 1
+    surrogate = SurrogateModel.load(path)
+    try:
+        values = {k: float(v) for k, v in (item.split('=', 1) for item in args.parameters)}
+        prediction = surrogate.predict(values)
+    except (KeyError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    source = "代理模型" if prediction.source == 'surrogate' else "完整模型（超出训练范围）"
+    print(f"[INFO] {source}, 耗时 {prediction.elapsed * 1000:.3f} ms")
+    for name, value in prediction.values.items():
+        print(f"  {name}: {value:.6g} ± {2 * prediction.std[name]:.3g}")
+    return 0
+
+
+def main():
+    logging.getLogger('parameters.parameter_manager').setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="ADM1代理模型")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_train = sub.add_parser('train', help="采样运行完整模型并拟合代理模型")
+    p_train.add_argument('--preset', default='food_waste')
+    p_train.add_argument('--samples', type=int, default=128, help="训练样本数")
+    p_train.add_argument('--validation', type=int, default=32, help="验证样本数")
+    p_train.add_argument('--method', choices=['sobol', 'lhs', 'random'], default='sobol')
+    p_train.add_argument('--spread', type=float, default=0.2, help="参数范围：名义值 ×/÷ (1+spread)")
+    p_train.add_argument('--horizon', type=float, default=DEFAULT_HORIZON, help="模拟时域 [d]")
+    p_train.add_argument('--seed', type=int, default=0)
+    p_train.add_argument('--output', default=None, help="保存路径（默认 results/surrogates/<预设>.npz）")
+    p_train.set_defaults(func=train)
+
+    p_query = sub.add_parser('query', help="查询代理模型")
+    p_query.add_argument('--preset', default='food_waste')
+    p_query.add_argument('--output', default=None, help="代理模型文件")
+    p_query.add_argument('parameters', nargs='*', metavar='NAME=VALUE')
+    p_query.set_defaults(func=query)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
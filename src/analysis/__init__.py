@@ -0,0 +1,12 @@
+# src/analysis/__init__.py
+"""
+结果分析模块 - 向量化 KPI 计算与排序、COD/N/电荷质量平衡检查
+"""
+
+from .kpi import KPI_UNITS, attach_kpis, compute_kpis, compute_kpis_batch, format_kpis, rank
+from .mass_balance import (ClosureReport, MassBalanceError, MassBalanceMonitor, check_closure,
+                           identify_stoichiometry)
+
+__all__ = ['KPI_UNITS', 'attach_kpis', 'compute_kpis', 'compute_kpis_batch', 'format_kpis',
+           'rank', 'ClosureReport', 'MassBalanceError', 'MassBalanceMonitor', 'check_closure',
+           'identify_stoichiometry']
@@ -0,0 +1,184 @@
+# src/analysis/kpi.py
+"""
+关键性能指标（KPI）- 对状态轨迹做向量化计算
+
+一次计算一批运行: states 为 (n_vars, n_t) 或 (N, n_vars, n_t)，所有指标按成员维
+整体计算，不逐变量、逐时间点循环。结果是扁平字典（名称 → 数值或长度 N 的数组），
+可直接写入结果元数据、汇总表或集合存储，按任一指标排序时无需重新读取轨迹
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+STEADY_STATE_TOLERANCE = 1e-3   # 稳态判据: 各变量 |dy/dt| / max|y| 的上限 [1/d]
+STEADY_STATE_FLOOR = 1e-9       # 近零变量的归一化下限
+METHANE_L_PER_GCOD = 0.35       # 标准状态下每 gCOD 甲烷的体积 [L]
+ACETATE_GCOD_PER_MOL = 64.0     # 乙酸当量换算 [gCOD/mol]
+VFA_VARIABLES = ('S_va', 'S_bu', 'S_pro', 'S_ac')
+# 金属络合/FeS 沉淀的时间尺度（数百天）远慢于生化过程，默认不参与稳态判定
+METAL_VARIABLES = ('S_Fe2', 'S_EDTA', 'S_FeEDTA', 'X_FeS')
+PROCESS_PREFIX = 'integral.'
+
+KPI_UNITS = {
+    'methane_cumulative': 'gCOD/m³',
+    'methane_volume': 'L/m³',
+    'cod_initial': 'gCOD/m³',
+    'cod_final': 'gCOD/m³',
+    'cod_removal': '-',
+    'vfa_peak': 'gCOD/m³',
+    'vfa_peak_time': 'd',
+    'vfa_final': 'gCOD/m³',
+    'alkalinity_min': 'mol/m³',
+    'vfa_alkalinity_peak': 'mol/mol',
+    'vfa_alkalinity_peak_time': 'd',
+    'time_to_steady_state': 'd',
+}
+
+
+def _integrate(values: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """沿最后一维的梯形积分"""
+    if values.shape[-1] < 2:
+        return np.zeros(values.shape[:-1])
+    return 0.5 * np.sum((values[..., 1:] + values[..., :-1]) * np.diff(time), axis=-1)
+
+
+def _batch_call(function, states: np.ndarray) -> np.ndarray:
+    """以 (n_vars, N·n_t) 批量调用模型函数，结果还原为 (..., N, n_t)"""
+    N, n, n_t = states.shape
+    flat = np.transpose(states, (1, 0, 2)).reshape(n, N * n_t)
+    values = np.asarray(function(flat))
+    return values.reshape(values.shape[:-1] + (N, n_t))
+
+
+def _time_to_steady_state(time: np.ndarray, states: np.ndarray, tolerance: float) -> np.ndarray:
+    """此后所有变量的相对变化率都低于 tolerance 的最早时刻（未达到时为 NaN）"""
+    n_t = states.shape[-1]
+    if n_t < 3:
+        return np.full(states.shape[0], np.nan)
+    rate = np.abs(np.gradient(states, time, axis=-1))
+    scale = np.maximum(np.max(np.abs(states), axis=-1, keepdims=True), STEADY_STATE_FLOOR)
+    worst = np.max(rate / scale, axis=1)                                   # (N, n_t)
+    remaining = np.maximum.accumulate(worst[:, ::-1], axis=1)[:, ::-1]     # 此后的最大值
+    steady = remaining < tolerance
+    first = np.argmax(steady, axis=1)
+    return np.where(steady.any(axis=1), time[first], np.nan)
+
+
+def compute_kpis_batch(model, time: np.ndarray, states: np.ndarray,
+                       steady_tolerance: float = STEADY_STATE_TOLERANCE,
+                       steady_variables: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    计算一批运行的 KPI
+
+    Args:
+        model: 提供 variable_index / state_units 的模型；有 methane_production_rate 与
+            process_rates 时据此积分甲烷产量和各过程速率
+        time: 时间轴 [n_t]（批内共用）
+        states: (n_vars, n_t) 或 (N, n_vars, n_t)
+        steady_tolerance: 稳态判据 [1/d]
+        steady_variables: 参与稳态判定的变量（默认为金属组分以外的生化状态）
+
+    Returns:
+        {KPI 名称: 长度 N 的数组}；过程积分以 'integral.<过程名>' 命名
+    """
+    time = np.asarray(time, dtype=float)
+    states = np.asarray(states, dtype=float)
+    if states.ndim == 2:
+        states = states[None]
+    if states.ndim != 3 or states.shape[-1] != len(time):
+        raise ValueError(f"状态数组维度不匹配: {states.shape} vs {len(time)} 个时间点")
+    index = model.variable_index
+    kpis: Dict[str, np.ndarray] = {}
+
+    # 累计甲烷: 产甲烷速率的时间积分（模型无此函数时取 S_ch4 的增量）
+    if hasattr(model, 'methane_production_rate'):
+        rate = _batch_call(model.methane_production_rate, states)
+        kpis['methane_cumulative'] = _integrate(rate, time)
+    else:
+        ch4 = states[:, index['S_ch4']]
+        kpis['methane_cumulative'] = ch4[:, -1] - ch4[:, 0]
+    kpis['methane_volume'] = kpis['methane_cumulative'] * METHANE_L_PER_GCOD
+
+    # COD 去除率: 液相 COD（不含甲烷）首末之比
+    units = getattr(model, 'state_units', {})
+    cod_rows = [i for var, i in index.items()
+                if units.get(var, 'gCOD/m³') == 'gCOD/m³' and var != 'S_ch4']
+    cod = states[:, cod_rows, :][:, :, [0, -1]].sum(axis=1)
+    kpis['cod_initial'], kpis['cod_final'] = cod[:, 0], cod[:, 1]
+    kpis['cod_removal'] = np.divide(cod[:, 0] - cod[:, 1], cod[:, 0],
+                                    out=np.full(len(cod), np.nan), where=cod[:, 0] > 0)
+
+    # VFA 与碱度: 碱度近似为 S_IC（中性 pH 下无机碳以 HCO₃⁻ 为主），VFA 折算为乙酸当量
+    vfa = states[:, [index[var] for var in VFA_VARIABLES], :].sum(axis=1)
+    peak = np.argmax(vfa, axis=1)
+    kpis['vfa_peak'] = np.take_along_axis(vfa, peak[:, None], axis=1)[:, 0]
+    kpis['vfa_peak_time'] = time[peak]
+    kpis['vfa_final'] = vfa[:, -1]
+    alkalinity = states[:, index['S_IC'], :]
+    kpis['alkalinity_min'] = alkalinity.min(axis=1)
+    ratio = np.divide(vfa / ACETATE_GCOD_PER_MOL, alkalinity,
+                      out=np.full(vfa.shape, np.nan), where=alkalinity > 0)
+    valid = ~np.isnan(ratio).all(axis=1)
+    peak = np.argmax(np.where(np.isnan(ratio), -np.inf, ratio), axis=1)
+    kpis['vfa_alkalinity_peak'] = np.where(
+        valid, np.take_along_axis(ratio, peak[:, None], axis=1)[:, 0], np.nan)
+    kpis['vfa_alkalinity_peak_time'] = np.where(valid, time[peak], np.nan)
+
+    if steady_variables is None:
+        steady_variables = [var for var in index if var not in METAL_VARIABLES]
+    rows = [index[var] for var in steady_variables]
+    kpis['time_to_steady_state'] = _time_to_steady_state(time, states[:, rows, :],
+                                                         steady_tolerance)
+
+    # 各过程速率积分（过程的总转化量）
+    if hasattr(model, 'process_rates') and hasattr(model, 'PROCESS_NAMES'):
+        integrals = _integrate(_batch_call(model.process_rates, states), time)
+        for name, values in zip(model.PROCESS_NAMES, integrals):
+            kpis[PROCESS_PREFIX + name] = values
+    return kpis
+
+
+def compute_kpis(results: Dict, **kwargs) -> Dict[str, float]:
+    """单次求解结果的 KPI（求解失败或无模型时为空字典）"""
+    model = results.get('model')
+    states = np.asarray(results.get('states', []))
+    if (not results.get('success') or not hasattr(model, 'variable_index')
+            or states.ndim != 2 or states.shape[1] == 0
+            or states.shape[0] != len(model.variable_index)):
+        return {}
+    kpis = compute_kpis_batch(model, results['time'], states, **kwargs)
+    return {name: float(values[0]) for name, values in kpis.items()}
+
+
+def attach_kpis(results: Dict) -> Dict[str, float]:
+    """计算 KPI 并缓存到 results['kpis']（已有时直接返回）"""
+    if 'kpis' not in results:
+        results['kpis'] = compute_kpis(results)
+    return results['kpis']
+
+
+def rank(kpis: Dict[str, np.ndarray], name: str, descending: bool = True,
+         top: Optional[int] = None) -> np.ndarray:
+    """按某一 KPI 对成员排序，返回成员下标（NaN 排在最后）"""
+    values = np.asarray(kpis[name], dtype=float)
+    keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+    order = np.argsort(keys, kind='stable')
+    return order[:top] if top is not None else order
+
+
+def format_kpis(kpis: Dict[str, float]) -> List[str]:
+    """KPI 的文本行（报告与命令行输出共用）"""
+    lines = []
+    for name, value in kpis.items():
+        if name.startswith(PROCESS_PREFIX):
+            continue
+        unit = KPI_UNITS.get(name, '')
+        text = 'N/A' if value is None or np.isnan(value) else f"{value:.4g}"
+        lines.append(f"{name}: {text} {unit}".rstrip())
+    integrals = [(name[len(PROCESS_PREFIX):], value) for name, value in kpis.items()
+                 if name.startswith(PROCESS_PREFIX)]
+    if integrals:
+        lines.append("过程速率积分:")
+        lines.extend(f"  {name}: {value:.4g}" for name, value in integrals)
+    return lines
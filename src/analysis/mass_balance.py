@@ -0,0 +1,321 @@
+# src/analysis/mass_balance.py
+"""
+COD / 氮 / 电荷质量平衡检查
+
+化学计量矩阵 ν 由模型自身辨识（在随机状态上求解 f(y) = ν·r(y)），检查的是实际的
+右端函数代码而不是文档。每个过程的闭合残差 = Σ_i c_i·ν_ij − 声明交换量：
+  - COD: 简化模型不追踪分解代谢产物（含甲烷），摄取过程按声明产率 Y 有 (1−Y) 的
+    COD 离开液相，其余必须进入该过程的降解菌
+  - 氮: 全部过程闭合（释放的氮应进入 S_IN）
+  - 电荷: 全部过程闭合，FeS 沉淀的 S²⁻ 来自外部（声明交换 −2 eq/mol）
+另外检查生长项是否写入该过程自己的降解菌。
+
+模型可在 KNOWN_IMBALANCES 中声明已知的缺口（{守恒量: 过程名}，简化模型结构所致），
+缺口的期望残差由模型的参考化学计量（model.reference_spec()，与右端函数代码独立）计算。
+MassBalanceMonitor 在求解开始时报告一次 check_closure 发现的问题（生长目标、产率不一致），
+积分过程中每 stride 次右端函数调用检查一次 c·f(y) 与「声明交换量 + 期望缺口」的偏差，
+右端函数偏离参考（含已知缺口的大小改变）即报告；只多一次过程速率计算和几个矩阵乘，可常开
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUANTITIES = ('COD', 'N', 'charge')
+DEFAULT_STRIDE = 50
+DEFAULT_TOLERANCE = 1e-6   # 相对不平衡（不平衡速率 / 该量的总转化速率）
+
+# 含氮量 [molN/gCOD]（BSM2 取值）
+N_AA = 0.007
+N_BAC = 0.08 / 14.0
+N_I = 0.06 / 14.0
+NITROGEN_CONTENT = {'S_aa': N_AA, 'X_pr': N_AA, 'S_I': N_I, 'X_I': N_I, 'S_IN': 1.0,
+                    'X_su': N_BAC, 'X_aa': N_BAC, 'X_fa': N_BAC, 'X_c4': N_BAC,
+                    'X_pro': N_BAC, 'X_ac': N_BAC, 'X_h2': N_BAC}
+
+# 电荷 [eq/单位]：中性 pH 下 S_IN 以 NH₄⁺、S_IC 以 HCO₃⁻ 计，VFA 全部解离 [eq/gCOD]
+CHARGE = {'S_cat': 1.0, 'S_an': -1.0, 'S_IN': 1.0, 'S_IC': -1.0,
+          'S_va': -1.0 / 208.0, 'S_bu': -1.0 / 160.0, 'S_pro': -1.0 / 112.0, 'S_ac': -1.0 / 64.0,
+          'S_Fe2': 2.0, 'S_EDTA': -4.0, 'S_FeEDTA': -2.0}
+
+# 摄取过程 → (底物, 降解菌, 产率参数)
+UPTAKE_PROCESSES = {
+    'uptake_su': ('S_su', 'X_su', 'Y_su'),
+    'uptake_aa': ('S_aa', 'X_aa', 'Y_aa'),
+    'uptake_fa': ('S_fa', 'X_fa', 'Y_fa'),
+    'uptake_va': ('S_va', 'X_c4', 'Y_c4'),
+    'uptake_bu': ('S_bu', 'X_c4', 'Y_c4'),
+    'uptake_pro': ('S_pro', 'X_pro', 'Y_pro'),
+    'uptake_ac': ('S_ac', 'X_ac', 'Y_ac'),
+    'uptake_h2': ('S_h2', 'X_h2', 'Y_h2'),
+}
+EXTERNAL_CHARGE = {'fes_precipitation': -2.0}
+
+
+class MassBalanceError(ValueError):
+    """积分过程中质量平衡偏差超过容差（mode='raise'）"""
+
+
+def content_vectors(model) -> np.ndarray:
+    """各守恒量的组分含量 c [len(QUANTITIES), n_states]"""
+    units = getattr(model, 'state_units', {})
+    variables = model.state_variables
+    return np.array([
+        [1.0 if units.get(var, 'gCOD/m³') == 'gCOD/m³' else 0.0 for var in variables],
+        [NITROGEN_CONTENT.get(var, 0.0) for var in variables],
+        [CHARGE.get(var, 0.0) for var in variables],
+    ])
+
+
+def identify_stoichiometry(model, n_samples: Optional[int] = None, seed: int = 0) -> np.ndarray:
+    """
+    由 biochemical_reactions 与 process_rates 辨识化学计量矩阵 ν [n_states, n_processes]
+
+    Raises:
+        ValueError: 模型不提供 process_rates，或右端函数不是过程速率的线性组合
+    """
+    if not hasattr(model, 'process_rates') or not hasattr(model, 'PROCESS_NAMES'):
+        raise ValueError("模型未提供 process_rates/PROCESS_NAMES，无法辨识化学计量")
+    n_processes = len(model.PROCESS_NAMES)
+    rng = np.random.default_rng(seed)
+    y_ref = np.abs(np.asarray(model.initial_conditions, dtype=float)) + 0.01
+    samples = y_ref[:, None] * rng.lognormal(0.0, 1.0, (len(y_ref), n_samples or 3 * n_processes))
+
+    rates = np.asarray(model.process_rates(samples))                   # (P, m)
+    derivatives = np.asarray(model.biochemical_reactions(0.0, samples))  # (n, m)
+    nu = np.linalg.lstsq(rates.T, derivatives.T, rcond=None)[0].T
+    error = np.max(np.abs(nu @ rates - derivatives)) / max(np.max(np.abs(derivatives)), 1e-300)
+    if error > 1e-8:
+        raise ValueError(f"右端函数不能表示为过程速率的线性组合（相对误差 {error:.1e}）")
+    nu[np.abs(nu) < 1e-12] = 0.0
+    return nu
+
+
+def reference_stoichiometry(model) -> Optional[np.ndarray]:
+    """
+    参考化学计量 ν_ref [n_states, n_processes]（model.reference_spec()，未提供时为 None）
+    """
+    if not hasattr(model, 'reference_spec'):
+        return None
+    spec = model.reference_spec()
+    index = model.variable_index
+    nu = np.zeros((len(model.state_variables), len(model.PROCESS_NAMES)))
+    columns = {name: j for j, name in enumerate(model.PROCESS_NAMES)}
+    for process in spec.processes:
+        j = columns[process.name]
+        for var, coefficient in process.stoichiometry.items():
+            nu[index[var], j] = (spec.parameters[coefficient] if isinstance(coefficient, str)
+                                 else coefficient)
+    return nu
+
+
+def declared_yields(model) -> Dict[str, float]:
+    """
+    声明产率: 模型参数 > 预设声明（model.declared_parameters）> 参数管理器默认值
+
+    模型参数可在创建后被修改（扫描、情景参数），以模型自身的字段为准；预设声明只补充
+    不是 ADM1Parameters 字段的 Y_c4 / Y_pro
+    """
+    from dataclasses import asdict, is_dataclass
+
+    from parameters.parameter_manager import KineticParameters
+
+    values = {k: v for k, v in asdict(KineticParameters()).items() if k.startswith('Y_')}
+    values.update({k: float(v) for k, v in getattr(model, 'declared_parameters', {}).items()
+                   if k.startswith('Y_')})
+    parameters = getattr(model, 'parameters', None)
+    if is_dataclass(parameters):
+        values.update({k: v for k, v in asdict(parameters).items() if k.startswith('Y_')})
+    return values
+
+
+def declared_exchange(model, yields: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """各过程声明的守恒量交换 D [len(QUANTITIES), n_processes]（离开液相为负）"""
+    yields = yields if yields is not None else declared_yields(model)
+    exchange = np.zeros((len(QUANTITIES), len(model.PROCESS_NAMES)))
+    for j, name in enumerate(model.PROCESS_NAMES):
+        if name in UPTAKE_PROCESSES:
+            exchange[0, j] = -(1.0 - yields[UPTAKE_PROCESSES[name][2]])
+        exchange[2, j] = EXTERNAL_CHARGE.get(name, 0.0)
+    return exchange
+
+
+@dataclass
+class ClosureReport:
+    """化学计量闭合结果"""
+    processes: List[str]
+    residuals: np.ndarray                  # [len(QUANTITIES), n_processes]，单位同各量/过程速率单位
+    issues: List[str] = field(default_factory=list)
+    tolerance: float = DEFAULT_TOLERANCE
+    known: Set[Tuple[str, str]] = field(default_factory=set)  # 模型声明的已知缺口
+    reference: Optional[np.ndarray] = None  # 参考化学计量给出的残差（同 residuals 形状）
+
+    def violations(self) -> List[Tuple[str, str, float]]:
+        """[(守恒量, 过程, 残差)]"""
+        rows, cols = np.nonzero(np.abs(self.residuals) > self.tolerance)
+        return [(QUANTITIES[k], self.processes[j], float(self.residuals[k, j]))
+                for k, j in zip(rows, cols)]
+
+    def baseline(self) -> np.ndarray:
+        """已知缺口的期望残差（取自参考化学计量，其余为 0），运行时检查的基线"""
+        if self.reference is None:
+            return np.zeros_like(self.residuals)
+        mask = np.array([[(q, p) in self.known for p in self.processes] for q in QUANTITIES])
+        return np.where(mask, self.reference, 0.0)
+
+    def unexpected(self) -> List[Tuple[str, str, float]]:
+        """已知缺口以外、或大小与参考不符的不闭合"""
+        baseline = self.baseline()
+        return [v for v in self.violations()
+                if abs(v[2] - baseline[QUANTITIES.index(v[0]), self.processes.index(v[1])])
+                > self.tolerance]
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues and not self.violations()
+
+    def format(self) -> List[str]:
+        unexpected = {(q, p) for q, p, _ in self.unexpected()}
+        lines = [f"{quantity} 不闭合: {process} 残差 {residual:+.4g}"
+                 f"{'' if (quantity, process) in unexpected else '（已知）'}"
+                 for quantity, process, residual in self.violations()]
+        return lines + self.issues
+
+
+def known_gaps(model) -> Set[Tuple[str, str]]:
+    """模型声明的已知缺口 {(守恒量, 过程)}（model.KNOWN_IMBALANCES）"""
+    declared = getattr(model, 'KNOWN_IMBALANCES', {})
+    return {(quantity, process) for quantity, processes in declared.items()
+            for process in processes}
+
+
+def check_closure(model, tolerance: float = DEFAULT_TOLERANCE) -> ClosureReport:
+    """
+    由化学计量计算各过程的 COD/N/电荷 闭合残差，并检查生长项的目标与产率
+
+    Raises:
+        ValueError: 无法辨识化学计量
+    """
+    nu = identify_stoichiometry(model)
+    yields = declared_yields(model)
+    content = content_vectors(model)
+    exchange = declared_exchange(model, yields)
+    known = known_gaps(model)
+    nu_ref = reference_stoichiometry(model) if known else None
+    report = ClosureReport(list(model.PROCESS_NAMES), content @ nu - exchange,
+                           tolerance=tolerance, known=known,
+                           reference=None if nu_ref is None else content @ nu_ref - exchange)
+
+    index = model.variable_index
+    biomass = {var for var in NITROGEN_CONTENT if var.startswith('X_') and var != 'X_pr'}
+    for j, name in enumerate(model.PROCESS_NAMES):
+        if name not in UPTAKE_PROCESSES:
+            continue
+        _, degrader, yield_name = UPTAKE_PROCESSES[name]
+        targets = {var: nu[index[var], j] for var in biomass
+                   if var in index and nu[index[var], j] > 0}
+        wrong = sorted(var for var in targets if var != degrader)
+        if wrong:
+            report.issues.append(f"{name}: 生长写入 {', '.join(wrong)}（应为 {degrader}）")
+        growth = sum(targets.values())
+        if abs(growth - yields[yield_name]) > tolerance:
+            report.issues.append(f"{name}: 产率 {growth:.4g} 与声明 {yield_name}="
+                                 f"{yields[yield_name]:.4g} 不一致")
+    return report
+
+
+# 已报告过的不平衡（模型结构 + 守恒量），同一问题在一次扫描中只警告一次
+_reported = set()
+
+
+class MassBalanceMonitor:
+    """
+    积分过程中的质量平衡检查
+
+    创建时做一次 check_closure，生长目标/产率问题记入 issues 并警告（同一问题只警告一次，
+    不中止求解）。每 stride 次右端函数调用，计算各守恒量的不平衡速率 c·f(y) − (D + B)·r(y)
+    （D 为声明交换量，B 为已知缺口按参考化学计量的期望残差），相对于该量的总转化速率
+    超过 tolerance 时按 mode 处理: 'warn' 记录日志（同一模型同一守恒量只警告一次），
+    'raise' 抛出 MassBalanceError。y 可为 (n,) 或批量 (n, m)
+    """
+
+    def __init__(self, model, stride: int = DEFAULT_STRIDE,
+                 tolerance: float = DEFAULT_TOLERANCE, mode: str = 'warn'):
+        if mode not in ('warn', 'raise'):
+            raise ValueError(f"未知的质量平衡检查模式: {mode}")
+        self.model = model
+        self.stride = max(1, int(stride))
+        self.tolerance = tolerance
+        self.mode = mode
+        self.content = content_vectors(model)
+        self.exchange = declared_exchange(model)
+        try:
+            report = check_closure(model, tolerance)
+        except ValueError as e:  # 无法辨识化学计量：只做运行时检查
+            self.issues = [str(e)]
+        else:
+            self.exchange = self.exchange + report.baseline()
+            self.issues = list(report.issues)
+        for issue in self.issues:
+            if (type(model).__name__, issue) not in _reported:
+                _reported.add((type(model).__name__, issue))
+                logger.warning(f"质量平衡结构问题: {issue}")
+        self.calls = 0
+        self.checks = 0
+        self.max_imbalance = np.zeros(len(QUANTITIES))
+        self.first_violation: Dict[str, float] = {}
+        self._key = (type(model).__name__, tuple(model.PROCESS_NAMES),
+                     self.exchange.round(12).tobytes())
+
+    def check(self, t: float, y: np.ndarray, dydt: np.ndarray) -> np.ndarray:
+        """检查一个状态，返回各守恒量的相对不平衡"""
+        self.checks += 1
+        dydt = np.asarray(dydt)
+        if dydt.ndim == 1:
+            dydt = dydt[:, None]
+            y = np.asarray(y)[:, None]
+        rates = np.asarray(self.model.process_rates(y))                  # (P, m)
+        imbalance = self.content @ dydt - self.exchange @ rates          # (Q, m)
+        scale = np.abs(self.content) @ np.abs(dydt) + np.abs(self.exchange) @ np.abs(rates)
+        relative_all = np.abs(imbalance) / np.maximum(scale, 1e-300)
+        worst = np.argmax(relative_all, axis=1)                          # 批量中最差的一列
+        relative = relative_all[np.arange(len(QUANTITIES)), worst]
+        imbalance = imbalance[np.arange(len(QUANTITIES)), worst]
+        np.maximum(self.max_imbalance, relative, out=self.max_imbalance)
+
+        for k in np.nonzero(relative > self.tolerance)[0]:
+            quantity = QUANTITIES[k]
+            if quantity in self.first_violation:
+                continue
+            self.first_violation[quantity] = float(t)
+            message = (f"{quantity} 质量平衡偏离参考化学计量: t={t:.4g} d, "
+                       f"不平衡速率 {imbalance[k]:+.3e}（相对 {relative[k]:.2e}）")
+            if self.mode == 'raise':
+                raise MassBalanceError(message)
+            if (self._key, quantity) not in _reported:
+                _reported.add((self._key, quantity))
+                logger.warning(message + "；check_closure() 给出各过程残差")
+        return relative
+
+    def wrap_rhs(self, rates):
+        """包装速率函数 rates(t, y)，每 stride 次调用检查一次"""
+        def monitored_rates(t, y):
+            dydt = rates(t, y)
+            if self.calls % self.stride == 0:
+                self.check(t, y, dydt)
+            self.calls += 1
+            return dydt
+        return monitored_rates
+
+    def summary(self) -> Dict:
+        return {
+            'checks': self.checks,
+            'stride': self.stride,
+            'max_imbalance': {q: float(v) for q, v in zip(QUANTITIES, self.max_imbalance)},
+            'violations': dict(self.first_violation),
+            'issues': list(self.issues),
+        }
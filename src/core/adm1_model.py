@@ -8,6 +8,20 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
+# 相对导入：同时支持 core.adm1_model 与 src.core.adm1_model 两种导入方式
+try:
+    from .parameter_vector import (
+        P_K_S_SU, P_K_M_SU, P_Y_SU, P_K_S_AA, P_K_M_AA, P_Y_AA, P_K_S_FA, P_K_M_FA, P_Y_FA,
+        P_K_S_C4, P_K_M_C4, P_K_S_PRO, P_K_M_PRO, P_K_S_AC, P_K_M_AC, P_Y_AC,
+        P_K_S_H2, P_K_M_H2, P_Y_H2, P_KI_H2_FA, P_KI_H2_C4, P_KI_H2_PRO, P_KI_NH3,
+        P_K_EDTA_FE, P_K_EDTA_FE_REV, P_K_PRECIP_FES, ParameterVector)
+except ImportError:  # 直接运行本文件
+    from parameter_vector import (
+        P_K_S_SU, P_K_M_SU, P_Y_SU, P_K_S_AA, P_K_M_AA, P_Y_AA, P_K_S_FA, P_K_M_FA, P_Y_FA,
+        P_K_S_C4, P_K_M_C4, P_K_S_PRO, P_K_M_PRO, P_K_S_AC, P_K_M_AC, P_Y_AC,
+        P_K_S_H2, P_K_M_H2, P_Y_H2, P_KI_H2_FA, P_KI_H2_C4, P_KI_H2_PRO, P_KI_NH3,
+        P_K_EDTA_FE, P_K_EDTA_FE_REV, P_K_PRECIP_FES, ParameterVector)
+
 @dataclass
 class ADM1Parameters:
     """ADM1模型参数类（文档2表2.2-2.5）"""
@@ -60,12 +74,33 @@ class ADM1Parameters:
 class ADM1Model:
     """ADM1模型主类"""
 
-    def __init__(self, parameters: ADM1Parameters = None):
+    # process_rates 的行顺序
+    PROCESS_NAMES = ('uptake_su', 'uptake_aa', 'uptake_fa', 'uptake_va', 'uptake_bu',
+                     'uptake_pro', 'uptake_ac', 'uptake_h2',
+                     'fe_edta_complexation', 'fes_precipitation')
+
+    # 已知的质量平衡缺口（简化模型结构所致，见 analysis.mass_balance.check_closure）：
+    # C4/丙酸生长使用硬编码产率 0.1/0.08；摄取过程不释放/同化 S_IN；VFA 摄取不生成 S_IC。
+    # 缺口的期望残差由参考化学计量（reference_spec）计算，不取右端函数自身的残差；
+    # 运行时检查只接受与参考一致的缺口
+    KNOWN_IMBALANCES = {
+        'COD': ('uptake_va', 'uptake_bu', 'uptake_pro'),
+        'N': ('uptake_su', 'uptake_aa', 'uptake_fa', 'uptake_va', 'uptake_bu',
+              'uptake_pro', 'uptake_ac', 'uptake_h2'),
+        'charge': ('uptake_va', 'uptake_bu', 'uptake_pro', 'uptake_ac'),
+    }
+
+    def __init__(self, parameters=None):
         """
         初始化ADM1模型
         基于文档2的26个状态变量定义 + 文档6的4个金属变量
+
+        Args:
+            parameters: ADM1Parameters 或 ParameterVector；右端函数和雅可比使用编译后的参数向量
         """
-        self.parameters = parameters or ADM1Parameters()
+        self.parameters = parameters if parameters is not None else ADM1Parameters()
+        # 预设声明的动力学参数（含模型未使用的 Y_c4/Y_pro），供质量平衡检查对照
+        self.declared_parameters = {}
 
         # 定义完整的26个状态变量名称（文档2表2.6）
         self.state_variables = [
@@ -113,6 +148,33 @@ class ADM1Model:
         # 创建变量索引映射
         self.variable_index = {var: idx for idx, var in enumerate(self.state_variables)}
 
+        # 状态变量单位（逐变量容差按单位设置下限）
+        self.state_units = {var: 'gCOD/m³' for var in self.state_variables}
+        self.state_units.update({
+            'S_IC': 'molC/m³',
+            'S_IN': 'molN/m³',
+            'S_cat': 'eq/m³',
+            'S_an': 'eq/m³',
+            'S_Fe2': 'mol/m³',
+            'S_EDTA': 'mol/m³',
+            'S_FeEDTA': 'mol/m³',
+            'X_FeS': 'mol/m³'
+        })
+
+    @property
+    def parameters(self) -> ADM1Parameters:
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        """赋值时重新编译参数向量（修改 ADM1Parameters 的字段后需重新赋值才生效）"""
+        if isinstance(parameters, ParameterVector):
+            self.parameter_vector = parameters
+            self._parameters = parameters.to_parameters()
+        else:
+            self.parameter_vector = ParameterVector.from_parameters(parameters)
+            self._parameters = parameters
+
     def _set_initial_conditions(self) -> np.ndarray:
         """设置初始条件（文档3表3-2典型值）"""
         initial_values = [
@@ -160,69 +222,200 @@ class ADM1Model:
         """
         计算19个生化过程的反应速率
         基于文档2表3.1-3.2的动力学方程
+        y 可为 (n,) 或 (n, m)：按列批量计算 m 个状态（集合预报）
         """
-        # 解包关键状态变量
-        S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = y[0:8]
-        X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = y[15:22]
-        S_IN = y[10]
+        # 解包关键状态变量（单个状态转为 Python float 运算，避免 numpy 标量开销）
+        state = y.tolist() if np.ndim(y) == 1 else y
+        S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = state[0:8]
+        X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = state[15:22]
+        S_IN = state[10]
+        p = self.parameter_vector.fields
 
         # 初始化反应速率向量
-        reaction_rates = np.zeros(len(y))
+        reaction_rates = np.zeros(np.shape(y))
 
         # 1. 单糖降解（文档2第3.4.1节）
-        r_su = self._monod_kinetics(S_su, self.parameters.K_S_su,
-                                  self.parameters.k_m_su, X_su)
+        r_su = self._monod_kinetics(S_su, p[P_K_S_SU], p[P_K_M_SU], X_su)
         reaction_rates[0] = -r_su  # S_su消耗
-        reaction_rates[15] = r_su * self.parameters.Y_su  # X_su生长
+        reaction_rates[15] = r_su * p[P_Y_SU]  # X_su生长
 
         # 2. 氨基酸降解（文档2第3.4.2节）
-        r_aa = self._monod_kinetics(S_aa, self.parameters.K_S_aa,
-                                  self.parameters.k_m_aa, X_aa)
+        r_aa = self._monod_kinetics(S_aa, p[P_K_S_AA], p[P_K_M_AA], X_aa)
         reaction_rates[1] = -r_aa  # S_aa消耗
-        reaction_rates[16] = r_aa * self.parameters.Y_aa  # X_aa生长
+        reaction_rates[16] = r_aa * p[P_Y_AA]  # X_aa生长
 
         # 3. 长链脂肪酸降解（文档2第3.4.3节）
-        inhibition_h2_fa = self._hydrogen_inhibition(S_h2, self.parameters.KI_h2_fa)
-        r_fa = self._monod_kinetics(S_fa, self.parameters.K_S_fa,
-                                  self.parameters.k_m_fa, X_fa) * inhibition_h2_fa
+        inhibition_h2_fa = self._hydrogen_inhibition(S_h2, p[P_KI_H2_FA])
+        r_fa = self._monod_kinetics(S_fa, p[P_K_S_FA], p[P_K_M_FA], X_fa) * inhibition_h2_fa
         reaction_rates[2] = -r_fa  # S_fa消耗
-        reaction_rates[17] = r_fa * self.parameters.Y_fa  # X_fa生长
+        reaction_rates[17] = r_fa * p[P_Y_FA]  # X_fa生长
 
         # 4. 丁酸/戊酸降解（文档2第3.4.4节）
         S_c4 = S_va + S_bu  # C4组分总和
-        inhibition_h2_c4 = self._hydrogen_inhibition(S_h2, self.parameters.KI_h2_c4)
-        r_c4 = self._monod_kinetics(S_c4, self.parameters.K_S_c4,
-                                  self.parameters.k_m_c4, X_c4) * inhibition_h2_c4
-        reaction_rates[3] = -r_c4 * (S_va / S_c4)  # S_va消耗
-        reaction_rates[4] = -r_c4 * (S_bu / S_c4)  # S_bu消耗
+        inhibition_h2_c4 = self._hydrogen_inhibition(S_h2, p[P_KI_H2_C4])
+        r_c4 = self._monod_kinetics(S_c4, p[P_K_S_C4], p[P_K_M_C4], X_c4) * inhibition_h2_c4
+        # 按占比分配消耗: r_c4·S_va/S_c4 化简为 k_m·X·I·S_va/(K_S+S_c4)，S_c4=0时不出现0/0
+        uptake_c4 = p[P_K_M_C4] * X_c4 * inhibition_h2_c4 / (p[P_K_S_C4] + S_c4)
+        reaction_rates[3] = -uptake_c4 * S_va  # S_va消耗
+        reaction_rates[4] = -uptake_c4 * S_bu  # S_bu消耗
         reaction_rates[19] = r_c4 * 0.1  # X_c4生长（简化）
 
         # 5. 丙酸降解（文档2第3.4.5节）
-        inhibition_h2_pro = self._hydrogen_inhibition(S_h2, self.parameters.KI_h2_pro)
-        r_pro = self._monod_kinetics(S_pro, self.parameters.K_S_pro,
-                                   self.parameters.k_m_pro, X_pro) * inhibition_h2_pro
+        inhibition_h2_pro = self._hydrogen_inhibition(S_h2, p[P_KI_H2_PRO])
+        r_pro = self._monod_kinetics(S_pro, p[P_K_S_PRO], p[P_K_M_PRO], X_pro) * inhibition_h2_pro
         reaction_rates[5] = -r_pro  # S_pro消耗
         reaction_rates[20] = r_pro * 0.08  # X_pro生长
 
         # 6. 乙酸降解（文档2第3.4.6节）
         inhibition_nh3 = self._ammonia_inhibition(S_IN)
-        r_ac = self._monod_kinetics(S_ac, self.parameters.K_S_ac,
-                                  self.parameters.k_m_ac, X_ac) * inhibition_nh3
+        r_ac = self._monod_kinetics(S_ac, p[P_K_S_AC], p[P_K_M_AC], X_ac) * inhibition_nh3
         reaction_rates[6] = -r_ac  # S_ac消耗
-        reaction_rates[21] = r_ac * self.parameters.Y_ac  # X_ac生长
+        reaction_rates[21] = r_ac * p[P_Y_AC]  # X_ac生长
 
         # 7. 氢降解（文档2第3.4.7节）
-        r_h2 = self._monod_kinetics(S_h2, self.parameters.K_S_h2,
-                                  self.parameters.k_m_h2, X_h2)
+        r_h2 = self._monod_kinetics(S_h2, p[P_K_S_H2], p[P_K_M_H2], X_h2)
         reaction_rates[7] = -r_h2  # S_h2消耗
-        reaction_rates[22] = r_h2 * self.parameters.Y_h2  # X_h2生长
+        reaction_rates[22] = r_h2 * p[P_Y_H2]  # X_h2生长
 
         # 8. 金属络合反应（文档6表2）
-        r_metal = self._metal_reactions(y)
+        r_metal = self._metal_reactions(state)
         reaction_rates += r_metal
 
         return reaction_rates
 
+    def jacobian(self, t: float, y: np.ndarray) -> np.ndarray:
+        """
+        解析雅可比矩阵 ∂f/∂y（与 biochemical_reactions 的动力学一致）
+        每个过程的速率梯度乘以其化学计量系数累加到对应行
+        生物量列按 y[15:22] 的解包取 X_su..X_h2，生长项写入的行与速率函数保持一致
+        y 为 (n, m) 时返回 (n, n, m)，即每列状态各自的雅可比
+        """
+        p = self.parameter_vector.fields
+        n = len(y)
+        J = np.zeros((n, n) + np.shape(y)[1:])
+
+        state = y.tolist() if np.ndim(y) == 1 else y
+        S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = state[0:8]
+        X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = state[15:22]
+        S_IN = state[10]
+
+        def monod_terms(S, K_S, k_m, X):
+            """返回 (速率, ∂r/∂S, ∂r/∂X)"""
+            sat = S / (K_S + S)
+            return k_m * sat * X, k_m * K_S / (K_S + S) ** 2 * X, k_m * sat
+
+        def inhibition_terms(S, KI):
+            """返回 (抑制因子, ∂I/∂S)"""
+            factor = 1.0 / (1.0 + S / KI)
+            return factor, -factor ** 2 / KI
+
+        def add_process(gradient, stoichiometry):
+            """gradient: {状态索引: ∂r/∂y}, stoichiometry: {状态索引: 系数}"""
+            for row, coef in stoichiometry.items():
+                for col, value in gradient.items():
+                    J[row, col] += coef * value
+
+        # 1-2. 单糖、氨基酸降解
+        _, dr_dS, dr_dX = monod_terms(S_su, p[P_K_S_SU], p[P_K_M_SU], X_su)
+        add_process({0: dr_dS, 15: dr_dX}, {0: -1.0, 15: p[P_Y_SU]})
+        _, dr_dS, dr_dX = monod_terms(S_aa, p[P_K_S_AA], p[P_K_M_AA], X_aa)
+        add_process({1: dr_dS, 16: dr_dX}, {1: -1.0, 16: p[P_Y_AA]})
+
+        # 3. 长链脂肪酸降解（氢抑制）
+        r, dr_dS, dr_dX = monod_terms(S_fa, p[P_K_S_FA], p[P_K_M_FA], X_fa)
+        inh, dinh = inhibition_terms(S_h2, p[P_KI_H2_FA])
+        add_process({2: dr_dS * inh, 17: dr_dX * inh, 7: r * dinh}, {2: -1.0, 17: p[P_Y_FA]})
+
+        # 4. 丁酸/戊酸降解（按S_va、S_bu占比分配消耗）
+        S_c4 = S_va + S_bu
+        r, dr_dS, dr_dX = monod_terms(S_c4, p[P_K_S_C4], p[P_K_M_C4], X_c4)
+        inh, dinh = inhibition_terms(S_h2, p[P_KI_H2_C4])
+        grad_c4 = {3: dr_dS * inh, 4: dr_dS * inh, 18: dr_dX * inh, 7: r * dinh}
+        add_process(grad_c4, {19: 0.1})
+        # 消耗项 -u·S_va、-u·S_bu，u = k_m·X·I/(K_S+S_c4)
+        denom = p[P_K_S_C4] + S_c4
+        u = p[P_K_M_C4] * X_c4 * inh / denom
+        grad_u = {3: -u / denom, 4: -u / denom, 18: p[P_K_M_C4] * inh / denom,
+                  7: p[P_K_M_C4] * X_c4 * dinh / denom}
+        add_process(grad_u, {3: -S_va, 4: -S_bu})
+        J[3, 3] -= u
+        J[4, 4] -= u
+
+        # 5. 丙酸降解（氢抑制）
+        r, dr_dS, dr_dX = monod_terms(S_pro, p[P_K_S_PRO], p[P_K_M_PRO], X_pro)
+        inh, dinh = inhibition_terms(S_h2, p[P_KI_H2_PRO])
+        add_process({5: dr_dS * inh, 19: dr_dX * inh, 7: r * dinh}, {5: -1.0, 20: 0.08})
+
+        # 6. 乙酸降解（氨抑制）
+        r, dr_dS, dr_dX = monod_terms(S_ac, p[P_K_S_AC], p[P_K_M_AC], X_ac)
+        inh, dinh = inhibition_terms(S_IN, p[P_KI_NH3])
+        add_process({6: dr_dS * inh, 20: dr_dX * inh, 10: r * dinh}, {6: -1.0, 21: p[P_Y_AC]})
+
+        # 7. 氢降解
+        _, dr_dS, dr_dX = monod_terms(S_h2, p[P_K_S_H2], p[P_K_M_H2], X_h2)
+        add_process({7: dr_dS, 21: dr_dX}, {7: -1.0, 22: p[P_Y_H2]})
+
+        # 8. 金属络合与沉淀
+        idx_fe2 = self.variable_index['S_Fe2']
+        idx_edta = self.variable_index['S_EDTA']
+        idx_fe_edta = self.variable_index['S_FeEDTA']
+        idx_fes = self.variable_index['X_FeS']
+        add_process({idx_fe2: p[P_K_EDTA_FE] * state[idx_edta],
+                     idx_edta: p[P_K_EDTA_FE] * state[idx_fe2],
+                     idx_fe_edta: -p[P_K_EDTA_FE_REV]},
+                    {idx_fe2: -1.0, idx_edta: -1.0, idx_fe_edta: 1.0})
+        add_process({idx_fe2: p[P_K_PRECIP_FES]}, {idx_fe2: -1.0, idx_fes: 1.0})
+
+        return J
+
+    def methane_production_rate(self, y: np.ndarray) -> np.ndarray:
+        """
+        甲烷生成速率 [gCOD/m³/d] = (1 - Y_ac)·r_ac + (1 - Y_h2)·r_h2
+
+        乙酸和氢利用过程中未转化为生物量的COD生成甲烷；y 可为 (n,) 或 (n, m)
+        """
+        p = self.parameter_vector.fields
+        S_ac, S_h2 = y[6], y[7]
+        X_ac, X_h2 = y[20], y[21]
+        r_ac = self._monod_kinetics(S_ac, p[P_K_S_AC], p[P_K_M_AC], X_ac) * \
+            self._ammonia_inhibition(y[10])
+        r_h2 = self._monod_kinetics(S_h2, p[P_K_S_H2], p[P_K_M_H2], X_h2)
+        return (1.0 - p[P_Y_AC]) * r_ac + (1.0 - p[P_Y_H2]) * r_h2
+
+    def reference_spec(self):
+        """声明式参考描述（modelgen.adm1_spec，按当前参数），质量平衡检查的参考化学计量"""
+        from modelgen.adm1 import adm1_spec
+        return adm1_spec(self.parameters)
+
+    def process_rates(self, y: np.ndarray) -> np.ndarray:
+        """
+        各过程速率，行顺序同 PROCESS_NAMES（与 modelgen.adm1_spec 的过程一致）
+
+        生化过程单位 gCOD/m³/d，金属过程 mol/m³/d；y 可为 (n,) 或 (n, m)
+        """
+        p = self.parameter_vector.fields
+        S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = y[0:8]
+        X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = y[15:22]
+        S_Fe2, S_EDTA, S_FeEDTA = y[25:28]
+
+        uptake_c4 = p[P_K_M_C4] * X_c4 * self._hydrogen_inhibition(S_h2, p[P_KI_H2_C4]) / \
+            (p[P_K_S_C4] + S_va + S_bu)
+        return np.array([
+            self._monod_kinetics(S_su, p[P_K_S_SU], p[P_K_M_SU], X_su),
+            self._monod_kinetics(S_aa, p[P_K_S_AA], p[P_K_M_AA], X_aa),
+            self._monod_kinetics(S_fa, p[P_K_S_FA], p[P_K_M_FA], X_fa) *
+            self._hydrogen_inhibition(S_h2, p[P_KI_H2_FA]),
+            uptake_c4 * S_va,
+            uptake_c4 * S_bu,
+            self._monod_kinetics(S_pro, p[P_K_S_PRO], p[P_K_M_PRO], X_pro) *
+            self._hydrogen_inhibition(S_h2, p[P_KI_H2_PRO]),
+            self._monod_kinetics(S_ac, p[P_K_S_AC], p[P_K_M_AC], X_ac) *
+            self._ammonia_inhibition(y[10]),
+            self._monod_kinetics(S_h2, p[P_K_S_H2], p[P_K_M_H2], X_h2),
+            p[P_K_EDTA_FE] * S_Fe2 * S_EDTA - p[P_K_EDTA_FE_REV] * S_FeEDTA,
+            p[P_K_PRECIP_FES] * S_Fe2,
+        ])
+
     def _monod_kinetics(self, substrate: float, K_S: float,
                        k_m: float, biomass: float) -> float:
         """Monod动力学方程"""
@@ -234,11 +427,11 @@ class ADM1Model:
 
     def _ammonia_inhibition(self, S_IN: float) -> float:
         """氨抑制函数"""
-        return 1.0 / (1.0 + S_IN / self.parameters.KI_nh3)
+        return 1.0 / (1.0 + S_IN / self.parameter_vector.fields[P_KI_NH3])
 
     def _metal_reactions(self, y: np.ndarray) -> np.ndarray:
         """金属相关反应（文档6扩展）"""
-        metal_rates = np.zeros(len(y))
+        metal_rates = np.zeros(np.shape(y))  # y 可为状态数组或其 tolist()
 
         # 获取金属变量索引
         idx_fe2 = self.variable_index['S_Fe2']
@@ -247,8 +440,8 @@ class ADM1Model:
         idx_fes = self.variable_index['X_FeS']
 
         # EDTA-Fe络合反应
-        r_fe_edta = (self.parameters.k_edta_fe * y[idx_fe2] * y[idx_edta] -
-                    self.parameters.k_edta_fe_rev * y[idx_fe_edta])
+        p = self.parameter_vector.fields
+        r_fe_edta = p[P_K_EDTA_FE] * y[idx_fe2] * y[idx_edta] - p[P_K_EDTA_FE_REV] * y[idx_fe_edta]
 
         metal_rates[idx_fe2] = -r_fe_edta
         metal_rates[idx_edta] = -r_fe_edta
@@ -256,7 +449,7 @@ class ADM1Model:
 
         # FeS沉淀反应（简化）
         # 假设S²⁻来自其他过程
-        r_precip = self.parameters.k_precip_fes * y[idx_fe2]
+        r_precip = p[P_K_PRECIP_FES] * y[idx_fe2]
         metal_rates[idx_fe2] -= r_precip
         metal_rates[idx_fes] += r_precip
 
@@ -0,0 +1,259 @@
+# src/core/kernels.py
+"""
+ADM1右端函数与雅可比的计算后端
+
+numpy: ADM1Model.biochemical_reactions / jacobian（向量化，支持 (n, m) 批量状态）
+numba: 逐元素标量内核经 numba.njit 编译，读取编译后的参数向量 (P,) 和状态 (n,)，
+       写入调用方预分配的缓冲区；cache=True 把机器码缓存到磁盘（__pycache__ 或
+       NUMBA_CACHE_DIR），JIT 编译只在首次运行时发生
+auto:  已安装 numba 时用 numba，否则用 numpy
+
+内核与 ADM1Model 的动力学逐项对应（包括生长项写入行的错位），
+批量状态或批量参数仍走 numpy 路径
+"""
+
+import warnings
+from typing import Optional
+
+import numpy as np
+
+from core.parameter_vector import (
+    P_K_S_SU, P_K_M_SU, P_Y_SU, P_K_S_AA, P_K_M_AA, P_Y_AA, P_K_S_FA, P_K_M_FA, P_Y_FA,
+    P_K_S_C4, P_K_M_C4, P_K_S_PRO, P_K_M_PRO, P_K_S_AC, P_K_M_AC, P_Y_AC,
+    P_K_S_H2, P_K_M_H2, P_Y_H2, P_KI_H2_FA, P_KI_H2_C4, P_KI_H2_PRO, P_KI_NH3,
+    P_K_EDTA_FE, P_K_EDTA_FE_REV, P_K_PRECIP_FES)
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+KERNEL_BACKENDS = ('numpy', 'numba', 'auto')
+N_STATES = 29
+
+# 金属变量在状态向量中的位置（与 ADM1Model.state_variables 一致）
+I_FE2, I_EDTA, I_FEEDTA, I_FES = 25, 26, 27, 28
+
+
+def rates_kernel(p, y, out):
+    """生化与金属反应速率，写入 out (n,)"""
+    S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = y[0], y[1], y[2], y[3], y[4], y[5], y[6], y[7]
+    X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = y[15], y[16], y[17], y[18], y[19], y[20], y[21]
+    S_IN = y[10]
+    for i in range(out.shape[0]):
+        out[i] = 0.0
+
+    r = p[P_K_M_SU] * S_su / (p[P_K_S_SU] + S_su) * X_su
+    out[0] = -r
+    out[15] = r * p[P_Y_SU]
+
+    r = p[P_K_M_AA] * S_aa / (p[P_K_S_AA] + S_aa) * X_aa
+    out[1] = -r
+    out[16] = r * p[P_Y_AA]
+
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_FA])
+    r = p[P_K_M_FA] * S_fa / (p[P_K_S_FA] + S_fa) * X_fa * inh
+    out[2] = -r
+    out[17] = r * p[P_Y_FA]
+
+    S_c4 = S_va + S_bu
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_C4])
+    r = p[P_K_M_C4] * S_c4 / (p[P_K_S_C4] + S_c4) * X_c4 * inh
+    u = p[P_K_M_C4] * X_c4 * inh / (p[P_K_S_C4] + S_c4)
+    out[3] = -u * S_va
+    out[4] = -u * S_bu
+    out[19] = r * 0.1
+
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_PRO])
+    r = p[P_K_M_PRO] * S_pro / (p[P_K_S_PRO] + S_pro) * X_pro * inh
+    out[5] = -r
+    out[20] = r * 0.08
+
+    inh = 1.0 / (1.0 + S_IN / p[P_KI_NH3])
+    r = p[P_K_M_AC] * S_ac / (p[P_K_S_AC] + S_ac) * X_ac * inh
+    out[6] = -r
+    out[21] = r * p[P_Y_AC]
+
+    r = p[P_K_M_H2] * S_h2 / (p[P_K_S_H2] + S_h2) * X_h2
+    out[7] = -r
+    out[22] = r * p[P_Y_H2]
+
+    r = p[P_K_EDTA_FE] * y[I_FE2] * y[I_EDTA] - p[P_K_EDTA_FE_REV] * y[I_FEEDTA]
+    r_precip = p[P_K_PRECIP_FES] * y[I_FE2]
+    out[I_FE2] = -r - r_precip
+    out[I_EDTA] = -r
+    out[I_FEEDTA] = r
+    out[I_FES] = r_precip
+
+
+def jacobian_kernel(p, y, out):
+    """解析雅可比 ∂f/∂y，写入 out (n, n)"""
+    S_su, S_aa, S_fa, S_va, S_bu, S_pro, S_ac, S_h2 = y[0], y[1], y[2], y[3], y[4], y[5], y[6], y[7]
+    X_su, X_aa, X_fa, X_c4, X_pro, X_ac, X_h2 = y[15], y[16], y[17], y[18], y[19], y[20], y[21]
+    S_IN = y[10]
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            out[i, j] = 0.0
+
+    # Monod: ∂r/∂S = k·K/(K+S)²·X, ∂r/∂X = k·S/(K+S)；抑制: ∂I/∂S = -I²/KI
+    # 1. 单糖
+    K, k = p[P_K_S_SU], p[P_K_M_SU]
+    dS, dX = k * K / (K + S_su) ** 2 * X_su, k * S_su / (K + S_su)
+    out[0, 0] -= dS
+    out[0, 15] -= dX
+    out[15, 0] += p[P_Y_SU] * dS
+    out[15, 15] += p[P_Y_SU] * dX
+
+    # 2. 氨基酸
+    K, k = p[P_K_S_AA], p[P_K_M_AA]
+    dS, dX = k * K / (K + S_aa) ** 2 * X_aa, k * S_aa / (K + S_aa)
+    out[1, 1] -= dS
+    out[1, 16] -= dX
+    out[16, 1] += p[P_Y_AA] * dS
+    out[16, 16] += p[P_Y_AA] * dX
+
+    # 3. 长链脂肪酸（氢抑制）
+    K, k = p[P_K_S_FA], p[P_K_M_FA]
+    r = k * S_fa / (K + S_fa) * X_fa
+    dS, dX = k * K / (K + S_fa) ** 2 * X_fa, k * S_fa / (K + S_fa)
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_FA])
+    dinh = -inh * inh / p[P_KI_H2_FA]
+    for row, coef in ((2, -1.0), (17, p[P_Y_FA])):
+        out[row, 2] += coef * dS * inh
+        out[row, 17] += coef * dX * inh
+        out[row, 7] += coef * r * dinh
+
+    # 4. 丁酸/戊酸：生长项 r_c4·0.1 写入第19行；消耗 -u·S_va、-u·S_bu
+    K, k = p[P_K_S_C4], p[P_K_M_C4]
+    S_c4 = S_va + S_bu
+    r = k * S_c4 / (K + S_c4) * X_c4
+    dS, dX = k * K / (K + S_c4) ** 2 * X_c4, k * S_c4 / (K + S_c4)
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_C4])
+    dinh = -inh * inh / p[P_KI_H2_C4]
+    out[19, 3] += 0.1 * dS * inh
+    out[19, 4] += 0.1 * dS * inh
+    out[19, 18] += 0.1 * dX * inh
+    out[19, 7] += 0.1 * r * dinh
+    denom = K + S_c4
+    u = k * X_c4 * inh / denom
+    for row, coef in ((3, -S_va), (4, -S_bu)):
+        out[row, 3] += coef * (-u / denom)
+        out[row, 4] += coef * (-u / denom)
+        out[row, 18] += coef * k * inh / denom
+        out[row, 7] += coef * k * X_c4 * dinh / denom
+    out[3, 3] -= u
+    out[4, 4] -= u
+
+    # 5. 丙酸（氢抑制），生长项写入第20行
+    K, k = p[P_K_S_PRO], p[P_K_M_PRO]
+    r = k * S_pro / (K + S_pro) * X_pro
+    dS, dX = k * K / (K + S_pro) ** 2 * X_pro, k * S_pro / (K + S_pro)
+    inh = 1.0 / (1.0 + S_h2 / p[P_KI_H2_PRO])
+    dinh = -inh * inh / p[P_KI_H2_PRO]
+    for row, coef in ((5, -1.0), (20, 0.08)):
+        out[row, 5] += coef * dS * inh
+        out[row, 19] += coef * dX * inh
+        out[row, 7] += coef * r * dinh
+
+    # 6. 乙酸（氨抑制），生长项写入第21行
+    K, k = p[P_K_S_AC], p[P_K_M_AC]
+    r = k * S_ac / (K + S_ac) * X_ac
+    dS, dX = k * K / (K + S_ac) ** 2 * X_ac, k * S_ac / (K + S_ac)
+    inh = 1.0 / (1.0 + S_IN / p[P_KI_NH3])
+    dinh = -inh * inh / p[P_KI_NH3]
+    for row, coef in ((6, -1.0), (21, p[P_Y_AC])):
+        out[row, 6] += coef * dS * inh
+        out[row, 20] += coef * dX * inh
+        out[row, 10] += coef * r * dinh
+
+    # 7. 氢，生长项写入第22行
+    K, k = p[P_K_S_H2], p[P_K_M_H2]
+    dS, dX = k * K / (K + S_h2) ** 2 * X_h2, k * S_h2 / (K + S_h2)
+    out[7, 7] -= dS
+    out[7, 21] -= dX
+    out[22, 7] += p[P_Y_H2] * dS
+    out[22, 21] += p[P_Y_H2] * dX
+
+    # 8. 金属络合与沉淀
+    d_fe, d_edta, d_complex = p[P_K_EDTA_FE] * y[I_EDTA], p[P_K_EDTA_FE] * y[I_FE2], \
+        -p[P_K_EDTA_FE_REV]
+    for row, coef in ((I_FE2, -1.0), (I_EDTA, -1.0), (I_FEEDTA, 1.0)):
+        out[row, I_FE2] += coef * d_fe
+        out[row, I_EDTA] += coef * d_edta
+        out[row, I_FEEDTA] += coef * d_complex
+    out[I_FE2, I_FE2] -= p[P_K_PRECIP_FES]
+    out[I_FES, I_FE2] += p[P_K_PRECIP_FES]
+
+
+_COMPILED = {}
+
+
+def compiled_kernels():
+    """numba 编译的 (rates_kernel, jacobian_kernel)，磁盘缓存；未安装 numba 时返回 None"""
+    if not NUMBA_AVAILABLE:
+        return None
+    if not _COMPILED:
+        _COMPILED['rates'] = numba.njit(cache=True, nogil=True)(rates_kernel)
+        _COMPILED['jacobian'] = numba.njit(cache=True, nogil=True)(jacobian_kernel)
+    return _COMPILED['rates'], _COMPILED['jacobian']
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """解析后端名称；请求 numba 但未安装时警告并回退到 numpy"""
+    backend = backend or 'numpy'
+    if backend not in KERNEL_BACKENDS:
+        raise ValueError(f"未知内核后端: {backend}（可选 {', '.join(KERNEL_BACKENDS)}）")
+    if backend == 'auto':
+        return 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if backend == 'numba' and not NUMBA_AVAILABLE:
+        warnings.warn("未安装 numba，内核回退到 numpy 实现", RuntimeWarning, stacklevel=2)
+        return 'numpy'
+    return backend
+
+
+def _into(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+class ModelKernels:
+    """
+    模型的右端函数/雅可比入口，按后端分派
+
+    rates(t, y, out=None)、jacobian(t, y, out=None) 与 ADM1Model 的同名方法签名兼容；
+    out 给出时写入该缓冲区并返回它，否则每次分配新数组（积分器可能保留返回值）
+    """
+
+    def __init__(self, model, backend: Optional[str] = 'auto'):
+        self.model = model
+        self.backend = resolve_backend(backend)
+        # 只有标准ADM1状态布局的模型可以使用标量内核
+        layout_ok = (hasattr(model, 'parameter_vector')
+                     and len(getattr(model, 'state_variables', ())) == N_STATES)
+        if self.backend == 'numba' and not layout_ok:
+            self.backend = 'numpy'
+        self._kernels = compiled_kernels() if self.backend == 'numba' else None
+
+    def _scalar_path(self, y) -> bool:
+        return (self._kernels is not None and np.ndim(y) == 1
+                and self.model.parameter_vector.values.ndim == 1)
+
+    def rates(self, t: float, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if not self._scalar_path(y):
+            return _into(self.model.biochemical_reactions(t, y), out)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        out = np.empty(len(y)) if out is None else out
+        self._kernels[0](self.model.parameter_vector.values, y, out)
+        return out
+
+    def jacobian(self, t: float, y: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if not self._scalar_path(y):
+            return _into(self.model.jacobian(t, y), out)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        out = np.empty((len(y), len(y))) if out is None else out
+        self._kernels[1](self.model.parameter_vector.values, y, out)
+        return out
@@ -0,0 +1,173 @@
+# src/core/parameter_vector.py
+"""
+编译后的参数向量 - ADM1Parameters 按字段顺序打包为只读 float64 数组
+
+右端函数和雅可比在热循环中按下标常量（P_K_S_SU 等）取值，代替数据类的属性查找；
+集合计算把多组参数向量按列堆叠为 (P, m) 矩阵，各下标取出 (m,) 行与 (n, m) 状态广播。
+只读数组可直接按字节哈希，用作缓存键
+"""
+
+import hashlib
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+# 与 ADM1Parameters 字段顺序一致（adm1_model 导入本模块，这里不能反向导入）
+PARAMETER_NAMES = (
+    'k_dis', 'k_hyd_ch', 'k_hyd_pr', 'k_hyd_li',
+    'k_m_su', 'K_S_su', 'Y_su',
+    'k_m_aa', 'K_S_aa', 'Y_aa',
+    'k_m_fa', 'K_S_fa', 'Y_fa',
+    'k_m_c4', 'K_S_c4', 'k_m_pro', 'K_S_pro',
+    'k_m_ac', 'K_S_ac', 'Y_ac', 'k_m_h2', 'K_S_h2', 'Y_h2',
+    'KI_h2_fa', 'KI_h2_c4', 'KI_h2_pro', 'KI_nh3',
+    'k_edta_fe', 'k_edta_fe_rev', 'k_precip_fes',
+)
+PARAMETER_INDEX: Dict[str, int] = {name: i for i, name in enumerate(PARAMETER_NAMES)}
+N_PARAMETERS = len(PARAMETER_NAMES)
+
+# 下标常量
+P_K_DIS = PARAMETER_INDEX['k_dis']
+P_K_HYD_CH = PARAMETER_INDEX['k_hyd_ch']
+P_K_HYD_PR = PARAMETER_INDEX['k_hyd_pr']
+P_K_HYD_LI = PARAMETER_INDEX['k_hyd_li']
+P_K_M_SU = PARAMETER_INDEX['k_m_su']
+P_K_S_SU = PARAMETER_INDEX['K_S_su']
+P_Y_SU = PARAMETER_INDEX['Y_su']
+P_K_M_AA = PARAMETER_INDEX['k_m_aa']
+P_K_S_AA = PARAMETER_INDEX['K_S_aa']
+P_Y_AA = PARAMETER_INDEX['Y_aa']
+P_K_M_FA = PARAMETER_INDEX['k_m_fa']
+P_K_S_FA = PARAMETER_INDEX['K_S_fa']
+P_Y_FA = PARAMETER_INDEX['Y_fa']
+P_K_M_C4 = PARAMETER_INDEX['k_m_c4']
+P_K_S_C4 = PARAMETER_INDEX['K_S_c4']
+P_K_M_PRO = PARAMETER_INDEX['k_m_pro']
+P_K_S_PRO = PARAMETER_INDEX['K_S_pro']
+P_K_M_AC = PARAMETER_INDEX['k_m_ac']
+P_K_S_AC = PARAMETER_INDEX['K_S_ac']
+P_Y_AC = PARAMETER_INDEX['Y_ac']
+P_K_M_H2 = PARAMETER_INDEX['k_m_h2']
+P_K_S_H2 = PARAMETER_INDEX['K_S_h2']
+P_Y_H2 = PARAMETER_INDEX['Y_h2']
+P_KI_H2_FA = PARAMETER_INDEX['KI_h2_fa']
+P_KI_H2_C4 = PARAMETER_INDEX['KI_h2_c4']
+P_KI_H2_PRO = PARAMETER_INDEX['KI_h2_pro']
+P_KI_NH3 = PARAMETER_INDEX['KI_nh3']
+P_K_EDTA_FE = PARAMETER_INDEX['k_edta_fe']
+P_K_EDTA_FE_REV = PARAMETER_INDEX['k_edta_fe_rev']
+P_K_PRECIP_FES = PARAMETER_INDEX['k_precip_fes']
+
+
+class ParameterVector:
+    """
+    不可变参数向量
+
+    values 为 (P,)（单组参数）或 (P, m)（m 组参数按列堆叠）的只读 float64 数组；
+    相等比较与哈希按数组内容
+    """
+
+    __slots__ = ('_values', '_hash', '_fields')
+
+    def __init__(self, values):
+        values = np.array(values, dtype=np.float64)
+        if values.ndim not in (1, 2) or values.shape[0] != N_PARAMETERS:
+            raise ValueError(f"参数向量形状应为 ({N_PARAMETERS},) 或 ({N_PARAMETERS}, m): "
+                             f"{values.shape}")
+        values.flags.writeable = False
+        self._values = values
+        self._hash = None
+        self._fields = None
+
+    @classmethod
+    def from_parameters(cls, parameters) -> 'ParameterVector':
+        """由 ADM1Parameters 构建；数组字段（批量参数）得到 (P, m) 向量"""
+        columns = [np.asarray(getattr(parameters, name), dtype=np.float64)
+                   for name in PARAMETER_NAMES]
+        if all(c.ndim == 0 for c in columns):
+            return cls(columns)
+        return cls(np.vstack(np.broadcast_arrays(*columns)))
+
+    @classmethod
+    def from_preset(cls, preset_name: str, manager=None) -> 'ParameterVector':
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = manager or ADM1ParameterManager()
+        return cls.from_parameters(manager.create_model_parameters(preset_name))
+
+    @classmethod
+    def stack(cls, vectors: Iterable['ParameterVector']) -> 'ParameterVector':
+        """多组单参数向量 → (P, m) 批量向量"""
+        return cls(np.column_stack([v.values for v in vectors]))
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def batch_size(self) -> int:
+        """按列堆叠的参数组数（单组为 1）"""
+        return 1 if self._values.ndim == 1 else self._values.shape[1]
+
+    @property
+    def fields(self) -> list:
+        """
+        热循环用的逐字段视图：单组参数为 Python float 列表（避免 numpy 标量运算开销），
+        批量参数为各行 (m,) 数组的列表；按 P_* 下标取值
+        """
+        if self._fields is None:
+            self._fields = self._values.tolist() if self._values.ndim == 1 else list(self._values)
+        return self._fields
+
+    def __getitem__(self, key: Union[str, int]):
+        index = PARAMETER_INDEX[key] if isinstance(key, str) else key
+        return self._values[index]
+
+    def column(self, j: int) -> 'ParameterVector':
+        """批量向量的第 j 组参数"""
+        return self if self._values.ndim == 1 else ParameterVector(self._values[:, j])
+
+    def replace(self, **changes) -> 'ParameterVector':
+        unknown = set(changes) - set(PARAMETER_INDEX)
+        if unknown:
+            raise KeyError(f"未知参数: {', '.join(sorted(unknown))}")
+        values = self._values.copy()
+        for name, value in changes.items():
+            values[PARAMETER_INDEX[name]] = value
+        return ParameterVector(values)
+
+    def to_parameters(self):
+        """还原为 ADM1Parameters（批量向量的字段为 (m,) 数组）"""
+        from core.adm1_model import ADM1Parameters
+
+        if self._values.ndim == 1:
+            return ADM1Parameters(**{name: float(v)
+                                     for name, v in zip(PARAMETER_NAMES, self._values)})
+        return ADM1Parameters(**{name: row.copy()
+                                 for name, row in zip(PARAMETER_NAMES, self._values)})
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: self._values[i].tolist() for i, name in enumerate(PARAMETER_NAMES)}
+
+    def digest(self) -> str:
+        """内容哈希（十六进制），可用于磁盘缓存键"""
+        payload = self._values.tobytes() + str(self._values.shape).encode()
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParameterVector):
+            return NotImplemented
+        return self._values.shape == other._values.shape and \
+            bool(np.array_equal(self._values, other._values))
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((self._values.shape, self._values.tobytes()))
+        return self._hash
+
+    def __len__(self) -> int:
+        return N_PARAMETERS
+
+    def __repr__(self) -> str:
+        shape = '' if self._values.ndim == 1 else f", batch={self.batch_size}"
+        return f"ParameterVector({N_PARAMETERS} parameters{shape})"
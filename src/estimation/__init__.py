@@ -0,0 +1,12 @@
+# src/estimation/__init__.py
+"""
+状态估计模块 - EKF/EnKF 同化在线测量
+"""
+
+from .filters import (EnsembleKalmanFilter, ExtendedKalmanFilter, FilterResult,
+                      ReactorDynamics)
+from .measurements import MeasurementSeries, load_measurements, save_measurements
+from .observations import ObservationModel
+
+__all__ = ['EnsembleKalmanFilter', 'ExtendedKalmanFilter', 'FilterResult', 'ReactorDynamics',
+           'MeasurementSeries', 'load_measurements', 'save_measurements', 'ObservationModel']
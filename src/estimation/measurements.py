@@ -0,0 +1,126 @@
+# src/estimation/measurements.py
+"""
+在线测量序列 - 读取/写入 data/input/ 下的CSV文件
+
+格式: 第一列为时间（'time' 单位天，或 'hour' 单位小时），其余每列一个测量量；
+空值表示该时刻无测量。列名按 observations.canonical_name 规范化（ch4 → q_ch4, vfa → VFA）
+
+data/input/measurements.csv 为随仓库提供的示例：默认模型在稀释率 1/20 d⁻¹ 下的孪生实验
+（synthesize_measurements，seed=1），5 天内每 6 小时一次甲烷速率、每 12 小时一次VFA
+"""
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from estimation.observations import canonical_name
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MEASUREMENT_DIR = PROJECT_ROOT / 'data' / 'input'
+DEFAULT_MEASUREMENT_FILE = DEFAULT_MEASUREMENT_DIR / 'measurements.csv'
+HOURS_PER_DAY = 24.0
+
+
+@dataclass
+class MeasurementSeries:
+    """测量时间序列（NaN表示缺测）"""
+    times: np.ndarray                                   # [d]
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def names(self):
+        return list(self.values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def at(self, k: int) -> Dict[str, float]:
+        """第k个时刻的有效测量"""
+        return {name: float(series[k]) for name, series in self.values.items()
+                if np.isfinite(series[k])}
+
+    def __iter__(self) -> Iterator[Tuple[float, Dict[str, float]]]:
+        for k, t in enumerate(self.times):
+            yield float(t), self.at(k)
+
+    def select(self, names: Sequence[str]) -> 'MeasurementSeries':
+        """只保留给定的测量量"""
+        return MeasurementSeries(self.times, {n: self.values[n] for n in names if n in self.values})
+
+
+def load_measurements(path=None) -> MeasurementSeries:
+    """读取测量CSV（默认 data/input/measurements.csv）"""
+    path = Path(path) if path is not None else DEFAULT_MEASUREMENT_FILE
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"测量文件为空: {path}")
+        rows = [row for row in reader if row and any(cell.strip() for cell in row)]
+
+    time_column = header[0].strip().lower()
+    if time_column not in ('time', 't', 'day', 'days', 'hour', 'hours'):
+        raise ValueError(f"测量文件第一列应为时间(time/hour): {header[0]}")
+    scale = 1.0 / HOURS_PER_DAY if time_column.startswith('hour') else 1.0
+
+    def parse(cell: str) -> float:
+        cell = cell.strip()
+        return float(cell) if cell else np.nan
+
+    data = np.array([[parse(cell) for cell in row] + [np.nan] * (len(header) - len(row))
+                     for row in rows], dtype=float).reshape(len(rows), len(header))
+    order = np.argsort(data[:, 0], kind='stable')
+    data = data[order]
+
+    values = {canonical_name(name): data[:, j] for j, name in enumerate(header) if j > 0}
+    return MeasurementSeries(data[:, 0] * scale, values)
+
+
+def save_measurements(series: MeasurementSeries, path=None) -> Path:
+    """写出测量CSV（时间单位：天）"""
+    path = Path(path) if path is not None else DEFAULT_MEASUREMENT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['time'] + series.names)
+        for k, t in enumerate(series.times):
+            row = [f"{t:.10g}"]
+            for name in series.names:
+                value = series.values[name][k]
+                row.append(f"{value:.8g}" if np.isfinite(value) else '')
+            writer.writerow(row)
+    return path
+
+
+def synthesize_measurements(dynamics, y0: np.ndarray, times: np.ndarray,
+                            names: Sequence[str] = ('q_ch4', 'VFA'),
+                            noise: Optional[Dict[str, float]] = None,
+                            substeps: int = 4, seed: Optional[int] = None
+                            ) -> Tuple[MeasurementSeries, np.ndarray]:
+    """
+    生成合成测量（孪生实验）：用给定动力学积分"真实"轨迹并加入相对高斯噪声
+
+    Returns:
+        (测量序列, 真实状态 (n, len(times)))
+    """
+    from estimation.observations import ObservationModel
+
+    rng = np.random.default_rng(seed)
+    observe = ObservationModel(dynamics.model, names, noise)
+    times = np.asarray(times, dtype=float)
+    y = np.array(y0, dtype=float)[:, None]
+    t = float(times[0])
+    truth = np.empty((len(y0), len(times)))
+    observed = np.empty((len(names), len(times)))
+    for k, t_next in enumerate(times):
+        if t_next > t:
+            y = dynamics.forecast(t, y, t_next - t, substeps=substeps)
+            t = float(t_next)
+        truth[:, k] = y[:, 0]
+        clean = observe(y)[:, 0]
+        std = np.sqrt(np.diag(observe.covariance(clean)))
+        observed[:, k] = np.maximum(clean + std * rng.standard_normal(len(names)), 0.0)
+    return MeasurementSeries(times, dict(zip(names, observed))), truth
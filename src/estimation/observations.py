@@ -0,0 +1,89 @@
+# src/estimation/observations.py
+"""
+观测算子 - 由模型状态计算在线测量量
+
+支持 (n,) 与 (n, m) 状态（集合按列批量计算）:
+  状态变量名（如 S_ch4、S_ac）: 直接观测该状态
+  'VFA':   挥发性脂肪酸总量 S_va + S_bu + S_pro + S_ac [gCOD/m³]
+  'q_ch4': 甲烷生成速率 (1-Y_ac)·r_ac + (1-Y_h2)·r_h2 [gCOD/m³/d]
+pH 无法观测：模型不含酸碱平衡（无 S_H+、离子电荷平衡）
+"""
+
+from typing import Callable, Dict, Sequence
+
+import numpy as np
+
+VFA_VARIABLES = ('S_va', 'S_bu', 'S_pro', 'S_ac')
+UNSUPPORTED_OBSERVATIONS = {
+    'pH': "模型不含酸碱平衡（无S_H+与电荷平衡），无法由状态计算pH",
+}
+
+# 数据文件列名 → 观测名
+OBSERVATION_ALIASES = {
+    'ch4': 'q_ch4',
+    'methane': 'q_ch4',
+    'ch4_production': 'q_ch4',
+    'vfa': 'VFA',
+    'ph': 'pH',
+}
+
+# 默认观测噪声：相对标准差与绝对下限
+DEFAULT_RELATIVE_NOISE = {'q_ch4': 0.05, 'VFA': 0.10}
+DEFAULT_STATE_NOISE = 0.05
+NOISE_FLOOR = 1e-6
+
+
+def canonical_name(name: str) -> str:
+    """数据列名规范化为观测名"""
+    return OBSERVATION_ALIASES.get(name.strip().lower(), name.strip())
+
+
+def observation_function(name: str, model) -> Callable[[np.ndarray], np.ndarray]:
+    """返回观测算子 h(y)"""
+    if name in UNSUPPORTED_OBSERVATIONS:
+        raise ValueError(f"不支持的观测 {name}: {UNSUPPORTED_OBSERVATIONS[name]}")
+    if name == 'VFA':
+        rows = [model.variable_index[var] for var in VFA_VARIABLES]
+        return lambda y: np.sum(np.asarray(y)[rows], axis=0)
+    if name == 'q_ch4':
+        return model.methane_production_rate
+    if name in model.variable_index:
+        idx = model.variable_index[name]
+        return lambda y: np.asarray(y)[idx]
+    raise ValueError(f"未知观测: {name}")
+
+
+def is_supported(name: str, model) -> bool:
+    try:
+        observation_function(name, model)
+        return True
+    except ValueError:
+        return False
+
+
+class ObservationModel:
+    """一组观测的算子与噪声"""
+
+    def __init__(self, model, names: Sequence[str], noise: Dict[str, float] = None):
+        self.names = list(names)
+        self.functions = [observation_function(name, model) for name in self.names]
+        self.noise = dict(noise or {})
+
+    def __call__(self, y: np.ndarray) -> np.ndarray:
+        """观测值 (k,) 或 (k, m)"""
+        return np.array([h(y) for h in self.functions])
+
+    def covariance(self, values: np.ndarray) -> np.ndarray:
+        """观测误差协方差 R（对角），标准差 = 相对噪声 × |测量值| + 下限"""
+        std = []
+        for name, value in zip(self.names, values):
+            relative = self.noise.get(name, DEFAULT_RELATIVE_NOISE.get(name, DEFAULT_STATE_NOISE))
+            std.append(relative * abs(value) + NOISE_FLOOR)
+        return np.diag(np.square(std))
+
+    def jacobian(self, y: np.ndarray) -> np.ndarray:
+        """观测雅可比 H (k, n)：对全部分量的扰动一次批量求值"""
+        y = np.asarray(y, dtype=float)
+        steps = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y), 1e-8)
+        perturbed = y[:, None] + np.diag(steps)
+        return (self(perturbed) - self(y)[:, None]) / steps[None, :]
@@ -12,6 +12,51 @@ import numpy as np
 from pathlib import Path
 import sys
 
+src_path = Path(__file__).parent.parent
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from visualization.downsampling import LevelOfDetailPlotter
+
+
+class BlitManager:
+    """单个画布的blit重绘管理 - 背景缓存一次，数据更新时只重绘曲线"""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self._cid = canvas.mpl_connect('draw_event', self.on_draw)
+
+    def add_artist(self, artist):
+        """登记动态更新的图元（设为animated，不参与背景绘制）"""
+        artist.set_animated(True)
+        self.artists.append(artist)
+
+    def on_draw(self, event):
+        """完整重绘后缓存背景并补画动态图元"""
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        """用缓存背景 + 动态图元刷新画布"""
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+    def disconnect(self):
+        """断开draw事件"""
+        self.canvas.mpl_disconnect(self._cid)
+
 
 class ChartManager:
     """图表管理器 - 集成现有可视化模块到GUI"""
@@ -20,6 +65,14 @@ class ChartManager:
         self.parent = parent_frame
         self.figures = {}
         self.canvases = {}
+        self.blitters = {}
+        self.main_frame = None
+        self.title_label = None
+        self.model = None
+        # 曲线 -> (状态索引, 缩放系数)，增量更新时用于替换数据
+        self.line_sources = {}
+        # 长轨迹降采样，缩放时按可见范围重新采样
+        self.lod = LevelOfDetailPlotter()
         self.setup_chart_environment()
 
     def setup_chart_environment(self):
@@ -40,16 +93,19 @@ class ChartManager:
 
         # 清除现有图表
         self.clear_charts()
+        self.model = results.get('model')
 
         # 创建主框架
         main_frame = ttk.Frame(self.parent)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.main_frame = main_frame
 
         # 创建标题
         title_label = ttk.Label(main_frame,
-                                text=f"ADM1 Simulation - {preset_name} (30 days, {len(results['time'])} time points)",
+                                text=self._title_text(results, preset_name),
                                 font=("Arial", 14, "bold"))
         title_label.pack(pady=(0, 10))
+        self.title_label = title_label
 
         # 创建图表容器
         chart_container = ttk.Frame(main_frame)
@@ -98,8 +154,12 @@ class ChartManager:
         # 调用绘图函数
         plot_func(ax, results)
 
-        # 创建画布并嵌入到GUI
+        # 创建画布并嵌入到GUI，曲线由blit管理器增量刷新
         canvas = FigureCanvasTkAgg(fig, master=subplot_frame)
+        blitter = BlitManager(canvas)
+        for line in ax.get_lines():
+            if line in self.line_sources:
+                blitter.add_artist(line)
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -111,6 +171,20 @@ class ChartManager:
         # 保存引用
         self.figures[f"chart_{row}_{col}"] = fig
         self.canvases[f"chart_{row}_{col}"] = canvas
+        self.blitters[f"chart_{row}_{col}"] = blitter
+
+    def _title_text(self, results, preset_name):
+        """图表标题文字"""
+        time = results['time']
+        days = time[-1] if len(time) else 0
+        return f"ADM1 Simulation - {preset_name} ({days:.0f} days, {len(time)} time points)"
+
+    def _plot_state(self, ax, time, states, idx, scale=1.0, **kwargs):
+        """绘制单个状态变量并登记数据来源"""
+        values = states[idx, :] * scale if scale != 1.0 else states[idx, :]
+        line = self.lod.plot(ax, time, values, **kwargs)
+        self.line_sources[line] = (idx, scale)
+        return line
 
     def plot_soluble_substrates(self, ax, results):
         """绘制可溶性底物 - 对应左上角图表"""
@@ -131,7 +205,7 @@ class ChartManager:
         for var_code, label, color in soluble_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self._plot_state(ax, time, states, idx, label=label, linewidth=1.5, color=color)
 
         ax.set_title('Soluble Substrates')
         ax.set_xlabel('Time (days)')
@@ -157,7 +231,7 @@ class ChartManager:
         for var_code, label, color in particulate_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self._plot_state(ax, time, states, idx, label=label, linewidth=1.5, color=color)
 
         ax.set_title('Particulate Substrates')
         ax.set_xlabel('Time (days)')
@@ -184,7 +258,7 @@ class ChartManager:
         for var_code, label, color in microbial_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self._plot_state(ax, time, states, idx, label=label, linewidth=1.5, color=color)
 
         ax.set_title('Microbial Populations')
         ax.set_xlabel('Time (days)')
@@ -211,10 +285,10 @@ class ChartManager:
             if idx != -1 and idx < states.shape[0]:
                 # 对氢气进行缩放以便显示
                 if var_code == 'S_h2':
-                    ax.plot(time, states[idx, :] * 1000, label=f'{label} (x1000)',
-                            linewidth=2, color=color, linestyle='--')
+                    self._plot_state(ax, time, states, idx, scale=1000, label=f'{label} (x1000)',
+                                     linewidth=2, color=color, linestyle='--')
                 else:
-                    ax.plot(time, states[idx, :], label=label, linewidth=2, color=color)
+                    self._plot_state(ax, time, states, idx, label=label, linewidth=2, color=color)
 
         ax.set_title('Key Variables Overview')
         ax.set_xlabel('Time (days)')
@@ -236,7 +310,7 @@ class ChartManager:
         for var_code, label, color in ionic_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=2, color=color)
+                self._plot_state(ax, time, states, idx, label=label, linewidth=2, color=color)
 
         ax.set_title('Ionic Components')
         ax.set_xlabel('Time (days)')
@@ -310,18 +384,93 @@ class ChartManager:
                 filetypes=[("PNG files", "*.png"), ("All files", "*.*")]
             )
             if filename:
-                canvas.figure.savefig(filename, dpi=300, bbox_inches='tight')
+                # blit曲线为animated，保存时临时恢复为普通图元
+                animated = canvas.figure.findobj(lambda a: a.get_animated())
+                for artist in animated:
+                    artist.set_animated(False)
+                try:
+                    canvas.figure.savefig(filename, dpi=300, bbox_inches='tight')
+                finally:
+                    for artist in animated:
+                        artist.set_animated(True)
                 tk.messagebox.showinfo("成功", f"图表已保存: {filename}")
         except Exception as e:
             tk.messagebox.showerror("错误", f"保存失败: {e}")
 
     def clear_charts(self):
         """清除所有图表"""
+        for blitter in self.blitters.values():
+            blitter.disconnect()
         for canvas in self.canvases.values():
             canvas.get_tk_widget().destroy()
+        if self.main_frame is not None:
+            self.main_frame.destroy()
+            self.main_frame = None
+            self.title_label = None
+        self.lod.clear()
         self.figures.clear()
         self.canvases.clear()
+        self.blitters.clear()
+        self.line_sources.clear()
 
     def update_charts(self, results, preset_name):
-        """更新图表数据"""
-        self.create_comprehensive_charts(results, preset_name)
\ No newline at end of file
+        """
+        更新图表数据
+
+        图表已存在且状态变量布局相同时保留Figure和曲线对象，只替换数据并blit重绘
+        （每次模拟都会创建新模型，曲线只依赖状态变量索引）；
+        首次调用、图表已销毁或状态变量布局变化时完整创建
+        """
+        if not results or not results.get('success'):
+            return None
+
+        model = results.get('model') or self.model
+        if not self.canvases or self.main_frame is None or \
+                not self.main_frame.winfo_exists() or self.model is None or \
+                list(model.state_variables) != list(self.model.state_variables):
+            return self.create_comprehensive_charts(results, preset_name)
+
+        self.model = model
+        self.update_chart_data(results['time'], results['states'])
+        if self.title_label is not None:
+            self.title_label.configure(text=self._title_text(results, preset_name))
+        return self.main_frame
+
+    def _view_contains_data(self, ax):
+        """当前坐标范围是否已容纳全部数据（用户手动缩放时视为容纳）"""
+        data = ax.dataLim
+        x_min, x_max = sorted(ax.get_xlim())
+        y_min, y_max = sorted(ax.get_ylim())
+        x_ok = not ax.get_autoscalex_on() or (x_min <= data.x0 and data.x1 <= x_max)
+        y_ok = not ax.get_autoscaley_on() or (y_min <= data.y0 and data.y1 <= y_max)
+        return x_ok and y_ok
+
+    def update_chart_data(self, time, states):
+        """
+        增量更新全部曲线数据（可用于流式模拟进度刷新）
+
+        数据仍在当前坐标范围内时只blit曲线；超出范围时扩展坐标轴并完整重绘一次
+        """
+        time = np.asarray(time)
+        states = np.asarray(states)
+
+        for key, fig in self.figures.items():
+            changed_axes = []
+            for ax in fig.axes:
+                lines = [line for line in ax.get_lines() if line in self.line_sources]
+                if not lines:
+                    continue
+                for line in lines:
+                    idx, scale = self.line_sources[line]
+                    values = states[idx, :] * scale if scale != 1.0 else states[idx, :]
+                    self.lod.set_data(line, time, values)
+
+                ax.relim()
+                if not self._view_contains_data(ax):
+                    ax.autoscale_view()
+                    changed_axes.append(ax)
+
+            if changed_axes:
+                self.canvases[key].draw_idle()
+            else:
+                self.blitters[key].update()
\ No newline at end of file
@@ -23,8 +23,10 @@ class ParametersTab:
         ttk.Label(control_frame, text="预设:").pack(side=tk.LEFT, padx=(0, 10))
         self.preset_var = tk.StringVar(value="food_waste")
         preset_combo = ttk.Combobox(control_frame, textvariable=self.preset_var,
-                                   values=["food_waste", "sewage_sludge"],
+                                   values=self.available_presets(),
                                    state="readonly", width=15)
+        preset_combo.configure(postcommand=lambda: preset_combo.configure(
+            values=self.available_presets()))
         preset_combo.pack(side=tk.LEFT, padx=(0, 20))
         preset_combo.bind('<<ComboboxSelected>>', self.refresh_parameters)
 
@@ -46,26 +48,23 @@ class ParametersTab:
         parameters = self.load_parameters(preset)
         self.display_parameters(parameters)
 
+    def available_presets(self):
+        """预设列表（进程级注册表，文件修改后自动更新）"""
+        try:
+            from parameters.preset_registry import get_preset_registry
+            return get_preset_registry().names()
+        except Exception as e:
+            print(f"[WARNING] 预设注册表不可用: {e}")
+            return ["food_waste", "sewage_sludge"]
+
     def load_parameters(self, preset):
-        """加载参数数据"""
-        # 这里应该从实际参数管理器加载
-        # 暂时返回模拟数据
-        if preset == "food_waste":
-            return {
-                "k_dis": 0.5,
-                "k_hyd_ch": 12.0,
-                "k_hyd_pr": 8.0,
-                "k_m_su": 35.0,
-                "K_S_su": 0.6
-            }
-        else:
-            return {
-                "k_dis": 0.3,
-                "k_hyd_ch": 10.0,
-                "k_hyd_pr": 12.0,
-                "k_m_su": 30.0,
-                "K_S_su": 0.8
-            }
+        """加载参数数据（注册表中已编译的预设，切换无需重新读取文件）"""
+        try:
+            from parameters.preset_registry import get_preset_registry
+            return get_preset_registry().get(preset).data.get('kinetic_parameters', {})
+        except Exception as e:
+            print(f"[WARNING] 加载预设参数失败: {e}")
+            return {}
 
     def display_parameters(self, parameters):
         """显示参数"""
@@ -0,0 +1,181 @@
+# src/inputs/sensor_feed.py
+"""
+传感器数据源 - 代替SCADA的本地文件/TCP套接字数据流
+
+每条读数为一行JSON（JSON Lines）:
+  {"t": 0.000694, "digester": "D1", "flow": 150.0,
+   "influent": {"X_ch": 20.0, "S_IN": 0.05}, "measurements": {"S_ac": 2.9}}
+t 为模拟时间（天），也可用 "minute" 字段按分钟给出；flow 为进水流量 [m³/d]
+"""
+
+import json
+import socket
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+MINUTES_PER_DAY = 1440.0
+
+
+@dataclass
+class SensorReading:
+    """单条传感器读数"""
+    t: float                                   # 模拟时间 [d]
+    digester: str = 'default'                  # 消化器名称
+    flow: Optional[float] = None               # 进水流量 [m³/d]，None表示不变
+    influent: Dict[str, float] = field(default_factory=dict)       # 进水浓度
+    measurements: Dict[str, float] = field(default_factory=dict)   # 在线测量值
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SensorReading':
+        """由JSON对象创建读数"""
+        if 't' in data:
+            t = float(data['t'])
+        elif 'minute' in data:
+            t = float(data['minute']) / MINUTES_PER_DAY
+        else:
+            raise ValueError("读数缺少时间字段 't' 或 'minute'")
+        flow = data.get('flow')
+        return cls(
+            t=t,
+            digester=str(data.get('digester', 'default')),
+            flow=float(flow) if flow is not None else None,
+            influent={k: float(v) for k, v in data.get('influent', {}).items()},
+            measurements={k: float(v) for k, v in data.get('measurements', {}).items()},
+        )
+
+    def to_dict(self) -> Dict:
+        data = {'t': self.t, 'digester': self.digester}
+        if self.flow is not None:
+            data['flow'] = self.flow
+        if self.influent:
+            data['influent'] = dict(self.influent)
+        if self.measurements:
+            data['measurements'] = dict(self.measurements)
+        return data
+
+    def influent_update(self) -> Optional[Dict[str, float]]:
+        """进水更新（DigitalTwin.advance 的 influent 参数），无变化时返回None"""
+        if self.flow is None and not self.influent:
+            return None
+        update = dict(self.influent)
+        if self.flow is not None:
+            update['flow'] = self.flow
+        return update
+
+
+def parse_reading(line: str) -> Optional[SensorReading]:
+    """解析一行JSON读数，空行返回None"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return SensorReading.from_dict(json.loads(line))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"无法解析传感器读数: {line[:80]} ({e})") from e
+
+
+def write_readings(path, readings: Iterable[SensorReading], append: bool = False) -> Path:
+    """把读数写为JSON Lines文件（回放或测试用）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+        for reading in readings:
+            f.write(json.dumps(reading.to_dict(), ensure_ascii=False) + "\n")
+    return path
+
+
+class FileSensorFeed:
+    """
+    文件数据源 - 逐行读取JSON Lines文件
+
+    follow=True 时像 tail -f 一样跟随追加写入的文件，
+    只处理以换行结束的完整行；timeout 秒内没有新数据则结束
+    """
+
+    def __init__(self, path, follow: bool = False, poll_interval: float = 0.5,
+                 timeout: Optional[float] = None, skip_invalid: bool = True):
+        self.path = Path(path)
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.skip_invalid = skip_invalid
+        self.n_invalid = 0
+
+    def __iter__(self) -> Iterator[SensorReading]:
+        last_data = time.monotonic()
+        buffer = ''
+        with open(self.path, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.readline()
+                if chunk:
+                    buffer += chunk
+                    if not buffer.endswith('\n') and self.follow:
+                        continue  # 行未写完，等待剩余部分
+                    line, buffer = buffer, ''
+                    last_data = time.monotonic()
+                    reading = self._parse(line)
+                    if reading is not None:
+                        yield reading
+                    continue
+
+                if not self.follow:
+                    if buffer:
+                        reading = self._parse(buffer)
+                        if reading is not None:
+                            yield reading
+                    return
+                if self.timeout is not None and time.monotonic() - last_data > self.timeout:
+                    return
+                time.sleep(self.poll_interval)
+
+    def _parse(self, line: str) -> Optional[SensorReading]:
+        try:
+            return parse_reading(line)
+        except ValueError as e:
+            if not self.skip_invalid:
+                raise
+            self.n_invalid += 1
+            print(f"[WARNING] {e}")
+            return None
+
+
+class SocketSensorFeed:
+    """
+    TCP套接字数据源 - 连接到SCADA网关（或模拟服务），按行接收JSON读数
+
+    服务端关闭连接时迭代结束；timeout 为单次接收的最长等待时间（秒）
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 5020,
+                 timeout: Optional[float] = None, skip_invalid: bool = True):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.skip_invalid = skip_invalid
+        self.n_invalid = 0
+
+    def __iter__(self) -> Iterator[SensorReading]:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            conn.settimeout(self.timeout)
+            with conn.makefile('r', encoding='utf-8') as stream:
+                for line in stream:
+                    try:
+                        reading = parse_reading(line)
+                    except ValueError as e:
+                        if not self.skip_invalid:
+                            raise
+                        self.n_invalid += 1
+                        print(f"[WARNING] {e}")
+                        continue
+                    if reading is not None:
+                        yield reading
+
+
+def open_feed(source: str, follow: bool = False, timeout: Optional[float] = None):
+    """按来源字符串创建数据源：'tcp://host:port' 为套接字，其余视为文件路径"""
+    if source.startswith('tcp://'):
+        host, _, port = source[len('tcp://'):].rpartition(':')
+        return SocketSensorFeed(host or '127.0.0.1', int(port), timeout=timeout)
+    return FileSensorFeed(source, follow=follow, timeout=timeout)
@@ -10,8 +10,10 @@ from pathlib import Path
 class CLIInterface:
     """命令行界面控制器"""
 
-    def __init__(self):
+    def __init__(self, profile=False, profile_mode='both'):
         self.setup_complete = False
+        self.profile = profile  # 剖析模式：运行模拟时写出性能报告
+        self.profile_mode = profile_mode
         self._setup_environment()
 
     def _setup_environment(self):
@@ -43,27 +45,27 @@ class CLIInterface:
         print("3. 查看帮助")
         print("4. 退出系统")
 
-    def run_simulation(self):
-        """运行模拟"""
+    def run_simulation(self, preset_name=None, days=30):
+        """运行模拟（剖析模式下记录各阶段耗时）"""
         self._print_header("ADM1模拟运行")
 
-        try:
-            from patches.environment_patch import safe_import
-            from pathlib import Path
+        if not self.profile:
+            self._run_simulation(preset_name, days)
+            return
 
-            base_path = Path(__file__).parent.parent
+        from utils.profiler import RunProfiler
 
-            # 导入核心模块
-            ADM1Model = safe_import(base_path / 'core/adm1_model.py', 'ADM1Model')
-            ADM1Solver = safe_import(base_path / 'solvers/ode_solver.py', 'ADM1Solver')
-            ADM1ParameterManager = safe_import(base_path / 'parameters/parameter_manager.py', 'ADM1ParameterManager')
+        with RunProfiler('simulation', mode=self.profile_mode) as profiler:
+            self._run_simulation(preset_name, days)
+        profiler.print_summary()
 
-            if not all([ADM1Model, ADM1Solver, ADM1ParameterManager]):
-                print("[ERROR] 核心模块导入失败")
-                return
+    def _run_simulation(self, preset_name=None, days=30):
+        """模拟流程：参数加载 → 求解 → 可视化"""
+        try:
+            from solvers.ode_solver import ADM1Solver
+            from parameters.parameter_manager import ADM1ParameterManager
 
             # 初始化组件
-            model = ADM1Model()
             solver = ADM1Solver()
             param_manager = ADM1ParameterManager()
 
@@ -74,14 +76,20 @@ class CLIInterface:
                 return
 
             print(f"[INFO] 可用预设: {presets}")
-            preset_name = presets[0]
+            if preset_name is None:
+                preset_name = presets[0]
+            elif preset_name not in presets:
+                print(f"[ERROR] 未知预设: {preset_name}")
+                return
             param_manager.set_current_preset(preset_name)
 
             print(f"[INFO] 使用预设: {preset_name}")
 
+            # 按预设参数与初始条件创建模型
+            model, y0 = param_manager.create_model(preset_name)
+
             # 运行模拟
-            t_span = (0, 30)
-            y0 = model.initial_conditions
+            t_span = (0, days)
 
             print("[PROGRESS] 求解微分方程...")
             results = solver.solve(model, t_span, y0)
@@ -129,8 +137,19 @@ class CLIInterface:
 - food_waste: 餐厨垃圾（高碳水化合物）
 - sewage_sludge: 污水污泥（高蛋白质）
 
+剖析模式:
+- python run_adm1.py --profile      # 剖析单次模拟
+- python src/interface/cli_interface.py --profile
+
+批量模式（无交互，可续跑）:
+- python run_adm1.py --scenario examples/scenarios/nightly_whatif.json --workers 4
+- 情景文件支持 JSON/YAML/CSV，汇总表写入 results/batch/<情景文件名>/
+
+预设校验:
+- python run_adm1.py --lint-presets
+
 输出目录:
-- results/: 模拟数据结果
+- results/: 模拟数据结果、剖析报告(profile_*.txt / *.collapsed)、批量汇总(batch/)
 - figures/: 生成的可视化图表
 
 技术支持:
@@ -147,6 +166,8 @@ class CLIInterface:
         self._print_header("ADM1厌氧消化模型系统")
         print("版本: 1.0.0")
         print("描述: 专业ADM1模型模拟平台")
+        if self.profile:
+            print("[INFO] 剖析模式已启用，报告输出到 results/")
 
         while True:
             self._print_menu()
@@ -173,9 +194,18 @@ class CLIInterface:
                 print(f"[ERROR] 操作失败: {e}")
 
 
-def main():
+def main(argv=None):
     """主界面函数"""
-    interface = CLIInterface()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ADM1命令行界面")
+    parser.add_argument('--profile', action='store_true',
+                        help="剖析模拟运行，报告写入 results/")
+    parser.add_argument('--profile-mode', choices=['both', 'sampling', 'cprofile'], default='both',
+                        help="剖析方式（sampling开销最小）")
+    args = parser.parse_args(argv)
+
+    interface = CLIInterface(profile=args.profile, profile_mode=args.profile_mode)
     interface.run()
 
 
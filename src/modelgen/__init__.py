@@ -0,0 +1,11 @@
+# src/modelgen/__init__.py
+"""
+模型代码生成模块 - 声明式模型描述 → 符号求导 → 带公共子表达式消除的内核
+"""
+
+from .adm1 import adm1_spec
+from .codegen import GeneratedModel, generate_source, load_generated
+from .spec import ModelSpec, Process, Species
+
+__all__ = ['adm1_spec', 'GeneratedModel', 'generate_source', 'load_generated',
+           'ModelSpec', 'Process', 'Species']
@@ -0,0 +1,66 @@
+# src/modelgen/adm1.py
+"""
+ADM1 的声明式描述 - 与 core.adm1_model.ADM1Model 的动力学逐项对应
+
+生长项的写入行与 ADM1Model 一致（c4→X_pro、pro→X_ac、ac→X_h2、h2→X_I，
+c4/pro 的产率为常数 0.1/0.08）；修正这些行应同时修改两处
+"""
+
+from dataclasses import asdict
+from typing import Optional
+
+from modelgen.spec import ModelSpec
+
+METAL_SPECIES = ('S_Fe2', 'S_EDTA', 'S_FeEDTA', 'X_FeS')
+METAL_PARAMETERS = ('k_edta_fe', 'k_edta_fe_rev', 'k_precip_fes')
+
+
+def adm1_spec(parameters=None, metals: bool = True, name: Optional[str] = None) -> ModelSpec:
+    """
+    构建 ADM1 模型描述
+
+    Args:
+        parameters: ADM1Parameters（默认取缺省参数）
+        metals: 是否包含金属扩展（Fe²⁺/EDTA 络合与 FeS 沉淀）
+    """
+    from core.adm1_model import ADM1Model, ADM1Parameters
+
+    reference = ADM1Model(parameters if parameters is not None else ADM1Parameters())
+    spec = ModelSpec(name or ('adm1_metals' if metals else 'adm1'))
+    for var, initial in zip(reference.state_variables, reference.initial_conditions):
+        if metals or var not in METAL_SPECIES:
+            spec.add_species(var, float(initial), reference.state_units[var])
+    for key, value in asdict(reference.parameters).items():
+        if metals or key not in METAL_PARAMETERS:
+            spec.add_parameter(key, value)
+
+    # 抑制因子
+    spec.add_expression('I_h2_fa', '1 / (1 + S_h2 / KI_h2_fa)')
+    spec.add_expression('I_h2_c4', '1 / (1 + S_h2 / KI_h2_c4)')
+    spec.add_expression('I_h2_pro', '1 / (1 + S_h2 / KI_h2_pro)')
+    spec.add_expression('I_nh3', '1 / (1 + S_IN / KI_nh3)')
+    # 丁酸/戊酸共用的比摄取速率 k_m·X·I/(K_S+S_c4)
+    spec.add_expression('uptake_c4', 'k_m_c4 * X_c4 * I_h2_c4 / (K_S_c4 + S_va + S_bu)')
+
+    spec.add_process('uptake_su', 'k_m_su * S_su / (K_S_su + S_su) * X_su',
+                     {'S_su': -1, 'X_su': 'Y_su'})
+    spec.add_process('uptake_aa', 'k_m_aa * S_aa / (K_S_aa + S_aa) * X_aa',
+                     {'S_aa': -1, 'X_aa': 'Y_aa'})
+    spec.add_process('uptake_fa', 'k_m_fa * S_fa / (K_S_fa + S_fa) * X_fa * I_h2_fa',
+                     {'S_fa': -1, 'X_fa': 'Y_fa'})
+    spec.add_process('uptake_va', 'uptake_c4 * S_va', {'S_va': -1, 'X_pro': 0.1})
+    spec.add_process('uptake_bu', 'uptake_c4 * S_bu', {'S_bu': -1, 'X_pro': 0.1})
+    spec.add_process('uptake_pro', 'k_m_pro * S_pro / (K_S_pro + S_pro) * X_pro * I_h2_pro',
+                     {'S_pro': -1, 'X_ac': 0.08})
+    spec.add_process('uptake_ac', 'k_m_ac * S_ac / (K_S_ac + S_ac) * X_ac * I_nh3',
+                     {'S_ac': -1, 'X_h2': 'Y_ac'})
+    spec.add_process('uptake_h2', 'k_m_h2 * S_h2 / (K_S_h2 + S_h2) * X_h2',
+                     {'S_h2': -1, 'X_I': 'Y_h2'})
+
+    if metals:
+        spec.add_process('fe_edta_complexation',
+                         'k_edta_fe * S_Fe2 * S_EDTA - k_edta_fe_rev * S_FeEDTA',
+                         {'S_Fe2': -1, 'S_EDTA': -1, 'S_FeEDTA': 1})
+        spec.add_process('fes_precipitation', 'k_precip_fes * S_Fe2',
+                         {'S_Fe2': -1, 'X_FeS': 1})
+    return spec
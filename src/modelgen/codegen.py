@@ -0,0 +1,255 @@
+# src/modelgen/codegen.py
+"""
+由 ModelSpec 生成右端函数、雅可比和参数灵敏度
+
+生成的模块（纯 Python + numpy，按结构哈希缓存到磁盘）包含三个写缓冲区的内核:
+    rhs(y, p, out)          out[i]    = f_i
+    jacobian(y, p, out)     out[i, j] = ∂f_i/∂y_j   （只写非零项）
+    sensitivity(y, p, out)  out[i, k] = ∂f_i/∂p_k
+导数由符号求导得到，每个内核内部做公共子表达式消除。内核只用下标和算术，
+y/p 为 (n,)/(P,) 时可被 numba 编译；y 为 (n, m)、p 的各项为 (m,) 时按列批量计算
+"""
+
+import dataclasses
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modelgen.spec import ModelSpec
+from modelgen.symbolic import (ZERO, Expr, diff, eliminate_common_subexpressions, is_num, make,
+                               parse, symbols, to_source)
+
+GENERATOR_VERSION = 1
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / 'results' / 'codegen'   # 与当前工作目录无关
+
+_loaded_modules: Dict[str, object] = {}
+
+
+def build_equations(spec: ModelSpec) -> List[Expr]:
+    """展开辅助量，得到每个组分的 f_i = Σ_k ν_ik·ρ_k"""
+    spec.validate()
+    substitutions: Dict[str, Expr] = {}
+    for name, expression in spec.expressions.items():
+        substitutions[name] = parse(expression, substitutions)
+
+    equations = {name: ZERO for name in spec.species_names}
+    for process in spec.processes:
+        rate = parse(process.rate, substitutions)
+        for target, coefficient in process.stoichiometry.items():
+            term = make('mul', parse(coefficient, substitutions), rate)
+            equations[target] = make('add', equations[target], term)
+    return [equations[name] for name in spec.species_names]
+
+
+def _kernel_source(name: str, outputs: List[Tuple[tuple, Expr]],
+                   references: Dict[str, str]) -> List[str]:
+    """
+    一个内核函数的源码行：符号解包 → 公共子表达式 → 清零 → 非零输出赋值
+
+    outputs: [(输出下标, 表达式)]；references: 符号名 → 'y[i]' / 'p[k]'（按此顺序解包）
+    """
+    outputs = [(index, e) for index, e in outputs if not is_num(e, 0.0)]
+    temps, names = eliminate_common_subexpressions([e for _, e in outputs], prefix='_t')
+    used = set()
+    for _, e in outputs:
+        used |= symbols(e)
+
+    lines = [f"def {name}(y, p, out):"]
+    lines += [f"    {symbol} = {ref}" for symbol, ref in references.items() if symbol in used]
+    lines += [f"    {temp} = {to_source(e, str, names)}" for temp, e in temps]
+    lines.append("    out[:] = 0.0")
+    lines += [f"    out[{', '.join(map(str, index))}] = {to_source(e, str, names)}"
+              for index, e in outputs]
+    return lines
+
+
+def generate_source(spec: ModelSpec) -> str:
+    """生成内核模块源码"""
+    equations = build_equations(spec)
+    species = spec.species_names
+    parameters = spec.parameter_names
+    references = {name: f'y[{i}]' for i, name in enumerate(species)}
+    references.update({name: f'p[{k}]' for k, name in enumerate(parameters)})
+
+    cache = {}
+    jacobian, sensitivity = [], []
+    for i, f in enumerate(equations):
+        present = symbols(f)
+        for j, name in enumerate(species):
+            if name in present:
+                d = diff(f, name, cache)
+                if not is_num(d, 0.0):
+                    jacobian.append(((i, j), d))
+        for k, name in enumerate(parameters):
+            if name in present:
+                d = diff(f, name, cache)
+                if not is_num(d, 0.0):
+                    sensitivity.append(((i, k), d))
+
+    header = [
+        "# 由 modelgen 自动生成，请勿手工修改",
+        f"# 模型: {spec.name}  结构哈希: {spec.digest()}  生成器版本: {GENERATOR_VERSION}",
+        "import numpy as np",
+        "",
+        f"SPEC_DIGEST = {spec.digest()!r}",
+        f"GENERATOR_VERSION = {GENERATOR_VERSION}",
+        f"STATE_NAMES = {tuple(species)!r}",
+        f"PARAMETER_NAMES = {tuple(parameters)!r}",
+        f"JACOBIAN_NONZEROS = {tuple(index for index, _ in jacobian)!r}",
+        "",
+    ]
+    body = (_kernel_source('rhs', [((i,), f) for i, f in enumerate(equations)], references)
+            + ["", ""] + _kernel_source('jacobian', jacobian, references)
+            + ["", ""] + _kernel_source('sensitivity', sensitivity, references))
+    return "\n".join(header + [""] + body) + "\n"
+
+
+def _import_file(path: Path, module_name: str):
+    module_spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def load_generated(spec: ModelSpec, cache_dir=None):
+    """
+    加载生成的内核模块：进程内缓存 → 磁盘缓存 → 重新生成并写盘
+
+    缓存文件名含结构哈希；生成器版本不一致或文件损坏时重新生成
+    """
+    digest = spec.digest()
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    safe_name = ''.join(c if c.isalnum() else '_' for c in spec.name)
+    path = cache_dir / f'{safe_name}_{digest}.py'
+    key = str(path.resolve())
+    if key in _loaded_modules:
+        return _loaded_modules[key]
+    module_name = f'modelgen_{safe_name}_{digest}'
+
+    module = None
+    if path.exists():
+        try:
+            module = _import_file(path, module_name)
+            if getattr(module, 'GENERATOR_VERSION', None) != GENERATOR_VERSION:
+                module = None
+        except Exception as e:
+            print(f"[WARNING] 生成代码缓存不可用，重新生成: {path} ({e})")
+            module = None
+
+    if module is None:
+        source = generate_source(spec)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再替换，并行进程不会读到半个文件
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(source)
+        os.replace(tmp, path)
+        module = _import_file(path, module_name)
+
+    _loaded_modules[key] = module
+    return module
+
+
+def _parameters_class(spec: ModelSpec):
+    """按参数表构建数据类（tolerances、method_selector 等按属性/asdict 访问参数）"""
+    fields = [(name, float, dataclasses.field(default=value))
+              for name, value in spec.parameters.items()]
+    return dataclasses.make_dataclass(f'{spec.name.title().replace("_", "")}Parameters', fields)
+
+
+class GeneratedModel:
+    """
+    由 ModelSpec 生成的模型，接口与 ADM1Model 兼容（可直接交给 ADM1Solver）
+
+    Args:
+        spec: 模型描述
+        backend: 'numpy' | 'numba' | 'auto'；numba 编译生成的内核，用于单组状态
+        cache_dir: 生成代码的磁盘缓存目录（默认 results/codegen）
+    """
+
+    def __init__(self, spec: ModelSpec, backend: Optional[str] = 'numpy', cache_dir=None):
+        from core.kernels import resolve_backend
+
+        self.spec = spec
+        self.module = load_generated(spec, cache_dir)
+        self.state_variables = spec.species_names
+        self.variable_index = {var: idx for idx, var in enumerate(self.state_variables)}
+        self.state_units = {s.name: s.unit for s in spec.species}
+        self.initial_conditions = np.array([s.initial for s in spec.species], dtype=float)
+        self.parameter_names = spec.parameter_names
+        self.parameters = _parameters_class(spec)()
+
+        self.backend = resolve_backend(backend)
+        self._compiled = None
+        if self.backend == 'numba':
+            import numba
+            self._compiled = tuple(numba.njit(cache=True, nogil=True)(kernel) for kernel in
+                                   (self.module.rhs, self.module.jacobian,
+                                    self.module.sensitivity))
+
+    @property
+    def parameters(self):
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        """赋值时重新打包参数值（字段可为 (m,) 数组，对应批量参数）"""
+        if isinstance(parameters, dict):
+            parameters = _parameters_class(self.spec)(**parameters)
+        columns = [np.asarray(getattr(parameters, name), dtype=np.float64)
+                   for name in self.parameter_names]
+        if all(c.ndim == 0 for c in columns):
+            self.parameter_values = np.array(columns, dtype=np.float64)
+            self._fields = self.parameter_values.tolist()
+        else:
+            self.parameter_values = np.vstack(np.broadcast_arrays(*columns))
+            self._fields = list(self.parameter_values)
+        self._parameters = parameters
+
+    def _evaluate(self, index: int, y: np.ndarray, shape: tuple) -> np.ndarray:
+        out = np.empty(shape)
+        if np.ndim(y) == 1 and self.parameter_values.ndim == 1:
+            if self._compiled is not None:
+                self._compiled[index](np.ascontiguousarray(y, dtype=np.float64),
+                                      self.parameter_values, out)
+                return out
+            y = y.tolist()
+        (self.module.rhs, self.module.jacobian, self.module.sensitivity)[index](
+            y, self._fields, out)
+        return out
+
+    def biochemical_reactions(self, t: float, y: np.ndarray) -> np.ndarray:
+        """右端函数 f(y)；y 可为 (n,) 或 (n, m)"""
+        return self._evaluate(0, y, np.shape(y))
+
+    def jacobian(self, t: float, y: np.ndarray) -> np.ndarray:
+        """∂f/∂y，(n, n) 或批量 (n, n, m)"""
+        n = len(y)
+        return self._evaluate(1, y, (n, n) + np.shape(y)[1:])
+
+    def parameter_sensitivity(self, t: float, y: np.ndarray) -> np.ndarray:
+        """∂f/∂p，(n, P) 或批量 (n, P, m)；列顺序同 parameter_names"""
+        return self._evaluate(2, y, (len(y), len(self.parameter_names)) + np.shape(y)[1:])
+
+    def sensitivity_system(self, t: float, z: np.ndarray) -> np.ndarray:
+        """
+        前向灵敏度方程的右端函数，z = [y, vec(S)]，S = ∂y/∂p 为 (n, P):
+            dy/dt = f,  dS/dt = J·S + ∂f/∂p
+        """
+        n, P = len(self.state_variables), len(self.parameter_names)
+        y, S = z[:n], z[n:].reshape(n, P)
+        dS = self.jacobian(t, y) @ S + self.parameter_sensitivity(t, y)
+        return np.concatenate([self.biochemical_reactions(t, y), dS.ravel()])
+
+    def get_variable_index(self, variable_name: str) -> int:
+        return self.variable_index.get(variable_name, -1)
+
+    def get_variable_name(self, index: int) -> str:
+        if 0 <= index < len(self.state_variables):
+            return self.state_variables[index]
+        return "UNKNOWN"
@@ -0,0 +1,177 @@
+# src/modelgen/spec.py
+"""
+声明式模型描述 - 组分、参数、辅助表达式、过程速率与化学计量
+
+    dy_i/dt = Σ_k ν_ik · ρ_k(y, p)
+
+速率 ρ_k 和系数 ν_ik 写成 Python 表达式字符串（支持 + - * / ** 与 exp/log/sqrt），
+可引用组分、参数和 expressions 中先定义的辅助量。结构摘要（不含参数值和初值）
+作为生成代码的缓存键，改参数值不需要重新生成
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+Coefficient = Union[float, str]
+
+# 生成的内核使用的局部名称，组分/参数/辅助量不能与之重名
+RESERVED_NAMES = frozenset({'y', 'p', 'out', 'np'})
+
+
+@dataclass
+class Species:
+    """状态组分"""
+    name: str
+    initial: float = 0.0
+    unit: str = 'gCOD/m³'
+
+
+@dataclass
+class Process:
+    """过程：速率表达式与各组分的化学计量系数（数值或表达式）"""
+    name: str
+    rate: str
+    stoichiometry: Dict[str, Coefficient] = field(default_factory=dict)
+
+
+@dataclass
+class ModelSpec:
+    """模型描述；compile() 生成（或从磁盘缓存加载）右端函数、雅可比和参数灵敏度"""
+    name: str
+    species: List[Species] = field(default_factory=list)
+    parameters: Dict[str, float] = field(default_factory=dict)
+    expressions: Dict[str, str] = field(default_factory=dict)
+    processes: List[Process] = field(default_factory=list)
+
+    # ---- 构建 ----
+
+    def add_species(self, name: str, initial: float = 0.0, unit: str = 'gCOD/m³') -> 'ModelSpec':
+        self.species.append(Species(name, initial, unit))
+        return self
+
+    def add_parameter(self, name: str, value: float) -> 'ModelSpec':
+        self.parameters[name] = float(value)
+        return self
+
+    def add_expression(self, name: str, expression: str) -> 'ModelSpec':
+        self.expressions[name] = expression
+        return self
+
+    def add_process(self, name: str, rate: str,
+                    stoichiometry: Dict[str, Coefficient]) -> 'ModelSpec':
+        self.processes.append(Process(name, rate, dict(stoichiometry)))
+        return self
+
+    def add_inhibition(self, process: str, factor: str,
+                       parameters: Optional[Dict[str, float]] = None) -> 'ModelSpec':
+        """给过程速率乘上抑制因子（可同时声明因子用到的新参数）"""
+        for name, value in (parameters or {}).items():
+            self.add_parameter(name, value)
+        target = self.process(process)
+        target.rate = f"({target.rate}) * ({factor})"
+        return self
+
+    def process(self, name: str) -> Process:
+        for process in self.processes:
+            if process.name == name:
+                return process
+        raise KeyError(f"未知过程: {name}")
+
+    # ---- 查询 ----
+
+    @property
+    def species_names(self) -> List[str]:
+        return [s.name for s in self.species]
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return list(self.parameters)
+
+    def validate(self):
+        """
+        检查名称唯一、表达式可解析且只引用已定义的名称
+
+        Raises:
+            ValueError: 描述不合法
+        """
+        from modelgen.symbolic import parse, symbols
+
+        names = self.species_names + self.parameter_names
+        declared = names + list(self.expressions)
+        for name in declared:
+            if not name.isidentifier() or name in RESERVED_NAMES or name.startswith('_'):
+                raise ValueError(f"名称不合法（需为标识符，不以下划线开头，不能是保留名）: {name!r}")
+        duplicates = {name for name in declared if declared.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"名称重复: {', '.join(sorted(duplicates))}")
+
+        known = set(names)
+        for name, expression in self.expressions.items():
+            unknown = symbols(parse(expression)) - known
+            if unknown:
+                raise ValueError(f"辅助量 {name} 引用了未定义的名称: {', '.join(sorted(unknown))}")
+            known.add(name)
+
+        species = set(self.species_names)
+        process_names = [p.name for p in self.processes]
+        if len(set(process_names)) != len(process_names):
+            raise ValueError("过程名称重复")
+        for process in self.processes:
+            unknown = symbols(parse(process.rate)) - known
+            for target, coefficient in process.stoichiometry.items():
+                if target not in species:
+                    raise ValueError(f"过程 {process.name} 的化学计量引用了未知组分: {target}")
+                unknown |= symbols(parse(coefficient)) - known
+            if unknown:
+                raise ValueError(f"过程 {process.name} 引用了未定义的名称: "
+                                 f"{', '.join(sorted(unknown))}")
+
+    def structure(self) -> Dict:
+        """决定生成代码的结构部分（组分/参数名称、表达式、过程）"""
+        return {
+            'species': self.species_names,
+            'parameters': self.parameter_names,
+            'expressions': self.expressions,
+            'processes': [{'name': p.name, 'rate': p.rate,
+                           'stoichiometry': {k: v if isinstance(v, str) else float(v)
+                                             for k, v in p.stoichiometry.items()}}
+                          for p in self.processes],
+        }
+
+    def digest(self) -> str:
+        """结构哈希（十六进制），生成代码的缓存键"""
+        payload = json.dumps(self.structure(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    # ---- 序列化 ----
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ModelSpec':
+        return cls(name=data['name'],
+                   species=[Species(**s) for s in data.get('species', [])],
+                   parameters={k: float(v) for k, v in data.get('parameters', {}).items()},
+                   expressions=dict(data.get('expressions', {})),
+                   processes=[Process(**p) for p in data.get('processes', [])])
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'ModelSpec':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def compile(self, backend: Optional[str] = 'numpy', cache_dir=None):
+        """生成代码并构建 GeneratedModel"""
+        from modelgen.codegen import GeneratedModel
+        return GeneratedModel(self, backend=backend, cache_dir=cache_dir)
@@ -0,0 +1,268 @@
+# src/modelgen/symbolic.py
+"""
+轻量符号表达式 - 基于 Python ast 的解析、化简、求导与公共子表达式消除
+
+表达式树用嵌套元组表示（可哈希，相同子树自动相等）:
+    ('num', 值)  ('sym', 名称)  ('neg', a)  ('call', 函数名, a)
+    ('add' | 'sub' | 'mul' | 'div' | 'pow', a, b)
+"""
+
+import ast
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+Expr = tuple
+
+FUNCTIONS = ('exp', 'log', 'sqrt')
+ZERO = ('num', 0.0)
+ONE = ('num', 1.0)
+
+_BINARY = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div', ast.Pow: 'pow'}
+
+
+def num(value: float) -> Expr:
+    return ('num', float(value))
+
+
+def is_num(e: Expr, value=None) -> bool:
+    return e[0] == 'num' and (value is None or e[1] == value)
+
+
+# ---- 解析 ----
+
+def parse(source, substitutions: Mapping[str, Expr] = None) -> Expr:
+    """
+    解析表达式字符串（或数值）；substitutions 中的名称展开为对应子树
+
+    Raises:
+        ValueError: 不支持的语法
+    """
+    if isinstance(source, (int, float)):
+        return num(source)
+    substitutions = substitutions or {}
+    try:
+        tree = ast.parse(str(source).strip(), mode='eval').body
+    except SyntaxError as e:
+        raise ValueError(f"表达式语法错误: {source!r}") from e
+
+    def convert(node) -> Expr:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return num(node.value)
+        if isinstance(node, ast.Name):
+            return substitutions.get(node.id, ('sym', node.id))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = convert(node.operand)
+            return operand if isinstance(node.op, ast.UAdd) else neg(operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            return make(_BINARY[type(node.op)], convert(node.left), convert(node.right))
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords):
+            return call(node.func.id, convert(node.args[0]))
+        raise ValueError(f"不支持的表达式: {ast.unparse(node)}（在 {source!r} 中）")
+
+    return convert(tree)
+
+
+def symbols(e: Expr) -> set:
+    """表达式中出现的符号名"""
+    if e[0] == 'sym':
+        return {e[1]}
+    if e[0] == 'num':
+        return set()
+    return set().union(*(symbols(child) for child in children(e)))
+
+
+def children(e: Expr) -> Tuple[Expr, ...]:
+    if e[0] in ('num', 'sym'):
+        return ()
+    if e[0] == 'call':
+        return (e[2],)
+    return e[1:]
+
+
+# ---- 构造（带化简） ----
+
+def neg(a: Expr) -> Expr:
+    if is_num(a):
+        return num(-a[1])
+    if a[0] == 'neg':
+        return a[1]
+    return ('neg', a)
+
+
+def call(name: str, a: Expr) -> Expr:
+    return ('call', name, a)
+
+
+def make(op: str, a: Expr, b: Expr) -> Expr:
+    """二元运算，做常数折叠和 0/1 化简"""
+    if is_num(a) and is_num(b) and not (op == 'div' and b[1] == 0.0):
+        x, y = a[1], b[1]
+        if op == 'add':
+            return num(x + y)
+        if op == 'sub':
+            return num(x - y)
+        if op == 'mul':
+            return num(x * y)
+        if op == 'div':
+            return num(x / y)
+        return num(x ** y)
+    if op == 'add':
+        if is_num(a, 0.0):
+            return b
+        if is_num(b, 0.0):
+            return a
+        if b[0] == 'neg':
+            return make('sub', a, b[1])
+    elif op == 'sub':
+        if is_num(b, 0.0):
+            return a
+        if is_num(a, 0.0):
+            return neg(b)
+        if a == b:
+            return ZERO
+        if b[0] == 'neg':
+            return make('add', a, b[1])
+    elif op == 'mul':
+        if is_num(a, 0.0) or is_num(b, 0.0):
+            return ZERO
+        if is_num(a, 1.0):
+            return b
+        if is_num(b, 1.0):
+            return a
+        if is_num(a, -1.0):
+            return neg(b)
+        if is_num(b, -1.0):
+            return neg(a)
+        if a[0] == 'neg' and b[0] == 'neg':
+            return make('mul', a[1], b[1])
+        if a[0] == 'neg':
+            return neg(make('mul', a[1], b))
+        if b[0] == 'neg':
+            return neg(make('mul', a, b[1]))
+    elif op == 'div':
+        if is_num(a, 0.0):
+            return ZERO
+        if is_num(b, 1.0):
+            return a
+        if a[0] == 'neg':
+            return neg(make('div', a[1], b))
+    elif op == 'pow':
+        if is_num(b, 1.0):
+            return a
+        if is_num(b, 0.0):
+            return ONE
+    return (op, a, b)
+
+
+# ---- 求导 ----
+
+def diff(e: Expr, var: str, _cache: Dict = None) -> Expr:
+    """对符号 var 求偏导（结果已化简）"""
+    cache = {} if _cache is None else _cache
+    key = (e, var)
+    if key in cache:
+        return cache[key]
+
+    kind = e[0]
+    if kind == 'num':
+        result = ZERO
+    elif kind == 'sym':
+        result = ONE if e[1] == var else ZERO
+    elif kind == 'neg':
+        result = neg(diff(e[1], var, cache))
+    elif kind == 'call':
+        inner = e[2]
+        d_inner = diff(inner, var, cache)
+        if is_num(d_inner, 0.0):
+            result = ZERO
+        elif e[1] == 'exp':
+            result = make('mul', e, d_inner)
+        elif e[1] == 'log':
+            result = make('div', d_inner, inner)
+        else:   # sqrt
+            result = make('div', d_inner, make('mul', num(2.0), e))
+    else:
+        a, b = e[1], e[2]
+        da, db = diff(a, var, cache), diff(b, var, cache)
+        if kind in ('add', 'sub'):
+            result = make(kind, da, db)
+        elif kind == 'mul':
+            result = make('add', make('mul', da, b), make('mul', a, db))
+        elif kind == 'div':
+            if is_num(db, 0.0):
+                result = make('div', da, b)
+            else:
+                result = make('div', make('sub', make('mul', da, b), make('mul', a, db)),
+                              make('pow', b, num(2.0)))
+        else:   # pow
+            if is_num(b):
+                result = make('mul', make('mul', b, make('pow', a, num(b[1] - 1.0))), da)
+            else:
+                result = make('mul', e, make('add', make('mul', db, call('log', a)),
+                                             make('div', make('mul', b, da), a)))
+    cache[key] = result
+    return result
+
+
+# ---- 公共子表达式消除与代码生成 ----
+
+def _count(e: Expr, counts: Dict[Expr, int]):
+    if e[0] in ('num', 'sym'):
+        return
+    counts[e] = counts.get(e, 0) + 1
+    if counts[e] == 1:
+        for child in children(e):
+            _count(child, counts)
+
+
+def eliminate_common_subexpressions(outputs: Iterable[Expr], prefix: str = 't'
+                                    ) -> Tuple[List[Tuple[str, Expr]], Dict[Expr, str]]:
+    """
+    找出在全部输出中出现不止一次的非叶子子树
+
+    Returns:
+        (按依赖顺序排列的 [(临时变量名, 子树)], {子树: 临时变量名})
+    """
+    outputs = list(outputs)
+    counts: Dict[Expr, int] = {}
+    for e in outputs:
+        _count(e, counts)
+
+    names: Dict[Expr, str] = {}
+    order: List[Tuple[str, Expr]] = []
+
+    def visit(e: Expr):
+        if e[0] in ('num', 'sym') or e in names:
+            return
+        for child in children(e):
+            visit(child)
+        if counts.get(e, 0) > 1:
+            names[e] = f'{prefix}{len(order)}'
+            order.append((names[e], e))
+
+    for e in outputs:
+        visit(e)
+    return order, names
+
+
+def to_source(e: Expr, resolve: Callable[[str], str], names: Mapping[Expr, str] = None,
+              top: bool = True) -> str:
+    """
+    表达式 → Python 源码
+
+    resolve: 符号名 → 源码中的引用（如 'y[3]'）；names: 已提取为临时变量的子树
+    """
+    names = names or {}
+    if not top and e in names:
+        return names[e]
+    kind = e[0]
+    if kind == 'num':
+        return repr(e[1])
+    if kind == 'sym':
+        return resolve(e[1])
+    if kind == 'neg':
+        return f"(-{to_source(e[1], resolve, names, False)})"
+    if kind == 'call':
+        return f"np.{e[1]}({to_source(e[2], resolve, names, False)})"
+    op = {'add': '+', 'sub': '-', 'mul': '*', 'div': '/', 'pow': '**'}[kind]
+    return f"({to_source(e[1], resolve, names, False)} {op} {to_source(e[2], resolve, names, False)})"
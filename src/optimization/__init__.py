@@ -0,0 +1,8 @@
+# src/optimization/__init__.py
+"""
+进料优化模块 - 滚动时域（MPC）进料流量优化
+"""
+
+from .feed_optimizer import FeedOptimizer, FeedPlan
+
+__all__ = ['FeedOptimizer', 'FeedPlan']
@@ -3,13 +3,16 @@ ADM1参数管理器 - 全新创建版本
 完全避免编码问题
 """
 
-import json
-import os
+import copy
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import logging
 
+import numpy as np
+
+from parameters.preset_registry import get_preset_registry
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -53,48 +56,55 @@ class MetalParameters:
     KI_Co: float = 0.0003
 
 class ADM1ParameterManager:
-    """ADM1参数管理器"""
+    """
+    ADM1参数管理器
+
+    预设由进程级注册表（parameters.preset_registry）解析、编译并缓存，
+    各实例共享同一份编译结果，创建管理器不再重复读取JSON
+    """
 
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
             project_root = Path(__file__).parent.parent.parent
             self.config_path = project_root / 'config' / 'substrate_presets.json'
+            self.registry = get_preset_registry()
         else:
             self.config_path = Path(config_path)
+            self.registry = get_preset_registry([self.config_path])
 
-        self.presets = {}
         self.current_preset = None
-        self.load_presets()
+        if not self.config_path.exists():
+            logger.warning(f"配置文件不存在: {self.config_path}")
 
-    def load_presets(self) -> bool:
-        """加载预设"""
-        try:
-            if not self.config_path.exists():
-                logger.warning(f"配置文件不存在: {self.config_path}")
-                return False
+    @property
+    def presets(self) -> Dict[str, Dict]:
+        """{预设名: 继承展开后的预设数据}"""
+        return {name: compiled.data for name, compiled in self.registry.items()}
 
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                preset_data = json.load(f)
-
-            loaded_count = 0
-            for preset_name, data in preset_data.items():
-                self.presets[preset_name] = data
-                loaded_count += 1
-                logger.info(f"已加载预设: {preset_name}")
+    def load_presets(self) -> bool:
+        """重新检查配置文件并加载有变化的预设"""
+        self.registry.refresh(force=True)
+        return len(self.registry) > 0
 
-            return loaded_count > 0
+    def get_compiled_preset(self, preset_name: str):
+        """
+        编译后的预设（CompiledPreset）
 
-        except Exception as e:
-            logger.error(f"加载预设失败: {e}")
-            return False
+        Raises:
+            KeyError: 未知或无效预设
+        """
+        return self.registry.get(preset_name)
 
     def get_preset(self, preset_name: str) -> Optional[Dict]:
-        """获取预设"""
-        return self.presets.get(preset_name)
+        """获取预设（继承已展开的数据副本）"""
+        try:
+            return copy.deepcopy(self.registry.get(preset_name).data)
+        except KeyError:
+            return None
 
     def set_current_preset(self, preset_name: str) -> bool:
         """设置当前预设"""
-        if preset_name in self.presets:
+        if preset_name in self.registry:
             self.current_preset = preset_name
             return True
         return False
@@ -103,11 +113,11 @@ class ADM1ParameterManager:
         """获取当前参数"""
         if not self.current_preset:
             return {}
-        return self.presets.get(self.current_preset, {})
+        return self.get_preset(self.current_preset) or {}
 
     def list_available_presets(self) -> List[str]:
         """列出可用预设"""
-        return list(self.presets.keys())
+        return self.registry.names()
 
     def get_preset_info(self, preset_name: str) -> Dict[str, Any]:
         """获取预设信息"""
@@ -120,6 +130,29 @@ class ADM1ParameterManager:
             'parameters': preset.get('kinetic_parameters', {})
         }
 
+    def create_model_parameters(self, preset_name: str):
+        """根据预设创建模型参数对象（ADM1Parameters），未给出的参数保持默认值"""
+        return self.registry.get(preset_name).create_parameters()
+
+    def create_initial_conditions(self, preset_name: str, model) -> np.ndarray:
+        """根据预设生成模型初始条件向量，预设中缺少的变量使用模型默认值"""
+        compiled = self.registry.get(preset_name)
+        y0 = np.array(model.initial_conditions, dtype=float)
+        for var, value in compiled.data.get('initial_conditions', {}).items():
+            idx = model.get_variable_index(var)
+            if idx != -1:
+                y0[idx] = float(value)
+        return y0
+
+    def create_model(self, preset_name: str):
+        """创建使用预设参数的模型，返回 (模型, 初始条件)"""
+        from core.adm1_model import ADM1Model
+
+        compiled = self.registry.get(preset_name)
+        model = ADM1Model(compiled.parameter_vector)
+        model.declared_parameters = dict(compiled.data.get('kinetic_parameters', {}))
+        return model, compiled.initial_state.copy()
+
 def test_function():
     """测试函数"""
     manager = ADM1ParameterManager()
@@ -0,0 +1,298 @@
+# src/parameters/preset_registry.py
+"""
+进程级预设注册表 - 预设只解析、编译一次，按文件修改时间增量重载
+
+来源: config/substrate_presets.json 与 config/presets/*.json（厂站专用变体等）。
+预设可用 "extends" 继承另一预设，只写需要覆盖的键（参数块内逐键合并）:
+    "plant_a": {"extends": "food_waste", "kinetic_parameters": {"k_m_ac": 6.0}}
+文件变化时只重新编译内容变化的预设及其派生预设；查询时最多每 check_interval
+秒检查一次修改时间
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_SOURCES = (PROJECT_ROOT / 'config' / 'substrate_presets.json',
+                   PROJECT_ROOT / 'config' / 'presets')
+EXTENDS_KEY = 'extends'
+CHECK_INTERVAL = 1.0                   # 修改时间检查间隔 [s]
+
+# 预设与模型参数命名差异
+PARAMETER_ALIASES = {'KI_NH3': 'KI_nh3'}
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledPreset:
+    """编译后的预设：继承已展开的原始数据、模型参数向量和初始状态"""
+    name: str
+    source: Path
+    data: Dict                          # 继承展开后的预设数据（只读使用）
+    parameter_vector: object            # core.parameter_vector.ParameterVector
+    initial_state: np.ndarray           # 按 ADM1Model 状态顺序的初始条件（只读）
+    parents: Tuple[str, ...] = ()       # 继承链（由近到远）
+    report: Optional[object] = None     # 加载时的校验结论（preset_validation.ValidationReport）
+
+    @property
+    def description(self) -> str:
+        return self.data.get('description', '')
+
+    def create_parameters(self):
+        """新的 ADM1Parameters（调用方可修改）"""
+        return self.parameter_vector.to_parameters()
+
+
+def merge_preset(parent: Dict, child: Dict) -> Dict:
+    """子预设覆盖父预设：字典块逐键合并，其余键直接替换"""
+    merged = copy.deepcopy(parent)
+    for key, value in child.items():
+        if key == EXTENDS_KEY:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key].update(copy.deepcopy(value))
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def compile_preset(name: str, source: Path, data: Dict, parents: Tuple[str, ...] = ()
+                   ) -> CompiledPreset:
+    """预设数据 → 参数向量与初始状态（未给出的参数/初值取模型默认值）"""
+    from core.adm1_model import ADM1Model, ADM1Parameters
+
+    values = {}
+    values.update(data.get('kinetic_parameters', {}))
+    values.update(data.get('metal_parameters', {}))
+    for alias, target in PARAMETER_ALIASES.items():
+        if alias in values and target not in values:
+            values[target] = values[alias]
+    model_fields = {f.name for f in fields(ADM1Parameters)}
+    parameters = ADM1Parameters(**{k: float(v) for k, v in values.items() if k in model_fields})
+
+    model = ADM1Model(parameters)
+    y0 = np.array(model.initial_conditions, dtype=float)
+    for var, value in data.get('initial_conditions', {}).items():
+        idx = model.get_variable_index(var)
+        if idx != -1:
+            y0[idx] = float(value)
+    y0.flags.writeable = False
+    return CompiledPreset(name, source, data, model.parameter_vector, y0, parents)
+
+
+class PresetRegistry:
+    """
+    预设注册表
+
+    Args:
+        sources: 预设文件或目录（目录下全部 *.json），后出现的同名预设覆盖先出现的
+        check_interval: 查询时检查文件修改时间的最小间隔 [s]（0 为每次检查）
+        validate: 编译时校验预设（parameters.preset_validation），错误和警告写入日志
+        reject_invalid: 校验有错误的预设在 get 时拒绝（KeyError）；False 时只记录日志，
+            items() 与 lint 始终能看到全部预设
+    """
+
+    def __init__(self, sources: Sequence = DEFAULT_SOURCES, check_interval: float = CHECK_INTERVAL,
+                 validate: bool = True, reject_invalid: bool = True):
+        self.sources = tuple(Path(s) for s in sources)
+        self.check_interval = check_interval
+        self.validate = validate
+        self.reject_invalid = reject_invalid
+        self._lock = threading.RLock()
+        self._mtimes: Dict[Path, int] = {}
+        self._raw: Dict[Path, Dict[str, Dict]] = {}       # 文件 → {预设名: 原始数据}
+        self._compiled: Dict[str, CompiledPreset] = {}
+        self._errors: Dict[str, str] = {}
+        self._last_check = 0.0
+        self.reload_count = 0                             # 累计重新编译的预设数
+        self.refresh(force=True)
+
+    # ---- 文件扫描 ----
+
+    def _files(self) -> List[Path]:
+        files = []
+        for source in self.sources:
+            if source.is_dir():
+                files.extend(sorted(source.glob('*.json')))
+            elif source.exists():
+                files.append(source)
+        return files
+
+    def _read(self, path: Path) -> Dict[str, Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"读取预设文件失败: {path} ({e})")
+            return self._raw.get(path, {})          # 保留上次成功读取的内容
+        if not isinstance(data, dict):
+            logger.error(f"预设文件顶层应为对象: {path}")
+            return {}
+        return {name: preset for name, preset in data.items() if isinstance(preset, dict)}
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        检查来源文件的修改时间，重新编译变化的预设
+
+        Returns:
+            本次重新编译（或移除）的预设名
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < self.check_interval:
+                return []
+            self._last_check = now
+
+            files = self._files()
+            changed = False
+            for path in files:
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                if force or self._mtimes.get(path) != mtime:
+                    self._mtimes[path] = mtime
+                    self._raw[path] = self._read(path)
+                    changed = True
+            for path in set(self._raw) - set(files):
+                del self._raw[path]
+                self._mtimes.pop(path, None)
+                changed = True
+            return self._rebuild() if changed else []
+
+    def _rebuild(self) -> List[str]:
+        """展开继承并只编译数据有变化的预设"""
+        entries: Dict[str, Tuple[Path, Dict]] = {}
+        for path, presets in self._raw.items():
+            for name, data in presets.items():
+                entries[name] = (path, data)
+
+        resolved: Dict[str, Tuple[Dict, Tuple[str, ...]]] = {}
+        errors: Dict[str, str] = {}
+
+        def resolve(name: str, chain: Tuple[str, ...]):
+            if name in resolved or name in errors:
+                return
+            if name in chain:
+                errors[name] = f"继承循环: {' → '.join(chain + (name,))}"
+                return
+            data = entries[name][1]
+            parent = data.get(EXTENDS_KEY)
+            if parent is None:
+                resolved[name] = (copy.deepcopy(data), ())
+                return
+            if parent not in entries:
+                errors[name] = f"继承的预设不存在: {parent}"
+                return
+            resolve(parent, chain + (name,))
+            if parent in errors:
+                errors.setdefault(name, f"继承的预设无效: {parent}")
+                return
+            parent_data, parent_chain = resolved[parent]
+            merged = merge_preset(parent_data, data)
+            merged[EXTENDS_KEY] = parent
+            resolved[name] = (merged, (parent,) + parent_chain)
+
+        for name in entries:
+            resolve(name, ())
+
+        updated = []
+        compiled: Dict[str, CompiledPreset] = {}
+        for name in [n for n in entries if n in resolved]:       # 保持文件中的顺序
+            data, parents = resolved[name]
+            previous = self._compiled.get(name)
+            if previous is not None and previous.data == data and previous.parents == parents:
+                compiled[name] = previous
+                continue
+            try:
+                compiled[name] = compile_preset(name, entries[name][0], data, parents)
+            except (TypeError, ValueError) as e:
+                errors[name] = f"编译失败: {e}"
+                continue
+            updated.append(name)
+            logger.info(f"已加载预设: {name}")
+            if self.validate:
+                compiled[name] = self._validated(compiled[name])
+
+        for name, message in errors.items():
+            if self._errors.get(name) != message:
+                logger.error(f"预设 {name} 无效: {message}")
+        removed = [name for name in self._compiled if name not in compiled]
+        self._compiled = compiled
+        self._errors = errors
+        self.reload_count += len(updated)
+        return updated + removed
+
+    @staticmethod
+    def _validated(compiled: CompiledPreset) -> CompiledPreset:
+        from parameters.preset_validation import validate_preset
+
+        report = validate_preset(compiled.name, compiled.data, compiled)
+        for issue in report.errors:
+            logger.error(f"预设 {compiled.name} 校验失败: {issue}")
+        if report.warnings:
+            logger.warning(f"预设 {compiled.name}: {len(report.warnings)} 个警告"
+                           f"（python run_adm1.py --lint-presets 查看）")
+        return replace(compiled, report=report)
+
+    # ---- 查询 ----
+
+    def get(self, name: str) -> CompiledPreset:
+        """
+        Raises:
+            KeyError: 未知、无效或（reject_invalid 时）校验有错误的预设
+        """
+        self.refresh()
+        try:
+            compiled = self._compiled[name]
+        except KeyError:
+            if name in self._errors:
+                raise KeyError(f"预设无效: {name} ({self._errors[name]})") from None
+            raise KeyError(f"未知预设: {name}") from None
+        if self.reject_invalid and compiled.report is not None and compiled.report.errors:
+            issues = '; '.join(f"{i.field}: {i.message}" for i in compiled.report.errors)
+            raise KeyError(f"预设校验失败: {name} ({issues})")
+        return compiled
+
+    def names(self) -> List[str]:
+        self.refresh()
+        return list(self._compiled)
+
+    def errors(self) -> Dict[str, str]:
+        """无法编译的预设及原因"""
+        self.refresh()
+        return dict(self._errors)
+
+    def __contains__(self, name: str) -> bool:
+        self.refresh()
+        return name in self._compiled
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def items(self) -> Iterable[Tuple[str, CompiledPreset]]:
+        self.refresh()
+        return list(self._compiled.items())
+
+
+_registries: Dict[Tuple[Path, ...], PresetRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_preset_registry(sources: Optional[Sequence] = None) -> PresetRegistry:
+    """按来源路径共享的进程级注册表（默认 config/substrate_presets.json + config/presets/）"""
+    sources = DEFAULT_SOURCES if sources is None else sources
+    key = tuple(Path(s).resolve() for s in sources)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = PresetRegistry(key)
+        return _registries[key]
@@ -0,0 +1,233 @@
+# src/parameters/preset_validation.py
+"""
+预设校验 - 取值范围、单位一致性与数值刚性预检
+
+在注册表编译预设时运行，积分开始前发现不合理或会让求解变得困难的预设:
+  1. 模式检查: 数值类型、K_S/KI/速率 > 0、0 < Y < 1、初值 ≥ 0、
+     可选 "units" 块与模式单位一致、取值偏离典型范围
+  2. 数值检查（需编译后的预设）: 初始状态下雅可比的最快时间尺度与刚性比、
+     不稳定增长、KI_h2 之间及 S_h2/KI_h2 的极端比值
+结论按预设数据的内容哈希缓存，内容不变的预设不会重复校验
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VALIDATOR_VERSION = 1
+PARAMETER_BLOCKS = ('kinetic_parameters', 'metal_parameters', 'physical_parameters')
+
+# 参数模式: (名称正则, 单位, 下界, 上界, 典型范围)；界为开区间，None 表示不限
+PARAMETER_SCHEMA = (
+    (r'k_dis|k_hyd_\w+|k_m_\w+|k_dec|k_edta_fe_rev|k_precip_fes', 'd⁻¹', 0.0, None, (1e-4, 1e3)),
+    (r'K_S_h2', 'gCOD/m³', 0.0, None, (1e-8, 1e-2)),
+    (r'K_S_\w+', 'gCOD/m³', 0.0, None, (1e-3, 1e4)),
+    (r'Y_\w+', '-', 0.0, 1.0, (0.01, 0.5)),
+    (r'KI_h2_\w+', 'gCOD/m³', 0.0, None, (1e-8, 1e-2)),
+    (r'KI_NH3|KI_nh3', 'M', 0.0, None, (1e-5, 1.0)),
+    (r'KI_(Fe|Ni|Co)', 'mol/m³', 0.0, None, (1e-6, 1.0)),
+    (r'k_edta_fe', 'm³/mol/d', 0.0, None, (1.0, 1e9)),
+    (r'kLa', 'd⁻¹', 0.0, None, (1.0, 1e4)),
+    (r'K_H_\w+', 'M/bar', 0.0, None, (1e-5, 1.0)),
+)
+
+# 数值预检阈值
+MAX_RATE = 1e6                # 最快特征速率 [d⁻¹]，超过时步长需 < 1 µd
+MAX_STIFFNESS_RATIO = 1e10
+MAX_GROWTH_RATE = 50.0        # 最大正实部 [d⁻¹]
+MAX_KI_H2_RATIO = 1e3         # 各 KI_h2 之间的比值
+MAX_H2_INHIBITION = 1e3       # S_h2(0)/KI_h2，超过时过程在初始时刻几乎被完全抑制
+
+_verdicts: Dict[str, 'ValidationReport'] = {}
+
+
+@dataclass
+class ValidationIssue:
+    """单条校验结论；severity: 'error' | 'warning' | 'info'"""
+    severity: str
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"[{self.severity.upper()}] {self.field}: {self.message}"
+
+
+@dataclass
+class ValidationReport:
+    """一个预设的校验结论"""
+    preset: str
+    issues: List[ValidationIssue] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [i for i in self.issues if i.severity == 'error']
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [i for i in self.issues if i.severity == 'warning']
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add(self, severity: str, field_name: str, message: str):
+        self.issues.append(ValidationIssue(severity, field_name, message))
+
+
+def parameter_rule(name: str):
+    """参数名对应的模式规则，未知参数返回 None"""
+    for pattern, unit, lower, upper, typical in PARAMETER_SCHEMA:
+        if re.fullmatch(pattern, name):
+            return unit, lower, upper, typical
+    return None
+
+
+def data_digest(data: Dict) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{VALIDATOR_VERSION}:{payload}".encode('utf-8')).hexdigest()[:16]
+
+
+def _check_schema(report: ValidationReport, data: Dict, model_fields, state_variables):
+    units = data.get('units', {})
+    for block in PARAMETER_BLOCKS:
+        for name, value in data.get(block, {}).items():
+            label = f"{block}.{name}"
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                report.add('error', label, f"应为数值: {value!r}")
+                continue
+            if not math.isfinite(value):
+                report.add('error', label, f"非有限值: {value}")
+                continue
+            rule = parameter_rule(name)
+            if rule is None:
+                report.add('warning', label, "未知参数（模式中没有该名称，可能是拼写错误）")
+                continue
+            unit, lower, upper, (low, high) = rule
+            if name in units and units[name] != unit:
+                report.add('error', label, f"单位不一致: 预设 {units[name]}，模型 {unit}")
+            if lower is not None and value <= lower or upper is not None and value >= upper:
+                bounds = f"({'-∞' if lower is None else lower}, {'∞' if upper is None else upper})"
+                report.add('error', label, f"取值 {value:g} 超出允许范围 {bounds} [{unit}]")
+            elif not low <= value <= high:
+                report.add('warning', label,
+                           f"取值 {value:g} 偏离典型范围 [{low:g}, {high:g}] {unit}")
+            canonical = 'KI_nh3' if name == 'KI_NH3' else name
+            if block != 'physical_parameters' and canonical not in model_fields:
+                report.add('info', label, "模型未使用该参数")
+
+    for name in units:
+        if parameter_rule(name) is None:
+            report.add('warning', f"units.{name}", "单位声明对应的参数未知")
+
+    for var, value in data.get('initial_conditions', {}).items():
+        label = f"initial_conditions.{var}"
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or not math.isfinite(value):
+            report.add('error', label, f"应为有限数值: {value!r}")
+        elif value < 0:
+            report.add('error', label, f"初值为负: {value:g}")
+        elif var not in state_variables:
+            report.add('info', label, "不是模型状态变量，已忽略")
+
+
+def _check_numerics(report: ValidationReport, compiled):
+    """初始状态下的雅可比谱与氢抑制比值"""
+    from core.adm1_model import ADM1Model
+
+    model = ADM1Model(compiled.parameter_vector)
+    p, y0 = compiled.parameter_vector, compiled.initial_state
+
+    J = model.jacobian(0.0, y0)
+    if not np.all(np.isfinite(J)):
+        report.add('error', 'jacobian', "初始状态下雅可比含非有限值")
+        return
+    eigenvalues = np.linalg.eigvals(J)
+    magnitude = np.abs(eigenvalues)
+    fastest = float(magnitude.max())
+    nonzero = magnitude[magnitude > 1e-12 * max(fastest, 1e-300)]
+    ratio = fastest / float(nonzero.min()) if len(nonzero) else 1.0
+    growth = float(eigenvalues.real.max())
+    report.metrics.update({'fastest_rate': fastest, 'stiffness_ratio': ratio,
+                           'max_growth_rate': growth})
+    if fastest > MAX_RATE:
+        report.add('warning', 'jacobian',
+                   f"最快特征时间尺度 {1.0 / fastest:.2e} d，显式方法不可行，需用 BDF/Radau/Rosenbrock")
+    if ratio > MAX_STIFFNESS_RATIO:
+        report.add('warning', 'jacobian', f"刚性比 {ratio:.2e}，求解可能非常缓慢")
+    if growth > MAX_GROWTH_RATE:
+        report.add('warning', 'jacobian',
+                   f"初始状态存在快速增长模态（实部 {growth:.3g} d⁻¹），解可能发散")
+
+    ki_h2 = {name: float(p[name]) for name in ('KI_h2_fa', 'KI_h2_c4', 'KI_h2_pro')}
+    spread = max(ki_h2.values()) / min(ki_h2.values())
+    report.metrics['KI_h2_ratio'] = spread
+    if spread > MAX_KI_H2_RATIO:
+        report.add('warning', 'KI_h2', f"各 KI_h2 相差 {spread:.2e} 倍，氢抑制的时间尺度极端分离")
+    S_h2 = float(y0[model.variable_index['S_h2']])
+    for name, value in ki_h2.items():
+        if S_h2 / value > MAX_H2_INHIBITION:
+            report.add('warning', name, f"S_h2(0)/{name} = {S_h2 / value:.2e}，"
+                                        f"该过程在初始时刻几乎被完全抑制")
+
+
+def validate_preset(name: str, data: Dict, compiled=None) -> ValidationReport:
+    """
+    校验一个预设（继承已展开的数据）；compiled 给出时追加数值预检
+
+    结论按 (数据内容, 是否含数值预检) 缓存
+    """
+    from dataclasses import fields
+    from core.adm1_model import ADM1Model, ADM1Parameters
+
+    key = f"{data_digest(data)}:{compiled is not None}"
+    if key in _verdicts:
+        cached = _verdicts[key]
+        return ValidationReport(name, list(cached.issues), dict(cached.metrics))
+
+    report = ValidationReport(name)
+    model_fields = {f.name for f in fields(ADM1Parameters)}
+    _check_schema(report, data, model_fields, ADM1Model().variable_index)
+    if compiled is not None and report.ok:
+        try:
+            _check_numerics(report, compiled)
+        except (ValueError, np.linalg.LinAlgError) as e:
+            report.add('error', 'jacobian', f"数值预检失败: {e}")
+    _verdicts[key] = report
+    return ValidationReport(name, list(report.issues), dict(report.metrics))
+
+
+def lint_presets(registry=None, verbose: bool = False, strict: bool = False) -> int:
+    """
+    检查注册表中的全部预设并打印结论
+
+    Returns:
+        退出码：有错误（strict 时含警告）为 1，否则 0
+    """
+    from parameters.preset_registry import get_preset_registry
+
+    registry = registry or get_preset_registry()
+    failed = False
+    for name, message in registry.errors().items():
+        print(f"[ERROR] {name}: {message}")
+        failed = True
+
+    for name, compiled in registry.items():
+        report = compiled.report or validate_preset(name, compiled.data, compiled)
+        shown = [i for i in report.issues if verbose or i.severity != 'info']
+        status = 'ERROR' if report.errors else 'WARNING' if report.warnings else 'SUCCESS'
+        metrics = ", ".join(f"{k} {v:.3g}" for k, v in report.metrics.items())
+        print(f"[{status}] {name}: {len(report.errors)} 个错误, {len(report.warnings)} 个警告"
+              + (f" ({metrics})" if metrics else ""))
+        for issue in shown:
+            print(f"    {issue}")
+        failed |= bool(report.errors) or (strict and bool(report.warnings))
+    return 1 if failed else 0
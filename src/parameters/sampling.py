@@ -0,0 +1,247 @@
+# src/parameters/sampling.py
+"""
+参数空间采样 - 预设参数块的取值范围与拟随机（Sobol/LHS）采样
+
+样本在单位立方体中生成后映射到参数取值；batch_vector 把 m 组样本按列堆叠为
+(P, m) 参数向量（batch_parameters 为对应的数组字段 ADM1Parameters），
+模型按列批量求值（状态为 (n, m)）
+"""
+
+import warnings
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+SAMPLING_METHODS = ('sobol', 'lhs', 'random')
+DISTRIBUTIONS = ('uniform', 'loguniform', 'triangular', 'normal', 'lognormal')
+NORMAL_95 = 1.959963984540054          # 标准正态97.5%分位数
+UNIT_EPS = 1e-12
+DEFAULT_SPREAD = 0.2                   # 默认范围：名义值 ×/÷ (1 + spread)
+DEFAULT_BLOCKS = ('kinetic_parameters',)
+
+# 预设参数名 → ADM1Parameters 字段名
+PRESET_NAME_MAP = {'KI_NH3': 'KI_nh3'}
+
+
+def model_parameter_name(name: str) -> str:
+    return PRESET_NAME_MAP.get(name, name)
+
+
+def unit_samples(n: int, dim: int, method: str = 'sobol',
+                 seed: Optional[int] = None) -> np.ndarray:
+    """单位立方体中的 (n, dim) 样本"""
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"未知采样方法: {method}（可选 {', '.join(SAMPLING_METHODS)}）")
+    if method == 'random':
+        return np.random.default_rng(seed).random((n, dim))
+
+    from scipy.stats import qmc
+
+    sampler = (qmc.Sobol(dim, scramble=True, seed=seed) if method == 'sobol'
+               else qmc.LatinHypercube(dim, seed=seed))
+    with warnings.catch_warnings():
+        # Sobol点数非2的幂时平衡性略差，仍优于伪随机
+        warnings.simplefilter('ignore', UserWarning)
+        return sampler.random(n)
+
+
+def unit_batches(dim: int, batch_size: int, method: str = 'sobol',
+                 seed: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    逐批产生单位立方体样本 (batch_size, dim)
+
+    Sobol 序列跨批连续（任意前缀都保持低差异，可随时停止）；LHS 与随机采样每批独立
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"未知采样方法: {method}（可选 {', '.join(SAMPLING_METHODS)}）")
+    rng = np.random.default_rng(seed)
+    if method == 'sobol':
+        from scipy.stats import qmc
+
+        sampler = qmc.Sobol(dim, scramble=True, seed=rng)
+    while True:
+        if method == 'random':
+            yield rng.random((batch_size, dim))
+        elif method == 'lhs':
+            yield unit_samples(batch_size, dim, 'lhs', int(rng.integers(2 ** 31)))
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                yield sampler.random(batch_size)
+
+
+@dataclass(frozen=True)
+class ParameterRange:
+    """
+    单个参数的分布，由区间 [lower, upper] 和分布形状给出:
+      uniform / loguniform: 区间内（对数）均匀
+      triangular:           区间内三角分布，众数为名义值
+      normal / lognormal:   区间为（对数）95%置信区间，均值/中位数为区间（几何）中点
+    """
+    name: str
+    nominal: float
+    lower: float
+    upper: float
+    distribution: str = 'uniform'
+
+    def __post_init__(self):
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"未知分布 {self.distribution}（可选 {', '.join(DISTRIBUTIONS)}）")
+        if self.distribution in ('loguniform', 'lognormal') and self.lower <= 0:
+            raise ValueError(f"参数 {self.name} 的{self.distribution}分布要求下限为正")
+
+    def _scipy(self):
+        from scipy import stats
+
+        width = self.upper - self.lower
+        if self.distribution == 'triangular':
+            mode = (self.nominal - self.lower) / width if width else 0.5
+            return stats.triang(min(max(mode, 0.0), 1.0), loc=self.lower, scale=width)
+        if self.distribution == 'normal':
+            return stats.norm(0.5 * (self.lower + self.upper), width / (2 * NORMAL_95))
+        log_width = np.log(self.upper / self.lower)
+        return stats.norm(0.5 * np.log(self.lower * self.upper), log_width / (2 * NORMAL_95))
+
+    def from_unit(self, u: np.ndarray) -> np.ndarray:
+        u = np.asarray(u, dtype=float)
+        if self.distribution == 'uniform':
+            return self.lower + u * (self.upper - self.lower)
+        if self.distribution == 'loguniform':
+            return np.exp(np.log(self.lower) + u * (np.log(self.upper) - np.log(self.lower)))
+        # 无界分布：把单位立方体边界点收回到 (0, 1) 内
+        u = np.clip(u, UNIT_EPS, 1.0 - UNIT_EPS)
+        values = self._scipy().ppf(u)
+        return np.exp(values) if self.distribution == 'lognormal' else values
+
+    def to_unit(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if self.upper == self.lower:
+            return np.zeros_like(x)
+        if self.distribution == 'uniform':
+            return (x - self.lower) / (self.upper - self.lower)
+        if self.distribution == 'loguniform':
+            return (np.log(x) - np.log(self.lower)) / (np.log(self.upper) - np.log(self.lower))
+        if self.distribution == 'lognormal':
+            return self._scipy().cdf(np.log(np.maximum(x, 1e-300)))
+        return self._scipy().cdf(x)
+
+
+class ParameterSpace:
+    """
+    一组模型参数的取值空间
+
+    Args:
+        ranges: 各参数范围（名称为 ADM1Parameters 字段名）
+        base: 其余参数取值（默认 ADM1Parameters()）
+    """
+
+    def __init__(self, ranges: Sequence[ParameterRange], base=None):
+        from core.adm1_model import ADM1Parameters
+
+        self.base = base if base is not None else ADM1Parameters()
+        known = {f.name for f in fields(self.base)}
+        unknown = [r.name for r in ranges if r.name not in known]
+        if unknown:
+            raise ValueError(f"模型中不存在的参数: {', '.join(unknown)}")
+        self.ranges: List[ParameterRange] = list(ranges)
+
+    @classmethod
+    def from_preset(cls, preset_name: str, blocks: Iterable[str] = DEFAULT_BLOCKS,
+                    spread: float = DEFAULT_SPREAD, names: Optional[Sequence[str]] = None,
+                    distribution: str = 'loguniform', overrides: Optional[Dict[str, Dict]] = None,
+                    manager=None) -> 'ParameterSpace':
+        """
+        以预设参数块的取值为名义值构建空间，默认区间为 [名义值/(1+spread), 名义值·(1+spread)]
+
+        模型中不存在的预设参数（如 KI_Fe）忽略；names 给出时只取这些参数；
+        overrides 按参数给出 {'distribution', 'lower', 'upper' 或 'spread'}
+        """
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = manager or ADM1ParameterManager()
+        preset = manager.get_preset(preset_name)
+        if preset is None:
+            raise KeyError(f"未知预设: {preset_name}")
+        base = manager.create_model_parameters(preset_name)
+        known = {f.name for f in fields(base)}
+
+        values: Dict[str, float] = {}
+        for block in blocks:
+            for name, value in preset.get(block, {}).items():
+                name = model_parameter_name(name)
+                if name in known and (names is None or name in names):
+                    values[name] = float(value)
+        overrides = {model_parameter_name(k): v for k, v in (overrides or {}).items()}
+        unknown = set(overrides) - set(values)
+        if unknown:
+            raise KeyError(f"参数不在所选参数块中: {', '.join(sorted(unknown))}")
+
+        ranges = []
+        for name, value in values.items():
+            spec = overrides.get(name, {})
+            factor = 1.0 + spec.get('spread', spread)
+            shape = spec.get('distribution', distribution)
+            if value <= 0 and shape in ('loguniform', 'lognormal'):
+                shape = 'uniform'
+            ranges.append(ParameterRange(name, value, float(spec.get('lower', value / factor)),
+                                         float(spec.get('upper', value * factor)), shape))
+        return cls(ranges, base)
+
+    @property
+    def names(self) -> List[str]:
+        return [r.name for r in self.ranges]
+
+    @property
+    def dim(self) -> int:
+        return len(self.ranges)
+
+    @property
+    def nominal(self) -> np.ndarray:
+        return np.array([r.nominal for r in self.ranges])
+
+    def from_unit(self, U: np.ndarray) -> np.ndarray:
+        """单位立方体样本 (m, d) → 参数取值 (m, d)"""
+        U = np.atleast_2d(U)
+        return np.column_stack([r.from_unit(U[:, j]) for j, r in enumerate(self.ranges)])
+
+    def to_unit(self, X: np.ndarray) -> np.ndarray:
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return np.column_stack([r.to_unit(X[:, j]) for j, r in enumerate(self.ranges)])
+
+    def sample(self, n: int, method: str = 'sobol', seed: Optional[int] = None) -> np.ndarray:
+        """(n, d) 参数样本"""
+        return self.from_unit(unit_samples(n, self.dim, method, seed))
+
+    def contains(self, X: np.ndarray, tolerance: float = 1e-9) -> np.ndarray:
+        """各样本是否在取值范围内 (m,)"""
+        U = self.to_unit(X)
+        return np.all((U >= -tolerance) & (U <= 1.0 + tolerance), axis=1)
+
+    def vector(self, values: Dict[str, float]) -> np.ndarray:
+        """参数字典 → 取值向量（缺省取名义值；接受预设命名）"""
+        values = {model_parameter_name(k): v for k, v in values.items()}
+        unknown = set(values) - set(self.names)
+        if unknown:
+            raise KeyError(f"参数不在采样空间中: {', '.join(sorted(unknown))}")
+        return np.array([float(values.get(r.name, r.nominal)) for r in self.ranges])
+
+    def parameters(self, x: np.ndarray):
+        """单组取值 → ADM1Parameters"""
+        return replace(self.base, **{name: float(v) for name, v in zip(self.names, x)})
+
+    def batch_parameters(self, X: np.ndarray):
+        """m 组取值 → 字段为 (m,) 数组的 ADM1Parameters（配合 (n, m) 状态批量求值）"""
+        X = np.atleast_2d(X)
+        return replace(self.base, **{name: X[:, j].copy() for j, name in enumerate(self.names)})
+
+    def batch_vector(self, X: np.ndarray):
+        """m 组取值 → (P, m) 参数向量（直接按列堆叠，不经过数据类）"""
+        from core.parameter_vector import PARAMETER_INDEX, ParameterVector
+
+        X = np.atleast_2d(X)
+        base = ParameterVector.from_parameters(self.base).values
+        values = np.repeat(base[:, None], len(X), axis=1)
+        for j, name in enumerate(self.names):
+            values[PARAMETER_INDEX[name]] = X[:, j]
+        return ParameterVector(values)
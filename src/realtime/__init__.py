@@ -0,0 +1,8 @@
+# src/realtime/__init__.py
+"""
+实时数字孪生模块
+"""
+
+from .digital_twin import DigitalTwin, DigitalTwinFleet, NudgingAssimilator, MINUTE
+
+__all__ = ['DigitalTwin', 'DigitalTwinFleet', 'NudgingAssimilator', 'MINUTE']
@@ -0,0 +1,386 @@
+# src/realtime/digital_twin.py
+"""
+实时数字孪生 - 与装置同步、随在线数据逐步推进的ADM1模型
+
+DigitalTwin 在调用之间保留积分器状态，advance(dt, influent) 只推进新增的时间段；
+默认使用定步长Rosenbrock（每步一次雅可比、一次LU分解、两次右端函数），
+每次推进的计算量只取决于 dt/步长，延迟可预测。
+进水按连续搅拌釜（CSTR）处理: dy/dt = f(y) + D·(y_in - y)，D = Q/V
+"""
+
+import math
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from solvers.integrators import get_integrator, integrator_options
+from solvers.ode_solver import project_nonnegative, replace_integrator_state
+
+MINUTE = 1.0 / 1440.0          # 1分钟 [d]
+DEFAULT_VOLUME = 3400.0        # 消化器液相体积 [m³]
+LATENCY_WINDOW = 1000          # 延迟统计保留的最近推进次数
+
+DEFAULT_TWIN_SOLVER = {
+    'method': 'Rosenbrock',
+    'fixed_step': MINUTE,
+    'rosenbrock_order': 2,
+    'rtol': 1e-6,
+    'atol': 1e-8,
+    'positivity': True,
+}
+
+# 有历史/Fortran状态的积分器在进水突变后需要重新启动
+_ONE_STEP_METHODS = ('Rosenbrock',)
+
+
+class NudgingAssimilator:
+    """
+    牛顿松弛（nudging）同化：y ← y + K·(z - y)
+
+    gain 为默认增益（0~1），gains 可按变量单独指定；
+    新状态截断为非负
+    """
+
+    def __init__(self, gain: float = 0.3, gains: Optional[Dict[str, float]] = None):
+        self.gain = gain
+        self.gains = dict(gains or {})
+
+    def __call__(self, twin: 'DigitalTwin', measurements: Dict[str, float]) -> np.ndarray:
+        y = twin.state
+        for name, value in measurements.items():
+            idx = twin.variable_index.get(name)
+            if idx is None:
+                continue
+            gain = self.gains.get(name, self.gain)
+            y[idx] = max(y[idx] + gain * (value - y[idx]), 0.0)
+        return y
+
+
+class DigitalTwin:
+    """
+    单个消化器的数字孪生
+
+    Args:
+        model: ADM1模型实例（默认参数模型）
+        y0: 初始状态
+        name: 消化器名称
+        volume: 液相体积 [m³]
+        influent: 初始进水，{'flow': Q, 变量名: 浓度, ...}；未给出的浓度取 y0
+        solver_params: 积分参数（默认 DEFAULT_TWIN_SOLVER）
+        assimilator: 同化函数 assimilator(twin, measurements) -> 新状态，默认nudging
+        t0: 起始时间 [d]
+    """
+
+    def __init__(self, model=None, y0: Optional[np.ndarray] = None, name: str = 'default',
+                 volume: float = DEFAULT_VOLUME, influent: Optional[Dict] = None,
+                 solver_params: Optional[Dict] = None,
+                 assimilator: Optional[Callable] = None, t0: float = 0.0):
+        if model is None:
+            from core.adm1_model import ADM1Model
+            model = ADM1Model()
+        if volume <= 0:
+            raise ValueError("消化器体积必须为正")
+
+        self.model = model
+        self.name = name
+        self.volume = float(volume)
+        self.solver_params = dict(DEFAULT_TWIN_SOLVER, **(solver_params or {}))
+        self.method = self.solver_params['method']
+        get_integrator(self.method)
+        self.assimilator = assimilator or NudgingAssimilator()
+        self.variable_index = model.variable_index
+
+        y0 = np.array(model.initial_conditions if y0 is None else y0, dtype=float)
+        self._t = float(t0)
+        self._y = y0
+        self._integrator = None
+        self.dilution = 0.0
+        self.influent_composition = y0.copy()
+        if influent:
+            self.set_influent(influent)
+
+        self._lower = np.zeros(len(y0))
+        self.n_advance = 0
+        self.n_steps = 0
+        self.n_assimilations = 0
+        self.n_projections = 0
+        self.last_innovation: Dict[str, float] = {}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._latency_max = 0.0
+        self._latency_total = 0.0
+
+    # ------------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------------
+    @property
+    def t(self) -> float:
+        return self._integrator.t if self._integrator is not None else self._t
+
+    @property
+    def state(self) -> np.ndarray:
+        """当前状态（副本）"""
+        y = self._integrator.y if self._integrator is not None else self._y
+        return np.array(y, dtype=float)
+
+    def value(self, name: str) -> float:
+        """当前某个状态变量的值"""
+        return float(self.state[self.variable_index[name]])
+
+    def set_state(self, y: np.ndarray):
+        """替换当前状态（同化或人工校正）"""
+        y = np.array(y, dtype=float)
+        if self._integrator is not None and self.method in _ONE_STEP_METHODS:
+            replace_integrator_state(self._integrator, y)
+            return
+        # 多步法的历史与新状态不一致，下次推进时重新启动
+        self._detach_integrator()
+        self._y = y
+
+    # ------------------------------------------------------------------
+    # 进水与右端函数
+    # ------------------------------------------------------------------
+    def set_influent(self, influent: Dict):
+        """更新进水：'flow' [m³/d] 与各变量浓度，未给出的保持原值"""
+        composition = self.influent_composition.copy()
+        for key, value in influent.items():
+            if key == 'flow':
+                continue
+            idx = self.variable_index.get(key)
+            if idx is None:
+                raise KeyError(f"未知进水变量: {key}")
+            composition[idx] = float(value)
+        changed = not np.array_equal(composition, self.influent_composition)
+        self.influent_composition = composition
+
+        if 'flow' in influent and influent['flow'] is not None:
+            flow = float(influent['flow'])
+            if flow < 0:
+                raise ValueError("进水流量不能为负")
+            dilution = flow / self.volume
+            changed = changed or dilution != self.dilution
+            self.dilution = dilution
+
+        # 多步法的历史在右端函数突变后失效
+        if changed and self.method not in _ONE_STEP_METHODS:
+            self._detach_integrator()
+
+    def _rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        y = np.maximum(y, 0.0)
+        rates = self.model.biochemical_reactions(t, y)
+        if self.dilution:
+            rates += self.dilution * (self.influent_composition - y)
+        return rates
+
+    def _jac(self, t: float, y: np.ndarray) -> np.ndarray:
+        J = self.model.jacobian(t, np.maximum(y, 0.0))
+        if self.dilution:
+            J[np.diag_indices_from(J)] -= self.dilution
+        return J
+
+    def _detach_integrator(self):
+        if self._integrator is not None:
+            self._t = self._integrator.t
+            self._y = np.array(self._integrator.y, dtype=float)
+            self._integrator = None
+
+    def _prepare_integrator(self, t_end: float):
+        if self._integrator is not None and self.method != 'LSODA':
+            # 延长积分区间，继续使用原积分器（LSODA的终点在Fortran中固定，需要重建）
+            self._integrator.t_bound = t_end
+            self._integrator.status = 'running'
+            return
+        self._detach_integrator()
+        jac = self._jac if hasattr(self.model, 'jacobian') else None
+        options = integrator_options(self.method, self.solver_params,
+                                     self.solver_params['atol'], True, jac)
+        self._integrator = get_integrator(self.method)(self._rhs, self._t, self._y,
+                                                       t_end, **options)
+
+    # ------------------------------------------------------------------
+    # 推进与同化
+    # ------------------------------------------------------------------
+    def advance(self, dt: float, influent: Optional[Dict] = None) -> np.ndarray:
+        """
+        推进 dt 天
+
+        Args:
+            dt: 推进时长 [d]
+            influent: 进水更新（见 set_influent），None表示保持不变
+
+        Returns:
+            推进后的状态
+        """
+        if dt < 0:
+            raise ValueError("推进时长不能为负")
+        start = time.perf_counter()
+        if influent:
+            self.set_influent(influent)
+        if dt == 0:
+            return self.state
+
+        t_before, y_before = self.t, self.state
+        self._prepare_integrator(t_before + dt)
+        integrator = self._integrator
+        positivity = self.solver_params.get('positivity', True)
+
+        message = None
+        while integrator.status == 'running':
+            message = integrator.step()
+            if integrator.status == 'failed':
+                break
+            self.n_steps += 1
+            if positivity and project_nonnegative(integrator, self._lower) > 0:
+                self.n_projections += 1
+
+        if integrator.status == 'failed':
+            # 恢复到推进前的状态，调用方可减小步长后重试
+            self._integrator = None
+            self._t, self._y = t_before, y_before
+            raise RuntimeError(f"{self.name} 推进失败: {message}")
+
+        self.n_advance += 1
+        self._record_latency(time.perf_counter() - start)
+        return self.state
+
+    def assimilate(self, measurements: Dict[str, float]) -> Dict[str, float]:
+        """
+        数据同化钩子：把状态向测量值推近
+
+        Returns:
+            新息（测量值 - 同化前的模型值）
+        """
+        innovation = {name: float(value) - self.value(name)
+                      for name, value in measurements.items() if name in self.variable_index}
+        if innovation:
+            self.set_state(self.assimilator(self, measurements))
+            self.n_assimilations += 1
+        self.last_innovation = innovation
+        return innovation
+
+    # ------------------------------------------------------------------
+    # 延迟统计
+    # ------------------------------------------------------------------
+    def _record_latency(self, elapsed: float):
+        self._latencies.append(elapsed)
+        self._latency_total += elapsed
+        self._latency_max = max(self._latency_max, elapsed)
+
+    def latency_stats(self) -> Dict:
+        """推进延迟统计（秒），p95基于最近 LATENCY_WINDOW 次推进"""
+        recent = np.asarray(self._latencies)
+        return {
+            'count': self.n_advance,
+            'last': float(recent[-1]) if len(recent) else None,
+            'mean': self._latency_total / self.n_advance if self.n_advance else None,
+            'p95': float(np.percentile(recent, 95)) if len(recent) else None,
+            'max': self._latency_max if self.n_advance else None,
+            'steps': self.n_steps,
+        }
+
+
+class DigitalTwinFleet:
+    """
+    多个消化器的数字孪生集合 - 在同一进程中按读数依次推进
+
+    每条读数推进对应的孪生到读数时间（使用读数中的进水），再同化其中的测量值
+    """
+
+    def __init__(self, twins: Optional[Sequence[DigitalTwin]] = None):
+        self.twins: Dict[str, DigitalTwin] = {}
+        self.n_readings = 0
+        self.n_stale = 0
+        for twin in twins or []:
+            self.add(twin)
+
+    def add(self, twin: DigitalTwin) -> DigitalTwin:
+        if twin.name in self.twins:
+            raise ValueError(f"消化器名称重复: {twin.name}")
+        self.twins[twin.name] = twin
+        return twin
+
+    def __getitem__(self, name: str) -> DigitalTwin:
+        return self.twins[name]
+
+    def __len__(self) -> int:
+        return len(self.twins)
+
+    @classmethod
+    def from_preset(cls, preset_name: str, names: Sequence[str], **twin_kwargs) -> 'DigitalTwinFleet':
+        """用同一预设创建多个消化器（各自独立的模型实例）"""
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        twins = []
+        for name in names:
+            model, y0 = manager.create_model(preset_name)
+            twins.append(DigitalTwin(model, y0, name=name, **twin_kwargs))
+        return cls(twins)
+
+    def process(self, reading) -> Optional[Dict]:
+        """
+        处理一条 SensorReading
+
+        Returns:
+            {'digester', 't', 'latency', 'innovation'}；过期读数（早于孪生当前时间）返回None
+        """
+        if reading.digester not in self.twins:
+            raise KeyError(f"未知消化器: {reading.digester}")
+        twin = self.twins[reading.digester]
+        start = time.perf_counter()
+
+        dt = reading.t - twin.t
+        if dt < -1e-12:
+            self.n_stale += 1
+            return None
+        twin.advance(max(dt, 0.0), reading.influent_update())
+        innovation = twin.assimilate(reading.measurements) if reading.measurements else {}
+
+        self.n_readings += 1
+        return {'digester': twin.name, 't': twin.t,
+                'latency': time.perf_counter() - start, 'innovation': innovation}
+
+    def run(self, feed, max_readings: Optional[int] = None,
+            on_update: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        消费数据源直到结束
+
+        Args:
+            feed: SensorReading 可迭代对象（FileSensorFeed/SocketSensorFeed）
+            max_readings: 最多处理的读数条数
+            on_update: 每条读数处理后的回调
+        """
+        start = time.perf_counter()
+        worst = 0.0
+        processed = 0
+        for reading in feed:
+            update = self.process(reading)
+            if update is not None:
+                worst = max(worst, update['latency'])
+                if on_update:
+                    on_update(update)
+            processed += 1
+            if max_readings is not None and processed >= max_readings:
+                break
+        return {
+            'readings': processed,
+            'stale': self.n_stale,
+            'elapsed': time.perf_counter() - start,
+            'max_latency': worst,
+            'twins': {name: twin.latency_stats() for name, twin in self.twins.items()},
+        }
+
+    def realtime_margin(self, update_interval: float = MINUTE) -> float:
+        """
+        实时余量：更新周期（天，默认1分钟）的墙钟时长 / 全部消化器各推进一次的平均耗时
+
+        >1 表示能跟上；假设每次推进对应一个更新周期
+        """
+        per_cycle = 0.0
+        for twin in self.twins.values():
+            stats = twin.latency_stats()
+            if not stats['mean']:
+                return math.inf
+            per_cycle += stats['mean']
+        return update_interval * 86400.0 / per_cycle if per_cycle > 0 else math.inf
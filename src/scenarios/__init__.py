@@ -0,0 +1,12 @@
+# src/scenarios/__init__.py
+"""
+情景批量运行模块 - 情景文件（JSON/YAML/CSV）→ 并行、可续跑的批量模拟 → 汇总表
+"""
+
+from .batch_runner import (RESULTS_SCHEMA_VERSION, BatchResult, BatchRunner, preset_digest,
+                           resume_key, run_batch, run_scenario)
+from .scenario_file import Scenario, build_scenarios, expand_sweep, load_scenarios
+
+__all__ = ['RESULTS_SCHEMA_VERSION', 'BatchResult', 'BatchRunner', 'preset_digest',
+           'resume_key', 'run_batch', 'run_scenario',
+           'Scenario', 'build_scenarios', 'expand_sweep', 'load_scenarios']
@@ -0,0 +1,236 @@
+# src/scenarios/batch_runner.py
+"""
+情景批量运行 - 多进程并行、断点续跑、汇总表
+
+每完成一个情景，主进程向 progress.jsonl 追加一行（续跑键 + 汇总行）；
+中断后重新运行同一输出目录时跳过已完成的情景（默认重跑失败的情景）。
+续跑键由情景定义、汇总行格式版本和编译后预设的内容哈希组成：情景定义、
+预设参数/初值或汇总行内容改变后都会重新计算。结束时按情景文件顺序写出
+summary.csv / summary.json
+"""
+
+import csv
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from scenarios.scenario_file import Scenario
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_OUTPUT_ROOT = PROJECT_ROOT / 'results' / 'batch'
+SUMMARY_COLUMNS = ('name', 'preset', 'days', 'success', 'message', 'elapsed', 'nfev', 'n_points')
+# 汇总行格式版本：run_scenario 输出的列改变时递增，旧进度行随之失效
+# （2: 附带 analysis.kpi 的 KPI 列）
+RESULTS_SCHEMA_VERSION = 2
+
+
+def _safe_name(name: str) -> str:
+    return ''.join(c if c.isalnum() or c in '-_=' else '_' for c in name)
+
+
+def run_scenario(scenario: Scenario, store_root: Optional[str] = None) -> Dict:
+    """
+    运行单个情景，返回汇总行（失败时 success=False 并附原因，不抛出异常）
+
+    输出请求的每个状态变量给出 <变量>_final 与 <变量>_max，并附带全部 KPI（analysis.kpi）
+    """
+    from parameters.parameter_manager import ADM1ParameterManager
+    from solvers.ode_solver import ADM1Solver
+
+    start = time.perf_counter()
+    row = {'name': scenario.name, 'preset': scenario.preset, 'days': scenario.days,
+           'success': False, 'message': '', 'elapsed': 0.0, 'nfev': 0, 'n_points': 0}
+    try:
+        model, y0 = ADM1ParameterManager().create_model(scenario.preset)
+        if scenario.parameters:
+            model.parameters = model.parameter_vector.replace(**scenario.parameters)
+        for var, value in scenario.initial_conditions.items():
+            y0[model.variable_index[var]] = value
+
+        solver = ADM1Solver()
+        solver.solver_params.update(scenario.solver)
+        results = solver.solve(model, (0.0, scenario.days), y0)
+
+        row.update(success=bool(results['success']), message=str(results.get('message', '')),
+                   nfev=int(results.get('nfev', 0) or 0), n_points=int(len(results['time'])))
+        if results['success']:
+            from analysis.kpi import attach_kpis
+
+            states = results['states']
+            for var in scenario.outputs:
+                trajectory = states[model.variable_index[var]]
+                row[f'{var}_final'] = float(trajectory[-1])
+                row[f'{var}_max'] = float(np.max(trajectory))
+            row.update(attach_kpis(results))
+            if scenario.store:
+                from storage.result_store import ResultStore
+
+                path = ResultStore(store_root).save(results, preset_name=scenario.preset,
+                                                    run_id=_safe_name(scenario.name),
+                                                    extra_metadata={'scenario': scenario.to_dict()})
+                row['store_path'] = str(path)
+    except Exception as e:
+        row['message'] = f"{type(e).__name__}: {e}"
+    row['elapsed'] = time.perf_counter() - start
+    return row
+
+
+def preset_digest(compiled) -> str:
+    """编译后预设的内容哈希（参数向量 + 初始状态）"""
+    payload = compiled.parameter_vector.digest().encode() + compiled.initial_state.tobytes()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def resume_key(scenario: Scenario, digest: str) -> str:
+    """续跑键：情景内容哈希 + 汇总行格式版本 + 预设内容哈希"""
+    payload = f"{scenario.key()}:{RESULTS_SCHEMA_VERSION}:{digest}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class BatchResult:
+    """批量运行结果"""
+    rows: List[Dict]
+    n_run: int
+    n_skipped: int
+    summary_path: Path
+    elapsed: float
+
+    @property
+    def n_failed(self) -> int:
+        return sum(1 for row in self.rows if not row.get('success'))
+
+
+class BatchRunner:
+    """
+    情景批量运行器
+
+    Args:
+        scenarios: 情景列表
+        output_dir: 输出目录（progress.jsonl、summary.csv/json、store/）
+        workers: 并行进程数（1 为当前进程顺序运行）
+        resume: 跳过 progress.jsonl 中已完成的情景
+        retry_failed: 续跑时重跑失败的情景
+    """
+
+    def __init__(self, scenarios: List[Scenario], output_dir, workers: int = 1,
+                 resume: bool = True, retry_failed: bool = True):
+        self.scenarios = list(scenarios)
+        self.output_dir = Path(output_dir)
+        self.workers = max(1, int(workers))
+        self.resume = resume
+        self.retry_failed = retry_failed
+        self.progress_path = self.output_dir / 'progress.jsonl'
+        self.store_root = str(self.output_dir / 'store')
+
+    def keys(self) -> Dict[str, str]:
+        """{情景名: 续跑键}（未知或无效预设的哈希为空，情景运行时再报错）"""
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        digests = {}
+        for preset in {s.preset for s in self.scenarios}:
+            try:
+                digests[preset] = preset_digest(manager.get_compiled_preset(preset))
+            except KeyError:
+                digests[preset] = ''
+        return {s.name: resume_key(s, digests[s.preset]) for s in self.scenarios}
+
+    def completed(self) -> Dict[str, Dict]:
+        """progress.jsonl 中已记录的 {续跑键: 汇总行}（忽略中断时写坏的行）"""
+        done = {}
+        if not self.progress_path.exists():
+            return done
+        with open(self.progress_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done[record['key']] = record['row']
+                except (ValueError, KeyError):
+                    continue
+        return done
+
+    def _record(self, key: str, row: Dict):
+        # 上次中断时末行可能未写完，先换行，避免新记录接在坏行后面一起丢失
+        broken = False
+        if self.progress_path.exists() and self.progress_path.stat().st_size:
+            with open(self.progress_path, 'rb') as f:
+                f.seek(-1, 2)
+                broken = f.read(1) != b'\n'
+        with open(self.progress_path, 'a', encoding='utf-8') as f:
+            f.write(('\n' if broken else '') + json.dumps({'key': key, 'row': row},
+                                                          ensure_ascii=False) + '\n')
+            f.flush()
+
+    def run(self, verbose: bool = True) -> BatchResult:
+        start = time.perf_counter()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not self.resume and self.progress_path.exists():
+            self.progress_path.unlink()
+
+        done = self.completed()
+        keys = self.keys()
+        pending = [s for s in self.scenarios
+                   if keys[s.name] not in done
+                   or (self.retry_failed and not done[keys[s.name]].get('success'))]
+        n_skipped = len(self.scenarios) - len(pending)
+        if verbose and n_skipped:
+            print(f"[INFO] 续跑: 跳过 {n_skipped} 个已完成的情景")
+
+        rows = {key: row for key, row in done.items()}
+        total = len(pending)
+
+        def finish(scenario: Scenario, row: Dict, count: int):
+            rows[keys[scenario.name]] = row
+            self._record(keys[scenario.name], row)
+            if verbose:
+                status = "成功" if row['success'] else f"失败: {row['message']}"
+                print(f"[PROGRESS] {count}/{total} {scenario.name} "
+                      f"({status}, {row['elapsed']:.1f} s)")
+
+        if self.workers == 1 or total <= 1:
+            for count, scenario in enumerate(pending, 1):
+                finish(scenario, run_scenario(scenario, self.store_root), count)
+        else:
+            with ProcessPoolExecutor(min(self.workers, total)) as executor:
+                futures = {executor.submit(run_scenario, s, self.store_root): s for s in pending}
+                for count, future in enumerate(as_completed(futures), 1):
+                    finish(futures[future], future.result(), count)
+
+        ordered = [rows[keys[s.name]] for s in self.scenarios if keys[s.name] in rows]
+        summary_path = self.write_summary(ordered)
+        return BatchResult(ordered, total, n_skipped, summary_path, time.perf_counter() - start)
+
+    def write_summary(self, rows: List[Dict]) -> Path:
+        """汇总表: summary.csv（表格工具）与 summary.json"""
+        columns = list(SUMMARY_COLUMNS)
+        for row in rows:
+            columns.extend(c for c in row if c not in columns)
+
+        path = self.output_dir / 'summary.csv'
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(self.output_dir / 'summary.json', 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def run_batch(path, output_dir=None, workers: int = 1, resume: bool = True,
+              verbose: bool = True) -> BatchResult:
+    """读取情景文件并批量运行；输出目录默认 results/batch/<情景文件名>"""
+    from scenarios.scenario_file import load_scenarios
+
+    path = Path(path)
+    scenarios = load_scenarios(path)
+    output_dir = Path(output_dir) if output_dir else DEFAULT_OUTPUT_ROOT / path.stem
+    if verbose:
+        print(f"[INFO] {len(scenarios)} 个情景, {workers} 个进程, 输出目录 {output_dir}")
+    return BatchRunner(scenarios, output_dir, workers, resume).run(verbose)
@@ -0,0 +1,191 @@
+# src/scenarios/scenario_file.py
+"""
+情景文件 - 批量运行的预设、参数覆盖、时长与输出请求
+
+JSON / YAML（需安装 PyYAML）:
+    {"defaults": {"days": 30, "outputs": ["S_ac", "S_pro"]},
+     "scenarios": [
+        {"name": "base", "preset": "food_waste"},
+        {"name": "slow_ac", "preset": "food_waste", "parameters": {"k_m_ac": 5.0},
+         "initial_conditions": {"S_ac": 6.0}, "days": 60, "store": true},
+        {"name": "doe", "preset": "sewage_sludge",
+         "sweep": {"k_m_ac": [6, 8], "KI_nh3": [0.001, 0.002]}}]}
+  sweep 按全因子展开为 4 个情景（doe[k_m_ac=6,KI_nh3=0.001] 等）
+
+CSV: 每行一个情景，列 name, preset, days, outputs（分号分隔）, store，
+     以及 param.<参数名>、init.<状态变量>、solver.<求解器选项>；空单元格忽略
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DAYS = 30.0
+DEFAULT_OUTPUTS = ('S_va', 'S_bu', 'S_pro', 'S_ac', 'S_h2', 'S_IN')
+SCENARIO_KEYS = ('name', 'preset', 'days', 'parameters', 'initial_conditions', 'solver',
+                 'outputs', 'store', 'sweep')
+
+# 预设与模型参数命名差异
+PARAMETER_ALIASES = {'KI_NH3': 'KI_nh3'}
+
+
+@dataclass
+class Scenario:
+    """单个情景"""
+    name: str
+    preset: str
+    days: float = DEFAULT_DAYS
+    parameters: Dict[str, float] = field(default_factory=dict)          # 参数覆盖
+    initial_conditions: Dict[str, float] = field(default_factory=dict)  # 初值覆盖
+    solver: Dict[str, Any] = field(default_factory=dict)                # 求解器选项覆盖
+    outputs: List[str] = field(default_factory=lambda: list(DEFAULT_OUTPUTS))
+    store: bool = False                                                 # 保存完整轨迹
+
+    def key(self) -> str:
+        """内容哈希：情景定义变化后断点续跑会重新计算"""
+        payload = json.dumps(asdict(self), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _format_value(value) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def expand_sweep(entry: Dict) -> List[Dict]:
+    """sweep 中各参数取值的全因子组合展开为多个情景"""
+    sweep = entry.get('sweep')
+    if not sweep:
+        return [entry]
+    names = list(sweep)
+    expanded = []
+    for values in itertools.product(*(sweep[n] for n in names)):
+        item = {k: v for k, v in entry.items() if k != 'sweep'}
+        item['parameters'] = dict(entry.get('parameters', {}), **dict(zip(names, values)))
+        label = ",".join(f"{n}={_format_value(v)}" for n, v in zip(names, values))
+        item['name'] = f"{entry['name']}[{label}]"
+        expanded.append(item)
+    return expanded
+
+
+def build_scenarios(entries: List[Dict], defaults: Optional[Dict] = None) -> List[Scenario]:
+    """
+    由字典列表构建并校验情景
+
+    Raises:
+        ValueError: 缺少字段、未知字段/参数/状态变量、名称重复
+    """
+    from core.adm1_model import ADM1Model, ADM1Parameters
+
+    model_parameters = {f.name for f in fields(ADM1Parameters)}
+    state_variables = set(ADM1Model().state_variables)
+    defaults = defaults or {}
+
+    scenarios: List[Scenario] = []
+    for i, raw in enumerate(entries):
+        entry = dict(defaults, **raw)
+        unknown = set(entry) - set(SCENARIO_KEYS)
+        if unknown:
+            raise ValueError(f"情景 {i + 1} 含未知字段: {', '.join(sorted(unknown))}")
+        entry.setdefault('name', f"scenario_{i + 1}")
+        if 'preset' not in entry:
+            raise ValueError(f"情景 {entry['name']} 缺少 preset")
+
+        for item in expand_sweep(entry):
+            parameters = {PARAMETER_ALIASES.get(k, k): float(v)
+                          for k, v in item.get('parameters', {}).items()}
+            bad = set(parameters) - model_parameters
+            if bad:
+                raise ValueError(f"情景 {item['name']} 含未知参数: {', '.join(sorted(bad))}")
+            initial = {k: float(v) for k, v in item.get('initial_conditions', {}).items()}
+            outputs = list(item.get('outputs', DEFAULT_OUTPUTS))
+            bad = (set(initial) | set(outputs)) - state_variables
+            if bad:
+                raise ValueError(f"情景 {item['name']} 含未知状态变量: {', '.join(sorted(bad))}")
+            days = float(item.get('days', DEFAULT_DAYS))
+            if days <= 0:
+                raise ValueError(f"情景 {item['name']} 的时长应为正数: {days}")
+            scenarios.append(Scenario(str(item['name']), str(item['preset']), days, parameters,
+                                      initial, dict(item.get('solver', {})), outputs,
+                                      bool(item.get('store', False))))
+
+    names = [s.name for s in scenarios]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(f"情景名称重复: {', '.join(duplicates)}")
+    return scenarios
+
+
+def _parse_cell(value: str):
+    """CSV 单元格：数值、布尔或字符串"""
+    text = value.strip()
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _read_csv(path: Path) -> List[Dict]:
+    entries = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            entry: Dict[str, Any] = {}
+            for column, value in row.items():
+                if column is None or value is None or not value.strip():
+                    continue
+                column = column.strip()
+                prefix, _, name = column.partition('.')
+                if prefix in ('param', 'init', 'solver') and name:
+                    block = {'param': 'parameters', 'init': 'initial_conditions',
+                             'solver': 'solver'}[prefix]
+                    entry.setdefault(block, {})[name] = _parse_cell(value)
+                elif column == 'outputs':
+                    entry['outputs'] = [v.strip() for v in value.split(';') if v.strip()]
+                elif column in ('name', 'preset'):
+                    entry[column] = value.strip()
+                else:
+                    entry[column] = _parse_cell(value)
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def load_scenarios(path) -> List[Scenario]:
+    """
+    读取情景文件（按扩展名: .json / .yaml / .yml / .csv）
+
+    Raises:
+        ValueError: 格式不支持或内容不合法
+        ImportError: YAML 文件但未安装 PyYAML
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return build_scenarios(_read_csv(path))
+    if suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("读取YAML情景文件需要安装 PyYAML（pip install pyyaml），"
+                              "或改用 JSON/CSV") from e
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    elif suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"不支持的情景文件格式: {path.suffix}（支持 .json/.yaml/.yml/.csv）")
+
+    if isinstance(data, list):
+        return build_scenarios(data)
+    if not isinstance(data, dict) or 'scenarios' not in data:
+        raise ValueError("情景文件应为情景列表，或含 scenarios 字段的对象")
+    return build_scenarios(data['scenarios'], data.get('defaults'))
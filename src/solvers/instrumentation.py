@@ -0,0 +1,194 @@
+"""
+求解器插桩 - 记录步长历史、拒绝步、LU分解和各阶段耗时
+通过包装积分器的右端函数、雅可比和线性代数回调实现，不修改SciPy内部
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class SolverInstrumentation:
+    """单次求解的插桩记录器"""
+
+    def __init__(self, variable_names: Optional[Sequence[str]] = None):
+        self.variable_names = list(variable_names) if variable_names else None
+
+        self.step_times: List[float] = []
+        self.step_sizes: List[float] = []
+        self.limiting_indices: List[int] = []
+        self.accepted_steps = 0
+        self.rejected_steps: Optional[int] = 0
+        self.limiting_source = None
+
+        self.time_rhs = 0.0
+        self.time_jacobian = 0.0
+        self.time_linear_algebra: Optional[float] = 0.0
+        self.time_total = 0.0
+        self.n_rhs = 0
+        self.n_jacobian = 0
+        self.n_lu = 0
+        self.projections = 0
+        self.max_negative = 0.0
+
+        self._in_jacobian = False
+        self._trial_times = set()
+        self._counts_rejections = False
+        self._integrator = None
+        self._order = None
+        self._y_old = None
+        self._rtol = 1e-6
+        self._atol = 1e-8
+        self._start = None
+        self._nlu_start = 0
+
+    # ------------------------------------------------------------------
+    # 回调包装
+    # ------------------------------------------------------------------
+    def wrap_rhs(self, fun):
+        """包装右端函数：计时，并记录每个试探步的时间点（用于统计拒绝步）"""
+        def instrumented_rhs(t, y):
+            if self._in_jacobian:
+                return fun(t, y)
+            start = time.perf_counter()
+            result = fun(t, y)
+            self.time_rhs += time.perf_counter() - start
+            self.n_rhs += 1
+            self._trial_times.add(float(t))
+            return result
+        return instrumented_rhs
+
+    def attach(self, integrator, rtol: float = 1e-6, atol=1e-8):
+        """在积分器创建后包装其雅可比和LU回调
+
+        rtol/atol 仅在积分器未公开容差（如LSODA）时用于误差加权
+        """
+        self._rtol = getattr(integrator, 'rtol', rtol)
+        self._atol = getattr(integrator, 'atol', atol)
+        jac = getattr(integrator, 'jac', None)
+        if callable(jac):
+            def instrumented_jac(t, y, *args):
+                self._in_jacobian = True
+                start = time.perf_counter()
+                try:
+                    return jac(t, y, *args)
+                finally:
+                    self.time_jacobian += time.perf_counter() - start
+                    self.n_jacobian += 1
+                    self._in_jacobian = False
+            integrator.jac = instrumented_jac
+
+        if hasattr(integrator, 'lu') and hasattr(integrator, 'solve_lu'):
+            integrator.lu = self._timed_linear_algebra(integrator.lu)
+            integrator.solve_lu = self._timed_linear_algebra(integrator.solve_lu)
+        else:
+            # LSODA等Fortran实现无法拆分线性代数耗时
+            self.time_linear_algebra = None
+
+        # 只有BDF每次试探步在唯一时间点上求值右端函数，可据此统计拒绝步
+        self._counts_rejections = type(integrator).__name__ == 'BDF'
+        if not self._counts_rejections:
+            self.rejected_steps = None
+        self.limiting_source = ('bdf_error_estimate' if type(integrator).__name__ == 'BDF'
+                                else 'step_change_proxy')
+
+        self._nlu_start = getattr(integrator, 'nlu', 0)
+        self._integrator = integrator
+        self._start = time.perf_counter()
+
+    def _timed_linear_algebra(self, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.time_linear_algebra += time.perf_counter() - start
+        return timed
+
+    # ------------------------------------------------------------------
+    # 步进记录
+    # ------------------------------------------------------------------
+    def before_step(self, integrator):
+        """步进前调用"""
+        self._trial_times.clear()
+        self._order = getattr(integrator, 'order', None)
+        self._y_old = integrator.y.copy()
+
+    def after_step(self, integrator):
+        """接受步之后调用"""
+        self.accepted_steps += 1
+        self.step_times.append(float(integrator.t))
+        self.step_sizes.append(float(integrator.t - integrator.t_old))
+
+        if self._counts_rejections:
+            attempts = len(self._trial_times - {float(integrator.t_old)})
+            self.rejected_steps += max(0, attempts - 1)
+
+        self.limiting_indices.append(self._limiting_component(integrator))
+
+    def record_projection(self, violation: float):
+        """记录一次非负投影（保正模式）"""
+        self.projections += 1
+        self.max_negative = max(self.max_negative, violation)
+
+    def _limiting_component(self, integrator) -> int:
+        """误差估计中占主导的状态分量"""
+        scale = self._atol + self._rtol * np.abs(integrator.y)
+        if self.limiting_source == 'bdf_error_estimate' and self._order is not None:
+            # BDF接受步后 D[order+1] 为校正量，与局部误差估计成正比
+            error = integrator.D[self._order + 1]
+        else:
+            error = integrator.y - self._y_old
+        return int(np.argmax(np.abs(error) / scale))
+
+    def finish(self):
+        """求解结束时调用"""
+        if self._start is not None:
+            self.time_total = time.perf_counter() - self._start
+        self.n_lu = getattr(self._integrator, 'nlu', 0) - self._nlu_start
+
+    # ------------------------------------------------------------------
+    # 汇总
+    # ------------------------------------------------------------------
+    def _name(self, index: int) -> str:
+        if self.variable_names and 0 <= index < len(self.variable_names):
+            return self.variable_names[index]
+        return f"y{index}"
+
+    def summary(self) -> Dict:
+        """结构化统计结果"""
+        sizes = np.asarray(self.step_sizes)
+        counts: Dict[str, int] = {}
+        for idx in self.limiting_indices:
+            name = self._name(idx)
+            counts[name] = counts.get(name, 0) + 1
+        limiting = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+        accounted = self.time_rhs + self.time_jacobian + (self.time_linear_algebra or 0.0)
+        return {
+            'accepted_steps': self.accepted_steps,
+            'rejected_steps': self.rejected_steps,
+            'lu_decompositions': self.n_lu,
+            'rhs_calls': self.n_rhs,
+            'jacobian_calls': self.n_jacobian,
+            'projections': self.projections,
+            'max_negative': self.max_negative,
+            'step_size': {
+                'min': float(sizes.min()) if len(sizes) else None,
+                'max': float(sizes.max()) if len(sizes) else None,
+                'mean': float(sizes.mean()) if len(sizes) else None,
+            },
+            'step_times': np.asarray(self.step_times),
+            'step_sizes': sizes,
+            'timings': {
+                'rhs': self.time_rhs,
+                'jacobian': self.time_jacobian,
+                'linear_algebra': self.time_linear_algebra,
+                'other': max(0.0, self.time_total - accounted),
+                'total': self.time_total,
+            },
+            'limiting_source': self.limiting_source,
+            'limiting_variables': limiting,
+            'limiting_trace': np.asarray(self.limiting_indices, dtype=int),
+        }
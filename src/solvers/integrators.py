@@ -0,0 +1,198 @@
+# src/solvers/integrators.py
+"""
+积分器后端 - 可插拔的 OdeSolver 注册表
+SciPy 的 BDF/Radau/LSODA 与定步长 Rosenbrock（线性隐式）积分器共用 scipy.integrate.OdeSolver 接口，
+因此 solve_ivp、手动步进（插桩/流式/保正）都可以直接使用任一后端
+"""
+
+from typing import Callable, Dict, Optional, Type
+
+import numpy as np
+from scipy.integrate import BDF, LSODA, RK45, Radau
+from scipy.integrate._ivp.base import DenseOutput, OdeSolver
+from scipy.linalg import lu_factor, lu_solve
+
+DEFAULT_ROSENBROCK_STEPS = 1000  # 未给出步长且 max_step 无界时的步数
+ROS2_GAMMA = 1.0 + 1.0 / np.sqrt(2.0)
+
+
+class _LinearDenseOutput(DenseOutput):
+    """步内线性插值"""
+
+    def __init__(self, t_old, t, y_old, y):
+        super().__init__(t_old, t)
+        self.y_old = y_old
+        self.y = y
+
+    def _call_impl(self, t):
+        theta = (np.asarray(t) - self.t_old) / (self.t - self.t_old)
+        if np.ndim(theta) == 0:
+            return self.y_old + theta * (self.y - self.y_old)
+        return self.y_old[:, None] + theta[None, :] * (self.y - self.y_old)[:, None]
+
+
+class RosenbrockFixed(OdeSolver):
+    """
+    定步长 Rosenbrock 积分器（线性隐式，每步一次LU分解，无牛顿迭代）
+
+    order=1: 线性隐式Euler  (I - hJ)k = f(y),  y+ = y + hk
+    order=2: ROS2 (γ = 1 + 1/√2，L稳定)
+        W = I - γhJ,  W k1 = f(y),  W k2 = f(y + hk1) - 2k1,  y+ = y + h(1.5k1 + 0.5k2)
+
+    步长固定、无误差控制，每步计算量恒定，适合实时运行；rtol/atol 被忽略。
+
+    Args:
+        jac: 雅可比矩阵函数 jac(t, y)；None 时使用前向差分
+        step: 步长（天），默认 first_step、其次 max_step
+    """
+
+    def __init__(self, fun, t0, y0, t_bound, jac=None, step=None, order=2,
+                 max_step=np.inf, first_step=None, rtol=None, atol=None,
+                 vectorized=False, **extraneous):
+        super().__init__(fun, t0, y0, t_bound, vectorized)
+        if order not in (1, 2):
+            raise ValueError(f"Rosenbrock阶数只支持1或2: {order}")
+        self.order = order
+
+        if step is None:
+            step = first_step if first_step is not None else max_step
+        if step is None or not np.isfinite(step):
+            step = abs(t_bound - t0) / DEFAULT_ROSENBROCK_STEPS
+        if step <= 0:
+            raise ValueError("步长必须为正")
+        self.h = float(step)
+
+        self.jac = jac if callable(jac) else self._finite_difference_jacobian
+        self.lu = lu_factor
+        self.solve_lu = lu_solve
+        self.identity = np.eye(self.n)
+        self.y_old = None
+        self._gamma = ROS2_GAMMA if order == 2 else 1.0
+
+    def _finite_difference_jacobian(self, t, y):
+        f0 = self.fun(t, y)
+        J = np.empty((self.n, self.n))
+        for j in range(self.n):
+            dy = np.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+            y_pert = y.copy()
+            y_pert[j] += dy
+            J[:, j] = (self.fun(t, y_pert) - f0) / dy
+        return J
+
+    def _step_impl(self):
+        t, y = self.t, self.y
+        remaining = abs(self.t_bound - t)
+        # 浮点累加误差不产生额外的极短末步
+        h = (remaining if remaining <= self.h * (1.0 + 1e-8) else self.h) * self.direction
+
+        J = np.asarray(self.jac(t, y), dtype=float)
+        self.njev += 1
+        LU = self.lu(self.identity - self._gamma * h * J)
+        self.nlu += 1
+
+        f0 = self.fun(t, y)
+        k1 = self.solve_lu(LU, f0)
+        if self.order == 1:
+            y_new = y + h * k1
+        else:
+            k2 = self.solve_lu(LU, self.fun(t + h, y + h * k1) - 2.0 * k1)
+            y_new = y + h * (1.5 * k1 + 0.5 * k2)
+
+        if not np.all(np.isfinite(y_new)):
+            return False, "Rosenbrock步产生非有限值，请减小步长"
+
+        self.y_old = y
+        self.t = t + h
+        self.y = y_new
+        return True, None
+
+    def _dense_output_impl(self):
+        return _LinearDenseOutput(self.t_old, self.t, self.y_old, self.y)
+
+
+def rosenbrock_batch(fun, jac, t: float, Y: np.ndarray, h: float, n_steps: int = 1,
+                     order: int = 2, nonnegative: bool = True) -> np.ndarray:
+    """
+    批量定步长 Rosenbrock 积分 - 按列同时推进 m 个互相独立的状态（集合预报）
+
+    与 RosenbrockFixed 相同的格式，但右端函数和雅可比对全部成员各调用一次：
+        fun(t, Y): (n, m) -> (n, m)
+        jac(t, Y): (n, m) -> (n, n, m)
+    各成员的 W = I - γhJ 用批量 numpy.linalg.solve 求解
+
+    Args:
+        h: 每步步长（天）
+        n_steps: 步数
+        nonnegative: 每步后截断为非负（与保正模式一致）
+
+    Returns:
+        t + n_steps·h 时刻的状态 (n, m)
+    """
+    Y = np.array(Y, dtype=float)
+    n = Y.shape[0]
+    gamma = ROS2_GAMMA if order == 2 else 1.0
+    identity = np.eye(n)
+    for _ in range(n_steps):
+        J = np.moveaxis(jac(t, Y), -1, 0)                # (m, n, n)
+        W = identity - gamma * h * J
+        f0 = fun(t, Y)
+        k1 = np.linalg.solve(W, f0.T[..., None])[..., 0].T
+        if order == 1:
+            Y = Y + h * k1
+        else:
+            rhs = fun(t + h, Y + h * k1) - 2.0 * k1
+            k2 = np.linalg.solve(W, rhs.T[..., None])[..., 0].T
+            Y = Y + h * (1.5 * k1 + 0.5 * k2)
+        if nonnegative:
+            np.maximum(Y, 0.0, out=Y)
+        t += h
+    return Y
+
+
+# 名称 → OdeSolver 子类
+INTEGRATOR_BACKENDS: Dict[str, Type[OdeSolver]] = {
+    'BDF': BDF,
+    'Radau': Radau,
+    'LSODA': LSODA,
+    'RK45': RK45,
+    'Rosenbrock': RosenbrockFixed,
+}
+
+# 使用（解析）雅可比的后端；LSODA/RK45 不使用传入的雅可比函数也不影响正确性
+JACOBIAN_BACKENDS = ('BDF', 'Radau', 'LSODA', 'Rosenbrock')
+
+# auto 模式的候选后端
+AUTO_CANDIDATES = ('BDF', 'Radau', 'LSODA', 'Rosenbrock')
+
+
+def register_integrator(name: str, solver_class: Type[OdeSolver]):
+    """注册新的积分器后端（须为 scipy.integrate.OdeSolver 子类）"""
+    if not (isinstance(solver_class, type) and issubclass(solver_class, OdeSolver)):
+        raise TypeError(f"{solver_class} 不是 OdeSolver 子类")
+    INTEGRATOR_BACKENDS[name] = solver_class
+
+
+def get_integrator(name: str) -> Type[OdeSolver]:
+    """按名称获取积分器类"""
+    if name not in INTEGRATOR_BACKENDS:
+        raise ValueError(f"未知积分方法: {name}，可用: {list(INTEGRATOR_BACKENDS)}")
+    return INTEGRATOR_BACKENDS[name]
+
+
+def integrator_options(name: str, solver_params: Dict, atol, use_first_step: bool = True,
+                       jac: Optional[Callable] = None) -> Dict:
+    """由 solver_params 生成积分器构造参数"""
+    options = {
+        'rtol': solver_params['rtol'],
+        'atol': atol,
+        'max_step': solver_params.get('max_step', np.inf),
+    }
+    if use_first_step and solver_params.get('first_step') is not None:
+        options['first_step'] = solver_params['first_step']
+    if jac is not None and name in JACOBIAN_BACKENDS:
+        options['jac'] = jac
+    if name == 'Rosenbrock':
+        options['order'] = solver_params.get('rosenbrock_order', 2)
+        if solver_params.get('fixed_step') is not None:
+            options['step'] = solver_params['fixed_step']
+    return options
@@ -0,0 +1,286 @@
+# src/solvers/metal_splitting.py
+"""
+金属络合快速过程的处理方式
+
+Fe-EDTA 络合 (k_edta_fe = 1e5) 比生化过程快若干数量级，决定了整个系统的刚性。
+  coupled: 与生化过程一起积分（原始形式）
+  qssa:    络合视为代数平衡（准稳态），每次右端函数求值时按总量闭式求解形态分布
+  split:   算子分裂 - 积分器只积分慢过程，每个接受步后对络合做精确的Riccati子步
+
+络合只在 Fe²⁺、EDTA、FeEDTA 之间转移，Fe 总量 F = Fe²⁺ + FeEDTA 与 EDTA 总量
+E = EDTA + FeEDTA 不变；设 c = FeEDTA, K = k_rev/k_f，则
+    dc/dt = k_f (c - c₋)(c - c₊)，c₋ ≤ c₊ 为 c² - (F+E+K)c + FE = 0 的两根，
+c₋ 即平衡值，且 (c - c₋)/(c - c₊) 按 exp(-k_f (c₊ - c₋) t) 衰减。
+"""
+
+import math
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+METAL_MODES = ('coupled', 'qssa', 'split')
+METAL_VARIABLES = ('S_Fe2', 'S_EDTA', 'S_FeEDTA')
+INITIAL_LAYER = 10.0  # 初始层长度（络合松弛时间的倍数），精度对比时跳过
+
+
+def equilibrium_complex(fe_total, edta_total, dissociation):
+    """
+    平衡络合物浓度 c₋ 及判别式平方根 c₊ - c₋
+
+    用 c₋ = 2FE / (b + √Δ) 计算较小根，避免 b - √Δ 的相消误差
+    """
+    fe_total = np.maximum(fe_total, 0.0)
+    edta_total = np.maximum(edta_total, 0.0)
+    b = fe_total + edta_total + dissociation
+    root = np.sqrt(np.maximum(b * b - 4.0 * fe_total * edta_total, 0.0))
+    denominator = b + root
+    complex_eq = np.divide(2.0 * fe_total * edta_total, denominator,
+                           out=np.zeros_like(np.asarray(denominator, dtype=float)),
+                           where=denominator > 0)
+    return complex_eq, root
+
+
+class CoupledMetals:
+    """原始耦合形式（不做任何处理）"""
+
+    name = 'coupled'
+    needs_stepping = False  # 是否需要手动步进（逐步子步）
+
+    def prepare(self, y0: np.ndarray) -> np.ndarray:
+        return np.asarray(y0, dtype=float)
+
+    def wrap_rhs(self, fun):
+        return fun
+
+    def wrap_jac(self, jac):
+        return jac
+
+    def substep(self, y: np.ndarray, dt: float) -> np.ndarray:
+        return y
+
+    def finalize(self, states: np.ndarray) -> np.ndarray:
+        return states
+
+    def relaxation_time(self, y: np.ndarray) -> float:
+        """络合趋向平衡的特征时间 1/(k_f·√Δ)（天）"""
+        return 0.0
+
+
+class _MetalScheme(CoupledMetals):
+    """qssa/split 共用：变量索引与络合速率"""
+
+    def __init__(self, model):
+        index = model.variable_index
+        missing = [var for var in METAL_VARIABLES if var not in index]
+        if missing:
+            raise ValueError(f"模型缺少金属变量: {missing}")
+        self.i_fe, self.i_edta, self.i_complex = (index[var] for var in METAL_VARIABLES)
+        self.k_forward = model.parameters.k_edta_fe
+        self.k_reverse = model.parameters.k_edta_fe_rev
+        self.dissociation = self.k_reverse / self.k_forward
+
+    def _totals(self, y):
+        complex_ = y[self.i_complex]
+        return y[self.i_fe] + complex_, y[self.i_edta] + complex_
+
+    def _set_complex(self, y, fe_total, edta_total, complex_):
+        y[self.i_complex] = complex_
+        y[self.i_fe] = fe_total - complex_
+        y[self.i_edta] = edta_total - complex_
+
+    def remove_complexation(self, y, rates):
+        """从总速率中扣除络合项，只保留慢过程"""
+        r = (self.k_forward * y[self.i_fe] * y[self.i_edta] -
+             self.k_reverse * y[self.i_complex])
+        rates[self.i_fe] += r
+        rates[self.i_edta] += r
+        rates[self.i_complex] -= r
+        return rates
+
+    def remove_complexation_jac(self, y, J):
+        """从雅可比中扣除络合项"""
+        rows = (self.i_fe, self.i_edta, self.i_complex)
+        gradient = {self.i_fe: self.k_forward * y[self.i_edta],
+                    self.i_edta: self.k_forward * y[self.i_fe],
+                    self.i_complex: -self.k_reverse}
+        for row, coef in zip(rows, (-1.0, -1.0, 1.0)):
+            for col, value in gradient.items():
+                J[row, col] -= coef * value
+        return J
+
+    def equilibrate(self, y: np.ndarray) -> np.ndarray:
+        """按当前总量把形态分布投影到络合平衡（支持 (n,) 与 (n, m)）"""
+        y = np.array(y, dtype=float)
+        fe_total, edta_total = self._totals(y)
+        if y.ndim == 1:
+            complex_eq, _ = self._equilibrium_scalar(fe_total, edta_total)
+        else:
+            complex_eq, _ = equilibrium_complex(fe_total, edta_total, self.dissociation)
+        self._set_complex(y, fe_total, edta_total, complex_eq)
+        return y
+
+    def relaxation_time(self, y):
+        _, root = self._equilibrium_scalar(*self._totals(np.asarray(y, dtype=float)))
+        return 1.0 / (self.k_forward * root) if root > 0 else 0.0
+
+    def _equilibrium_scalar(self, fe_total: float, edta_total: float):
+        """equilibrium_complex 的标量版本（右端函数每次调用都要求解，避免小数组开销）"""
+        fe_total = max(float(fe_total), 0.0)
+        edta_total = max(float(edta_total), 0.0)
+        b = fe_total + edta_total + self.dissociation
+        root = math.sqrt(max(b * b - 4.0 * fe_total * edta_total, 0.0))
+        return 2.0 * fe_total * edta_total / (b + root), root
+
+
+class QSSAMetals(_MetalScheme):
+    """
+    准稳态形式：络合物始终处于平衡，c = c₋(F, E)
+
+    慢过程改变总量 F、E，形态变化率由链式法则给出
+        dc/dt = (E - c)/√Δ · dF/dt + (F - c)/√Δ · dE/dt
+    系统中不再含有 k_f 量级的特征值
+    """
+
+    name = 'qssa'
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._rhs = None  # wrap_rhs 生成的准稳态右端函数，雅可比差分使用
+
+    def prepare(self, y0):
+        return self.equilibrate(y0)
+
+    def wrap_rhs(self, fun):
+        def qssa_rhs(t, y):
+            y_eq = self.equilibrate(y)
+            rates = self.remove_complexation(y_eq, fun(t, y_eq))
+            return self._project_rates(y_eq, rates)
+        self._rhs = qssa_rhs
+        return qssa_rhs
+
+    def _project_rates(self, y_eq, rates):
+        fe_total, edta_total = self._totals(y_eq)
+        complex_, root = self._equilibrium_scalar(fe_total, edta_total)
+        d_fe_total = rates[self.i_fe] + rates[self.i_complex]
+        d_edta_total = rates[self.i_edta] + rates[self.i_complex]
+        if root > 0:
+            d_complex = ((edta_total - complex_) * d_fe_total +
+                         (fe_total - complex_) * d_edta_total) / root
+        else:
+            d_complex = 0.0
+        rates[self.i_complex] = d_complex
+        rates[self.i_fe] = d_fe_total - d_complex
+        rates[self.i_edta] = d_edta_total - d_complex
+        return rates
+
+    def wrap_jac(self, jac):
+        if jac is None:
+            return None
+        if self._rhs is None:
+            raise RuntimeError("须先调用 wrap_rhs 再包装雅可比")
+        columns = (self.i_fe, self.i_edta, self.i_complex)
+
+        def qssa_jac(t, y):
+            # 生化过程不依赖金属变量：解析雅可比给出其余各列，金属三列按准稳态右端函数差分
+            J = jac(t, self.equilibrate(y))
+            base = self._rhs(t, y)
+            for col in columns:
+                step = np.sqrt(np.finfo(float).eps) * max(abs(y[col]), 1e-6)
+                y_pert = np.array(y, dtype=float)
+                y_pert[col] += step
+                J[:, col] = (self._rhs(t, y_pert) - base) / step
+            return J
+        return qssa_jac
+
+    def finalize(self, states):
+        return self.equilibrate(states)
+
+
+class SplitMetals(_MetalScheme):
+    """
+    算子分裂形式：积分器只积分慢过程（生化 + 沉淀），
+    每个接受步之后对络合做步长为 h 的精确子步（Lie分裂，一阶）
+    """
+
+    name = 'split'
+    needs_stepping = True
+
+    def wrap_rhs(self, fun):
+        def slow_rhs(t, y):
+            return self.remove_complexation(y, fun(t, y))
+        return slow_rhs
+
+    def wrap_jac(self, jac):
+        if jac is None:
+            return None
+
+        def slow_jac(t, y):
+            return self.remove_complexation_jac(y, jac(t, y))
+        return slow_jac
+
+    def substep(self, y: np.ndarray, dt: float) -> np.ndarray:
+        """络合子过程在 [t, t+dt] 上的精确解（F、E 不变）"""
+        y = np.array(y, dtype=float)
+        fe_total, edta_total = self._totals(y)
+        complex_eq, root = self._equilibrium_scalar(fe_total, edta_total)
+        complex_0 = y[self.i_complex]
+        complex_plus = complex_eq + root
+
+        gap = complex_0 - complex_plus
+        if root <= 0 or gap == 0:
+            complex_ = complex_eq
+        else:
+            ratio = (complex_0 - complex_eq) / gap * np.exp(-self.k_forward * root * dt)
+            complex_ = (complex_eq - ratio * complex_plus) / (1.0 - ratio)
+        self._set_complex(y, fe_total, edta_total, complex_)
+        return y
+
+
+def create_metal_scheme(mode: Optional[str], model):
+    """根据 solver_params['metal_mode'] 创建金属过程处理方式"""
+    if mode in (None, 'coupled'):
+        return CoupledMetals()
+    if mode == 'qssa':
+        return QSSAMetals(model)
+    if mode == 'split':
+        return SplitMetals(model)
+    raise ValueError(f"未知金属处理方式: {mode}，可用: {list(METAL_MODES)}")
+
+
+def compare_to_coupled(results: Dict, reference: Dict,
+                       variable_names: Optional[Sequence[str]] = None,
+                       t_skip: Optional[float] = None, floor: float = 1e-6) -> Dict:
+    """
+    与耦合求解结果的精度对比
+
+    终点误差直接比较；全程误差把参考解线性插值到 results 的时间点上
+    （插值误差与参考解步长有关，作为上界参考）。相对误差 = |Δ| / (|y_ref| + floor)
+    t_skip 之前（络合初始层）不参与全程比较：qssa 把初始条件直接投影到平衡，
+    耦合解在若干个松弛时间内完成同一过渡
+    两者的步数都按全程输出点数 - 1 统计（未指定 t_eval 时即接受步数），不受 t_skip 影响
+    """
+    t_ref, y_ref = reference['time'], reference['states']
+    times, states = results['time'], results['states']
+    steps = len(times) - 1
+    keep = times > (t_skip if t_skip is not None else times[0])
+    keep[-1] = True
+    times, states = times[keep], states[:, keep]
+    y_ref_on_grid = np.vstack([np.interp(times, t_ref, row) for row in y_ref])
+
+    final_error = np.abs(states[:, -1] - y_ref[:, -1]) / (np.abs(y_ref[:, -1]) + floor)
+    grid_error = np.max(np.abs(states - y_ref_on_grid) / (np.abs(y_ref_on_grid) + floor),
+                        axis=1)
+
+    names = list(variable_names) if variable_names else [f"y{i}" for i in range(len(states))]
+    worst = int(np.argmax(grid_error))
+    return {
+        'final_relative_error': float(final_error.max()),
+        'max_relative_error': float(grid_error.max()),
+        'worst_variable': names[worst],
+        't_skip': float(t_skip) if t_skip is not None else None,
+        'per_variable': {name: float(err) for name, err in zip(names, grid_error)},
+        'steps': int(steps),
+        'coupled_steps': int(len(t_ref) - 1),
+        'nfev': int(results.get('nfev', 0)),
+        'coupled_nfev': int(reference.get('nfev', 0)),
+    }
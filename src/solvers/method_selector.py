@@ -0,0 +1,127 @@
+# src/solvers/method_selector.py
+"""
+积分方法自动选择 - 对每组参数/初始条件做短时试算，选出最快且精度合格的后端并缓存
+缓存键由模型参数哈希、初始条件和影响选择的求解设置组成（同一预设得到同一键）
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from solvers.integrators import AUTO_CANDIDATES
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / 'results' / 'solver_choice.json'
+DEFAULT_PROBE_DAYS = 5.0
+DEFAULT_ACCURACY = 1e-3  # 试算终点相对参考解的最大允许误差
+
+# 影响试算结果或方法兼容性的求解设置（LSODA 不支持 split 金属模式与保正投影，
+# 内核、定步长与阶数改变各候选的耗时与精度）；缓存路径、预设标签等不参与
+SELECTION_SETTINGS = ('rtol', 'atol', 'max_step', 'first_step', 'scaling', 'positivity',
+                      'jacobian', 'metal_mode', 'kernel', 'fixed_step', 'rosenbrock_order')
+
+
+def selection_key(model, y0: np.ndarray, solver_params: Dict) -> str:
+    """缓存键：参数哈希 + 初始条件 + 容差/求解形式（SELECTION_SETTINGS）"""
+    from storage.result_store import parameters_hash
+
+    digest = hashlib.sha256()
+    digest.update(np.asarray(y0, dtype=float).tobytes())
+    settings = {k: solver_params.get(k) for k in SELECTION_SETTINGS}
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    return f"{parameters_hash(model.parameters)}-{digest.hexdigest()[:12]}"
+
+
+class MethodSelector:
+    """积分方法选择器"""
+
+    def __init__(self, cache_path=None, candidates: Sequence[str] = AUTO_CANDIDATES,
+                 probe_days: float = DEFAULT_PROBE_DAYS, accuracy: float = DEFAULT_ACCURACY):
+        self.cache_path = Path(cache_path) if cache_path is not None else DEFAULT_CACHE_PATH
+        self.candidates = tuple(candidates)
+        self.probe_days = probe_days
+        self.accuracy = accuracy
+
+    def _load_cache(self) -> Dict:
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: Dict):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+
+    def cached_choice(self, key: str) -> Optional[Dict]:
+        """读取缓存的选择结果"""
+        return self._load_cache().get(key)
+
+    def select(self, solver_params: Dict, model, y0: np.ndarray,
+               t_span: Tuple[float, float], label: Optional[str] = None) -> str:
+        """返回选中的方法名（优先读取缓存）"""
+        key = selection_key(model, y0, solver_params)
+        cached = self.cached_choice(key)
+        if cached and cached.get('method') in self.candidates:
+            return cached['method']
+
+        entry = self.probe(solver_params, model, y0, t_span)
+        if label:
+            entry['label'] = label
+        cache = self._load_cache()
+        cache[key] = entry
+        self._save_cache(cache)
+        return entry['method']
+
+    def probe(self, solver_params: Dict, model, y0: np.ndarray,
+              t_span: Tuple[float, float]) -> Dict:
+        """
+        短时试算全部候选方法
+
+        以严格容差的BDF解为参考，终点误差超过 accuracy 的方法不参与选择
+        """
+        from solvers.ode_solver import ADM1Solver
+
+        probe_span = (t_span[0], min(t_span[1], t_span[0] + self.probe_days))
+        reference_params = dict(solver_params, method='BDF',
+                                rtol=min(solver_params['rtol'], 1e-9))
+        if not isinstance(reference_params.get('atol'), str):
+            reference_params['atol'] = np.minimum(reference_params['atol'], 1e-11)
+        reference = ADM1Solver(reference_params).solve(model, probe_span, y0)
+        if not reference['success']:
+            raise RuntimeError(f"参考解求解失败: {reference['message']}")
+        y_ref = reference['states'][:, -1]
+
+        trials = {}
+        for method in self.candidates:
+            params = dict(solver_params, method=method)
+            start = time.perf_counter()
+            results = ADM1Solver(params).solve(model, probe_span, y0)
+            elapsed = time.perf_counter() - start
+
+            trial = {'success': bool(results['success']), 'time': elapsed}
+            if results['success']:
+                error = np.abs(results['states'][:, -1] - y_ref) / (np.abs(y_ref) + 1e-6)
+                trial['error'] = float(error.max())
+                trial['nfev'] = int(results['nfev'])
+            trials[method] = trial
+
+        acceptable = {m: t for m, t in trials.items()
+                      if t['success'] and t['error'] <= self.accuracy}
+        if not acceptable:
+            raise RuntimeError("没有候选方法通过试算精度检查")
+        method = min(acceptable, key=lambda m: acceptable[m]['time'])
+
+        return {
+            'method': method,
+            'probe_span': list(probe_span),
+            'trials': trials,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
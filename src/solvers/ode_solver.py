@@ -5,29 +5,101 @@ ADM1微分方程求解器 - 修复导入问题版本
 
 import sys
 import os
+import time
 from pathlib import Path
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import solve_ivp, BDF, LSODA
 from typing import Dict, Tuple, Optional
 
 # 修复导入路径问题：添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent  # 获取项目根目录
 sys.path.insert(0, str(project_root))  # 添加到Python路径
 
+from solvers.integrators import INTEGRATOR_BACKENDS, get_integrator, integrator_options
+from solvers.metal_splitting import (INITIAL_LAYER, CoupledMetals, compare_to_coupled,
+                                     create_metal_scheme)
+
+# 可手动步进的积分器（流式模式使用），与后端注册表为同一对象
+STEPPING_METHODS = INTEGRATOR_BACKENDS
+
+def replace_integrator_state(integrator, y: np.ndarray, shift_differences: bool = True) -> bool:
+    """
+    替换积分器当前状态，并同步更新内部历史，使下一步从新状态出发
+
+    BDF: shift_differences=True 时后向差分 D[0..order] 同时平移（投影类的小修正，
+    只改 D[0] 会破坏误差估计，拒绝步反而增多）；False 时只改 D[0]，
+    保留差分表示的慢过程轨迹（算子分裂的子步）。
+    Radau/RK 类方法缓存了当前右端函数值。LSODA 状态保存在Fortran工作数组中，无法替换。
+
+    Returns:
+        是否替换成功
+    """
+    if isinstance(integrator, LSODA):
+        return False
+    delta = y - integrator.y
+    integrator.y = y
+    if isinstance(integrator, BDF):
+        integrator.D[:integrator.order + 1 if shift_differences else 1] += delta
+    elif hasattr(integrator, 'f'):
+        integrator.f = integrator.fun(integrator.t, y)
+    return True
+
+
+def project_nonnegative(integrator, lower: np.ndarray) -> float:
+    """
+    把低于下界的状态投影回下界（变换空间中对应 y >= 0）
+
+    BDF：被投影分量的差分历史清零，预测器不会把它们重新外推到下界以下。
+    投影修改了积分器的历史，不会减少拒绝步：按30天基准，food_waste 拒绝步
+    35→32，sewage_sludge 42→53，函数调用次数相差几个百分点。保正模式换来的是
+    输出严格非负，而不是更少的步数。
+
+    Returns:
+        最大负偏差（0表示未投影，LSODA不投影）
+    """
+    deficit = lower - integrator.y
+    below = deficit > 0
+    if not below.any():
+        return 0.0
+    if isinstance(integrator, LSODA):
+        return 0.0
+    if isinstance(integrator, BDF):
+        integrator.D[0][below] = lower[below]
+        integrator.D[1:integrator.order + 1][:, below] = 0.0
+        integrator.y = integrator.D[0].copy()
+    elif not replace_integrator_state(integrator, np.where(below, lower, integrator.y)):
+        return 0.0
+    return float(np.max(deficit))
+
+
 class ADM1Solver:
     """ADM1微分方程求解器"""
 
-    def __init__(self, solver_params: Dict = None):
+    def __init__(self, solver_params: Dict = None, instrument: bool = False):
         # 默认求解参数（针对刚性系统优化）
         self.solver_params = solver_params or {
             'method': 'BDF',       # 刚性系统首选方法
             'rtol': 1e-6,          # 相对容差
-            'atol': 1e-8,          # 绝对容差
+            'atol': 1e-8,          # 绝对容差（标量、逐变量向量或 'auto'）
             'max_step': 0.1,       # 最大步长
             'first_step': 0.01     # 初始步长
         }
-
-    def solve(self, model, t_span: Tuple[float, float], y0: np.ndarray = None) -> Dict:
+        # method: 'BDF' | 'Radau' | 'LSODA' | 'RK45' | 'Rosenbrock'（定步长） | 'auto'（试算选择）
+        # 可选: 'scaling': None | 'scale' | 'log'（状态变换形式）
+        #       'positivity': True（截断速率计算 + 每步把负值投影回零，Rosenbrock默认启用，
+        #                     LSODA不支持；保证输出非负，但不减少拒绝步，某些预设反而略多）
+        #       'jacobian': 'analytic'（使用 model.jacobian，Rosenbrock默认使用）
+        #       'fixed_step' / 'rosenbrock_order': Rosenbrock 步长与阶数（1或2）
+        #       'metal_mode': 'coupled' | 'qssa'（络合准稳态） | 'split'（络合精确子步）
+        #       'metal_compare': True（附加与耦合求解的精度对比 'metal_accuracy'）
+        #       'kernel': 'numpy'（默认） | 'numba'（JIT编译内核，未安装时回退） | 'auto'
+        #       'mass_balance': 'warn'（默认） | 'raise' | 'off'（COD/N/电荷平衡运行时检查）
+        #       'mass_balance_stride' / 'mass_balance_tol': 检查间隔（右端函数调用次数）与相对容差
+        # 插桩模式：手动步进并记录步长、拒绝步和各阶段耗时
+        self.instrument = instrument
+
+    def solve(self, model, t_span: Tuple[float, float], y0: np.ndarray = None,
+              instrument: Optional[bool] = None) -> Dict:
         """
         求解ADM1微分方程系统
 
@@ -35,49 +107,413 @@ class ADM1Solver:
             model: ADM1模型实例
             t_span: 时间范围 (开始, 结束)
             y0: 初始条件向量
+            instrument: 是否记录求解器统计（默认使用构造时的设置）
 
         Returns:
-            包含求解结果的字典
+            包含求解结果的字典，插桩模式下附加 'instrumentation'，
+            metal_compare 时附加 'metal_accuracy'
         """
         if y0 is None:
             y0 = model.initial_conditions
 
+        start = time.perf_counter()
+        results = self._solve(model, t_span, y0, instrument)
+        elapsed = time.perf_counter() - start
+
+        if (results['success'] and self.solver_params.get('metal_compare')
+                and results.get('metal_mode', 'coupled') != 'coupled'):
+            reference_params = dict(self.solver_params, metal_mode='coupled',
+                                    metal_compare=False)
+            start = time.perf_counter()
+            reference = ADM1Solver(reference_params).solve(model, t_span, y0)
+            reference_elapsed = time.perf_counter() - start
+            if reference['success']:
+                metals = create_metal_scheme(results['metal_mode'], model)
+                t_skip = t_span[0] + INITIAL_LAYER * metals.relaxation_time(y0)
+                accuracy = compare_to_coupled(results, reference,
+                                              getattr(model, 'state_variables', None), t_skip)
+                accuracy['time'] = elapsed
+                accuracy['coupled_time'] = reference_elapsed
+                results['metal_accuracy'] = accuracy
+        return results
+
+    def _solve(self, model, t_span: Tuple[float, float], y0: np.ndarray,
+               instrument: Optional[bool] = None) -> Dict:
+        """solve 的实际求解过程"""
+        try:
+            method = self._resolve_method(model, y0, t_span)
+            positivity = self._positivity(method)
+            metals = self._metal_scheme(model, method)
+            y0 = metals.prepare(y0)
+            kernels = self._kernels(model)
+            monitor = self._mass_balance(model)
+            rates = metals.wrap_rhs(monitor.wrap_rhs(kernels.rates) if monitor else kernels.rates)
+            transform, atol = self._prepare_formulation(model, y0)
+            jac = self._jacobian(model, transform, method, positivity, metals, kernels)
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"求解失败: {str(e)}",
+                'time': np.array([]),
+                'states': np.array([]),
+                'model': model
+            }
+
         def ode_system(t: float, y: np.ndarray) -> np.ndarray:
             """定义ODE系统右手边函数"""
+            if positivity:
+                # 保正模式：在截断到非负的状态上计算速率，负浓度不再继续消耗
+                y = np.maximum(y, 0.0)
             # 计算总变化率 = 生化反应 + 物理化学过程
-            return model.biochemical_reactions(t, y)
+            return rates(t, y)
 
-        # 使用SciPy求解器
+        fun = transform.wrap_rhs(ode_system)
+        z0 = transform.forward(y0)
+
+        instrument = instrument if instrument is not None else self.instrument
+        if instrument or positivity or metals.needs_stepping:
+            results = self._solve_stepping(model, fun, t_span, z0, atol, transform,
+                                           instrument, positivity, method, jac, metals)
+            if monitor:
+                results['mass_balance'] = monitor.summary()
+            return results
+
+        # 使用SciPy求解器（后端均为 OdeSolver 子类）
         try:
+            options = integrator_options(method, self.solver_params, atol,
+                                         transform.uses_first_step, jac)
             solution = solve_ivp(
-                fun=ode_system,
+                fun=fun,
                 t_span=t_span,
-                y0=y0,
-                method=self.solver_params['method'],
-                rtol=self.solver_params['rtol'],
-                atol=self.solver_params['atol'],
-                max_step=self.solver_params['max_step'],
-                first_step=self.solver_params.get('first_step', None),
-                dense_output=True
+                y0=z0,
+                method=get_integrator(method),
+                dense_output=True,
+                **options
             )
 
-            return {
+            results = {
                 'time': solution.t,
-                'states': solution.y,
+                'states': metals.finalize(transform.inverse(solution.y)),
                 'success': solution.success,
                 'message': solution.message,
                 'nfev': solution.nfev,  # 函数调用次数
                 'njev': solution.njev,   # 雅可比调用次数
+                'method': method,
+                'metal_mode': metals.name,
+                'model': model
+            }
+            if monitor:
+                results['mass_balance'] = monitor.summary()
+            return results
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"求解失败: {str(e)}",
+                'time': np.array([]),
+                'states': np.array([]),
+                'model': model
+            }
+
+    def _prepare_formulation(self, model, y0: np.ndarray):
+        """
+        解析容差和状态变换
+
+        Returns:
+            (状态变换, 变换空间中的atol)
+        """
+        from solvers.tolerances import auto_atol, create_transform
+
+        atol = self.solver_params.get('atol', 1e-8)
+        if isinstance(atol, str):
+            if atol != 'auto':
+                raise ValueError(f"未知容差设置: {atol}")
+            atol = auto_atol(model, reference_states=[y0])
+
+        scaling = self.solver_params.get('scaling')
+        transform = create_transform(scaling, model, atol, reference_states=[y0])
+        return transform, transform.transform_atol(atol, y0)
+
+    def _resolve_method(self, model, y0: np.ndarray, t_span: Tuple[float, float]) -> str:
+        """解析积分方法，'auto' 时由 MethodSelector 试算选择（结果缓存）"""
+        method = self.solver_params['method']
+        if method != 'auto':
+            get_integrator(method)
+            return method
+
+        from solvers.method_selector import MethodSelector
+        selector = MethodSelector(self.solver_params.get('auto_cache'))
+        return selector.select(self.solver_params, model, y0, t_span,
+                               label=self.solver_params.get('preset'))
+
+    def _positivity(self, method: str) -> bool:
+        """是否启用保正模式（定步长Rosenbrock无误差控制，默认启用）"""
+        positivity = self.solver_params.get('positivity', method == 'Rosenbrock')
+        if positivity and method == 'LSODA':
+            raise ValueError("保正投影需要在每步后替换积分器状态，LSODA不支持")
+        return positivity
+
+    def _metal_scheme(self, model, method: str):
+        """金属络合的处理方式（solver_params['metal_mode']）"""
+        metals = create_metal_scheme(self.solver_params.get('metal_mode'), model)
+        if metals.needs_stepping and method == 'LSODA':
+            raise ValueError("split模式需要在每步后替换积分器状态，LSODA不支持")
+        return metals
+
+    def _mass_balance(self, model):
+        """质量平衡运行时检查（solver_params['mass_balance']），模型不提供过程速率时不检查"""
+        mode = self.solver_params.get('mass_balance', 'warn')
+        if mode in (None, False, 'off') or not hasattr(model, 'process_rates'):
+            return None
+        from analysis.mass_balance import (DEFAULT_STRIDE, DEFAULT_TOLERANCE,
+                                           MassBalanceMonitor)
+        return MassBalanceMonitor(model, self.solver_params.get('mass_balance_stride',
+                                                                DEFAULT_STRIDE),
+                                  self.solver_params.get('mass_balance_tol', DEFAULT_TOLERANCE),
+                                  mode)
+
+    def _kernels(self, model):
+        """右端函数/雅可比的计算后端（solver_params['kernel']）"""
+        from core.kernels import ModelKernels
+        return ModelKernels(model, self.solver_params.get('kernel', 'numpy'))
+
+    def _jacobian(self, model, transform, method: str, positivity: bool = False,
+                  metals=None, kernels=None):
+        """解析雅可比（变换空间），不使用或不可用时返回None（积分器用差分近似）
+
+        metals 须已调用过 wrap_rhs
+        """
+        mode = self.solver_params.get('jacobian', 'analytic' if method == 'Rosenbrock' else None)
+        if mode != 'analytic' or not hasattr(model, 'jacobian'):
+            return None
+        evaluate = kernels.jacobian if kernels is not None else model.jacobian
+
+        def jacobian(t, y):
+            if positivity:
+                y = np.maximum(y, 0.0)
+            return evaluate(t, y)
+        if metals is not None:
+            jacobian = metals.wrap_jac(jacobian)
+        return transform.wrap_jac(jacobian)
+
+    def _solve_stepping(self, model, fun, t_span: Tuple[float, float], z0: np.ndarray,
+                        atol, transform, instrument: bool = False,
+                        positivity: bool = False, method: Optional[str] = None,
+                        jac=None, metals=None) -> Dict:
+        """
+        手动步进求解 - 输出与 solve_ivp 相同的接受步序列
+
+        instrument: 记录求解器统计（'instrumentation'）
+        positivity: 每个接受步后把负状态投影回零（'projections' 记录投影次数）
+        metals: 金属处理方式，split 模式在每个接受步后做络合子步
+        """
+        metals = metals or CoupledMetals()
+        instrumentation = None
+        if instrument:
+            from solvers.instrumentation import SolverInstrumentation
+            instrumentation = SolverInstrumentation(getattr(model, 'state_variables', None))
+            fun = instrumentation.wrap_rhs(fun)
+
+        try:
+            integrator = self._create_integrator(fun, t_span, z0, atol,
+                                                 transform.uses_first_step, jac, method)
+            if instrumentation:
+                instrumentation.attach(integrator, self.solver_params.get('rtol', 1e-6), atol)
+            lower = transform.forward(np.zeros(len(z0))) if positivity else None
+
+            times = [t_span[0]]
+            states = [integrator.y.copy()]
+            projections = 0
+            message = None
+            while integrator.status == 'running':
+                if instrumentation:
+                    instrumentation.before_step(integrator)
+                message = integrator.step()
+                if integrator.status == 'failed':
+                    break
+                if positivity:
+                    violation = project_nonnegative(integrator, lower)
+                    if violation > 0:
+                        projections += 1
+                        if instrumentation:
+                            instrumentation.record_projection(violation)
+                if metals.needs_stepping:
+                    self._metal_substep(integrator, transform, metals)
+                if instrumentation:
+                    instrumentation.after_step(integrator)
+                times.append(integrator.t)
+                states.append(integrator.y.copy())
+            if instrumentation:
+                instrumentation.finish()
+
+            success = integrator.status == 'finished'
+            results = {
+                'time': np.array(times),
+                'states': metals.finalize(transform.inverse(np.array(states).T)),
+                'success': success,
+                'message': ("The solver successfully reached the end of the integration interval."
+                            if success else f"求解失败: {message}"),
+                'nfev': integrator.nfev,
+                'njev': integrator.njev,
+                'method': method or self.solver_params['method'],
+                'metal_mode': metals.name,
                 'model': model
             }
+            if instrumentation:
+                results['instrumentation'] = instrumentation.summary()
+            if positivity:
+                results['projections'] = projections
+            return results
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"求解失败: {str(e)}",
+                'time': np.array([]),
+                'states': np.array([]),
+                'model': model
+            }
+
+    @staticmethod
+    def _metal_substep(integrator, transform, metals):
+        """对刚接受的步做络合精确子步（原变量空间），并替换积分器状态"""
+        y = metals.substep(transform.inverse(integrator.y), integrator.t - integrator.t_old)
+        replace_integrator_state(integrator, transform.forward(y), shift_differences=False)
+
+    def _create_integrator(self, fun, t_span: Tuple[float, float], y0: np.ndarray, atol=None,
+                           use_first_step: bool = True, jac=None, method: Optional[str] = None):
+        """创建可手动步进的积分器实例（atol为已解析的容差，默认取 solver_params）"""
+        method = method or self.solver_params['method']
+        if atol is None:
+            atol = self.solver_params['atol']
+        options = integrator_options(method, self.solver_params, atol, use_first_step, jac)
+        return get_integrator(method)(fun, t_span[0], np.asarray(y0, dtype=float),
+                                      t_span[1], **options)
+
+    def solve_streaming(self, model, t_span: Tuple[float, float], output_path,
+                        y0: np.ndarray = None, output_interval: Optional[float] = None,
+                        flush_every: int = 1) -> Dict:
+        """
+        流式求解 - 手动步进积分器，边算边写入追加式二进制文件
+
+        内存中只保留积分器当前状态，完整轨迹由 storage.stream_writer.StreamReader
+        读取（GUI或tail工具可在求解过程中实时跟随）。
+
+        Args:
+            model: ADM1模型实例
+            t_span: 时间范围 (开始, 结束)
+            output_path: 输出文件路径
+            y0: 初始条件向量
+            output_interval: 输出网格间隔（天，最后一点为结束时刻），None表示写入每个接受步
+            flush_every: 每写入多少条记录刷新一次文件
+
+        Returns:
+            求解结果字典，time/states 只包含最终时刻
+        """
+        from storage.stream_writer import StreamWriter
+
+        if y0 is None:
+            y0 = model.initial_conditions
+
+        def ode_system(t: float, y: np.ndarray) -> np.ndarray:
+            """定义ODE系统右手边函数"""
+            if positivity:
+                y = np.maximum(y, 0.0)
+            return rates(t, y)
+
+        variables = getattr(model, 'state_variables', None) or \
+            [f"y{i}" for i in range(len(y0))]
+        metadata = {
+            'method': self.solver_params['method'],
+            't_span': list(t_span),
+            'output_interval': output_interval
+        }
+
+        writer = StreamWriter(output_path, variables, metadata=metadata,
+                              flush_every=flush_every)
+        integrator = None
+        try:
+            method = self._resolve_method(model, y0, t_span)
+            positivity = self._positivity(method)
+            metals = self._metal_scheme(model, method)
+            y0 = metals.prepare(y0)
+            kernels = self._kernels(model)
+            monitor = self._mass_balance(model)
+            rates = metals.wrap_rhs(monitor.wrap_rhs(kernels.rates) if monitor else kernels.rates)
+            transform, atol = self._prepare_formulation(model, y0)
+            integrator = self._create_integrator(transform.wrap_rhs(ode_system), t_span,
+                                                 transform.forward(y0), atol,
+                                                 transform.uses_first_step,
+                                                 self._jacobian(model, transform, method,
+                                                                positivity, metals, kernels),
+                                                 method)
+
+            def output(z):
+                return metals.finalize(transform.inverse(z))
+
+            writer.append(t_span[0], output(integrator.y))
+            lower = transform.forward(np.zeros(len(y0))) if positivity else None
+
+            next_output = None
+            n_output = 1
+            n_grid = 0
+            if output_interval is not None:
+                # 网格 t0 + k·interval，最后一点总是结束时刻（区间不整除时末段较短）
+                n_grid = int(np.ceil((t_span[1] - t_span[0]) / output_interval - 1e-9))
+                if n_grid >= 1:
+                    next_output = min(t_span[0] + output_interval, t_span[1])
+
+            while integrator.status == 'running':
+                message = integrator.step()
+                if integrator.status == 'failed':
+                    break
+                if positivity:
+                    project_nonnegative(integrator, lower)
+                if metals.needs_stepping:
+                    self._metal_substep(integrator, transform, metals)
+
+                if output_interval is None:
+                    writer.append(integrator.t, output(integrator.y))
+                    continue
+
+                # 在输出网格点上用稠密输出插值
+                dense = None
+                while next_output is not None and next_output <= integrator.t:
+                    if dense is None:
+                        dense = integrator.dense_output()
+                    writer.append(next_output, output(dense(next_output)))
+                    n_output += 1
+                    if n_output > n_grid:
+                        next_output = None
+                    else:
+                        next_output = min(t_span[0] + n_output * output_interval, t_span[1])
+
+            success = integrator.status == 'finished'
+            message = ("The solver successfully reached the end of the integration interval."
+                       if success else f"求解失败: {message}")
+
+            return {
+                'time': np.array([integrator.t]),
+                'states': output(integrator.y).reshape(-1, 1).copy(),
+                'success': success,
+                'message': message,
+                'nfev': integrator.nfev,
+                'njev': integrator.njev,
+                'stream_path': str(output_path),
+                'n_records': writer.n_records,
+                'model': model,
+                **({'mass_balance': monitor.summary()} if monitor else {})
+            }
         except Exception as e:
             return {
                 'success': False,
                 'message': f"求解失败: {str(e)}",
                 'time': np.array([]),
                 'states': np.array([]),
+                'stream_path': str(output_path),
+                'n_records': writer.n_records,
                 'model': model
             }
+        finally:
+            writer.close()
 
 def simple_test():
     """简化测试函数 - 避免复杂的导入依赖"""
@@ -0,0 +1,227 @@
+# src/solvers/tolerances.py
+"""
+逐变量绝对容差与状态缩放
+按状态单位和典型量级（模型/预设初始条件、半饱和常数）生成atol向量，
+并提供缩放和对数变换的求解形式
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+DEFAULT_RELATIVE_ATOL = 1e-4  # atol = 系数 × 典型量级
+MAX_LOG_STATE = np.log(1e12)  # 对数形式中状态的上限
+LOG_STATE_ATOL = 1e-6          # 对数分量的绝对容差（约等于相对误差）
+
+# 对数形式只用于跨越多个数量级、由Monod项主导的溶解性底物；
+# 金属络合为快速质量作用平衡，取对数后BDF误差估计失效，保持原变量
+LOG_VARIABLES = ('S_su', 'S_aa', 'S_fa', 'S_va', 'S_bu', 'S_pro', 'S_ac', 'S_h2')
+
+# 各单位的atol下限，避免典型量级极小或为零时容差过紧
+UNIT_ATOL_FLOORS = {
+    'gCOD/m³': 1e-12,
+    'molC/m³': 1e-10,
+    'molN/m³': 1e-10,
+    'eq/m³': 1e-10,
+    'mol/m³': 1e-12,
+}
+
+# 底物在半饱和常数附近最敏感，典型量级不超过对应的动力学常数
+HALF_SATURATION = {
+    'S_su': 'K_S_su',
+    'S_aa': 'K_S_aa',
+    'S_fa': 'K_S_fa',
+    'S_va': 'K_S_c4',
+    'S_bu': 'K_S_c4',
+    'S_pro': 'K_S_pro',
+    'S_ac': 'K_S_ac',
+    'S_h2': 'K_S_h2',
+    'S_IN': 'KI_nh3',
+}
+
+
+def preset_initial_states(model) -> list:
+    """全部预设的初始条件向量（参数管理器不可用时返回空列表）"""
+    try:
+        from parameters.parameter_manager import ADM1ParameterManager
+        manager = ADM1ParameterManager()
+        return [manager.create_initial_conditions(name, model)
+                for name in manager.list_available_presets()]
+    except Exception:
+        return []
+
+
+def typical_magnitudes(model, reference_states: Optional[Iterable[np.ndarray]] = None,
+                       include_presets: bool = True) -> np.ndarray:
+    """
+    各状态变量的典型量级
+
+    取模型默认初始条件、预设初始条件和给定参考状态中的最大绝对值；
+    底物再以半饱和常数为上限，全为零的变量取同单位变量的最小非零量级
+    """
+    states = [np.asarray(model.initial_conditions, dtype=float)]
+    if include_presets:
+        states += preset_initial_states(model)
+    if reference_states is not None:
+        states += [np.asarray(s, dtype=float) for s in reference_states]
+    typical = np.max(np.abs(np.vstack(states)), axis=0)
+
+    for var, param in HALF_SATURATION.items():
+        idx = model.variable_index.get(var)
+        value = getattr(model.parameters, param, None)
+        if idx is not None and value:
+            typical[idx] = min(typical[idx], value) if typical[idx] > 0 else value
+
+    units = state_units(model)
+    for idx in np.flatnonzero(typical == 0):
+        same_unit = [typical[j] for j, unit in enumerate(units)
+                     if unit == units[idx] and typical[j] > 0]
+        typical[idx] = min(same_unit) if same_unit else 1.0
+    return typical
+
+
+def state_units(model) -> list:
+    """按状态顺序的单位列表"""
+    units = getattr(model, 'state_units', None)
+    if units is None:
+        return ['gCOD/m³'] * len(model.state_variables)
+    return [units[var] for var in model.state_variables]
+
+
+def auto_atol(model, reference_states: Optional[Iterable[np.ndarray]] = None,
+              relative: float = DEFAULT_RELATIVE_ATOL,
+              floors: Dict[str, float] = None, include_presets: bool = True) -> np.ndarray:
+    """按单位和典型量级生成逐变量绝对容差向量"""
+    floors = floors or UNIT_ATOL_FLOORS
+    typical = typical_magnitudes(model, reference_states, include_presets)
+    floor = np.array([floors.get(unit, 1e-12) for unit in state_units(model)])
+    return np.maximum(relative * typical, floor)
+
+
+class IdentityTransform:
+    """原始变量形式"""
+
+    name = None
+    uses_first_step = True  # 是否沿用 solver_params['first_step']
+
+    def forward(self, y: np.ndarray) -> np.ndarray:
+        return np.asarray(y, dtype=float)
+
+    def inverse(self, z: np.ndarray) -> np.ndarray:
+        return z
+
+    def wrap_rhs(self, fun):
+        return fun
+
+    def transform_atol(self, atol, y0: np.ndarray):
+        return atol
+
+    def wrap_jac(self, jac):
+        """变换空间中的雅可比，None表示不支持"""
+        return jac
+
+
+class ScaleTransform(IdentityTransform):
+    """缩放形式 z = y / s，各分量量级接近1"""
+
+    name = 'scale'
+
+    def __init__(self, scales: np.ndarray):
+        self.scales = np.asarray(scales, dtype=float)
+
+    def _column(self, z):
+        return self.scales if np.ndim(z) == 1 else self.scales[:, None]
+
+    def forward(self, y):
+        return np.asarray(y, dtype=float) / self._column(y)
+
+    def inverse(self, z):
+        return z * self._column(z)
+
+    def wrap_rhs(self, fun):
+        scales = self.scales
+
+        def scaled_rhs(t, z):
+            return fun(t, z * scales) / scales
+        return scaled_rhs
+
+    def transform_atol(self, atol, y0):
+        return np.asarray(atol, dtype=float) / self.scales
+
+    def wrap_jac(self, jac):
+        scales = self.scales
+
+        def scaled_jac(t, z):
+            return jac(t, z * scales) * scales[None, :] / scales[:, None]
+        return scaled_jac
+
+
+class LogTransform(IdentityTransform):
+    """
+    对数形式 z = ln(y + ε)，ε取绝对容差
+
+    只对 mask 选中的分量取对数（其余保持原变量）；反变换 y = exp(z) - ε 始终大于 -ε，
+    z空间的误差近似为相对误差
+    """
+
+    name = 'log'
+    uses_first_step = False  # 初始瞬态在对数空间更剧烈，由积分器自行估计初始步长
+
+    def __init__(self, shifts: np.ndarray, mask: Optional[np.ndarray] = None):
+        self.shifts = np.asarray(shifts, dtype=float)
+        self.mask = (np.ones(len(self.shifts), dtype=bool) if mask is None
+                     else np.asarray(mask, dtype=bool))
+
+    def _column(self, values, z):
+        return values if np.ndim(z) == 1 else values[:, None]
+
+    def forward(self, y):
+        z = np.array(y, dtype=float)
+        m = self.mask
+        shifts = self._column(self.shifts[m], z)
+        z[m] = np.log(np.maximum(z[m] + shifts, shifts))
+        return z
+
+    def inverse(self, z):
+        y = np.array(z, dtype=float)
+        m = self.mask
+        y[m] = np.exp(np.minimum(y[m], MAX_LOG_STATE)) - self._column(self.shifts[m], z)
+        return y
+
+    def wrap_rhs(self, fun):
+        shifts = self.shifts[self.mask]
+        mask = self.mask
+
+        def log_rhs(t, z):
+            # 牛顿迭代的试探值可能远超物理范围，截断防止exp溢出
+            shifted = np.exp(np.minimum(z[mask], MAX_LOG_STATE))
+            y = z.copy()
+            y[mask] = shifted - shifts
+            rates = fun(t, y)
+            rates[mask] /= shifted
+            return rates
+        return log_rhs
+
+    def transform_atol(self, atol, y0):
+        # ln(y+ε) 的绝对误差 ≈ y的相对误差；ε附近 atol/ε ≈ 1 过松，取统一的小量
+        atol = np.array(np.broadcast_to(np.asarray(atol, dtype=float), self.shifts.shape))
+        atol[self.mask] = LOG_STATE_ATOL
+        return atol
+
+    def wrap_jac(self, jac):
+        # 对数空间的雅可比需要速率本身，交给积分器差分近似
+        return None
+
+
+def create_transform(kind: Optional[str], model, atol: np.ndarray,
+                     reference_states: Optional[Iterable[np.ndarray]] = None):
+    """根据 solver_params['scaling'] 创建状态变换"""
+    if kind in (None, 'none'):
+        return IdentityTransform()
+    if kind == 'scale':
+        return ScaleTransform(typical_magnitudes(model, reference_states))
+    if kind == 'log':
+        shifts = np.broadcast_to(np.asarray(atol, dtype=float), (len(model.state_variables),))
+        mask = np.isin(model.state_variables, LOG_VARIABLES)
+        return LogTransform(shifts.copy(), mask)
+    raise ValueError(f"未知状态缩放方式: {kind}")
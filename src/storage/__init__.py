@@ -0,0 +1,11 @@
+# src/storage/__init__.py
+"""
+结果存储模块
+"""
+
+from .result_store import ResultStore, StoredRun, parameters_hash
+from .stream_writer import StreamWriter, StreamReader
+from .ensemble_store import EnsembleWriter, EnsembleReader
+
+__all__ = ['ResultStore', 'StoredRun', 'parameters_hash', 'StreamWriter', 'StreamReader',
+           'EnsembleWriter', 'EnsembleReader']
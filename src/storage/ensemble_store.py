@@ -0,0 +1,177 @@
+# src/storage/ensemble_store.py
+"""
+集合结果存储 - (N, n_vars, n_t) 原始数组 + 内存映射读取
+数组以未压缩 .npy 保存，读取端用 numpy memmap 按需分页，按变量名返回视图而不复制数据
+"""
+
+import json
+import time as _time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024  # 统计计算时每个数据块的最大字节数
+
+
+class EnsembleWriter:
+    """集合结果写入器 - 按成员逐个写入内存映射数组"""
+
+    def __init__(self, path, n_members: int, variables: Sequence[str], time: np.ndarray,
+                 metadata: Optional[Dict] = None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.variables = list(variables)
+        self.time = np.asarray(time, dtype=float)
+        self.n_members = int(n_members)
+
+        np.save(self.path / 'time.npy', self.time)
+        self.states = np.lib.format.open_memmap(
+            self.path / 'states.npy', mode='w+', dtype='<f8',
+            shape=(self.n_members, len(self.variables), len(self.time)))
+
+        self.metadata = {
+            'format_version': FORMAT_VERSION,
+            'created': _time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'n_members': self.n_members,
+            'variables': self.variables,
+            'n_points': int(len(self.time)),
+            'metadata': metadata or {},
+        }
+        self._write_metadata()
+
+    def _write_metadata(self):
+        with open(self.path / 'metadata.json', 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+
+    def write_member(self, index: int, states: np.ndarray):
+        """写入单个成员的状态矩阵 [n_vars, n_t]"""
+        self.states[index] = states
+
+    def write_members(self, start: int, states: np.ndarray):
+        """批量写入连续成员 [k, n_vars, n_t]"""
+        self.states[start:start + len(states)] = states
+
+    def write_kpis(self, kpis: Dict[str, np.ndarray]):
+        """保存各成员的 KPI {指标: [N]}，排序时无需重新读取轨迹"""
+        np.savez(self.path / 'kpis.npz', **{name: np.asarray(values, dtype=float)
+                                           for name, values in kpis.items()})
+
+    def close(self):
+        """刷新并释放内存映射"""
+        if self.states is not None:
+            self.states.flush()
+            self.states = None
+        self._write_metadata()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class EnsembleReader:
+    """集合结果读取器 - 内存映射，按变量名返回零拷贝视图"""
+
+    def __init__(self, path, model=None):
+        self.path = Path(path)
+        with open(self.path / 'metadata.json', 'r', encoding='utf-8') as f:
+            self.metadata = json.load(f)
+
+        self.time = np.load(self.path / 'time.npy')
+        self.states = np.load(self.path / 'states.npy', mmap_mode='r')
+
+        # 优先使用模型的变量索引，保证与 ADM1Model 定义一致
+        if model is not None and hasattr(model, 'variable_index'):
+            self.variable_index = dict(model.variable_index)
+        else:
+            self.variable_index = {var: idx for idx, var in enumerate(self.metadata['variables'])}
+
+    @property
+    def n_members(self) -> int:
+        """集合成员数"""
+        return self.states.shape[0]
+
+    def _index(self, name: str) -> int:
+        idx = self.variable_index.get(name, -1)
+        if idx == -1 or idx >= self.states.shape[1]:
+            raise KeyError(f"未知状态变量: {name}")
+        return idx
+
+    def variable(self, name: str) -> np.ndarray:
+        """返回变量视图 [N, n_t]（memmap切片，不复制）"""
+        return self.states[:, self._index(name), :]
+
+    def member(self, index: int) -> np.ndarray:
+        """返回单个成员视图 [n_vars, n_t]"""
+        return self.states[index]
+
+    def _time_blocks(self, block_bytes: int):
+        """按时间切分数据块，使每块 N×块长 不超过给定字节数"""
+        n_t = self.states.shape[2]
+        block = max(1, int(block_bytes // (8 * max(1, self.n_members))))
+        for start in range(0, n_t, block):
+            yield start, min(start + block, n_t)
+
+    def percentile_band(self, name: str, q: Sequence[float] = (5, 50, 95),
+                        block_bytes: int = DEFAULT_BLOCK_BYTES) -> np.ndarray:
+        """
+        计算变量在成员维度上的分位数带
+
+        按时间分块读取，内存占用受 block_bytes 限制
+
+        Returns:
+            分位数数组 [len(q), n_t]
+        """
+        view = self.variable(name)
+        band = np.empty((len(q), view.shape[1]))
+        for start, stop in self._time_blocks(block_bytes):
+            band[:, start:stop] = np.percentile(view[:, start:stop], q, axis=0)
+        return band
+
+    def mean_std(self, name: str,
+                 block_bytes: int = DEFAULT_BLOCK_BYTES) -> Tuple[np.ndarray, np.ndarray]:
+        """计算变量在成员维度上的均值和标准差"""
+        view = self.variable(name)
+        mean = np.empty(view.shape[1])
+        std = np.empty(view.shape[1])
+        for start, stop in self._time_blocks(block_bytes):
+            block = view[:, start:stop]
+            mean[start:stop] = block.mean(axis=0)
+            std[start:stop] = block.std(axis=0)
+        return mean, std
+
+    def kpis(self, model=None, block_bytes: int = DEFAULT_BLOCK_BYTES) -> Dict[str, np.ndarray]:
+        """
+        各成员的 KPI {指标: [N]}
+
+        优先读取 kpis.npz；不存在且给出模型时按成员分块计算并写入 kpis.npz
+        """
+        path = self.path / 'kpis.npz'
+        if path.exists():
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        if model is None:
+            raise FileNotFoundError(f"未保存KPI且未提供模型: {path}")
+
+        from analysis.kpi import compute_kpis_batch
+
+        member_bytes = 8 * self.states.shape[1] * self.states.shape[2]
+        block = max(1, int(block_bytes // max(1, member_bytes)))
+        parts: Dict[str, list] = {}
+        for start in range(0, self.n_members, block):
+            batch = compute_kpis_batch(model, self.time, self.states[start:start + block])
+            for name, values in batch.items():
+                parts.setdefault(name, []).append(values)
+        kpis = {name: np.concatenate(values) for name, values in parts.items()}
+        np.savez(path, **kpis)
+        return kpis
+
+    def rank(self, kpi: str, descending: bool = True, top: Optional[int] = None,
+             model=None) -> np.ndarray:
+        """按某一 KPI 对成员排序，返回成员下标"""
+        from analysis.kpi import rank
+
+        return rank(self.kpis(model), kpi, descending, top)
@@ -0,0 +1,281 @@
+# src/storage/result_store.py
+"""
+列式结果存储 - 分块压缩数组 + 元数据
+每个时间块保存为一个压缩NPZ文件，每个状态变量为其中独立的一列，
+读取单个变量或时间窗口时只解压所需的块和列
+"""
+
+import hashlib
+import json
+import time as _time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def parameters_hash(parameters) -> str:
+    """计算参数集合的稳定哈希（dataclass或字典）"""
+    if parameters is None:
+        return ''
+    if is_dataclass(parameters):
+        parameters = asdict(parameters)
+    payload = json.dumps(parameters, sort_keys=True, default=float)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _json_safe(value):
+    """将求解器统计量转换为可JSON序列化的值"""
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class StoredRun:
+    """已存储的单次模拟 - 按需加载变量和时间窗口"""
+
+    def __init__(self, run_path: Path):
+        self.path = Path(run_path)
+        with open(self.path / 'metadata.json', 'r', encoding='utf-8') as f:
+            self.metadata = json.load(f)
+
+        self.variables: List[str] = self.metadata['variables']
+        self.variable_index = {var: idx for idx, var in enumerate(self.variables)}
+        self.chunks: List[Dict] = self.metadata['chunks']
+
+    @property
+    def kpis(self) -> Dict[str, float]:
+        """保存时计算的关键性能指标（不读取轨迹）"""
+        return self.metadata.get('kpis', {})
+
+    @property
+    def n_points(self) -> int:
+        """时间点总数"""
+        return self.metadata['n_points']
+
+    def _select_chunks(self, t_start: Optional[float], t_end: Optional[float]) -> List[Dict]:
+        """选出与时间窗口相交的块"""
+        selected = []
+        for chunk in self.chunks:
+            if t_start is not None and chunk['t_max'] < t_start:
+                continue
+            if t_end is not None and chunk['t_min'] > t_end:
+                continue
+            selected.append(chunk)
+        return selected
+
+    def _read_columns(self, columns: Sequence[str], t_start: Optional[float],
+                      t_end: Optional[float]) -> Dict[str, np.ndarray]:
+        """读取窗口内的若干列（只解压相交块中的对应列）"""
+        parts = {col: [] for col in columns}
+        for chunk in self._select_chunks(t_start, t_end):
+            with np.load(self.path / chunk['file']) as data:
+                time = data['time']
+                mask = np.ones(len(time), dtype=bool)
+                if t_start is not None:
+                    mask &= time >= t_start
+                if t_end is not None:
+                    mask &= time <= t_end
+                for col in columns:
+                    column = time if col == 'time' else data[col]
+                    parts[col].append(column[mask])
+
+        return {col: (np.concatenate(arrays) if arrays else np.array([]))
+                for col, arrays in parts.items()}
+
+    def load_time(self, t_start: Optional[float] = None,
+                  t_end: Optional[float] = None) -> np.ndarray:
+        """加载时间轴（可选时间窗口）"""
+        return self._read_columns(['time'], t_start, t_end)['time']
+
+    def load_variable(self, name: str, t_start: Optional[float] = None,
+                      t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """加载单个变量，返回 (时间, 数值)"""
+        if name not in self.variable_index:
+            raise KeyError(f"未知状态变量: {name}")
+        columns = self._read_columns(['time', name], t_start, t_end)
+        return columns['time'], columns[name]
+
+    def load_states(self, variables: Optional[Sequence[str]] = None,
+                    t_start: Optional[float] = None,
+                    t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """加载多个变量，返回 (时间, 状态矩阵[n_vars, n_t])"""
+        variables = list(variables) if variables else list(self.variables)
+        unknown = [var for var in variables if var not in self.variable_index]
+        if unknown:
+            raise KeyError(f"未知状态变量: {unknown}")
+
+        columns = self._read_columns(['time'] + variables, t_start, t_end)
+        states = np.vstack([columns[var] for var in variables]) if variables else np.empty((0, 0))
+        return columns['time'], states
+
+    def to_results(self, model=None, t_start: Optional[float] = None,
+                   t_end: Optional[float] = None) -> Dict:
+        """还原为求解器结果字典格式，供现有可视化模块使用"""
+        time, states = self.load_states(t_start=t_start, t_end=t_end)
+        stats = self.metadata.get('solver_stats', {})
+        results = {
+            'time': time,
+            'states': states,
+            'success': stats.get('success', True),
+            'message': stats.get('message', ''),
+            'nfev': stats.get('nfev'),
+            'njev': stats.get('njev'),
+            'preset_name': self.metadata.get('preset_name'),
+        }
+        if model is not None:
+            results['model'] = model
+        return results
+
+
+class ResultStore:
+    """结果存储管理器 - 默认位于 results/store/"""
+
+    def __init__(self, root: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 compress: bool = True):
+        if root is None:
+            project_root = Path(__file__).parent.parent.parent
+            self.root = project_root / 'results' / 'store'
+        else:
+            self.root = Path(root)
+        self.chunk_size = max(1, int(chunk_size))
+        self.compress = compress
+
+    def _make_run_id(self, preset_name: Optional[str], params_hash: str) -> str:
+        """生成运行ID: 预设_时间戳_参数哈希"""
+        stamp = _time.strftime('%Y%m%d_%H%M%S')
+        base = f"{preset_name or 'run'}_{stamp}_{params_hash[:8] or 'nohash'}"
+        run_id = base
+        counter = 1
+        while (self.root / run_id).exists():
+            run_id = f"{base}_{counter}"
+            counter += 1
+        return run_id
+
+    def save(self, results: Dict, preset_name: Optional[str] = None,
+             run_id: Optional[str] = None, variables: Optional[Sequence[str]] = None,
+             extra_metadata: Optional[Dict] = None) -> Path:
+        """
+        保存求解结果
+
+        Args:
+            results: 求解器返回的结果字典（含 time/states/model）
+            preset_name: 预设名称
+            run_id: 运行ID（默认自动生成）
+            variables: 状态变量名称（默认取自 results['model']）
+            extra_metadata: 附加元数据
+
+        Returns:
+            运行目录路径
+        """
+        time = np.asarray(results['time'], dtype=float)
+        states = np.asarray(results['states'], dtype=float)
+        if states.ndim != 2 or states.shape[1] != len(time):
+            raise ValueError(f"状态矩阵维度不匹配: {states.shape} vs {len(time)} 个时间点")
+
+        model = results.get('model')
+        if variables is None:
+            if model is not None and hasattr(model, 'state_variables'):
+                variables = model.state_variables
+            else:
+                variables = [f"y{i}" for i in range(states.shape[0])]
+        variables = list(variables)
+        if len(variables) != states.shape[0]:
+            raise ValueError(f"变量名称数量 {len(variables)} 与状态维度 {states.shape[0]} 不一致")
+
+        preset_name = preset_name or results.get('preset_name')
+        params_hash = parameters_hash(getattr(model, 'parameters', None))
+        run_id = run_id or self._make_run_id(preset_name, params_hash)
+        run_path = self.root / run_id
+        run_path.mkdir(parents=True, exist_ok=True)
+
+        writer = np.savez_compressed if self.compress else np.savez
+        chunks = []
+        for chunk_no, start in enumerate(range(0, max(len(time), 1), self.chunk_size)):
+            stop = min(start + self.chunk_size, len(time))
+            if stop <= start:
+                break
+            filename = f"chunk_{chunk_no:05d}.npz"
+            columns = {var: states[idx, start:stop] for idx, var in enumerate(variables)}
+            writer(run_path / filename, time=time[start:stop], **columns)
+            chunks.append({
+                'file': filename,
+                'start': start,
+                'stop': stop,
+                't_min': float(time[start]),
+                't_max': float(time[stop - 1]),
+            })
+
+        solver_stats = {key: results.get(key) for key in ('success', 'message', 'nfev', 'njev')
+                        if key in results}
+        kpis = results.get('kpis')
+        if kpis is None and model is not None:
+            from analysis.kpi import compute_kpis
+            kpis = compute_kpis(results)
+        metadata = {
+            'format_version': FORMAT_VERSION,
+            'run_id': run_id,
+            'created': _time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'preset_name': preset_name,
+            'parameters_hash': params_hash,
+            'parameters': _json_safe(asdict(model.parameters))
+            if model is not None and is_dataclass(getattr(model, 'parameters', None)) else None,
+            'solver_stats': _json_safe(solver_stats),
+            'kpis': _json_safe(kpis or {}),
+            'variables': variables,
+            'n_points': int(len(time)),
+            'chunk_size': self.chunk_size,
+            'compressed': self.compress,
+            'chunks': chunks,
+        }
+        if extra_metadata:
+            metadata['extra'] = _json_safe(extra_metadata)
+
+        with open(run_path / 'metadata.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        return run_path
+
+    def open(self, run_id: str) -> StoredRun:
+        """打开已存储的运行"""
+        run_path = self.root / run_id
+        if not (run_path / 'metadata.json').exists():
+            raise FileNotFoundError(f"结果不存在: {run_path}")
+        return StoredRun(run_path)
+
+    def list_runs(self) -> List[str]:
+        """列出所有已存储的运行ID"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / 'metadata.json').exists())
+
+    def kpi_table(self, run_ids: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+        """各运行的 KPI {运行ID: {指标: 数值}}，只读取元数据"""
+        table = {}
+        for run_id in (run_ids if run_ids is not None else self.list_runs()):
+            with open(self.root / run_id / 'metadata.json', 'r', encoding='utf-8') as f:
+                table[run_id] = json.load(f).get('kpis', {})
+        return table
+
+    def rank(self, kpi: str, descending: bool = True,
+             top: Optional[int] = None) -> List[Tuple[str, float]]:
+        """按某一 KPI 排序运行，返回 [(运行ID, 数值)]；缺少该指标的运行排在最后"""
+        from analysis.kpi import rank
+
+        table = self.kpi_table()
+        run_ids = list(table)
+        values = np.array([table[run_id].get(kpi, np.nan) for run_id in run_ids], dtype=float)
+        return [(run_ids[i], float(values[i]))
+                for i in rank({kpi: values}, kpi, descending, top)]
@@ -0,0 +1,140 @@
+# src/storage/stream_writer.py
+"""
+流式结果文件 - 积分过程中追加写入，读取端可实时跟随
+文件格式: 魔数 + 版本 + JSON头 + 定长float64记录 [t, y_0 .. y_n-1]
+结束时写入一条时间为NaN的哨兵记录
+"""
+
+import json
+import struct
+import time as _time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b'ADM1STRM'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')  # 魔数, 版本, 头长度
+
+
+class StreamWriter:
+    """追加式二进制写入器 - 内存占用与轨迹长度无关"""
+
+    def __init__(self, path, variables: Sequence[str], metadata: Optional[Dict] = None,
+                 flush_every: int = 1):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.variables = list(variables)
+        self.n_vars = len(self.variables)
+        self.flush_every = max(1, int(flush_every))
+        self.n_records = 0
+        self.closed = False
+
+        header = json.dumps({
+            'variables': self.variables,
+            'n_vars': self.n_vars,
+            'created': _time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'metadata': metadata or {},
+        }, ensure_ascii=False).encode('utf-8')
+
+        self._file = open(self.path, 'wb')
+        self._file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        self._file.write(header)
+        self._file.flush()
+
+    def append(self, t: float, y: np.ndarray):
+        """追加一条记录"""
+        record = np.empty(self.n_vars + 1, dtype='<f8')
+        record[0] = t
+        record[1:] = y
+        self._file.write(record.tobytes())
+        self.n_records += 1
+        if self.n_records % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        """写入结束哨兵并关闭文件"""
+        if self.closed:
+            return
+        self._file.write(np.full(self.n_vars + 1, np.nan, dtype='<f8').tobytes())
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class StreamReader:
+    """流式文件读取器 - 支持增量读取和实时跟随"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            magic, version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"不是ADM1流式文件: {self.path}")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"不支持的流式文件版本: {version}")
+            header = json.loads(f.read(header_len).decode('utf-8'))
+
+        self.variables: List[str] = header['variables']
+        self.n_vars = header['n_vars']
+        self.metadata = header.get('metadata', {})
+        self.data_offset = _PREAMBLE.size + header_len
+        self.record_size = (self.n_vars + 1) * 8
+        self.finished = False
+        self._offset = self.data_offset
+
+    def read_new(self) -> Tuple[np.ndarray, np.ndarray]:
+        """读取上次调用后新增的完整记录，返回 (时间, 状态[n_vars, k])"""
+        if self.finished:
+            return np.array([]), np.empty((self.n_vars, 0))
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            raw = f.read()
+
+        n_complete = len(raw) // self.record_size
+        if n_complete == 0:
+            return np.array([]), np.empty((self.n_vars, 0))
+
+        records = np.frombuffer(raw[:n_complete * self.record_size], dtype='<f8')
+        records = records.reshape(n_complete, self.n_vars + 1)
+        self._offset += n_complete * self.record_size
+
+        sentinel = np.isnan(records[:, 0])
+        if sentinel.any():
+            records = records[:np.argmax(sentinel)]
+            self.finished = True
+
+        return records[:, 0].copy(), records[:, 1:].T.copy()
+
+    def read_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        """从头读取全部记录"""
+        self._offset = self.data_offset
+        self.finished = False
+        return self.read_new()
+
+    def follow(self, poll_interval: float = 0.5,
+               timeout: Optional[float] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        跟随正在写入的文件，每次产出新增的记录块
+
+        Args:
+            poll_interval: 轮询间隔（秒）
+            timeout: 无新数据时的最长等待时间（秒），None表示一直等待到结束哨兵
+        """
+        last_data = _time.monotonic()
+        while not self.finished:
+            time, states = self.read_new()
+            if len(time):
+                last_data = _time.monotonic()
+                yield time, states
+            elif not self.finished:
+                if timeout is not None and _time.monotonic() - last_data > timeout:
+                    return
+                _time.sleep(poll_interval)
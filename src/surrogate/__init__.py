@@ -0,0 +1,10 @@
+# src/surrogate/__init__.py
+"""
+代理模型模块 - 由ADM1批量运行训练的快速仿真器
+"""
+
+from .emulator import SURROGATE_OUTPUTS, SurrogateModel, SurrogatePrediction, simulate_outputs
+from .gaussian_process import GaussianProcess
+
+__all__ = ['SURROGATE_OUTPUTS', 'SurrogateModel', 'SurrogatePrediction', 'simulate_outputs',
+           'GaussianProcess']
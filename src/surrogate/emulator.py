@@ -0,0 +1,257 @@
+# src/surrogate/emulator.py
+"""
+ADM1代理模型 - 离线训练、在线即时查询
+
+离线阶段：在预设参数空间中拟随机采样，按列批量积分（参数为 (m,) 数组字段，
+状态为 (n, m)），提取关键输出后为每个输出拟合一个高斯过程。
+在线阶段：查询返回预测值与标准差；超出训练范围（或不确定性过大）时回退到完整模型
+
+关键输出:
+  methane:  时域内累计甲烷生成量 [gCOD/m³]（模型中S_ch4无生成项，以生成速率积分代替终值）
+  peak_VFA: VFA峰值 [gCOD/m³]（含初始状态）
+  t_steady: 达到稳态的时间 [d]，取累计甲烷达到时域末累计量95%的时间（批式消化的T95）；
+            按状态变化率判定会被缓慢的FeS沉淀拖到时域末，不能区分参数
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from estimation.observations import VFA_VARIABLES
+from parameters.sampling import ParameterRange, ParameterSpace
+from solvers.integrators import rosenbrock_batch
+from surrogate.gaussian_process import GaussianProcess
+
+SURROGATE_OUTPUTS = ('methane', 'peak_VFA', 't_steady')
+DEFAULT_HORIZON = 60.0                 # 模拟时域 [d]
+DEFAULT_STEP = 1.0 / 24.0              # 积分步长 [d]
+STEADY_FRACTION = 0.95                 # 稳态判据：累计甲烷达到时域末累计量的比例
+BATCH_SIZE = 64
+MAX_RELATIVE_STD = None                # 默认不按不确定性回退
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SURROGATE_DIR = PROJECT_ROOT / 'results' / 'surrogates'
+
+
+def simulate_outputs(space: ParameterSpace, X: np.ndarray, y0: np.ndarray,
+                     horizon: float = DEFAULT_HORIZON, step: float = DEFAULT_STEP,
+                     batch_size: int = BATCH_SIZE) -> Dict[str, np.ndarray]:
+    """
+    完整模型：对 (m, d) 参数样本按批积分并提取关键输出
+
+    Returns:
+        {输出名: (m,)}
+    """
+    from core.adm1_model import ADM1Model
+
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    y0 = np.asarray(y0, dtype=float)
+    n_steps = max(1, int(round(horizon / step)))
+    h = horizon / n_steps
+    outputs = {name: np.empty(len(X)) for name in SURROGATE_OUTPUTS}
+    times = h * np.arange(n_steps + 1)
+
+    for start in range(0, len(X), batch_size):
+        chunk = slice(start, min(start + batch_size, len(X)))
+        m = chunk.stop - chunk.start
+        model = ADM1Model(space.batch_vector(X[chunk]))
+        vfa_rows = [model.variable_index[name] for name in VFA_VARIABLES]
+
+        Y = np.repeat(y0[:, None], m, axis=1)
+        rate = model.methane_production_rate(Y)
+        cumulative = np.zeros((n_steps + 1, m))
+        peak_vfa = Y[vfa_rows].sum(axis=0)
+        for k in range(n_steps):
+            Y = rosenbrock_batch(model.biochemical_reactions, model.jacobian, times[k], Y, h)
+            new_rate = model.methane_production_rate(Y)
+            cumulative[k + 1] = cumulative[k] + 0.5 * h * (rate + new_rate)
+            peak_vfa = np.maximum(peak_vfa, Y[vfa_rows].sum(axis=0))
+            rate = new_rate
+
+        outputs['methane'][chunk] = cumulative[-1]
+        outputs['peak_VFA'][chunk] = peak_vfa
+        outputs['t_steady'][chunk] = [np.interp(STEADY_FRACTION * curve[-1], curve, times)
+                                      for curve in cumulative.T]
+    return outputs
+
+
+@dataclass
+class SurrogatePrediction:
+    """查询结果：各输出的预测值与标准差，source 为 'surrogate' 或 'model'"""
+    values: Dict[str, float]
+    std: Dict[str, float]
+    source: str
+    in_domain: bool
+    elapsed: float = 0.0
+
+    def __getitem__(self, name: str) -> float:
+        return self.values[name]
+
+
+@dataclass
+class ValidationReport:
+    """独立验证集上的误差"""
+    n_samples: int
+    rmse: Dict[str, float] = field(default_factory=dict)
+    max_error: Dict[str, float] = field(default_factory=dict)
+    relative_rmse: Dict[str, float] = field(default_factory=dict)
+    coverage: Dict[str, float] = field(default_factory=dict)   # 真值落在 ±2σ 内的比例
+
+
+class SurrogateModel:
+    """
+    ADM1代理模型
+
+    Args:
+        space: 参数空间（训练范围）
+        y0: 初始状态
+        max_relative_std: 预测标准差/训练输出标准差超过该值时回退完整模型（None 不检查）
+    """
+
+    def __init__(self, space: ParameterSpace, y0: np.ndarray, horizon: float = DEFAULT_HORIZON,
+                 step: float = DEFAULT_STEP, preset: Optional[str] = None,
+                 max_relative_std: Optional[float] = MAX_RELATIVE_STD):
+        self.space = space
+        self.y0 = np.asarray(y0, dtype=float)
+        self.horizon = horizon
+        self.step = step
+        self.preset = preset
+        self.max_relative_std = max_relative_std
+        self.emulators: Dict[str, GaussianProcess] = {}
+        self.validation: Optional[ValidationReport] = None
+        self.n_fallbacks = 0
+
+    # ---- 离线阶段 ----
+
+    @classmethod
+    def train(cls, preset: str, n_samples: int = 128, n_validation: int = 32,
+              method: str = 'sobol', seed: Optional[int] = 0, spread: float = 0.2,
+              names: Optional[Sequence[str]] = None, horizon: float = DEFAULT_HORIZON,
+              step: float = DEFAULT_STEP, verbose: bool = False, **kwargs) -> 'SurrogateModel':
+        """在预设参数空间中采样、批量运行完整模型并拟合代理模型"""
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        space = ParameterSpace.from_preset(preset, spread=spread, names=names, manager=manager)
+        _, y0 = manager.create_model(preset)
+        surrogate = cls(space, y0, horizon, step, preset=preset, **kwargs)
+
+        start = time.perf_counter()
+        X = space.sample(n_samples, method, seed)
+        outputs = simulate_outputs(space, X, y0, horizon, step)
+        if verbose:
+            print(f"[PROGRESS] 训练样本: {n_samples} 次运行, {time.perf_counter() - start:.1f} s")
+        surrogate.fit(X, outputs, seed=seed)
+        if verbose:
+            print(f"[PROGRESS] 高斯过程拟合完成, 累计 {time.perf_counter() - start:.1f} s")
+
+        if n_validation:
+            # 验证集用独立的拉丁超立方样本
+            X_val = space.sample(n_validation, 'lhs', None if seed is None else seed + 1)
+            surrogate.validate(X_val, simulate_outputs(space, X_val, y0, horizon, step))
+        return surrogate
+
+    def fit(self, X: np.ndarray, outputs: Dict[str, np.ndarray], seed: Optional[int] = None):
+        U = self.space.to_unit(X)
+        for name in SURROGATE_OUTPUTS:
+            self.emulators[name] = GaussianProcess().fit(U, outputs[name], seed=seed)
+        return self
+
+    def validate(self, X: np.ndarray, outputs: Dict[str, np.ndarray]) -> ValidationReport:
+        """与完整模型结果比较"""
+        report = ValidationReport(len(X))
+        U = self.space.to_unit(X)
+        for name, gp in self.emulators.items():
+            mean, std = gp.predict(U)
+            error = mean - outputs[name]
+            rmse = float(np.sqrt(np.mean(error ** 2)))
+            report.rmse[name] = rmse
+            report.max_error[name] = float(np.max(np.abs(error)))
+            report.relative_rmse[name] = rmse / max(float(np.mean(np.abs(outputs[name]))), 1e-12)
+            report.coverage[name] = float(np.mean(np.abs(error) <= 2.0 * std + 1e-12))
+        self.validation = report
+        return report
+
+    # ---- 在线阶段 ----
+
+    def _as_vector(self, parameters) -> np.ndarray:
+        if isinstance(parameters, dict):
+            return self.space.vector(parameters)
+        return np.asarray(parameters, dtype=float).reshape(-1)
+
+    def predict(self, parameters=None, allow_fallback: bool = True) -> SurrogatePrediction:
+        """
+        查询代理模型
+
+        Args:
+            parameters: 参数字典（未给出的取名义值）或按 space.names 排列的取值向量
+            allow_fallback: 超出训练范围时运行完整模型（否则仍返回外推结果）
+        """
+        start = time.perf_counter()
+        x = self._as_vector({} if parameters is None else parameters)
+        in_domain = bool(self.space.contains(x[None, :])[0])
+
+        u = self.space.to_unit(x[None, :])
+        values, std = {}, {}
+        confident = True
+        for name, gp in self.emulators.items():
+            mean, sigma = gp.predict(u)
+            values[name], std[name] = float(mean[0]), float(sigma[0])
+            if self.max_relative_std is not None and sigma[0] > self.max_relative_std * gp.y_std:
+                confident = False
+
+        if allow_fallback and not (in_domain and confident):
+            self.n_fallbacks += 1
+            outputs = simulate_outputs(self.space, x[None, :], self.y0, self.horizon, self.step)
+            return SurrogatePrediction({name: float(v[0]) for name, v in outputs.items()},
+                                       {name: 0.0 for name in outputs}, 'model', in_domain,
+                                       time.perf_counter() - start)
+        return SurrogatePrediction(values, std, 'surrogate', in_domain,
+                                   time.perf_counter() - start)
+
+    def predict_batch(self, X: np.ndarray) -> Dict[str, tuple]:
+        """批量查询（不回退）：{输出: (均值 (m,), 标准差 (m,))}"""
+        U = self.space.to_unit(X)
+        return {name: gp.predict(U) for name, gp in self.emulators.items()}
+
+    # ---- 持久化 ----
+
+    def default_path(self) -> Path:
+        return DEFAULT_SURROGATE_DIR / f"{self.preset or 'custom'}.npz"
+
+    def save(self, path=None) -> Path:
+        path = Path(path) if path is not None else self.default_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            'preset': self.preset, 'horizon': self.horizon, 'step': self.step,
+            'max_relative_std': self.max_relative_std,
+            'ranges': [asdict(r) for r in self.space.ranges],
+            'base': asdict(self.space.base),
+            'outputs': list(self.emulators),
+            'validation': asdict(self.validation) if self.validation else None,
+        }
+        arrays = {'y0': self.y0, 'metadata': np.array(json.dumps(metadata))}
+        for name, gp in self.emulators.items():
+            arrays.update(gp.to_arrays(f'{name}__'))
+        np.savez(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'SurrogateModel':
+        from core.adm1_model import ADM1Parameters
+
+        with np.load(path, allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays['metadata']))
+            space = ParameterSpace([ParameterRange(**r) for r in metadata['ranges']],
+                                   ADM1Parameters(**metadata['base']))
+            surrogate = cls(space, arrays['y0'], metadata['horizon'], metadata['step'],
+                            preset=metadata['preset'],
+                            max_relative_std=metadata['max_relative_std'])
+            for name in metadata['outputs']:
+                surrogate.emulators[name] = GaussianProcess.from_arrays(arrays, f'{name}__')
+        if metadata['validation']:
+            surrogate.validation = ValidationReport(**metadata['validation'])
+        return surrogate
@@ -0,0 +1,132 @@
+# src/surrogate/gaussian_process.py
+"""
+高斯过程回归（仅NumPy/SciPy）
+
+各向异性平方指数核（ARD）+ 观测噪声，超参数按对数边际似然（解析梯度）用L-BFGS-B优化；
+输出做标准化，预测返回均值与标准差
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+LENGTH_SCALE_BOUNDS = (0.05, 50.0)     # 单位立方体输入上的长度尺度
+SIGNAL_VARIANCE_BOUNDS = (1e-3, 1e2)   # 标准化输出上的信号方差
+NOISE_VARIANCE_BOUNDS = (1e-10, 1e-1)
+JITTER = 1e-10
+
+
+class GaussianProcess:
+    """单输出高斯过程回归"""
+
+    def __init__(self):
+        self.X: Optional[np.ndarray] = None
+        self.length_scales: Optional[np.ndarray] = None
+        self.signal_variance = 1.0
+        self.noise_variance = 1e-6
+        self.y_mean = 0.0
+        self.y_std = 1.0
+        self._L = None
+        self._alpha = None
+
+    # ---- 核函数 ----
+
+    def _kernel(self, A: np.ndarray, B: np.ndarray) -> np.ndarray:
+        A = A / self.length_scales
+        B = B / self.length_scales
+        sq = np.sum(A ** 2, axis=1)[:, None] + np.sum(B ** 2, axis=1)[None, :] - 2.0 * A @ B.T
+        return self.signal_variance * np.exp(-0.5 * np.maximum(sq, 0.0))
+
+    def _unpack(self, theta: np.ndarray):
+        return np.exp(theta[0]), np.exp(theta[1:-1]), np.exp(theta[-1])
+
+    def _negative_log_likelihood(self, theta: np.ndarray, X: np.ndarray, y: np.ndarray,
+                                 sq_dists: np.ndarray) -> Tuple[float, np.ndarray]:
+        """负对数边际似然及其对 log 超参数的梯度"""
+        signal, scales, noise = self._unpack(theta)
+        n = len(y)
+        K_f = signal * np.exp(-0.5 * np.tensordot(1.0 / scales ** 2, sq_dists, axes=1))
+        K = K_f + (noise + JITTER) * np.eye(n)
+        try:
+            factor = cho_factor(K, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e10, np.zeros_like(theta)
+        alpha = cho_solve(factor, y)
+        nll = 0.5 * y @ alpha + np.sum(np.log(np.diag(factor[0]))) + 0.5 * n * np.log(2 * np.pi)
+
+        # dNLL/dθ = -½ tr((ααᵀ - K⁻¹) ∂K/∂θ)
+        W = np.outer(alpha, alpha) - cho_solve(factor, np.eye(n))
+        grad = np.empty_like(theta)
+        grad[0] = -0.5 * np.sum(W * K_f)
+        WK = W * K_f
+        grad[1:-1] = -0.5 * np.tensordot(sq_dists, WK, axes=([1, 2], [0, 1])) / scales ** 2
+        grad[-1] = -0.5 * noise * np.trace(W)
+        return nll, grad
+
+    # ---- 训练与预测 ----
+
+    def fit(self, X: np.ndarray, y: np.ndarray, n_restarts: int = 2,
+            seed: Optional[int] = None) -> 'GaussianProcess':
+        """按最大边际似然拟合超参数（多起点）"""
+        from scipy.optimize import minimize
+
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        y = np.asarray(y, dtype=float)
+        self.y_mean = float(np.mean(y))
+        self.y_std = float(np.std(y)) or 1.0
+        y_std = (y - self.y_mean) / self.y_std
+        dim = X.shape[1]
+        sq_dists = (X.T[:, :, None] - X.T[:, None, :]) ** 2      # (d, N, N)
+
+        bounds = ([np.log(SIGNAL_VARIANCE_BOUNDS)] + [np.log(LENGTH_SCALE_BOUNDS)] * dim
+                  + [np.log(NOISE_VARIANCE_BOUNDS)])
+        rng = np.random.default_rng(seed)
+        starts = [np.concatenate([[0.0], np.full(dim, np.log(0.5 * np.sqrt(dim))), [np.log(1e-4)]])]
+        for _ in range(n_restarts):
+            starts.append(np.array([rng.uniform(low, high) for low, high in bounds]))
+
+        best = None
+        for theta0 in starts:
+            result = minimize(self._negative_log_likelihood, theta0, args=(X, y_std, sq_dists),
+                              jac=True, method='L-BFGS-B', bounds=bounds)
+            if best is None or result.fun < best.fun:
+                best = result
+        self.signal_variance, self.length_scales, self.noise_variance = self._unpack(best.x)
+        self._set_training_data(X, y_std)
+        return self
+
+    def _set_training_data(self, X: np.ndarray, y_std: np.ndarray):
+        self.X = X
+        K = self._kernel(X, X) + (self.noise_variance + JITTER) * np.eye(len(X))
+        self._L = np.linalg.cholesky(K)
+        self._alpha = cho_solve((self._L, True), y_std)
+        self._y_std_values = y_std
+
+    def predict(self, X: np.ndarray, return_std: bool = True):
+        """预测均值（及标准差），X 为 (m, d)"""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        k = self._kernel(X, self.X)
+        mean = self.y_mean + self.y_std * (k @ self._alpha)
+        if not return_std:
+            return mean
+        v = solve_triangular(self._L, k.T, lower=True)
+        variance = np.maximum(self.signal_variance - np.sum(v ** 2, axis=0), 0.0)
+        return mean, self.y_std * np.sqrt(variance)
+
+    # ---- 持久化 ----
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        return {f'{prefix}X': self.X, f'{prefix}y': self._y_std_values,
+                f'{prefix}length_scales': self.length_scales,
+                f'{prefix}hyper': np.array([self.signal_variance, self.noise_variance,
+                                            self.y_mean, self.y_std])}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str) -> 'GaussianProcess':
+        gp = cls()
+        gp.signal_variance, gp.noise_variance, gp.y_mean, gp.y_std = \
+            (float(v) for v in arrays[f'{prefix}hyper'])
+        gp.length_scales = np.array(arrays[f'{prefix}length_scales'])
+        gp._set_training_data(np.array(arrays[f'{prefix}X']), np.array(arrays[f'{prefix}y']))
+        return gp
@@ -0,0 +1,10 @@
+# src/uncertainty/__init__.py
+"""
+不确定性传播模块 - 参数分布采样、批量蒙特卡洛与流式分位数
+"""
+
+from .monte_carlo import MonteCarlo, MonteCarloResult, load_distribution_config, simulate_members
+from .quantiles import StreamingQuantiles
+
+__all__ = ['MonteCarlo', 'MonteCarloResult', 'load_distribution_config', 'simulate_members',
+           'StreamingQuantiles']
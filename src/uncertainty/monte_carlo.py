@@ -0,0 +1,257 @@
+# src/uncertainty/monte_carlo.py
+"""
+蒙特卡洛不确定性传播 - 参数分布 → 甲烷产量置信带
+
+预设的动力学/金属参数块按可配置分布（见 parameters.sampling.ParameterRange）以
+Sobol/LHS 序列采样；每批成员按列堆叠为 (P, m) 参数向量，状态 (n, m) 按列批量积分，
+可选多进程并行多批。输出只进入流式分位数估计（P²），内存与成员数无关；
+相邻两轮的分位数相对变化连续 patience 轮小于 tol 时提前停止。
+
+输出:
+  methane:  输出时刻上的累计甲烷生成量 [gCOD/m³]（S_ch4无生成项，以生成速率积分）
+  peak_VFA: VFA峰值 [gCOD/m³]
+"""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from estimation.observations import VFA_VARIABLES
+from parameters.sampling import ParameterSpace, unit_batches
+from solvers.integrators import rosenbrock_batch
+from uncertainty.quantiles import StreamingQuantiles
+
+DEFAULT_BLOCKS = ('kinetic_parameters', 'metal_parameters')
+DEFAULT_PROBABILITIES = (0.05, 0.5, 0.95)
+DEFAULT_HORIZON = 60.0                 # 模拟时域 [d]
+DEFAULT_STEP = 1.0 / 24.0              # 积分步长 [d]
+DEFAULT_OUTPUT_INTERVAL = 1.0          # 置信带输出间隔 [d]
+BATCH_SIZE = 64                        # Sobol 批大小取2的幂
+DEFAULT_TOLERANCE = 0.005              # 分位数相对变化阈值
+DEFAULT_PATIENCE = 2
+MIN_MEMBERS = 256
+MAX_MEMBERS = 8192
+
+
+def simulate_members(space: ParameterSpace, X: np.ndarray, y0: np.ndarray,
+                     output_times: np.ndarray, step: float = DEFAULT_STEP) -> Dict[str, np.ndarray]:
+    """
+    一批成员按列同时积分
+
+    Returns:
+        {'methane': (m, T) 输出时刻上的累计甲烷, 'peak_VFA': (m,)}
+    """
+    from core.adm1_model import ADM1Model
+
+    X = np.atleast_2d(X)
+    m = len(X)
+    model = ADM1Model(space.batch_vector(X))
+    vfa_rows = [model.variable_index[name] for name in VFA_VARIABLES]
+
+    Y = np.repeat(np.asarray(y0, dtype=float)[:, None], m, axis=1)
+    rate = model.methane_production_rate(Y)
+    cumulative = np.zeros(m)
+    peak_vfa = Y[vfa_rows].sum(axis=0)
+    methane = np.zeros((m, len(output_times)))
+    t = float(output_times[0])
+    for k in range(1, len(output_times)):
+        n_steps = max(1, int(round((output_times[k] - t) / step)))
+        h = (output_times[k] - t) / n_steps
+        for _ in range(n_steps):
+            Y = rosenbrock_batch(model.biochemical_reactions, model.jacobian, t, Y, h)
+            new_rate = model.methane_production_rate(Y)
+            cumulative = cumulative + 0.5 * h * (rate + new_rate)
+            peak_vfa = np.maximum(peak_vfa, Y[vfa_rows].sum(axis=0))
+            rate = new_rate
+            t += h
+        t = float(output_times[k])
+        methane[:, k] = cumulative
+    return {'methane': methane, 'peak_VFA': peak_vfa}
+
+
+def load_distribution_config(path) -> Dict:
+    """
+    读取参数分布配置（JSON）:
+        {"preset": "food_waste",
+         "blocks": ["kinetic_parameters", "metal_parameters"],
+         "distribution": "lognormal", "spread": 0.2,
+         "parameters": {"k_m_ac": {"distribution": "triangular", "spread": 0.3},
+                        "KI_NH3": {"distribution": "uniform", "lower": 0.001, "upper": 0.003}}}
+    除 parameters 外各项可省略
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    unknown = set(config) - {'preset', 'blocks', 'distribution', 'spread', 'parameters'}
+    if unknown:
+        raise ValueError(f"分布配置中的未知字段: {', '.join(sorted(unknown))}")
+    return config
+
+
+@dataclass
+class MonteCarloResult:
+    """蒙特卡洛结果：累计甲烷置信带与各输出的分位数统计"""
+    times: np.ndarray
+    probabilities: Sequence[float]
+    bands: np.ndarray                  # (n_q, T) 累计甲烷分位数
+    mean: np.ndarray                   # (T,)
+    std: np.ndarray                    # (T,)
+    summary: Dict[str, Dict[str, float]]
+    n_members: int
+    n_failed: int
+    converged: bool
+    parameter_names: List[str]
+    history: List[float] = field(default_factory=list)    # 每轮分位数最大相对变化
+    elapsed: float = 0.0
+
+    def band(self, probability: float) -> np.ndarray:
+        index = int(np.argmin(np.abs(np.asarray(self.probabilities) - probability)))
+        return self.bands[index]
+
+    def to_dict(self) -> Dict:
+        return {
+            'times': self.times.tolist(), 'probabilities': list(self.probabilities),
+            'bands': self.bands.tolist(), 'mean': self.mean.tolist(), 'std': self.std.tolist(),
+            'summary': self.summary, 'n_members': self.n_members, 'n_failed': self.n_failed,
+            'converged': self.converged, 'parameter_names': self.parameter_names,
+            'history': self.history, 'elapsed': self.elapsed,
+        }
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+class MonteCarlo:
+    """
+    蒙特卡洛不确定性传播引擎
+
+    Args:
+        space: 参数分布空间
+        y0: 初始状态
+        method: 'sobol' | 'lhs' | 'random'
+        batch_size: 每批成员数（一次批量积分）
+        workers: 并行进程数（1 为单进程）；每轮并行积分 workers 批
+        tol, patience: 分位数相对变化连续 patience 轮小于 tol 时停止
+        min_members, max_members: 成员数下限/上限
+    """
+
+    def __init__(self, space: ParameterSpace, y0: np.ndarray,
+                 horizon: float = DEFAULT_HORIZON, step: float = DEFAULT_STEP,
+                 output_interval: float = DEFAULT_OUTPUT_INTERVAL,
+                 probabilities: Sequence[float] = DEFAULT_PROBABILITIES,
+                 method: str = 'sobol', seed: Optional[int] = 0,
+                 batch_size: int = BATCH_SIZE, workers: int = 1,
+                 tol: float = DEFAULT_TOLERANCE, patience: int = DEFAULT_PATIENCE,
+                 min_members: int = MIN_MEMBERS, max_members: int = MAX_MEMBERS):
+        self.space = space
+        self.y0 = np.asarray(y0, dtype=float)
+        n_outputs = max(1, int(round(horizon / output_interval)))
+        self.times = np.linspace(0.0, horizon, n_outputs + 1)
+        self.step = step
+        self.probabilities = tuple(probabilities)
+        self.method = method
+        self.seed = seed
+        self.batch_size = batch_size
+        self.workers = max(1, int(workers))
+        self.tol = tol
+        self.patience = patience
+        self.min_members = min_members
+        self.max_members = max_members
+
+    @classmethod
+    def from_preset(cls, preset: str, blocks: Sequence[str] = DEFAULT_BLOCKS,
+                    spread: float = 0.2, distribution: str = 'lognormal',
+                    parameters: Optional[Dict[str, Dict]] = None, **kwargs) -> 'MonteCarlo':
+        """按预设参数块构建（parameters 为逐参数的分布设置）"""
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        space = ParameterSpace.from_preset(preset, blocks, spread=spread,
+                                           distribution=distribution, overrides=parameters,
+                                           manager=manager)
+        _, y0 = manager.create_model(preset)
+        return cls(space, y0, **kwargs)
+
+    @classmethod
+    def from_config(cls, path, preset: Optional[str] = None, **kwargs) -> 'MonteCarlo':
+        """按分布配置文件构建，preset 给出时覆盖配置中的预设"""
+        config = load_distribution_config(path)
+        return cls.from_preset(preset or config.get('preset', 'food_waste'),
+                               blocks=config.get('blocks', DEFAULT_BLOCKS),
+                               spread=config.get('spread', 0.2),
+                               distribution=config.get('distribution', 'lognormal'),
+                               parameters=config.get('parameters'), **kwargs)
+
+    def _simulate(self, executor, batches: List[np.ndarray]) -> List[Dict[str, np.ndarray]]:
+        args = (self.y0, self.times, self.step)
+        if executor is None:
+            return [simulate_members(self.space, X, *args) for X in batches]
+        futures = [executor.submit(simulate_members, self.space, X, *args) for X in batches]
+        return [f.result() for f in futures]
+
+    def run(self, verbose: bool = False) -> MonteCarloResult:
+        start = time.perf_counter()
+        methane = StreamingQuantiles(self.probabilities, (len(self.times),))
+        peak_vfa = StreamingQuantiles(self.probabilities)
+        samples = unit_batches(self.space.dim, self.batch_size, self.method, self.seed)
+
+        history: List[float] = []
+        previous = None
+        quiet_rounds = 0
+        converged = False
+        n_failed = 0
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            while methane.count + n_failed < self.max_members:
+                remaining = self.max_members - methane.count - n_failed
+                n_batches = min(self.workers, -(-remaining // self.batch_size))
+                batches = [self.space.from_unit(next(samples)) for _ in range(n_batches)]
+                batches[-1] = batches[-1][:remaining - (n_batches - 1) * self.batch_size]
+
+                for outputs in self._simulate(executor, batches):
+                    ok = (np.all(np.isfinite(outputs['methane']), axis=1)
+                          & np.isfinite(outputs['peak_VFA']))
+                    n_failed += int(np.sum(~ok))
+                    methane.update(outputs['methane'][ok])
+                    peak_vfa.update(outputs['peak_VFA'][ok])
+
+                current = np.concatenate([methane.quantiles()[:, 1:].ravel(),
+                                          peak_vfa.quantiles().ravel()])
+                if previous is not None:
+                    change = float(np.max(np.abs(current - previous)
+                                          / np.maximum(np.abs(current), 1e-12)))
+                    history.append(change)
+                    quiet_rounds = quiet_rounds + 1 if change < self.tol else 0
+                previous = current
+                if verbose:
+                    last = f", 分位数相对变化 {history[-1]:.2e}" if history else ""
+                    print(f"[PROGRESS] {methane.count} 个成员, "
+                          f"{time.perf_counter() - start:.1f} s{last}")
+                if quiet_rounds >= self.patience and methane.count >= self.min_members:
+                    converged = True
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        summary = {}
+        for name, estimator, final in (('methane', methane, -1), ('peak_VFA', peak_vfa, None)):
+            q = estimator.quantiles()
+            q = q[:, final] if final is not None else q
+            stats = {'mean': float(np.ravel(estimator.mean)[-1]),
+                     'std': float(np.ravel(estimator.std)[-1])}
+            stats.update({f'p{100 * p:g}': float(v) for p, v in zip(self.probabilities, q)})
+            summary[name] = stats
+
+        return MonteCarloResult(self.times, self.probabilities, methane.quantiles(),
+                                methane.mean, methane.std, summary, methane.count, n_failed,
+                                converged, self.space.names, history,
+                                time.perf_counter() - start)
@@ -0,0 +1,106 @@
+# src/uncertainty/quantiles.py
+"""
+流式分位数 - P²算法（Jain & Chlamtac, 1985），内存与样本数无关
+
+每个数据流、每个分位数只保存5个标记（高度与位置），新样本到来时局部修正；
+所有数据流（如输出时刻 × 输出量）按数组向量化更新。同时用Welford算法累计均值和方差
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+N_MARKERS = 5
+
+
+class StreamingQuantiles:
+    """
+    多数据流的流式分位数估计
+
+    Args:
+        probabilities: 分位数概率，如 (0.05, 0.5, 0.95)
+        shape: 每个样本的形状（数据流个数），如输出时刻数 (T,)
+    """
+
+    def __init__(self, probabilities: Sequence[float], shape: Tuple[int, ...] = ()):
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        if np.any((self.probabilities <= 0) | (self.probabilities >= 1)):
+            raise ValueError("分位数概率必须在 (0, 1) 内")
+        self.shape = tuple(shape)
+        n_streams = int(np.prod(self.shape, dtype=int))
+        n_q = len(self.probabilities)
+        p = self.probabilities[:, None]
+
+        self.count = 0
+        self._buffer = np.empty((N_MARKERS, n_streams))
+        self._heights = np.empty((n_q, n_streams, N_MARKERS))
+        self._positions = np.empty((n_q, n_streams, N_MARKERS))
+        # 期望位置及其增量只与样本数有关，各数据流共用
+        self._desired = np.hstack([np.zeros_like(p), 2 * p, 4 * p, 2 + 2 * p, np.full_like(p, 4)])
+        self._increments = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])
+        self._mean = np.zeros(n_streams)
+        self._m2 = np.zeros(n_streams)
+
+    def update(self, values: np.ndarray):
+        """加入一批样本 (m, *shape)"""
+        values = np.asarray(values, dtype=float).reshape(-1, self._mean.size)
+        for x in values:
+            self._push(x)
+
+    def _push(self, x: np.ndarray):
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+
+        if self.count <= N_MARKERS:
+            self._buffer[self.count - 1] = x
+            if self.count == N_MARKERS:
+                self._heights[:] = np.sort(self._buffer, axis=0).T[None, :, :]
+                self._positions[:] = np.arange(N_MARKERS, dtype=float)
+            return
+
+        q, n = self._heights, self._positions
+        # 找到样本所在的标记区间，必要时扩展端点
+        q[:, :, 0] = np.minimum(q[:, :, 0], x)
+        q[:, :, -1] = np.maximum(q[:, :, -1], x)
+        k = np.clip(np.sum(x[None, :, None] >= q[:, :, 1:-1], axis=2), 0, N_MARKERS - 2)
+        n += np.arange(N_MARKERS) > k[:, :, None]
+        self._desired += self._increments
+
+        for i in range(1, N_MARKERS - 1):
+            d = self._desired[:, None, i] - n[:, :, i]
+            move = (((d >= 1) & (n[:, :, i + 1] - n[:, :, i] > 1))
+                    | ((d <= -1) & (n[:, :, i - 1] - n[:, :, i] < -1)))
+            if not np.any(move):
+                continue
+            s = np.sign(d)
+            # 抛物线（P²）插值，越界时退化为线性插值
+            span = n[:, :, i + 1] - n[:, :, i - 1]
+            right = (q[:, :, i + 1] - q[:, :, i]) / (n[:, :, i + 1] - n[:, :, i])
+            left = (q[:, :, i] - q[:, :, i - 1]) / (n[:, :, i] - n[:, :, i - 1])
+            parabolic = q[:, :, i] + s / span * ((n[:, :, i] - n[:, :, i - 1] + s) * right
+                                                 + (n[:, :, i + 1] - n[:, :, i] - s) * left)
+            linear = q[:, :, i] + s * np.where(s > 0, right, left)
+            inside = (q[:, :, i - 1] < parabolic) & (parabolic < q[:, :, i + 1])
+            q[:, :, i] = np.where(move, np.where(inside, parabolic, linear), q[:, :, i])
+            n[:, :, i] += np.where(move, s, 0.0)
+
+    def quantiles(self) -> np.ndarray:
+        """当前分位数估计 (n_q, *shape)；样本少于5个时用精确分位数"""
+        if self.count == 0:
+            return np.full((len(self.probabilities),) + self.shape, np.nan)
+        if self.count < N_MARKERS:
+            estimate = np.quantile(self._buffer[:self.count], self.probabilities, axis=0)
+        else:
+            estimate = self._heights[:, :, 2]
+        return estimate.reshape((len(self.probabilities),) + self.shape)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean.reshape(self.shape)
+
+    @property
+    def std(self) -> np.ndarray:
+        variance = self._m2 / (self.count - 1) if self.count > 1 else np.zeros_like(self._m2)
+        return np.sqrt(variance).reshape(self.shape)
@@ -90,17 +90,88 @@ class OutputManager:
         print(f"状态变量: {results['states'].shape[0]} 个")
         print(f"数据维度: {results['states'].shape}")
 
-        # 关键性能指标
-        if hasattr(results.get('model'), 'state_variables'):
+        # 关键变量变化（一次取出首末两列）
+        model = results.get('model')
+        if hasattr(model, 'state_variables'):
             print("\n关键变量变化:")
-            key_vars = ['S_su', 'S_aa', 'S_ac', 'S_ch4', 'S_h2']
-            for var in key_vars:
-                idx = results['model'].get_variable_index(var)
-                if idx != -1 and idx < results['states'].shape[0]:
-                    initial = results['states'][idx, 0]
-                    final = results['states'][idx, -1]
-                    change = final - initial
-                    print(f"  {var}: {initial:.4f} → {final:.4f} (Δ{change:+.4f})")
+            key_vars = [var for var in ['S_su', 'S_aa', 'S_ac', 'S_ch4', 'S_h2']
+                        if 0 <= model.get_variable_index(var) < results['states'].shape[0]]
+            rows = [model.get_variable_index(var) for var in key_vars]
+            ends = results['states'][rows][:, [0, -1]]
+            for var, (initial, final) in zip(key_vars, ends):
+                print(f"  {var}: {initial:.4f} → {final:.4f} (Δ{final - initial:+.4f})")
+
+            from analysis.kpi import attach_kpis
+            self.print_kpis(attach_kpis(results))
+
+        if results.get('mass_balance'):
+            self.print_mass_balance(results['mass_balance'])
+        if results.get('instrumentation'):
+            self.print_solver_statistics(results['instrumentation'])
+        if results.get('metal_accuracy'):
+            self.print_metal_accuracy(results['metal_mode'], results['metal_accuracy'])
+
+    def print_kpis(self, kpis):
+        """关键性能指标（analysis.kpi）"""
+        if not kpis:
+            return
+        from analysis.kpi import format_kpis
+
+        print("\n关键性能指标:")
+        for line in format_kpis(kpis):
+            print(f"  {line}")
+
+    def print_mass_balance(self, summary):
+        """质量平衡运行时检查结果（analysis.mass_balance）"""
+        imbalance = ', '.join(f"{q} {v:.1e}" for q, v in summary['max_imbalance'].items())
+        print(f"\n质量平衡检查: {summary['checks']} 次 (每 {summary['stride']} 次右端函数调用)")
+        print(f"  最大相对不平衡: {imbalance}")
+        for quantity, t in summary['violations'].items():
+            self.print_warning(f"{quantity} 偏离参考化学计量的不闭合，首次于 t={t:.4g} d")
+        for issue in summary.get('issues', []):
+            self.print_warning(f"结构问题: {issue}")
+
+    def print_solver_statistics(self, stats):
+        """求解器插桩统计"""
+        print("\n求解器统计:")
+        rejected = stats.get('rejected_steps')
+        print(f"  接受步数: {stats['accepted_steps']}")
+        print(f"  拒绝步数: {rejected if rejected is not None else 'N/A'}")
+        print(f"  LU分解次数: {stats['lu_decompositions']}")
+        print(f"  右端函数/雅可比调用: {stats['rhs_calls']} / {stats['jacobian_calls']}")
+        if stats.get('projections'):
+            print(f"  非负投影次数: {stats['projections']} (最大负偏差 {stats['max_negative']:.2e})")
+
+        step = stats.get('step_size', {})
+        if step.get('min') is not None:
+            print(f"  步长范围: {step['min']:.3e} ~ {step['max']:.3e} 天 (平均 {step['mean']:.3e})")
+
+        timings = stats.get('timings', {})
+        labels = [('rhs', '右端函数'), ('jacobian', '雅可比'),
+                  ('linear_algebra', '线性代数'), ('other', '其他')]
+        total = timings.get('total') or 0.0
+        print(f"  总耗时: {total:.3f} s")
+        for key, label in labels:
+            value = timings.get(key)
+            if value is None:
+                continue
+            share = value / total * 100 if total > 0 else 0.0
+            print(f"    {label}: {value:.3f} s ({share:.1f}%)")
+
+        limiting = stats.get('limiting_variables', {})
+        if limiting:
+            top = ', '.join(f"{name}({count})" for name, count in list(limiting.items())[:5])
+            print(f"  限制误差估计的变量: {top}")
+
+    def print_metal_accuracy(self, mode, accuracy):
+        """金属络合快速处理（qssa/split）与耦合求解的精度对比"""
+        print(f"\n金属络合处理 ({mode}) 与耦合求解对比:")
+        print(f"  终点最大相对误差: {accuracy['final_relative_error']:.2e}")
+        print(f"  全程最大相对误差: {accuracy['max_relative_error']:.2e} "
+              f"({accuracy['worst_variable']})")
+        print(f"  步数: {accuracy['steps']} / 耦合 {accuracy['coupled_steps']}")
+        print(f"  右端函数调用: {accuracy['nfev']} / 耦合 {accuracy['coupled_nfev']}")
+        print(f"  耗时: {accuracy['time']:.3f} s / 耦合 {accuracy['coupled_time']:.3f} s")
 
 
 # 全局单例实例
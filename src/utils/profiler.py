@@ -0,0 +1,251 @@
+# src/utils/profiler.py
+"""
+运行性能剖析 - cProfile排序报告 + 采样调用栈（火焰图collapsed格式）
+按调用栈中最内层的项目/库帧把耗时归类到模型、求解器、参数加载和绘图
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_SAMPLE_INTERVAL = 0.002  # 采样间隔（秒）
+PROFILE_MODES = ('both', 'sampling', 'cprofile')
+
+# (类别, 路径片段)，按顺序匹配，路径统一使用 '/'
+CATEGORY_RULES = [
+    ('model', '/src/core/'),
+    ('solver', '/src/solvers/'),
+    ('solver', '/scipy/integrate/'),
+    ('parameters', '/src/parameters/'),
+    ('plotting', '/src/visualization/'),
+    ('plotting', '/matplotlib/'),
+    ('import', '<frozen importlib'),
+]
+
+CATEGORY_LABELS = {
+    'model': '模型',
+    'solver': '求解器',
+    'parameters': '参数加载',
+    'plotting': '绘图',
+    'import': '模块导入',
+    'other': '其他',
+}
+
+
+def classify_file(filename: str) -> Optional[str]:
+    """根据源文件路径判断所属类别，无法归类时返回None"""
+    path = filename.replace('\\', '/')
+    for category, fragment in CATEGORY_RULES:
+        if fragment in path:
+            return category
+    return None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class _StackSampler(threading.Thread):
+    """后台线程定期采样目标线程的调用栈"""
+
+    def __init__(self, target_thread_id: int, interval: float):
+        super().__init__(name='adm1-profiler-sampler', daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.n_samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            self._record(frame)
+
+    def _record(self, frame):
+        labels = []
+        category = None
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            if category is None:
+                category = classify_file(frame.f_code.co_filename)
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(labels))] += 1
+        self.categories[category or 'other'] += 1
+        self.n_samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """
+    运行剖析器 - 启用cProfile和/或栈采样
+
+    cProfile给出精确的调用次数，但对大量小函数调用（右端函数）有显著额外开销；
+    mode='sampling' 只采样，耗时归类更接近真实运行
+
+    用法:
+        with RunProfiler('simulation') as profiler:
+            ...
+        profiler.report_path / profiler.collapsed_path
+    """
+
+    def __init__(self, label: str = 'run', output_dir=PROJECT_ROOT / 'results', mode: str = 'both',
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL, sort_by: str = 'cumulative',
+                 top_n: int = 40):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未知剖析模式: {mode}")
+        self.label = label
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval
+        self.sort_by = sort_by
+        self.top_n = top_n
+
+        self.elapsed = 0.0
+        self.report_path: Optional[Path] = None
+        self.collapsed_path: Optional[Path] = None
+        self._profile = None
+        self._sampler = None
+        self._start = None
+
+    def start(self):
+        """开始剖析（在被剖析的线程中调用）"""
+        if self.mode != 'cprofile':
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        if self.mode != 'sampling':
+            self._profile = cProfile.Profile()
+        self._start = time.perf_counter()
+        if self._sampler:
+            self._sampler.start()
+        if self._profile:
+            self._profile.enable()
+
+    def stop(self):
+        """停止剖析并写出报告"""
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._sampler.stop()
+        self.elapsed = time.perf_counter() - self._start
+        self._write_outputs()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def category_breakdown(self) -> Dict[str, float]:
+        """各类别耗时占比（有采样时基于采样，否则基于cProfile自身耗时）"""
+        if self._sampler:
+            counts = self._sampler.categories
+        elif self._profile:
+            counts = self._profile_categories()
+        else:
+            return {}
+        total = sum(counts.values())
+        if total == 0:
+            return {}
+        return {category: value / total for category, value in counts.most_common()}
+
+    def _profile_categories(self) -> Counter:
+        """cProfile耗时归类：未归类函数（numpy、内置函数）的自身耗时按调用边归到调用者的类别"""
+        stats = pstats.Stats(self._profile).stats
+        resolved: Dict[tuple, Optional[str]] = {}
+
+        def resolve(func):
+            if func in resolved:
+                return resolved[func]
+            resolved[func] = None  # 递归调用环中按未归类处理
+            category = classify_file(func[0])
+            if category is None and func in stats:
+                # 取累计耗时最大的调用者的类别
+                weights = Counter()
+                for caller, edge in stats[func][4].items():
+                    weights[resolve(caller) or 'other'] += edge[3]
+                if weights:
+                    category = weights.most_common(1)[0][0]
+            resolved[func] = category
+            return category
+
+        counts = Counter()
+        for func, (_, _, tottime, _, callers) in stats.items():
+            category = resolve(func)
+            if category is not None or not callers:
+                counts[category or 'other'] += tottime
+                continue
+            for caller, edge in callers.items():
+                counts[resolve(caller) or 'other'] += edge[2]
+        return counts
+
+    def _write_outputs(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        base = f"profile_{self.label}_{stamp}"
+        self.report_path = self.output_dir / f"{base}.txt"
+
+        if self._sampler:
+            self.collapsed_path = self.output_dir / f"{base}.collapsed"
+            with open(self.collapsed_path, 'w', encoding='utf-8') as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            f.write(self.format_summary())
+            f.write("\n\n")
+            f.write(self._pstats_text() if self._profile else self._sampled_functions_text())
+
+    def _pstats_text(self) -> str:
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buffer)
+        stats.sort_stats(self.sort_by).print_stats(self.top_n)
+        return buffer.getvalue()
+
+    def _sampled_functions_text(self) -> str:
+        """仅采样模式下的函数排序（按自身采样数）"""
+        own, cumulative = Counter(), Counter()
+        for stack, count in self._sampler.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for label in set(frames):
+                cumulative[label] += count
+
+        lines = [f"{'自身':>8} {'累计':>8}  函数"]
+        for label, _ in own.most_common(self.top_n):
+            lines.append(f"{own[label]:8d} {cumulative[label]:8d}  {label}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self) -> str:
+        """耗时归类摘要"""
+        lines = [f"性能剖析: {self.label} (模式: {self.mode})",
+                 f"总耗时: {self.elapsed:.3f} s"]
+        if self._sampler:
+            lines.append(f"采样数: {self._sampler.n_samples} "
+                         f"(间隔 {self.sample_interval * 1000:.1f} ms)")
+        lines.append("耗时归类:")
+        for category, share in self.category_breakdown().items():
+            label = CATEGORY_LABELS.get(category, category)
+            lines.append(f"  {label:8} {share * 100:5.1f}%  ~{share * self.elapsed:.3f} s")
+        return "\n".join(lines)
+
+    def print_summary(self):
+        """打印摘要和输出文件路径"""
+        print(self.format_summary())
+        if self.report_path:
+            print(f"[INFO] 剖析报告: {self.report_path}")
+        if self.collapsed_path:
+            print(f"[INFO] 火焰图栈文件: {self.collapsed_path}")
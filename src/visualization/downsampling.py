@@ -0,0 +1,180 @@
+# src/visualization/downsampling.py
+"""
+长轨迹降采样 - 按坐标轴像素宽度决定绘制点数
+min/max分箱保留每个像素列的极值，LTTB保留视觉形状；
+LevelOfDetailPlotter 在坐标轴缩放时用原始数据重新采样
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+DEFAULT_POINTS_PER_PIXEL = 2
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    min/max分箱降采样 - 每个分箱保留最小值和最大值点（按原顺序）
+
+    Args:
+        x: 单调递增的横坐标
+        y: 纵坐标
+        n_out: 目标点数（约等于 2 × 分箱数）
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= max(n_out, 4):
+        return x, y
+
+    n_bins = max(1, n_out // 2)
+    bin_size = int(np.ceil(n / n_bins))
+    n_full = n // bin_size
+    offsets = np.arange(n_full) * bin_size
+
+    # 等宽分箱一次性求每箱的最小/最大值位置，余下不足一箱的尾部单独处理
+    blocks = y[:n_full * bin_size].reshape(n_full, bin_size)
+    parts = [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1), [0, n - 1]]
+    tail_start = n_full * bin_size
+    if tail_start < n:
+        tail = y[tail_start:]
+        parts.append([tail_start + int(tail.argmin()), tail_start + int(tail.argmax())])
+
+    keep = np.unique(np.concatenate(parts).astype(int))
+    return x[keep], y[keep]
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets 降采样"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max(n_out, 3):
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = stop
+        avg_x = x[next_start:next_stop].mean() if next_stop > next_start else x[-1]
+        avg_y = y[next_start:next_stop].mean() if next_stop > next_start else y[-1]
+
+        bx = x[start:stop]
+        by = y[start:stop]
+        area = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(np.argmax(area)) if len(area) else start
+        keep[i + 1] = a
+
+    return x[keep], y[keep]
+
+
+DOWNSAMPLERS = {
+    'minmax': minmax_downsample,
+    'lttb': lttb_downsample
+}
+
+
+def axes_point_budget(ax, points_per_pixel: float = DEFAULT_POINTS_PER_PIXEL,
+                      output_dpi: float = None) -> int:
+    """根据坐标轴像素宽度计算绘制点数（output_dpi用于保存时的更高分辨率）"""
+    width = ax.bbox.width
+    if output_dpi is not None and ax.figure is not None:
+        width *= output_dpi / ax.figure.dpi
+    return max(16, int(width * points_per_pixel))
+
+
+def visible_slice(x: np.ndarray, x_min: float, x_max: float) -> slice:
+    """返回可见横坐标范围对应的切片（两侧各多保留一个点保证连线完整）"""
+    start = max(0, int(np.searchsorted(x, x_min, side='left')) - 1)
+    stop = min(len(x), int(np.searchsorted(x, x_max, side='right')) + 1)
+    return slice(start, stop)
+
+
+class LevelOfDetailPlotter:
+    """多细节层次绘图 - 缩放时按可见范围重新降采样"""
+
+    def __init__(self, points_per_pixel: float = DEFAULT_POINTS_PER_PIXEL,
+                 method: str = 'minmax', output_dpi: float = None):
+        if method not in DOWNSAMPLERS:
+            raise ValueError(f"未知降采样方法: {method}")
+        self.points_per_pixel = points_per_pixel
+        self.downsample = DOWNSAMPLERS[method]
+        self.output_dpi = output_dpi
+        self._series: Dict[object, List[Tuple[object, np.ndarray, np.ndarray]]] = {}
+        self._callbacks: Dict[object, int] = {}
+
+    def plot(self, ax, x, y, **kwargs):
+        """绘制降采样曲线并登记原始数据，返回Line2D对象"""
+        x = np.asarray(x)
+        y = np.asarray(y)
+        n_out = axes_point_budget(ax, self.points_per_pixel, self.output_dpi)
+        xs, ys = self.downsample(x, y, n_out)
+        line, = ax.plot(xs, ys, **kwargs)
+        line._lod_window = slice(0, len(x))
+
+        self._series.setdefault(ax, []).append((line, x, y))
+        if ax not in self._callbacks:
+            self._callbacks[ax] = ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        return line
+
+    def set_data(self, line, x, y):
+        """替换已登记曲线的原始数据并按当前视图重新采样"""
+        ax = line.axes
+        x = np.asarray(x)
+        y = np.asarray(y)
+        series = self._series.setdefault(ax, [])
+        for i, (registered, _, _) in enumerate(series):
+            if registered is line:
+                series[i] = (line, x, y)
+                break
+        else:
+            series.append((line, x, y))
+
+        # 自动缩放时使用全部数据（坐标范围随后由数据决定），用户缩放后只采样可见部分
+        if ax.get_autoscalex_on():
+            line._lod_window = slice(0, len(x))
+        else:
+            x_min, x_max = sorted(ax.get_xlim())
+            line._lod_window = visible_slice(x, x_min, x_max)
+        self._resample_line(ax, line, x, y)
+
+    def _resample_line(self, ax, line, x, y):
+        if len(x) == 0:
+            line.set_data(x, y)
+            return
+        n_out = axes_point_budget(ax, self.points_per_pixel, self.output_dpi)
+        window = line._lod_window
+        xs, ys = self.downsample(x[window], y[window], n_out)
+        line.set_data(xs, ys)
+
+    def _on_xlim_changed(self, ax):
+        """坐标轴范围变化（缩放/平移）时重新采样可见部分
+
+        只替换曲线数据，重绘由触发缩放的工具栏/画布负责
+        """
+        x_min, x_max = sorted(ax.get_xlim())
+        for line, x, y in self._series.get(ax, []):
+            window = visible_slice(x, x_min, x_max)
+            if getattr(line, '_lod_window', None) == window:
+                continue
+            line._lod_window = window
+            self._resample_line(ax, line, x, y)
+
+    def forget(self, ax):
+        """移除坐标轴的登记数据（图表销毁时调用）"""
+        self._series.pop(ax, None)
+        cid = self._callbacks.pop(ax, None)
+        if cid is not None:
+            ax.callbacks.disconnect(cid)
+
+    def clear(self):
+        """移除全部登记数据"""
+        for ax in list(self._callbacks):
+            self.forget(ax)
+        self._series.clear()
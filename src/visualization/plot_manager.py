@@ -8,12 +8,16 @@ import numpy as np
 from pathlib import Path
 from matplotlib.patches import Rectangle
 
+from .downsampling import LevelOfDetailPlotter
+
 
 class PlotManager:
     """图表管理器 - 带参数表入口"""
 
-    def __init__(self):
+    def __init__(self, points_per_pixel=2, downsample_method='minmax'):
         self.setup_matplotlib()
+        # 按坐标轴像素宽度降采样长轨迹
+        self.lod = LevelOfDetailPlotter(points_per_pixel, downsample_method)
 
     def setup_matplotlib(self):
         """配置matplotlib"""
@@ -27,18 +31,22 @@ class PlotManager:
             'figure.titlesize': 14,
         })
 
-    def create_comprehensive_plots(self, results, preset_name):
+    def create_comprehensive_plots(self, results, preset_name, dpi=300):
         """创建综合图表 - 添加参数表入口按钮"""
         if not results or not results.get('success'):
             return None
 
+        # 降采样点数按保存分辨率计算
+        self.lod.clear()
+        self.lod.output_dpi = dpi
+
         model = results['model']
         time = results['time']
         states = results['states']
 
         # 创建图表布局
         fig = plt.figure(figsize=(16, 12))
-        fig.suptitle(f'ADM1 Simulation - {preset_name}\n(30 days, {len(time)} time points)',
+        fig.suptitle(f'ADM1 Simulation - {preset_name}\n({time[-1]:.0f} days, {len(time)} time points)',
                      fontsize=16, fontweight='bold')
 
         # 创建子图网格
@@ -74,7 +82,7 @@ class PlotManager:
         Path('figures').mkdir(exist_ok=True)
         filename = f"comprehensive_results_{preset_name}.png"
         fig_path = Path('figures') / filename
-        plt.savefig(fig_path, dpi=300, bbox_inches='tight')
+        plt.savefig(fig_path, dpi=dpi, bbox_inches='tight')
         print(f"图表已保存: {fig_path}")
 
         return fig
@@ -126,7 +134,7 @@ class PlotManager:
         for var_code, label, color in soluble_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self.lod.plot(ax, time, states[idx, :], label=label, linewidth=1.5, color=color)
 
         ax.set_title('Soluble Substrates')
         ax.set_xlabel('Time (days)')
@@ -146,7 +154,7 @@ class PlotManager:
         for var_code, label, color in particulate_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self.lod.plot(ax, time, states[idx, :], label=label, linewidth=1.5, color=color)
 
         ax.set_title('Particulate Substrates')
         ax.set_xlabel('Time (days)')
@@ -167,7 +175,7 @@ class PlotManager:
         for var_code, label, color in microbial_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=1.5, color=color)
+                self.lod.plot(ax, time, states[idx, :], label=label, linewidth=1.5, color=color)
 
         ax.set_title('Microbial Populations')
         ax.set_xlabel('Time (days)')
@@ -190,10 +198,10 @@ class PlotManager:
             if idx != -1 and idx < states.shape[0]:
                 # 对氢气进行缩放以便显示
                 if var_code == 'S_h2':
-                    ax.plot(time, states[idx, :] * 1000, label=f'{label} (x1000)',
-                            linewidth=2, color=color, linestyle='--')
+                    self.lod.plot(ax, time, states[idx, :] * 1000, label=f'{label} (x1000)',
+                                  linewidth=2, color=color, linestyle='--')
                 else:
-                    ax.plot(time, states[idx, :], label=label, linewidth=2, color=color)
+                    self.lod.plot(ax, time, states[idx, :], label=label, linewidth=2, color=color)
 
         ax.set_title('Key Variables Overview')
         ax.set_xlabel('Time (days)')
@@ -211,7 +219,7 @@ class PlotManager:
         for var_code, label, color in ionic_vars:
             idx = model.get_variable_index(var_code)
             if idx != -1 and idx < states.shape[0]:
-                ax.plot(time, states[idx, :], label=label, linewidth=2, color=color)
+                self.lod.plot(ax, time, states[idx, :], label=label, linewidth=2, color=color)
 
         ax.set_title('Ionic Components')
         ax.set_xlabel('Time (days)')
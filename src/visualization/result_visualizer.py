@@ -42,19 +42,30 @@ class ResultVisualizer:
             ('S_h2', 'Hydrogen')
         ]
 
-        for var_code, name in key_vars:
-            idx = model.get_variable_index(var_code)
-            if idx != -1 and idx < states.shape[0]:
-                initial = states[idx, 0]
-                final = states[idx, -1]
-                change = final - initial
-                change_pct = (change / initial * 100) if abs(initial) > 1e-10 else 0
+        key_vars = [(var_code, name) for var_code, name in key_vars
+                    if 0 <= model.get_variable_index(var_code) < states.shape[0]]
+        rows = [model.get_variable_index(var_code) for var_code, _ in key_vars]
+        ends = states[rows][:, [0, -1]]
+        for (var_code, name), (initial, final) in zip(key_vars, ends):
+            change = final - initial
+            change_pct = (change / initial * 100) if abs(initial) > 1e-10 else 0
 
-                print(f"{var_code} ({name}):")
-                print(f"  初始值: {initial:.4f} gCOD/m³")
-                print(f"  最终值: {final:.4f} gCOD/m³")
-                print(f"  变化量: {change:+.4f} gCOD/m³ ({change_pct:+.1f}%)")
-                print()
+            print(f"{var_code} ({name}):")
+            print(f"  初始值: {initial:.4f} gCOD/m³")
+            print(f"  最终值: {final:.4f} gCOD/m³")
+            print(f"  变化量: {change:+.4f} gCOD/m³ ({change_pct:+.1f}%)")
+            print()
+
+        # 关键性能指标（向量化计算，缓存在 results['kpis']）
+        from analysis.kpi import attach_kpis, format_kpis
+        kpis = attach_kpis(results)
+        if kpis:
+            print("-" * 60)
+            print("关键性能指标")
+            print("-" * 60)
+            for line in format_kpis(kpis):
+                print(line)
+            print()
 
         # 生成带参数表入口的图表
         try:
@@ -0,0 +1,4 @@
+# tests/benchmarks/__init__.py
+"""
+性能基准测试
+"""
@@ -0,0 +1,386 @@
+# tests/benchmarks/benchmark_suite.py
+"""
+ADM1性能基准测试套件
+覆盖模型右端函数、雅可比（含计算后端对比）、完整求解、集合吞吐量、绘图和启动时间，
+结果追加到JSON历史记录，并与基线比较检测性能回退
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SRC_PATH = PROJECT_ROOT / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / 'results' / 'benchmarks'
+DEFAULT_THRESHOLD = 0.10  # 相对基线变慢超过10%视为回退
+
+
+class BenchmarkCase:
+    """单个基准测试用例"""
+
+    def __init__(self, name: str, func: Callable[[], Dict], unit: str,
+                 better: str = 'lower', quick: bool = True):
+        self.name = name
+        self.func = func
+        self.unit = unit
+        self.better = better  # 'lower' 或 'higher'
+        self.quick = quick    # 快速模式是否运行
+
+    def run(self, repeat: int) -> Dict:
+        """重复运行并汇总，value取最优值（减少系统噪声影响）"""
+        samples = []
+        extra = {}
+        for _ in range(max(1, repeat)):
+            outcome = self.func()
+            samples.append(outcome['value'])
+            extra = outcome.get('extra', extra)
+
+        best = min(samples) if self.better == 'lower' else max(samples)
+        return {
+            'value': float(best),
+            'median': float(np.median(samples)),
+            'samples': [float(v) for v in samples],
+            'unit': self.unit,
+            'better': self.better,
+            'extra': extra,
+        }
+
+
+def _rate_per_second(func: Callable[[], None], min_time: float = 0.5) -> float:
+    """在至少min_time秒内重复调用，返回每秒调用次数"""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(100):
+            func()
+        calls += 100
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def _load_presets():
+    from parameters.parameter_manager import ADM1ParameterManager
+    manager = ADM1ParameterManager()
+    return manager, manager.list_available_presets()
+
+
+def bench_rhs() -> Dict:
+    """biochemical_reactions 每秒调用次数"""
+    manager, presets = _load_presets()
+    model, y0 = manager.create_model(presets[0])
+    rate = _rate_per_second(lambda: model.biochemical_reactions(0.0, y0))
+    return {'value': rate}
+
+
+def bench_jacobian() -> Dict:
+    """解析雅可比每秒调用次数"""
+    manager, presets = _load_presets()
+    model, y0 = manager.create_model(presets[0])
+    rate = _rate_per_second(lambda: model.jacobian(0.0, y0))
+    return {'value': rate}
+
+
+def make_kernel_bench(kind: str, backend: str) -> Callable[[], Dict]:
+    """计算后端的右端函数/雅可比每秒调用次数（写入预分配缓冲区）"""
+    def bench() -> Dict:
+        from core.kernels import ModelKernels
+
+        manager, presets = _load_presets()
+        model, y0 = manager.create_model(presets[0])
+        kernels = ModelKernels(model, backend)
+        n = len(y0)
+        if kind == 'rhs':
+            out = np.empty(n)
+            kernels.rates(0.0, y0, out)     # 首次调用包含JIT编译/缓存加载
+            rate = _rate_per_second(lambda: kernels.rates(0.0, y0, out))
+        else:
+            out = np.empty((n, n))
+            kernels.jacobian(0.0, y0, out)
+            rate = _rate_per_second(lambda: kernels.jacobian(0.0, y0, out))
+        return {'value': rate, 'extra': {'backend': kernels.backend}}
+    return bench
+
+
+def make_solve_bench(preset_name: str, days: float,
+                     solver_params: Optional[Dict] = None) -> Callable[[], Dict]:
+    """生成单个预设的完整求解基准（solver_params 为 None 时使用默认求解参数）"""
+    def bench() -> Dict:
+        from solvers.ode_solver import ADM1Solver
+
+        manager, _ = _load_presets()
+        model, y0 = manager.create_model(preset_name)
+        solver = ADM1Solver(dict(solver_params) if solver_params else None)
+        start = time.perf_counter()
+        results = solver.solve(model, (0, days), y0)
+        elapsed = time.perf_counter() - start
+        if not results['success']:
+            raise RuntimeError(f"{preset_name} {days}天求解失败: {results['message']}")
+        return {'value': elapsed,
+                'extra': {'nfev': int(results['nfev']), 'njev': int(results['njev']),
+                          'n_points': int(len(results['time']))}}
+    return bench
+
+
+def bench_ensemble(n_members: int = 16, days: float = 30.0) -> Dict:
+    """集合吞吐量：参数扰动成员的求解并写入内存映射集合存储（成员/秒）"""
+    from dataclasses import replace
+    from core.adm1_model import ADM1Model
+    from solvers.ode_solver import ADM1Solver
+    from storage.ensemble_store import EnsembleWriter
+
+    manager, presets = _load_presets()
+    base_model, y0 = manager.create_model(presets[0])
+    solver = ADM1Solver()
+    grid = np.linspace(0, days, int(days * 10) + 1)
+    rng = np.random.default_rng(42)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        start = time.perf_counter()
+        with EnsembleWriter(tmpdir, n_members, base_model.state_variables, grid) as writer:
+            for i in range(n_members):
+                factor = rng.uniform(0.8, 1.2)
+                model = ADM1Model(replace(base_model.parameters,
+                                          k_m_ac=base_model.parameters.k_m_ac * factor))
+                results = solver.solve(model, (0, days), y0)
+                states = np.vstack([np.interp(grid, results['time'], row)
+                                    for row in results['states']])
+                writer.write_member(i, states)
+        elapsed = time.perf_counter() - start
+
+    return {'value': n_members / elapsed, 'extra': {'n_members': n_members, 'days': days}}
+
+
+def bench_twin(n_digesters: int = 10, minutes: int = 240) -> Dict:
+    """数字孪生吞吐量：多个消化器按1分钟更新推进（更新/秒），附带实时余量"""
+    from realtime.digital_twin import MINUTE, DigitalTwinFleet
+
+    _, presets = _load_presets()
+    fleet = DigitalTwinFleet.from_preset(presets[0], [f"D{i}" for i in range(n_digesters)],
+                                         influent={'flow': 100.0})
+    start = time.perf_counter()
+    for _ in range(minutes):
+        for twin in fleet.twins.values():
+            twin.advance(MINUTE)
+    elapsed = time.perf_counter() - start
+
+    worst = max(twin.latency_stats()['max'] for twin in fleet.twins.values())
+    return {'value': n_digesters * minutes / elapsed,
+            'extra': {'n_digesters': n_digesters, 'realtime_margin': fleet.realtime_margin(),
+                      'max_latency': worst}}
+
+
+def bench_mpc() -> Dict:
+    """一个MPC步（7天时域、逐小时积分）的进料优化时间"""
+    from estimation.filters import ReactorDynamics
+    from optimization.feed_optimizer import FeedOptimizer
+
+    manager, presets = _load_presets()
+    model, influent = manager.create_model(presets[0])
+    y0 = ReactorDynamics(model, dilution=0.05, influent=influent).forecast(
+        0.0, influent[:, None], 60.0)[:, 0]
+    optimizer = FeedOptimizer(model, influent=influent)
+    plan = optimizer.optimize(y0)
+    return {'value': plan.elapsed,
+            'extra': {'evaluations': plan.evaluations, 'feasible': plan.feasible}}
+
+
+def bench_plot() -> Dict:
+    """综合图表生成时间（Agg后端，不显示）"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from solvers.ode_solver import ADM1Solver
+    from visualization.plot_manager import PlotManager
+
+    manager, presets = _load_presets()
+    model, y0 = manager.create_model(presets[0])
+    results = ADM1Solver().solve(model, (0, 30), y0)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.chdir(tmpdir)
+        try:
+            plotter = PlotManager()
+            start = time.perf_counter()
+            fig = plotter.create_comprehensive_plots(results, presets[0], dpi=100)
+            elapsed = time.perf_counter() - start
+            plt.close(fig)
+        finally:
+            os.chdir(cwd)
+    return {'value': elapsed}
+
+
+def bench_startup() -> Dict:
+    """冷启动时间：新进程导入模型、求解器和参数管理器"""
+    code = ("import sys; sys.path.insert(0, %r); "
+            "import core.adm1_model, solvers.ode_solver, parameters.parameter_manager") % str(SRC_PATH)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+    return {'value': time.perf_counter() - start}
+
+
+def build_cases() -> List[BenchmarkCase]:
+    """构建全部基准用例"""
+    _, presets = _load_presets()
+    cases = [
+        BenchmarkCase('model.rhs_calls_per_s', bench_rhs, 'calls/s', better='higher'),
+        BenchmarkCase('model.jacobian_calls_per_s', bench_jacobian, 'calls/s', better='higher'),
+    ]
+    for preset_name in presets:
+        cases.append(BenchmarkCase(f'solve.{preset_name}.30d', make_solve_bench(preset_name, 30),
+                                   's'))
+        cases.append(BenchmarkCase(f'solve.{preset_name}.365d', make_solve_bench(preset_name, 365),
+                                   's', quick=False))
+    # 金属络合处理方式对比（不限最大步长，步数由刚性和精度决定）
+    if presets:
+        for mode in ('coupled', 'qssa', 'split'):
+            params = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8, 'max_step': np.inf,
+                      'metal_mode': mode}
+            cases.append(BenchmarkCase(f'solve.{presets[0]}.30d.metal_{mode}',
+                                       make_solve_bench(presets[0], 30, params), 's'))
+    # 计算后端对比（未安装numba时 auto 回退到numpy，extra.backend 记录实际后端）
+    for backend in ('numpy', 'auto'):
+        cases.append(BenchmarkCase(f'kernel.{backend}.rhs_calls_per_s',
+                                   make_kernel_bench('rhs', backend), 'calls/s', better='higher'))
+        cases.append(BenchmarkCase(f'kernel.{backend}.jacobian_calls_per_s',
+                                   make_kernel_bench('jacobian', backend), 'calls/s',
+                                   better='higher'))
+    if presets:
+        params = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8, 'max_step': 0.1,
+                  'first_step': 0.01, 'jacobian': 'analytic', 'kernel': 'auto'}
+        cases.append(BenchmarkCase(f'solve.{presets[0]}.30d.kernel_auto',
+                                   make_solve_bench(presets[0], 30, params), 's'))
+    cases += [
+        BenchmarkCase('ensemble.members_per_s', bench_ensemble, 'members/s', better='higher'),
+        BenchmarkCase('twin.updates_per_s', bench_twin, 'updates/s', better='higher'),
+        BenchmarkCase('mpc.step', bench_mpc, 's'),
+        BenchmarkCase('plot.comprehensive', bench_plot, 's'),
+        BenchmarkCase('startup.import', bench_startup, 's'),
+    ]
+    return cases
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(quick: bool = False, repeat: int = 3, pattern: Optional[str] = None,
+              progress: Callable[[str], None] = print) -> Dict:
+    """
+    运行基准套件
+
+    Args:
+        quick: 快速模式（跳过365天求解等耗时用例）
+        repeat: 每个用例的重复次数
+        pattern: 只运行名称包含该字符串的用例
+    """
+    results = {}
+    for case in build_cases():
+        if quick and not case.quick:
+            continue
+        if pattern and pattern not in case.name:
+            continue
+        progress(f"[PROGRESS] {case.name}")
+        results[case.name] = case.run(repeat)
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def append_history(run: Dict, output_dir: Path = DEFAULT_OUTPUT_DIR) -> Path:
+    """追加到JSON历史记录"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    history_path = output_dir / 'history.json'
+    history = []
+    if history_path.exists():
+        with open(history_path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    history.append(run)
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    return history_path
+
+
+def save_baseline(run: Dict, output_dir: Path = DEFAULT_OUTPUT_DIR) -> Path:
+    """保存为基线"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    baseline_path = output_dir / 'baseline.json'
+    with open(baseline_path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+    return baseline_path
+
+
+def load_baseline(output_dir: Path = DEFAULT_OUTPUT_DIR) -> Optional[Dict]:
+    """读取基线（不存在时返回None）"""
+    baseline_path = Path(output_dir) / 'baseline.json'
+    if not baseline_path.exists():
+        return None
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(run: Dict, baseline: Dict,
+                        threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    与基线比较
+
+    Returns:
+        每个共有用例的比较记录；slowdown>0 表示变慢，regression 标记超过阈值的回退
+    """
+    comparisons = []
+    for name, current in run['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference or not reference['value']:
+            continue
+        ratio = current['value'] / reference['value']
+        slowdown = ratio - 1.0 if current['better'] == 'lower' else 1.0 / ratio - 1.0
+        comparisons.append({
+            'name': name,
+            'baseline': reference['value'],
+            'current': current['value'],
+            'unit': current['unit'],
+            'slowdown': slowdown,
+            'regression': slowdown > threshold,
+        })
+    return comparisons
+
+
+def format_report(run: Dict, comparisons: Optional[List[Dict]] = None) -> str:
+    """格式化文本报告"""
+    lines = ["=" * 72, f"ADM1基准测试 - {run['timestamp']} (commit {run.get('commit') or 'N/A'})",
+             "=" * 72]
+    compared = {c['name']: c for c in comparisons or []}
+    for name, result in run['results'].items():
+        line = f"{name:40} {result['value']:14.4g} {result['unit']:10}"
+        if name in compared:
+            c = compared[name]
+            flag = '[REGRESSION]' if c['regression'] else ''
+            line += f" {c['slowdown'] * 100:+6.1f}% {flag}"
+        lines.append(line)
+    return "\n".join(lines)
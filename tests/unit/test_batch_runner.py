@@ -0,0 +1,141 @@
+# tests/unit/test_batch_runner.py
+"""
+情景文件与批量运行单元测试
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestBatchRunner(unittest.TestCase):
+    """情景批量运行单元测试"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_scenario_formats(self):
+        """测试 JSON（含默认值与全因子 sweep）和 CSV 情景文件"""
+        from scenarios import load_scenarios
+
+        path = self.root / 'scenarios.json'
+        path.write_text(json.dumps({
+            'defaults': {'days': 5, 'outputs': ['S_ac']},
+            'scenarios': [
+                {'name': 'base', 'preset': 'food_waste', 'parameters': {'KI_NH3': 0.002}},
+                {'name': 'doe', 'preset': 'food_waste',
+                 'sweep': {'k_m_ac': [5, 7], 'K_S_ac': [0.1, 0.2]}},
+            ]}), encoding='utf-8')
+        scenarios = load_scenarios(path)
+        self.assertEqual(len(scenarios), 5)
+        self.assertEqual(scenarios[0].parameters, {'KI_nh3': 0.002})
+        self.assertEqual(scenarios[0].days, 5.0)
+        self.assertEqual(scenarios[1].name, 'doe[k_m_ac=5,K_S_ac=0.1]')
+        self.assertEqual(scenarios[4].parameters, {'k_m_ac': 7.0, 'K_S_ac': 0.2})
+
+        csv_path = self.root / 'scenarios.csv'
+        csv_path.write_text("name,preset,days,outputs,param.k_m_ac,init.S_ac,solver.method,store\n"
+                            "a,food_waste,3,S_ac;S_pro,6.0,,,\n"
+                            "b,sewage_sludge,2,,,4.0,LSODA,true\n", encoding='utf-8')
+        a, b = load_scenarios(csv_path)
+        self.assertEqual((a.parameters, a.outputs), ({'k_m_ac': 6.0}, ['S_ac', 'S_pro']))
+        self.assertEqual((b.initial_conditions, b.solver, b.store),
+                         ({'S_ac': 4.0}, {'method': 'LSODA'}, True))
+
+    def test_scenario_validation(self):
+        """测试未知参数、状态变量、字段与重名情景在运行前报错"""
+        from scenarios import build_scenarios
+
+        for entries in ([{'name': 'x', 'preset': 'food_waste', 'parameters': {'k_m_xx': 1}}],
+                        [{'name': 'x', 'preset': 'food_waste', 'outputs': ['S_xx']}],
+                        [{'name': 'x', 'preset': 'food_waste', 'duration': 5}],
+                        [{'name': 'x'}],
+                        [{'name': 'x', 'preset': 'food_waste', 'days': 0}],
+                        [{'name': 'x', 'preset': 'food_waste'}, {'name': 'x', 'preset': 'a'}]):
+            with self.assertRaises(ValueError):
+                build_scenarios(entries)
+        with self.assertRaises(ValueError):
+            from scenarios import load_scenarios
+            load_scenarios(self.root / 'scenarios.txt')
+
+    def test_run_and_resume(self):
+        """测试批量运行、汇总表、失败情景不中断批次，以及断点续跑"""
+        from scenarios import BatchRunner, build_scenarios
+
+        scenarios = build_scenarios([
+            {'name': 'base', 'preset': 'food_waste', 'days': 2, 'outputs': ['S_ac'],
+             'store': True},
+            {'name': 'fast_ac', 'preset': 'food_waste', 'days': 2, 'outputs': ['S_ac'],
+             'parameters': {'k_m_ac': 14.0}},
+            {'name': 'missing', 'preset': 'no_such_preset', 'days': 2},
+        ])
+        output_dir = self.root / 'batch'
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = BatchRunner(scenarios, output_dir).run()
+        self.assertEqual((result.n_run, result.n_skipped, result.n_failed), (3, 0, 1))
+        base, fast, missing = result.rows
+        self.assertTrue(base['success'])
+        self.assertLess(fast['S_ac_final'], base['S_ac_final'])
+        self.assertIn('KeyError', missing['message'])
+        self.assertTrue((Path(base['store_path']) / 'metadata.json').exists())
+        header = (output_dir / 'summary.csv').read_text(encoding='utf-8').splitlines()[0]
+        self.assertTrue(header.startswith('name,preset,days,success'))
+
+        # 写坏的进度行被忽略；已完成的跳过，失败的和定义改变的重新运行
+        with open(output_dir / 'progress.jsonl', 'a', encoding='utf-8') as f:
+            f.write('{"key": "trunc')
+        scenarios[1].days = 3.0
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = BatchRunner(scenarios, output_dir).run()
+        self.assertEqual((result.n_run, result.n_skipped), (2, 1))
+        self.assertEqual(result.rows[1]['days'], 3.0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = BatchRunner(scenarios, output_dir, retry_failed=False).run()
+        self.assertEqual(result.n_run, 0)
+        self.assertEqual(len(json.loads((output_dir / 'summary.json').read_text('utf-8'))), 3)
+
+    def test_resume_key_tracks_schema_and_preset(self):
+        """测试汇总行格式版本或预设内容改变后，已完成的情景重新运行"""
+        from parameters.parameter_manager import ADM1ParameterManager
+        from parameters.preset_registry import compile_preset
+        from scenarios import BatchRunner, build_scenarios, preset_digest
+
+        compiled = ADM1ParameterManager().get_compiled_preset('food_waste')
+        data = dict(compiled.data, kinetic_parameters=dict(
+            compiled.data.get('kinetic_parameters', {}), k_m_ac=14.0))
+        self.assertEqual(preset_digest(compile_preset('x', compiled.source, compiled.data)),
+                         preset_digest(compiled))
+        self.assertNotEqual(preset_digest(compile_preset('x', compiled.source, data)),
+                            preset_digest(compiled))
+
+        scenarios = build_scenarios([{'name': 'base', 'preset': 'food_waste', 'days': 1}])
+        output_dir = self.root / 'batch'
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return BatchRunner(scenarios, output_dir).run()
+
+        self.assertEqual(run().n_run, 1)
+        self.assertEqual(run().n_run, 0)
+        with mock.patch('scenarios.batch_runner.RESULTS_SCHEMA_VERSION', -1):
+            self.assertEqual(run().n_run, 1)
+        with mock.patch('scenarios.batch_runner.preset_digest', lambda compiled: 'changed'):
+            self.assertEqual(run().n_run, 1)
+        self.assertEqual(run().n_run, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
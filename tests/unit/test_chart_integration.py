@@ -0,0 +1,131 @@
+# tests/unit/test_chart_integration.py
+"""
+GUI 图表增量更新单元测试（Agg 后端，不创建窗口）
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from core.adm1_model import ADM1Model
+
+
+class TestChartIntegration(unittest.TestCase):
+    """图表增量更新单元测试"""
+
+    def setUp(self):
+        from gui.chart_integration import BlitManager, ChartManager
+
+        self.model = ADM1Model()
+        self.time = np.linspace(0.0, 10.0, 200)
+        rng = np.random.default_rng(0)
+        self.states = 1.0 + rng.random((len(self.model.state_variables), len(self.time)))
+        results = {'success': True, 'model': self.model, 'time': self.time,
+                   'states': self.states}
+
+        # 与 ChartManager.create_subplot 相同的装配，画布换成 Agg
+        self.manager = ChartManager(parent_frame=None)
+        self.manager.model = self.model
+        self.draws = {}
+        for key, plot in (('chart_0_0', self.manager.plot_soluble_substrates),
+                          ('chart_1_0', self.manager.plot_microbial_populations)):
+            fig = Figure(figsize=(6, 4), dpi=100)
+            ax = fig.add_subplot(111)
+            plot(ax, results)
+            canvas = FigureCanvasAgg(fig)
+            blitter = BlitManager(canvas)
+            for line in ax.get_lines():
+                if line in self.manager.line_sources:
+                    blitter.add_artist(line)
+            self.draws[key] = 0
+            canvas.mpl_connect('draw_event', lambda event, key=key: self._count(key))
+            canvas.draw()
+            self.manager.figures[key] = fig
+            self.manager.canvases[key] = canvas
+            self.manager.blitters[key] = blitter
+
+    def _count(self, key):
+        self.draws[key] += 1
+
+    def _lines(self):
+        return [line for fig in self.manager.figures.values()
+                for ax in fig.axes for line in ax.get_lines()]
+
+    def test_repeated_updates_reuse_artists(self):
+        """测试重复更新复用同一 Figure、画布与 Line2D，并替换曲线数据"""
+        lines = self._lines()
+        figures = dict(self.manager.figures)
+        canvases = dict(self.manager.canvases)
+        self.assertTrue(all(line.get_animated() for line in lines))
+
+        for k in range(1, 4):
+            n = 50 * k
+            states = 1.0 + 0.5 * self.states[:, :n] / k
+            self.manager.update_chart_data(self.time[:n], states)
+
+            self.assertEqual([id(line) for line in self._lines()], [id(line) for line in lines])
+            self.assertEqual(self.manager.figures, figures)
+            self.assertEqual(self.manager.canvases, canvases)
+            for line in lines:
+                idx, scale = self.manager.line_sources[line]
+                np.testing.assert_allclose(line.get_xdata(), self.time[:n])
+                np.testing.assert_allclose(line.get_ydata(), states[idx] * scale)
+
+    def test_blit_within_view_redraw_when_growing(self):
+        """测试数据在当前坐标范围内时只 blit，超出范围时扩展坐标轴并完整重绘"""
+        blitter = self.manager.blitters['chart_0_0']
+        background = blitter.background
+        self.assertIsNotNone(background)
+        before = dict(self.draws)
+
+        self.manager.update_chart_data(self.time, 1.0 + 0.5 * self.states)
+        self.assertEqual(self.draws, before)
+        self.assertIs(blitter.background, background)
+
+        ax = self.manager.figures['chart_0_0'].axes[0]
+        y_max = ax.get_ylim()[1]
+        self.manager.update_chart_data(self.time, 10.0 * self.states)
+        self.assertEqual(self.draws['chart_0_0'], before['chart_0_0'] + 1)
+        self.assertGreater(ax.get_ylim()[1], y_max)
+        self.assertIsNot(blitter.background, background)
+
+    def test_update_charts_new_model_same_layout(self):
+        """测试新模型状态变量布局相同时复用画布，布局变化时完整重建"""
+        self.manager.main_frame = SimpleNamespace(winfo_exists=lambda: True)
+        lines = self._lines()
+        canvases = dict(self.manager.canvases)
+        model = ADM1Model()
+        results = {'success': True, 'model': model, 'time': self.time,
+                   'states': 0.5 * self.states}
+
+        with mock.patch.object(self.manager, 'create_comprehensive_charts') as rebuild:
+            frame = self.manager.update_charts(results, 'default')
+        rebuild.assert_not_called()
+        self.assertIs(frame, self.manager.main_frame)
+        self.assertIs(self.manager.model, model)
+        self.assertEqual(self.manager.canvases, canvases)
+        self.assertEqual([id(line) for line in self._lines()], [id(line) for line in lines])
+        for line in lines:
+            idx, scale = self.manager.line_sources[line]
+            np.testing.assert_allclose(line.get_ydata(), 0.5 * self.states[idx] * scale)
+
+        other = SimpleNamespace(state_variables=list(model.state_variables)[:-1])
+        with mock.patch.object(self.manager, 'create_comprehensive_charts') as rebuild:
+            self.manager.update_charts(dict(results, model=other), 'default')
+        rebuild.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/unit/test_cli_interface.py
+"""
+命令行模拟流程单元测试
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestCLIInterface(unittest.TestCase):
+    """命令行模拟流程单元测试"""
+
+    def test_preset_drives_model(self):
+        """测试 --preset 使用预设的参数与初始条件求解"""
+        from interface.cli_interface import CLIInterface
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        calls = []
+
+        def solve(solver, model, t_span, y0=None, **kwargs):
+            calls.append((model, t_span, y0))
+            return {'success': False, 'message': 'stub'}
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # CLI 在当前目录创建 results/ 与 figures/
+            try:
+                with mock.patch('solvers.ode_solver.ADM1Solver.solve', solve), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    CLIInterface().run_simulation('sewage_sludge', days=3)
+            finally:
+                os.chdir(cwd)
+
+        (model, t_span, y0), = calls
+        expected, expected_y0 = ADM1ParameterManager().create_model('sewage_sludge')
+        self.assertEqual(t_span, (0, 3))
+        np.testing.assert_array_equal(model.parameter_vector.fields,
+                                      expected.parameter_vector.fields)
+        np.testing.assert_array_equal(y0, expected_y0)
+        self.assertNotEqual(model.parameters.k_m_ac, 8.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# tests/unit/test_digital_twin.py
+"""
+实时数字孪生与传感器数据源单元测试
+"""
+
+import json
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestDigitalTwin(unittest.TestCase):
+    """数字孪生单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+        self.model = ADM1Model()
+
+    def test_incremental_advance_matches_batch(self):
+        """测试分钟级增量推进与一次推进结果一致，并与批量求解吻合"""
+        from realtime.digital_twin import MINUTE, DigitalTwin
+        from solvers.ode_solver import ADM1Solver
+
+        incremental = DigitalTwin(self.model)
+        for _ in range(120):
+            incremental.advance(MINUTE)
+        single = DigitalTwin(self.model)
+        single.advance(120 * MINUTE)
+
+        self.assertAlmostEqual(incremental.t, 120 * MINUTE)
+        np.testing.assert_allclose(incremental.state, single.state, rtol=1e-12, atol=1e-14)
+        self.assertEqual(incremental.latency_stats()['steps'], 120)
+
+        reference = ADM1Solver({'method': 'BDF', 'rtol': 1e-9, 'atol': 1e-11,
+                                'max_step': 0.01}).solve(self.model, (0, 120 * MINUTE))
+        # 定步长无误差控制：以初始量级衡量（耗尽到接近零的底物相对误差不具代表性）
+        y_ref = reference['states'][:, -1]
+        scale = np.abs(self.model.initial_conditions) + np.abs(y_ref) + 1e-6
+        self.assertLess(np.max(np.abs(incremental.state - y_ref) / scale), 1e-3)
+
+    def test_dilution_washes_toward_influent(self):
+        """测试进水稀释：高流量下状态趋向进水组成"""
+        from realtime.digital_twin import DigitalTwin
+
+        twin = DigitalTwin(self.model, volume=100.0, solver_params={'fixed_step': 0.001})
+        twin.advance(0.5, {'flow': 2000.0, 'S_IN': 0.2, 'S_I': 3.0})
+        index = self.model.variable_index
+        self.assertAlmostEqual(twin.value('S_I'), 3.0, places=3)
+        self.assertAlmostEqual(twin.value('S_IN'), 0.2, places=2)
+        self.assertAlmostEqual(twin.dilution, 20.0)
+        with self.assertRaises(KeyError):
+            twin.set_influent({'S_unknown': 1.0})
+        self.assertIn('S_IN', index)
+
+    def test_assimilation_nudges_state(self):
+        """测试同化把状态向测量值推近并返回新息"""
+        from realtime.digital_twin import DigitalTwin, NudgingAssimilator
+
+        for method in ('Rosenbrock', 'BDF'):
+            twin = DigitalTwin(self.model, solver_params={'method': method},
+                               assimilator=NudgingAssimilator(gain=0.5))
+            twin.advance(0.01)
+            before = twin.value('S_ac')
+            innovation = twin.assimilate({'S_ac': before + 1.0, 'unknown': 1.0})
+            self.assertAlmostEqual(innovation['S_ac'], 1.0)
+            self.assertNotIn('unknown', innovation)
+            self.assertAlmostEqual(twin.value('S_ac'), before + 0.5)
+            # 同化后继续推进
+            twin.advance(0.01)
+            self.assertAlmostEqual(twin.t, 0.02)
+
+    def test_fleet_runs_file_and_socket_feeds(self):
+        """测试多消化器按文件/套接字数据源推进"""
+        from inputs.sensor_feed import (FileSensorFeed, SensorReading, SocketSensorFeed,
+                                        write_readings)
+        from realtime.digital_twin import MINUTE, DigitalTwin, DigitalTwinFleet
+
+        readings = []
+        for minute in range(1, 31):
+            for name in ('D1', 'D2'):
+                readings.append(SensorReading(t=minute * MINUTE, digester=name, flow=100.0,
+                                              measurements={'S_ac': 3.0} if minute % 10 == 0
+                                              else {}))
+        readings.append(SensorReading(t=0.0, digester='D1'))  # 过期读数
+
+        def make_fleet():
+            return DigitalTwinFleet([DigitalTwin(self.model, name=name) for name in ('D1', 'D2')])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_readings(Path(tmp) / 'scada.jsonl', readings)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("not json\n")
+            feed = FileSensorFeed(path)
+            fleet = make_fleet()
+            summary = fleet.run(feed)
+            self.assertEqual(summary['readings'], 61)
+            self.assertEqual(summary['stale'], 1)
+            self.assertEqual(feed.n_invalid, 1)
+            self.assertAlmostEqual(fleet['D2'].t, 30 * MINUTE)
+            self.assertEqual(fleet['D1'].n_assimilations, 3)
+            self.assertGreater(fleet.realtime_margin(), 1.0)
+
+        # 套接字数据源：本地服务端发送同样的读数
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+
+        def serve():
+            conn, _ = server.accept()
+            with conn:
+                for reading in readings[:60]:
+                    conn.sendall((json.dumps(reading.to_dict()) + "\n").encode('utf-8'))
+            server.close()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        fleet = make_fleet()
+        summary = fleet.run(SocketSensorFeed('127.0.0.1', port, timeout=10))
+        thread.join(timeout=10)
+        self.assertEqual(summary['readings'], 60)
+        self.assertAlmostEqual(fleet['D1'].t, 30 * MINUTE)
+
+    def test_reading_parsing(self):
+        """测试读数解析：分钟时间字段与缺少时间的错误"""
+        from inputs.sensor_feed import parse_reading
+
+        reading = parse_reading('{"minute": 90, "digester": "D1", "influent": {"S_su": 1}}')
+        self.assertAlmostEqual(reading.t, 90 / 1440)
+        self.assertEqual(reading.influent_update(), {'S_su': 1.0})
+        self.assertIsNone(parse_reading('   '))
+        with self.assertRaises(ValueError):
+            parse_reading('{"digester": "D1"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
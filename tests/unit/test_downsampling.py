@@ -0,0 +1,95 @@
+# tests/unit/test_downsampling.py
+"""
+长轨迹降采样单元测试
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from visualization.downsampling import (LevelOfDetailPlotter, axes_point_budget,
+                                        lttb_downsample, minmax_downsample)
+
+
+class TestDownsampling(unittest.TestCase):
+    """降采样单元测试"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.linspace(0.0, 100.0, 100_001)
+        self.y = np.sin(self.x) + 0.1 * rng.standard_normal(len(self.x))
+        # 单点尖峰：全局极值只出现一次
+        self.y[31_337] = 5.0
+        self.y[77_777] = -5.0
+
+    def test_output_length(self):
+        """测试输出点数不超过点数预算"""
+        for n_out in (16, 100, 999, 2000):
+            xs, _ = minmax_downsample(self.x, self.y, n_out)
+            self.assertLessEqual(len(xs), n_out + 4)
+            self.assertGreater(len(xs), n_out // 2)
+            xs, _ = lttb_downsample(self.x, self.y, n_out)
+            self.assertEqual(len(xs), n_out)
+
+    def test_keeps_extrema_and_endpoints(self):
+        """测试保留首末点；min/max 分箱保留全局极值，结果按横坐标有序"""
+        for downsample in (minmax_downsample, lttb_downsample):
+            xs, ys = downsample(self.x, self.y, 500)
+            self.assertEqual((xs[0], xs[-1]), (self.x[0], self.x[-1]))
+            self.assertTrue(np.all(np.diff(xs) > 0))
+            self.assertTrue(np.isin(xs, self.x).all())
+        xs, ys = minmax_downsample(self.x, self.y, 500)
+        self.assertEqual((ys.max(), ys.min()), (5.0, -5.0))
+
+    def test_short_input_unchanged(self):
+        """测试目标点数不小于输入长度时原样返回"""
+        x, y = self.x[:50], self.y[:50]
+        for downsample in (minmax_downsample, lttb_downsample):
+            for n_out in (50, 200):
+                xs, ys = downsample(x, y, n_out)
+                np.testing.assert_array_equal(xs, x)
+                np.testing.assert_array_equal(ys, y)
+
+    def test_resample_on_zoom(self):
+        """测试坐标轴缩放后按可见范围重新采样，点数仍受像素预算限制"""
+        fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+        try:
+            plotter = LevelOfDetailPlotter()
+            line = plotter.plot(ax, self.x, self.y)
+            budget = axes_point_budget(ax)
+            self.assertLessEqual(len(line.get_xdata()), budget + 4)
+            full_step = np.median(np.diff(line.get_xdata()))
+
+            ax.set_xlim(30.0, 32.0)
+            xs = line.get_xdata()
+            self.assertLessEqual(len(xs), budget + 4)
+            self.assertLessEqual(xs[0], 30.0)
+            self.assertGreaterEqual(xs[-1], 32.0)
+            self.assertLess(xs[-1] - xs[0], 2.1)
+            self.assertLess(np.median(np.diff(xs)), full_step / 10)
+            self.assertIn(5.0, line.get_ydata())
+
+            plotter.set_data(line, self.x, -self.y)
+            self.assertIn(-5.0, line.get_ydata())
+            self.assertLess(line.get_xdata()[-1] - line.get_xdata()[0], 2.1)
+
+            # 移除登记后缩放不再重新采样
+            xs = line.get_xdata()
+            plotter.forget(ax)
+            ax.set_xlim(0.0, 100.0)
+            np.testing.assert_array_equal(line.get_xdata(), xs)
+        finally:
+            plt.close(fig)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# tests/unit/test_ensemble_store.py
+"""
+集合存储单元测试 - 内存映射视图与分块统计
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestEnsembleStore(unittest.TestCase):
+    """集合存储单元测试"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_views_and_percentiles(self):
+        """测试变量视图不复制数据，分块分位数与整体计算一致"""
+        from core.adm1_model import ADM1Model
+        from storage.ensemble_store import EnsembleWriter, EnsembleReader
+
+        model = ADM1Model()
+        rng = np.random.default_rng(0)
+        time = np.linspace(0, 1, 50)
+        data = rng.random((40, len(model.state_variables), len(time)))
+
+        with EnsembleWriter(self.tmpdir.name, 40, model.state_variables, time) as writer:
+            writer.write_members(0, data[:30])
+            for i in range(30, 40):
+                writer.write_member(i, data[i])
+
+        reader = EnsembleReader(self.tmpdir.name, model=model)
+        view = reader.variable('S_ch4')
+        self.assertIsInstance(view, np.memmap)
+        self.assertFalse(view.flags['OWNDATA'])
+
+        idx = model.variable_index['S_ch4']
+        band = reader.percentile_band('S_ch4', q=(5, 50, 95), block_bytes=8 * 40 * 7)
+        expected = np.percentile(data[:, idx, :], (5, 50, 95), axis=0)
+        np.testing.assert_allclose(band, expected)
+
+        mean, std = reader.mean_std('S_ch4', block_bytes=8 * 40 * 3)
+        np.testing.assert_allclose(mean, data[:, idx, :].mean(axis=0))
+        np.testing.assert_allclose(std, data[:, idx, :].std(axis=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
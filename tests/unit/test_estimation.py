@@ -0,0 +1,183 @@
+# tests/unit/test_estimation.py
+"""
+状态估计（EKF/EnKF）、批量模型求值与测量文件单元测试
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestBatchedModel(unittest.TestCase):
+    """模型按列批量求值单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+        self.model = ADM1Model()
+        rng = np.random.default_rng(0)
+        y0 = self.model.initial_conditions
+        self.Y = y0[:, None] * rng.uniform(0.5, 1.5, (len(y0), 5))
+
+    def test_rhs_and_jacobian_match_columns(self):
+        """测试 (n, m) 状态的右端函数、雅可比和甲烷速率与逐列结果一致"""
+        rates = self.model.biochemical_reactions(0.0, self.Y)
+        J = self.model.jacobian(0.0, self.Y)
+        q = self.model.methane_production_rate(self.Y)
+        self.assertEqual(rates.shape, self.Y.shape)
+        self.assertEqual(J.shape, (self.Y.shape[0],) + self.Y.shape)
+        for j in range(self.Y.shape[1]):
+            y = self.Y[:, j]
+            np.testing.assert_allclose(rates[:, j], self.model.biochemical_reactions(0.0, y))
+            np.testing.assert_allclose(J[:, :, j], self.model.jacobian(0.0, y))
+            self.assertAlmostEqual(q[j], self.model.methane_production_rate(y))
+        self.assertTrue(np.all(q > 0))
+
+    def test_rosenbrock_batch_matches_twin(self):
+        """测试批量Rosenbrock与数字孪生的定步长积分一致"""
+        from realtime.digital_twin import MINUTE, DigitalTwin
+        from solvers.integrators import rosenbrock_batch
+
+        twin = DigitalTwin(self.model)
+        twin.advance(60 * MINUTE)
+        Y = rosenbrock_batch(self.model.biochemical_reactions, self.model.jacobian, 0.0,
+                             np.repeat(self.model.initial_conditions[:, None], 3, axis=1),
+                             MINUTE, 60)
+        for j in range(3):
+            np.testing.assert_allclose(Y[:, j], twin.state, rtol=1e-6, atol=1e-10)
+
+
+class TestMeasurements(unittest.TestCase):
+    """测量文件单元测试"""
+
+    def test_load_aliases_and_missing_values(self):
+        """测试小时时间列、列名别名和缺测"""
+        from estimation.measurements import load_measurements, save_measurements
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'measurements.csv'
+            path.write_text("hour,CH4,vfa,pH\n2,1.5,,7.1\n1,1.2,30,7.0\n", encoding='utf-8')
+            series = load_measurements(path)
+            np.testing.assert_allclose(series.times, [1 / 24, 2 / 24])
+            self.assertEqual(series.names, ['q_ch4', 'VFA', 'pH'])
+            self.assertEqual(series.at(1), {'q_ch4': 1.5, 'pH': 7.1})
+
+            copy = load_measurements(save_measurements(series, Path(tmp) / 'copy.csv'))
+            np.testing.assert_allclose(copy.times, series.times)
+            np.testing.assert_allclose(copy.values['VFA'], series.values['VFA'])
+
+    def test_sample_file(self):
+        """测试随仓库提供的示例测量文件可直接读取"""
+        from estimation.measurements import DEFAULT_MEASUREMENT_FILE, load_measurements
+
+        self.assertTrue(DEFAULT_MEASUREMENT_FILE.exists())
+        series = load_measurements()
+        self.assertEqual(series.names, ['q_ch4', 'VFA'])
+        self.assertEqual(len(series), 21)
+        self.assertEqual(series.at(1), {'q_ch4': series.values['q_ch4'][1]})
+
+    def test_observation_operators(self):
+        """测试VFA与甲烷速率观测及不支持的pH"""
+        from core.adm1_model import ADM1Model
+        from estimation.observations import ObservationModel, is_supported
+
+        model = ADM1Model()
+        y = model.initial_conditions
+        observe = ObservationModel(model, ['VFA', 'S_ac', 'q_ch4'])
+        values = observe(y)
+        index = model.variable_index
+        self.assertAlmostEqual(values[0], sum(y[index[v]] for v in ('S_va', 'S_bu', 'S_pro', 'S_ac')))
+        self.assertAlmostEqual(values[2], model.methane_production_rate(y))
+        H = observe.jacobian(y)
+        self.assertEqual(H.shape, (3, len(y)))
+        self.assertAlmostEqual(H[1, index['S_ac']], 1.0)
+        self.assertGreater(H[2, index['X_ac']], 0.0)
+        self.assertFalse(is_supported('pH', model))
+        with self.assertRaises(ValueError):
+            ObservationModel(model, ['pH'])
+
+
+class TestKalmanFilters(unittest.TestCase):
+    """EKF/EnKF 孪生实验单元测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        from core.adm1_model import ADM1Model
+        from estimation.filters import ReactorDynamics
+        from estimation.measurements import synthesize_measurements
+
+        cls.model = ADM1Model()
+        y0 = cls.model.initial_conditions
+        cls.dynamics = ReactorDynamics(cls.model, dilution=1 / 20, influent=y0)
+        cls.times = np.arange(0.0, 10.0 + 1e-9, 1 / 24)
+        cls.series, cls.truth = synthesize_measurements(cls.dynamics, y0, cls.times, seed=1)
+
+        # 错误的初始生物量：乙酸/氢利用菌低估一半
+        cls.x0 = y0.copy()
+        for name in ('X_ac', 'X_h2'):
+            cls.x0[cls.model.variable_index[name]] *= 0.5
+        trajectory = [cls.x0[:, None]]
+        for t, t_next in zip(cls.times[:-1], cls.times[1:]):
+            trajectory.append(cls.dynamics.forecast(t, trajectory[-1], t_next - t))
+        cls.open_loop = np.hstack(trajectory)
+
+    def error(self, trajectory, name):
+        idx = self.model.variable_index[name]
+        return np.sqrt(np.mean((trajectory[idx] - self.truth[idx]) ** 2))
+
+    def test_filters_correct_biomass(self):
+        """测试EKF与EnKF同化甲烷速率和VFA后生物量误差明显小于开环预报"""
+        from estimation.filters import EnsembleKalmanFilter, ExtendedKalmanFilter
+
+        filters = {
+            'ekf': ExtendedKalmanFilter(self.model, x0=self.x0, dynamics=self.dynamics),
+            'enkf': EnsembleKalmanFilter(self.model, x0=self.x0, dynamics=self.dynamics,
+                                         n_members=100, initial_spread=0.5, seed=1),
+        }
+        for name, estimator in filters.items():
+            with self.subTest(filter=name):
+                result = estimator.run(self.series)
+                self.assertEqual(result.mean.shape, (len(self.x0), len(self.times)))
+                self.assertTrue(np.all(result.mean >= 0))
+                for variable in ('X_ac', 'X_h2'):
+                    self.assertLess(self.error(result.mean, variable),
+                                    0.7 * self.error(self.open_loop, variable))
+
+    def test_unsupported_measurements_ignored(self):
+        """测试pH测量被忽略并记录原因"""
+        from estimation.filters import EnsembleKalmanFilter
+        from estimation.measurements import MeasurementSeries
+
+        values = dict(self.series.values)
+        values['pH'] = np.full(len(self.times), 7.0)
+        series = MeasurementSeries(self.times[:25], {k: v[:25] for k, v in values.items()})
+        result = EnsembleKalmanFilter(self.model, dynamics=self.dynamics, n_members=20,
+                                      seed=0).run(series)
+        self.assertIn('pH', result.ignored)
+        self.assertNotIn('pH', result.innovations)
+        self.assertTrue(np.all(np.isfinite(result.innovations['VFA'])))
+        self.assertEqual(result.std.shape, result.mean.shape)
+
+    def test_filter_interface_is_abstract(self):
+        """测试滤波器基类不能实例化，子类须实现全部接口"""
+        from estimation.filters import _KalmanFilter
+
+        with self.assertRaises(TypeError):
+            _KalmanFilter(self.model)
+
+        class Incomplete(_KalmanFilter):
+            def forecast(self, dt):
+                pass
+
+        with self.assertRaises(TypeError):
+            Incomplete(self.model)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# tests/unit/test_feed_optimizer.py
+"""
+滚动时域进料优化单元测试
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestFeedOptimizer(unittest.TestCase):
+    """进料优化器单元测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        from core.adm1_model import ADM1Model
+        from estimation.filters import ReactorDynamics
+
+        cls.model = ADM1Model()
+        cls.influent = cls.model.initial_conditions.copy()
+        # 初始状态：停留时间20天运行60天
+        dynamics = ReactorDynamics(cls.model, dilution=0.05, influent=cls.influent)
+        cls.y0 = dynamics.forecast(0.0, cls.influent[:, None], 60.0)[:, 0]
+
+    def make_optimizer(self, **kwargs):
+        from optimization.feed_optimizer import FeedOptimizer
+
+        options = dict(influent=self.influent, volume=1000.0, horizon=3.0, step=1 / 12,
+                       flow_bounds=(0.0, 200.0))
+        options.update(kwargs)
+        return FeedOptimizer(self.model, **options)
+
+    def test_batched_simulation_matches_single(self):
+        """测试候选方案批量模拟与逐个模拟一致"""
+        optimizer = self.make_optimizer(limits={'VFA': 1e3})
+        flows = np.array([[0.0, 50.0, 100.0], [200.0, 200.0, 0.0]])
+        batch = optimizer.simulate(self.y0, flows)
+        for j, schedule in enumerate(flows):
+            single = optimizer.simulate(self.y0, schedule)
+            self.assertAlmostEqual(batch['methane'][j], single['methane'][0], places=9)
+            np.testing.assert_allclose(batch['peaks']['VFA'][j], single['peaks']['VFA'][0])
+            np.testing.assert_allclose(batch['final'][:, j], single['final'][:, 0])
+        self.assertEqual(batch['peaks']['VFA'].shape, (2, 3))
+        self.assertTrue(np.all(batch['methane'] > 0))
+
+    def test_limits_shape_the_schedule(self):
+        """测试宽松约束时取最大进料，严格约束时降低进料并满足限值"""
+        loose = self.make_optimizer(limits={'VFA': 1e3}).optimize(self.y0)
+        np.testing.assert_allclose(loose.flows, 200.0, atol=1.0)
+        self.assertTrue(loose.feasible)
+
+        # 以恒定最大进料的VFA峰值为参照，收紧限值
+        optimizer = self.make_optimizer(limits={'VFA': 1.0})
+        peak = optimizer.simulate(self.y0, np.full(3, 200.0))['peaks']['VFA'].max()
+        limit = 0.97 * peak
+        optimizer = self.make_optimizer(limits={'VFA': limit, 'pH': 7.0})
+        self.assertNotIn('pH', optimizer.limits)
+        plan = optimizer.optimize(self.y0, initial_flows=np.full(3, 100.0))
+        self.assertLess(plan.flows.mean(), 199.0)
+        self.assertLessEqual(plan.peaks['VFA'].max(), limit * 1.01)
+        self.assertLessEqual(plan.evaluations, 20)
+
+        # 相同状态与初始方案再次优化：全部命中缓存
+        again = optimizer.optimize(self.y0, initial_flows=np.full(3, 100.0))
+        self.assertEqual(again.evaluations, 0)
+        self.assertGreater(again.cache_hits, 0)
+        np.testing.assert_allclose(again.flows, plan.flows, atol=1e-9)
+
+    def test_closed_loop_with_twin(self):
+        """测试闭环滚动优化：热启动平移与数字孪生被控对象"""
+        from realtime.digital_twin import DigitalTwin
+
+        optimizer = self.make_optimizer(limits={'VFA': 1e3})
+        plan = optimizer.optimize(self.y0)
+        np.testing.assert_allclose(optimizer.warm_start(),
+                                   np.append(optimizer._to_unit(plan.flows)[1:],
+                                             optimizer._to_unit(plan.flows)[-1]))
+
+        twin = DigitalTwin(self.model, y0=self.y0, volume=1000.0,
+                           solver_params={'fixed_step': 1 / 96})
+        result = optimizer.run_closed_loop(self.y0, 2.0, plant=twin)
+        self.assertEqual(len(result['flows']), 2)
+        self.assertAlmostEqual(twin.t, 2.0)
+        self.assertAlmostEqual(twin.dilution, result['flows'][-1] / 1000.0)
+        self.assertTrue(np.all(result['methane'] > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
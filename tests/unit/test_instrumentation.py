@@ -0,0 +1,88 @@
+# tests/unit/test_instrumentation.py
+"""
+求解器插桩单元测试 - 统计结果与普通求解一致性
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestSolverInstrumentation(unittest.TestCase):
+    """求解器插桩单元测试"""
+
+    def test_instrumented_solve_matches_plain_solve(self):
+        """测试插桩求解与solve_ivp结果一致并给出统计"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+
+        model = ADM1Model()
+        plain = ADM1Solver().solve(model, (0, 5))
+        instrumented = ADM1Solver(instrument=True).solve(model, (0, 5))
+
+        self.assertTrue(instrumented['success'])
+        np.testing.assert_allclose(instrumented['time'], plain['time'])
+        np.testing.assert_allclose(instrumented['states'], plain['states'])
+        self.assertNotIn('instrumentation', plain)
+
+        stats = instrumented['instrumentation']
+        self.assertEqual(stats['accepted_steps'], len(plain['time']) - 1)
+        self.assertGreaterEqual(stats['rejected_steps'], 0)
+        self.assertGreater(stats['lu_decompositions'], 0)
+        self.assertEqual(len(stats['step_sizes']), stats['accepted_steps'])
+        self.assertAlmostEqual(stats['step_sizes'].sum(), 5.0)
+        self.assertEqual(sum(stats['limiting_variables'].values()), stats['accepted_steps'])
+        self.assertTrue(set(stats['limiting_variables']) <= set(model.state_variables))
+        self.assertGreaterEqual(stats['timings']['total'],
+                                stats['timings']['rhs'] + stats['timings']['jacobian'])
+
+    def test_non_bdf_methods(self):
+        """测试Radau/LSODA插桩（LSODA无法拆分线性代数耗时）"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+
+        model = ADM1Model()
+        for method in ('Radau', 'LSODA'):
+            solver = ADM1Solver({'method': method, 'rtol': 1e-6, 'atol': 1e-8, 'max_step': 0.1},
+                                instrument=True)
+            results = solver.solve(model, (0, 2))
+            self.assertTrue(results['success'], method)
+            stats = results['instrumentation']
+            self.assertIsNone(stats['rejected_steps'])
+            self.assertEqual(stats['limiting_source'], 'step_change_proxy')
+        self.assertIsNone(stats['timings']['linear_algebra'])
+
+    def test_positivity_mode(self):
+        """测试保正模式轨迹非负并记录投影次数，LSODA 报错"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+
+        model = ADM1Model()
+        params = {'method': 'BDF', 'rtol': 1e-6, 'atol': 'auto', 'max_step': 0.1,
+                  'first_step': 0.01}
+        plain = ADM1Solver(params).solve(model, (0, 30))
+        self.assertLess(plain['states'].min(), 0.0)
+
+        for method in ('BDF', 'Radau'):
+            results = ADM1Solver(dict(params, method=method, positivity=True),
+                                 instrument=True).solve(model, (0, 30))
+            self.assertTrue(results['success'], method)
+            self.assertGreaterEqual(results['states'].min(), 0.0, method)
+            self.assertGreater(results['projections'], 0, method)
+            self.assertEqual(results['instrumentation']['projections'], results['projections'])
+            np.testing.assert_allclose(results['states'][:, -1], plain['states'][:, -1],
+                                       rtol=1e-3, atol=1e-3)
+
+        results = ADM1Solver(dict(params, method='LSODA', positivity=True)).solve(model, (0, 1))
+        self.assertFalse(results['success'])
+        self.assertIn('LSODA', results['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
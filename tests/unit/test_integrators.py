@@ -0,0 +1,136 @@
+# tests/unit/test_integrators.py
+"""
+积分器后端与自动选择单元测试
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestIntegrators(unittest.TestCase):
+    """积分器后端单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+        self.model = ADM1Model()
+        self.t_span = (0.0, 5.0)
+
+    def _params(self, method, **extra):
+        params = {'method': method, 'rtol': 1e-6, 'atol': 1e-8,
+                  'max_step': 0.1, 'first_step': 0.01}
+        params.update(extra)
+        return params
+
+    def _reference(self):
+        from solvers.ode_solver import ADM1Solver
+        results = ADM1Solver({'method': 'BDF', 'rtol': 1e-9, 'atol': 1e-11,
+                              'max_step': 0.1}).solve(self.model, self.t_span)
+        return results['states'][:, -1]
+
+    def test_rosenbrock_matches_bdf(self):
+        """测试定步长Rosenbrock（1、2阶）与BDF参考解一致，2阶更精确"""
+        from solvers.ode_solver import ADM1Solver
+
+        y_ref = self._reference()
+        errors = {}
+        for order in (1, 2):
+            params = self._params('Rosenbrock', fixed_step=0.01, rosenbrock_order=order)
+            results = ADM1Solver(params).solve(self.model, self.t_span)
+            self.assertTrue(results['success'], results['message'])
+            self.assertEqual(results['method'], 'Rosenbrock')
+            # 定步长：步数固定
+            self.assertEqual(len(results['time']), 501)
+            # Rosenbrock 默认启用保正模式
+            self.assertIn('projections', results)
+            y = results['states'][:, -1]
+            errors[order] = np.max(np.abs(y - y_ref) / (np.abs(y_ref) + 1e-6))
+        self.assertLess(errors[2], 1e-3)
+        self.assertLess(errors[2], errors[1])
+
+    def test_backends_share_solve_ivp(self):
+        """测试各后端都能通过 solve_ivp 和插桩步进求解"""
+        from solvers.ode_solver import ADM1Solver
+
+        for method in ('BDF', 'Radau', 'LSODA'):
+            solver = ADM1Solver(self._params(method))
+            results = solver.solve(self.model, (0.0, 1.0))
+            self.assertTrue(results['success'], method)
+            self.assertEqual(results['method'], method)
+            stepped = solver.solve(self.model, (0.0, 1.0), instrument=True)
+            self.assertTrue(stepped['success'], method)
+            self.assertGreater(stepped['instrumentation']['accepted_steps'], 0)
+
+    def test_unknown_method_fails(self):
+        """测试未知方法返回失败结果"""
+        from solvers.ode_solver import ADM1Solver
+
+        results = ADM1Solver(self._params('Euler')).solve(self.model, (0.0, 1.0))
+        self.assertFalse(results['success'])
+        self.assertIn('Euler', results['message'])
+
+    def test_register_integrator(self):
+        """测试注册后端必须为 OdeSolver 子类"""
+        from solvers.integrators import (INTEGRATOR_BACKENDS, RosenbrockFixed,
+                                         get_integrator, register_integrator)
+
+        with self.assertRaises(TypeError):
+            register_integrator('bad', object)
+        register_integrator('Rosenbrock1', RosenbrockFixed)
+        try:
+            self.assertIs(get_integrator('Rosenbrock1'), RosenbrockFixed)
+        finally:
+            INTEGRATOR_BACKENDS.pop('Rosenbrock1')
+
+    def test_auto_selection_is_cached(self):
+        """测试auto模式试算选择并按参数/初始条件缓存"""
+        from solvers.method_selector import selection_key
+        from solvers.ode_solver import ADM1Solver
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / 'solver_choice.json'
+            params = self._params('auto', auto_cache=str(cache_path), preset='default')
+            results = ADM1Solver(params).solve(self.model, (0.0, 2.0))
+            self.assertTrue(results['success'], results['message'])
+
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            key = selection_key(self.model, self.model.initial_conditions, params)
+            self.assertIn(key, cache)
+            entry = cache[key]
+            self.assertEqual(results['method'], entry['method'])
+            self.assertEqual(entry['label'], 'default')
+            self.assertLessEqual(entry['trials'][entry['method']]['error'], 1e-3)
+
+            # 再次求解直接读取缓存
+            entry['method'] = 'Radau'
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            again = ADM1Solver(params).solve(self.model, (0.0, 2.0))
+            self.assertEqual(again['method'], 'Radau')
+
+    def test_selection_key_settings(self):
+        """测试影响方法选择的求解设置改变缓存键，预设标签与缓存路径不改变"""
+        from solvers.method_selector import selection_key
+
+        y0 = self.model.initial_conditions
+        params = self._params('auto')
+        key = selection_key(self.model, y0, params)
+        for name, value in (('metal_mode', 'split'), ('kernel', 'numba'), ('fixed_step', 0.05),
+                            ('rosenbrock_order', 1), ('first_step', 1e-4)):
+            self.assertNotEqual(selection_key(self.model, y0, dict(params, **{name: value})),
+                                key, name)
+        self.assertEqual(selection_key(self.model, y0,
+                                       dict(params, preset='x', auto_cache='c.json')), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/unit/test_kernels.py
+"""
+右端函数/雅可比计算后端单元测试
+"""
+
+import sys
+import unittest
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+def random_states(y0, n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [y0 * rng.uniform(0.5, 2.0, len(y0)) + rng.uniform(0.0, 0.01, len(y0))
+            for _ in range(n)]
+
+
+class TestKernels(unittest.TestCase):
+    """计算内核单元测试"""
+
+    def test_scalar_kernels_match_model(self):
+        """测试标量内核（numba 编译前的 Python 版本）与模型逐项一致"""
+        from core.kernels import jacobian_kernel, rates_kernel
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        for preset in manager.list_available_presets():
+            model, y0 = manager.create_model(preset)
+            p = model.parameter_vector.values
+            for y in random_states(y0, 5):
+                rates, J = np.empty(len(y)), np.empty((len(y), len(y)))
+                rates_kernel(p, y, rates)
+                jacobian_kernel(p, y, J)
+                np.testing.assert_allclose(rates, model.biochemical_reactions(0.0, y),
+                                           rtol=1e-12, atol=1e-15)
+                np.testing.assert_allclose(J, model.jacobian(0.0, y), rtol=1e-12, atol=1e-12)
+
+    def test_backend_resolution(self):
+        """测试后端解析：auto 按可用性选择，numba 不可用时警告回退，未知后端报错"""
+        from core.kernels import NUMBA_AVAILABLE, resolve_backend
+
+        self.assertEqual(resolve_backend('auto'), 'numba' if NUMBA_AVAILABLE else 'numpy')
+        self.assertEqual(resolve_backend(None), 'numpy')
+        if not NUMBA_AVAILABLE:
+            with self.assertWarns(RuntimeWarning):
+                self.assertEqual(resolve_backend('numba'), 'numpy')
+        with self.assertRaises(ValueError):
+            resolve_backend('cuda')
+
+    def test_model_kernels_and_buffers(self):
+        """测试后端入口写入预分配缓冲区，批量状态走 numpy 路径"""
+        from core.kernels import ModelKernels
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        model, y0 = ADM1ParameterManager().create_model('food_waste')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            kernels = ModelKernels(model, 'numba')
+        out = np.empty(len(y0))
+        self.assertIs(kernels.rates(0.0, y0, out), out)
+        np.testing.assert_allclose(out, model.biochemical_reactions(0.0, y0), rtol=1e-12)
+        J = kernels.jacobian(0.0, y0)
+        np.testing.assert_allclose(J, model.jacobian(0.0, y0), rtol=1e-12, atol=1e-12)
+        Y = np.repeat(y0[:, None], 3, axis=1)
+        self.assertEqual(kernels.jacobian(0.0, Y).shape, (len(y0), len(y0), 3))
+
+    def test_solver_kernel_option(self):
+        """测试求解器按 kernel 选项切换后端且结果一致"""
+        from parameters.parameter_manager import ADM1ParameterManager
+        from solvers.ode_solver import ADM1Solver
+
+        model, y0 = ADM1ParameterManager().create_model('food_waste')
+        base = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8, 'max_step': 0.5,
+                'jacobian': 'analytic'}
+        reference = ADM1Solver(dict(base, kernel='numpy')).solve(model, (0, 5), y0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            accelerated = ADM1Solver(dict(base, kernel='auto')).solve(model, (0, 5), y0)
+        self.assertTrue(accelerated['success'])
+        np.testing.assert_allclose(accelerated['states'][:, -1], reference['states'][:, -1],
+                                   rtol=1e-6, atol=1e-9)
+        failed = ADM1Solver(dict(base, kernel='cuda')).solve(model, (0, 5), y0)
+        self.assertFalse(failed['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
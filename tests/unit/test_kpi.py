@@ -0,0 +1,136 @@
+# tests/unit/test_kpi.py
+"""
+KPI 计算单元测试
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from core.adm1_model import ADM1Model
+
+
+class TestKPI(unittest.TestCase):
+    """KPI 计算单元测试"""
+
+    def setUp(self):
+        self.model = ADM1Model()
+        self.time = np.linspace(0.0, 10.0, 1001)
+        # 乙酸在前 6 天线性降到 0，其余变量不变
+        self.states = np.repeat(self.model.initial_conditions[:, None], len(self.time), axis=1)
+        self.states[6] = np.maximum(6.0 - self.time, 0.0)
+
+    def test_process_rates(self):
+        """测试过程速率与右端函数、声明式模型的过程一致"""
+        from modelgen.adm1 import adm1_spec
+
+        self.assertEqual(list(self.model.PROCESS_NAMES),
+                         [process.name for process in adm1_spec().processes])
+        y = self.model.initial_conditions * 1.5 + 0.01
+        r = dict(zip(self.model.PROCESS_NAMES, self.model.process_rates(y)))
+        dy = self.model.biochemical_reactions(0.0, y)
+        self.assertAlmostEqual(dy[0], -r['uptake_su'])
+        self.assertAlmostEqual(dy[4], -r['uptake_bu'])
+        self.assertAlmostEqual(dy[19], 0.1 * (r['uptake_va'] + r['uptake_bu']))
+        self.assertAlmostEqual(dy[28], r['fes_precipitation'])
+        batch = self.model.process_rates(np.stack([y, 2 * y], axis=1))
+        np.testing.assert_allclose(batch[:, 0], list(r.values()))
+
+    def test_kpi_values(self):
+        """测试累计甲烷、COD去除率、VFA峰值、稳态时间与过程积分"""
+        from analysis.kpi import VFA_VARIABLES, compute_kpis
+
+        kpis = compute_kpis({'success': True, 'model': self.model,
+                             'time': self.time, 'states': self.states})
+        methane = self.model.methane_production_rate(self.states)
+        self.assertAlmostEqual(kpis['methane_cumulative'],
+                               np.sum((methane[1:] + methane[:-1]) / 2 * np.diff(self.time)))
+        self.assertAlmostEqual(kpis['cod_final'], kpis['cod_initial'] - 6.0)
+        self.assertAlmostEqual(kpis['vfa_peak'], 6.0 + sum(
+            self.model.initial_conditions[self.model.variable_index[v]]
+            for v in VFA_VARIABLES if v != 'S_ac'))
+        self.assertEqual(kpis['vfa_peak_time'], 0.0)
+        self.assertAlmostEqual(kpis['time_to_steady_state'], 6.0, delta=0.02)
+        rate = self.model.process_rates(self.model.initial_conditions)
+        self.assertAlmostEqual(kpis['integral.uptake_su'], rate[0] * 10.0)
+
+        self.assertEqual(compute_kpis({'success': False}), {})
+
+    def test_steady_state_on_solution(self):
+        """测试实际求解的稳态时间由生化过程决定，不受缓慢的金属组分影响"""
+        from analysis.kpi import compute_kpis_batch
+        from solvers.ode_solver import ADM1Solver
+
+        results = ADM1Solver().solve(self.model, (0.0, 40.0))
+        kpis = compute_kpis_batch(self.model, results['time'], results['states'])
+        steady = kpis['time_to_steady_state'][0]
+        self.assertFalse(np.isnan(steady))
+        self.assertLess(steady, 40.0)
+        self.assertTrue(np.isnan(compute_kpis_batch(
+            self.model, results['time'], results['states'],
+            steady_variables=self.model.state_variables)['time_to_steady_state'][0]))
+
+    def test_batch_matches_single_runs(self):
+        """测试批量计算与逐个计算一致，并按指标排序"""
+        from analysis.kpi import compute_kpis, compute_kpis_batch, rank
+
+        other = self.states * 1.2
+        batch = compute_kpis_batch(self.model, self.time, np.stack([self.states, other]))
+        for i, states in enumerate((self.states, other)):
+            single = compute_kpis({'success': True, 'model': self.model,
+                                   'time': self.time, 'states': states})
+            for name, value in single.items():
+                self.assertAlmostEqual(batch[name][i], value, msg=name)
+        self.assertEqual(list(rank(batch, 'methane_cumulative')), [1, 0])
+        self.assertEqual(list(rank(batch, 'methane_cumulative', descending=False, top=1)), [0])
+        self.assertEqual(list(rank({'x': np.array([np.nan, 1.0])}, 'x')), [1, 0])
+
+    def test_stored_with_results(self):
+        """测试 KPI 随结果保存，排序只读取元数据"""
+        from storage import EnsembleReader, EnsembleWriter, ResultStore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResultStore(Path(tmp) / 'store')
+            for run_id, scale in (('low', 1.0), ('high', 1.5)):
+                store.save({'success': True, 'model': self.model, 'time': self.time,
+                            'states': self.states * scale}, run_id=run_id)
+            self.assertIn('integral.uptake_ac', store.open('low').kpis)
+            self.assertEqual([run_id for run_id, _ in store.rank('methane_cumulative')],
+                             ['high', 'low'])
+
+            path = Path(tmp) / 'ensemble'
+            with EnsembleWriter(path, 3, self.model.state_variables, self.time) as writer:
+                for i in range(3):
+                    writer.write_member(i, self.states * (1.0 + i))
+            reader = EnsembleReader(path)
+            kpis = reader.kpis(self.model, block_bytes=1)
+            self.assertTrue((path / 'kpis.npz').exists())
+            np.testing.assert_allclose(EnsembleReader(path).kpis()['cod_initial'],
+                                       kpis['cod_initial'])
+            self.assertEqual(list(reader.rank('cod_initial', top=2)), [2, 1])
+
+    def test_report_output(self):
+        """测试结果摘要输出 KPI 并缓存到结果字典"""
+        from utils.output_manager import OutputManager
+
+        results = {'success': True, 'model': self.model, 'time': self.time,
+                   'states': self.states}
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            OutputManager().print_simulation_results(results, 'test')
+        self.assertIn('关键性能指标', output.getvalue())
+        self.assertIn('time_to_steady_state', output.getvalue())
+        self.assertIn('kpis', results)
+
+
+if __name__ == '__main__':
+    unittest.main()
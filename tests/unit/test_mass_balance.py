@@ -0,0 +1,201 @@
+# tests/unit/test_mass_balance.py
+"""
+质量平衡检查单元测试
+"""
+
+import logging
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from core.adm1_model import ADM1Model
+
+
+class AcetateModel:
+    """单过程乙酸降解模型，COD/N/电荷 按声明产率闭合"""
+
+    PROCESS_NAMES = ('uptake_ac',)
+
+    def __init__(self, growth_yield=0.05):
+        from analysis.mass_balance import N_BAC
+
+        self.state_variables = ['S_ac', 'X_ac', 'S_IN', 'S_IC']
+        self.variable_index = {var: i for i, var in enumerate(self.state_variables)}
+        self.state_units = {'S_ac': 'gCOD/m³', 'X_ac': 'gCOD/m³',
+                            'S_IN': 'molN/m³', 'S_IC': 'molC/m³'}
+        self.initial_conditions = np.array([5.0, 0.5, 0.1, 0.1])
+        self.declared_parameters = {'Y_ac': 0.05}
+        # 乙酸根消耗、NH₄⁺ 同化分别由生成的 HCO₃⁻ 抵消电荷
+        self.nu = np.array([-1.0, growth_yield, -growth_yield * N_BAC,
+                            1.0 / 64.0 - growth_yield * N_BAC])
+
+    def process_rates(self, y):
+        return np.array([8.0 * y[0] / (0.15 + y[0]) * y[1]])
+
+    def biochemical_reactions(self, t, y):
+        return np.multiply.outer(self.nu, self.process_rates(y)[0])
+
+
+class LeakyModel(ADM1Model):
+    """糖降解菌生长多写一份，COD 与氮偏离参考化学计量"""
+
+    def biochemical_reactions(self, t, y):
+        dydt = super().biochemical_reactions(t, y)
+        dydt[self.variable_index['X_su']] += 0.5 * self.process_rates(y)[0]
+        return dydt
+
+
+class TestMassBalance(unittest.TestCase):
+    """质量平衡检查单元测试"""
+
+    def setUp(self):
+        # 故意不闭合的模型求解时的警告不输出到测试日志
+        self.logger = logging.getLogger('analysis.mass_balance')
+        self.level = self.logger.level
+        self.logger.setLevel(logging.ERROR)
+
+    def tearDown(self):
+        self.logger.setLevel(self.level)
+
+    def test_identified_stoichiometry(self):
+        """测试由右端函数辨识的化学计量与声明式模型一致"""
+        from analysis.mass_balance import identify_stoichiometry
+        from modelgen.adm1 import adm1_spec
+
+        model = ADM1Model()
+        spec = adm1_spec()
+        expected = np.zeros((len(spec.species), len(spec.processes)))
+        for j, process in enumerate(spec.processes):
+            for var, coefficient in process.stoichiometry.items():
+                value = spec.parameters[coefficient] if isinstance(coefficient, str) \
+                    else coefficient
+                expected[model.variable_index[var], j] = value
+        np.testing.assert_allclose(identify_stoichiometry(model), expected, atol=1e-10)
+
+    def test_adm1_closure(self):
+        """测试标出 C4/丙酸的硬编码产率和生长项错位，按声明产率时 COD 闭合"""
+        from analysis.mass_balance import check_closure
+
+        model = ADM1Model()
+        report = check_closure(model)
+        self.assertFalse(report.ok)
+        cod = {process for quantity, process, _ in report.violations() if quantity == 'COD'}
+        self.assertEqual(cod, {'uptake_va', 'uptake_bu', 'uptake_pro'})
+        self.assertTrue(any('uptake_va' in issue and 'X_pro' in issue for issue in report.issues))
+        self.assertTrue(any('uptake_h2' in issue and 'X_I' in issue for issue in report.issues))
+
+        model.declared_parameters = {'Y_c4': 0.1, 'Y_pro': 0.08}
+        cod = {process for quantity, process, _ in check_closure(model).violations()
+               if quantity == 'COD'}
+        self.assertEqual(cod, set())
+
+    def test_balanced_model(self):
+        """测试闭合的模型不报告问题，产率偏离声明时被标出"""
+        from analysis.mass_balance import MassBalanceMonitor, check_closure
+
+        model = AcetateModel()
+        self.assertTrue(check_closure(model).ok, check_closure(model).format())
+        monitor = MassBalanceMonitor(model, stride=1)
+        monitor.check(0.0, model.initial_conditions,
+                      model.biochemical_reactions(0.0, model.initial_conditions))
+        self.assertEqual(monitor.summary()['violations'], {})
+        self.assertLess(max(monitor.max_imbalance), 1e-12)
+
+        report = check_closure(AcetateModel(growth_yield=0.08))
+        self.assertEqual([quantity for quantity, _, _ in report.violations()], ['COD'])
+        self.assertIn('Y_ac', report.issues[0])
+
+    def test_monitor_stride(self):
+        """测试按间隔检查，raise 模式在首次检查时中止"""
+        from analysis.mass_balance import MassBalanceError, MassBalanceMonitor
+
+        model = AcetateModel(growth_yield=0.08)
+        monitor = MassBalanceMonitor(model, stride=50)
+        rates = monitor.wrap_rhs(model.biochemical_reactions)
+        for _ in range(120):
+            rates(0.0, model.initial_conditions)
+        self.assertEqual(monitor.checks, 3)
+        self.assertEqual(set(monitor.summary()['violations']), {'COD'})
+
+        rates = MassBalanceMonitor(model, mode='raise').wrap_rhs(model.biochemical_reactions)
+        with self.assertRaises(MassBalanceError):
+            rates(0.0, model.initial_conditions)
+
+    def test_known_gaps(self):
+        """测试已知缺口取参考化学计量的期望值：自带模型不报警，偏离参考的不闭合被标出"""
+        from analysis.mass_balance import MassBalanceMonitor, check_closure
+
+        report = check_closure(ADM1Model())
+        self.assertTrue(report.violations())
+        self.assertEqual(report.unexpected(), [])
+        self.assertTrue(any('（已知）' in line for line in report.format()))
+
+        # 已知缺口按参考化学计量取期望值：uptake_su 的氮缺口大小改变同样被标出
+        leaky = check_closure(LeakyModel()).unexpected()
+        self.assertEqual([(q, p) for q, p, _ in leaky], [('COD', 'uptake_su'), ('N', 'uptake_su')])
+
+        model = ADM1Model()
+        monitor = MassBalanceMonitor(model, stride=1)
+        y = model.initial_conditions
+        monitor.check(0.0, y, model.biochemical_reactions(0.0, y))
+        self.assertEqual(monitor.summary()['violations'], {})
+        self.assertLess(max(monitor.max_imbalance), 1e-8)
+
+    def test_batched_states(self):
+        """测试批量 (n, m) 状态按列检查，取最差的一列"""
+        from analysis.mass_balance import MassBalanceMonitor
+
+        model = LeakyModel()
+        y = np.stack([model.initial_conditions, 2.0 * model.initial_conditions], axis=1)
+        dydt = np.stack([model.biochemical_reactions(0.0, y[:, k]) for k in range(2)], axis=1)
+        monitor = MassBalanceMonitor(model, stride=1)
+        monitor.check(0.0, y, dydt)
+        self.assertEqual(set(monitor.summary()['violations']), {'COD', 'N'})
+
+        single = MassBalanceMonitor(model, stride=1)
+        for k in range(2):
+            single.check(0.0, y[:, k], dydt[:, k])
+        np.testing.assert_allclose(monitor.max_imbalance, single.max_imbalance, atol=1e-10)
+
+    def test_solver_integration(self):
+        """测试自带预设求解时无报警、raise 模式可用，改坏的模型使求解失败"""
+        from parameters.parameter_manager import ADM1ParameterManager
+        from solvers.ode_solver import ADM1Solver
+
+        model = ADM1Model()
+        results = ADM1Solver().solve(model, (0.0, 1.0))
+        summary = results['mass_balance']
+        self.assertGreater(summary['checks'], 0)
+        self.assertEqual(summary['violations'], {})
+        self.assertTrue(any('Y_c4' in issue for issue in summary['issues']))
+
+        solver = ADM1Solver()
+        solver.solver_params['mass_balance'] = 'off'
+        self.assertNotIn('mass_balance', solver.solve(model, (0.0, 1.0)))
+        solver.solver_params['mass_balance'] = 'raise'
+        self.assertTrue(solver.solve(model, (0.0, 1.0))['success'])
+        preset, y0 = ADM1ParameterManager().create_model('food_waste')
+        results = solver.solve(preset, (0.0, 1.0), y0)
+        self.assertTrue(results['success'])
+        # 结构问题在求解开始时报告，不中止求解
+        self.assertIn('uptake_pro: 产率 0.08 与声明 Y_pro=0.05 不一致',
+                      results['mass_balance']['issues'])
+
+        # 创建后修改的模型参数优先于预设声明，产率扫描不误报
+        preset.parameters = preset.parameter_vector.replace(Y_su=0.9)
+        results = solver.solve(preset, (0.0, 1.0), y0)
+        self.assertTrue(results['success'], results['message'])
+        self.assertEqual(results['mass_balance']['violations'], {})
+
+        results = solver.solve(LeakyModel(), (0.0, 1.0))
+        self.assertFalse(results['success'])
+        self.assertIn('COD', results['message'])
+
+if __name__ == '__main__':
+    unittest.main()
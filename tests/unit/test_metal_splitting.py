@@ -0,0 +1,101 @@
+# tests/unit/test_metal_splitting.py
+"""
+金属络合准稳态/算子分裂单元测试
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestMetalSplitting(unittest.TestCase):
+    """金属络合快速过程处理单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+        self.model = ADM1Model()
+        self.index = self.model.variable_index
+        self.params = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8,
+                       'max_step': 0.1, 'first_step': 0.01}
+
+    def test_equilibrium_satisfies_mass_action(self):
+        """测试平衡形态满足质量作用定律且总量守恒"""
+        from solvers.metal_splitting import QSSAMetals
+
+        scheme = QSSAMetals(self.model)
+        y = scheme.equilibrate(self.model.initial_conditions)
+        fe, edta, complex_ = (y[self.index[v]] for v in ('S_Fe2', 'S_EDTA', 'S_FeEDTA'))
+        p = self.model.parameters
+        self.assertAlmostEqual(p.k_edta_fe * fe * edta, p.k_edta_fe_rev * complex_, places=10)
+        y0 = self.model.initial_conditions
+        self.assertAlmostEqual(fe + complex_, y0[self.index['S_Fe2']] + y0[self.index['S_FeEDTA']])
+        self.assertAlmostEqual(edta + complex_,
+                               y0[self.index['S_EDTA']] + y0[self.index['S_FeEDTA']])
+
+    def test_substep_matches_complexation_ode(self):
+        """测试精确子步与络合子过程的数值解一致"""
+        from solvers.metal_splitting import SplitMetals
+
+        scheme = SplitMetals(self.model)
+        y0 = np.array(self.model.initial_conditions, dtype=float)
+        idx = [self.index[v] for v in ('S_Fe2', 'S_EDTA', 'S_FeEDTA')]
+        p = self.model.parameters
+
+        def complexation(t, m):
+            r = p.k_edta_fe * m[0] * m[1] - p.k_edta_fe_rev * m[2]
+            return [-r, -r, r]
+
+        for dt in (1e-5, 1e-4, 1e-3):
+            exact = scheme.substep(y0, dt)
+            numeric = solve_ivp(complexation, (0, dt), y0[idx], method='Radau',
+                                rtol=1e-10, atol=1e-14).y[:, -1]
+            np.testing.assert_allclose(exact[idx], numeric, rtol=1e-6, atol=1e-12)
+            # 非金属变量不受影响
+            mask = np.ones(len(y0), dtype=bool)
+            mask[idx] = False
+            np.testing.assert_array_equal(exact[mask], y0[mask])
+
+    def test_fast_modes_match_coupled(self):
+        """测试qssa/split与耦合求解一致，并附带精度对比"""
+        from solvers.ode_solver import ADM1Solver
+
+        for mode in ('qssa', 'split'):
+            params = dict(self.params, metal_mode=mode, metal_compare=True)
+            results = ADM1Solver(params).solve(self.model, (0.0, 5.0))
+            self.assertTrue(results['success'], results['message'])
+            self.assertEqual(results['metal_mode'], mode)
+            accuracy = results['metal_accuracy']
+            self.assertLess(accuracy['final_relative_error'], 1e-4)
+            self.assertIn('coupled_time', accuracy)
+            self.assertGreater(accuracy['t_skip'], 0.0)
+            self.assertEqual(accuracy['steps'], len(results['time']) - 1)
+
+    def test_fast_modes_remove_stiffness_for_explicit_method(self):
+        """测试去除络合刚性后显式方法的步数明显减少"""
+        from solvers.ode_solver import ADM1Solver
+
+        params = dict(self.params, method='RK45', max_step=np.inf)
+        coupled = ADM1Solver(params).solve(self.model, (0.0, 5.0))
+        qssa = ADM1Solver(dict(params, metal_mode='qssa')).solve(self.model, (0.0, 5.0))
+        self.assertTrue(coupled['success'] and qssa['success'])
+        self.assertLess(qssa['nfev'], coupled['nfev'] / 2)
+
+    def test_invalid_combinations(self):
+        """测试未知模式与LSODA分裂返回失败"""
+        from solvers.ode_solver import ADM1Solver
+
+        for params in (dict(self.params, metal_mode='fast'),
+                       dict(self.params, method='LSODA', metal_mode='split')):
+            results = ADM1Solver(params).solve(self.model, (0.0, 1.0))
+            self.assertFalse(results['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+# tests/unit/test_model_spec.py
+"""
+声明式模型描述与代码生成单元测试
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+def random_states(y0, n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [y0 * rng.uniform(0.5, 2.0, len(y0)) + rng.uniform(0.0, 0.01, len(y0))
+            for _ in range(n)]
+
+
+class TestModelSpec(unittest.TestCase):
+    """模型描述与生成内核单元测试"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_symbolic_derivatives(self):
+        """测试符号求导与化简"""
+        from modelgen.symbolic import diff, parse, symbols, to_source
+
+        e = parse('k * S / (K + S) * exp(-a * S) + sqrt(S) ** 2 - log(K)')
+        self.assertEqual(symbols(e), {'k', 'S', 'K', 'a'})
+        values = {'k': 3.0, 'S': 0.7, 'K': 0.4, 'a': 0.2}
+
+        def evaluate(expr, **changes):
+            return eval(to_source(expr, str), {'np': np}, dict(values, **changes))
+
+        for var in values:
+            h = 1e-6
+            fd = (evaluate(e, **{var: values[var] + h}) - evaluate(e, **{var: values[var] - h}))
+            self.assertAlmostEqual(evaluate(diff(e, var)), fd / (2 * h), places=6)
+        self.assertEqual(diff(parse('2 * x + y'), 'z'), ('num', 0.0))
+        with self.assertRaises(ValueError):
+            parse('max(S, 0)')
+
+    def test_adm1_spec_matches_model(self):
+        """测试 ADM1 描述生成的内核与 ADM1Model 逐项一致（含批量状态）"""
+        from modelgen import adm1_spec
+        from parameters.parameter_manager import ADM1ParameterManager
+
+        manager = ADM1ParameterManager()
+        for preset in manager.list_available_presets():
+            model, y0 = manager.create_model(preset)
+            generated = adm1_spec(model.parameters).compile(cache_dir=self.cache_dir)
+            self.assertEqual(generated.state_variables, model.state_variables)
+            for y in random_states(y0, 3):
+                np.testing.assert_allclose(generated.biochemical_reactions(0.0, y),
+                                           model.biochemical_reactions(0.0, y),
+                                           rtol=1e-10, atol=1e-12, err_msg=preset)
+                np.testing.assert_allclose(generated.jacobian(0.0, y), model.jacobian(0.0, y),
+                                           rtol=1e-10, atol=1e-12, err_msg=preset)
+            Y = np.column_stack(random_states(y0, 4, seed=1))
+            np.testing.assert_allclose(generated.jacobian(0.0, Y), model.jacobian(0.0, Y),
+                                       rtol=1e-10, atol=1e-12)
+
+    def test_parameter_sensitivity(self):
+        """测试 ∂f/∂p 与有限差分一致，前向灵敏度方程维度正确"""
+        from modelgen import adm1_spec
+
+        generated = adm1_spec().compile(cache_dir=self.cache_dir)
+        y = random_states(generated.initial_conditions, 1)[0]
+        S = generated.parameter_sensitivity(0.0, y)
+        self.assertEqual(S.shape, (len(y), len(generated.parameter_names)))
+        base = generated.parameters
+        for k, name in enumerate(generated.parameter_names):
+            value = getattr(base, name)
+            step = 1e-6 * value
+            generated.parameters = dict(vars(base), **{name: value + step})
+            forward = generated.biochemical_reactions(0.0, y)
+            generated.parameters = dict(vars(base), **{name: value - step})
+            backward = generated.biochemical_reactions(0.0, y)
+            np.testing.assert_allclose(S[:, k], (forward - backward) / (2 * step),
+                                       rtol=1e-5, atol=1e-8, err_msg=name)
+        generated.parameters = base
+        z = np.concatenate([y, np.zeros(S.size)])
+        dz = generated.sensitivity_system(0.0, z)
+        np.testing.assert_allclose(dz[len(y):], S.ravel())
+
+    def test_variants_and_validation(self):
+        """测试模型变体（去掉金属、附加抑制、新增组分）与描述校验"""
+        from modelgen import ModelSpec, adm1_spec
+
+        base = adm1_spec().compile(cache_dir=self.cache_dir)
+        no_metals = adm1_spec(metals=False).compile(cache_dir=self.cache_dir)
+        self.assertEqual(len(no_metals.state_variables), 25)
+
+        spec = adm1_spec()
+        spec.add_inhibition('uptake_ac', '1 / (1 + S_pro / KI_pro_ac)', {'KI_pro_ac': 0.5})
+        spec.add_species('S_x', 0.2)
+        spec.add_parameter('k_x', 2.0)
+        spec.add_process('decay_x', 'k_x * S_x', {'S_x': -1, 'S_I': 1})
+        self.assertNotEqual(spec.digest(), adm1_spec().digest())
+        variant = spec.compile(cache_dir=self.cache_dir)
+        y = np.append(base.initial_conditions, 0.2)
+        dy = variant.biochemical_reactions(0.0, y)
+        reference = base.biochemical_reactions(0.0, y[:-1])
+        factor = 1.0 / (1.0 + y[5] / 0.5)
+        self.assertAlmostEqual(dy[6], reference[6] * factor)
+        self.assertAlmostEqual(dy[-1], -0.4)
+        # 解析雅可比与有限差分一致
+        J = variant.jacobian(0.0, y)
+        for j in (5, 6, len(y) - 1):
+            e = np.zeros(len(y))
+            e[j] = 1e-7 * max(abs(y[j]), 1e-3)
+            fd = (variant.biochemical_reactions(0.0, y + e)
+                  - variant.biochemical_reactions(0.0, y - e)) / (2 * e[j])
+            np.testing.assert_allclose(J[:, j], fd, rtol=1e-5, atol=1e-6)
+
+        bad = ModelSpec('bad').add_species('A').add_process('r', 'k * A', {'A': -1})
+        with self.assertRaises(ValueError):
+            bad.validate()
+        with self.assertRaises(ValueError):
+            ModelSpec('bad').add_species('out').validate()
+
+    def test_disk_cache(self):
+        """测试生成代码按结构哈希缓存到磁盘，参数值不影响缓存键"""
+        from modelgen import ModelSpec, adm1_spec
+        from modelgen import codegen
+
+        spec = adm1_spec()
+        path = self.cache_dir / f'{spec.name}_{spec.digest()}.py'
+        spec.compile(cache_dir=self.cache_dir)
+        self.assertTrue(path.exists())
+
+        changed = adm1_spec()
+        changed.parameters['k_m_ac'] *= 2.0
+        self.assertEqual(changed.digest(), spec.digest())
+        codegen._loaded_modules.clear()
+        mtime = path.stat().st_mtime_ns
+        reloaded = changed.compile(cache_dir=self.cache_dir)
+        self.assertEqual(path.stat().st_mtime_ns, mtime)
+        self.assertEqual(reloaded.parameters.k_m_ac, changed.parameters['k_m_ac'])
+
+        restored = ModelSpec.load(spec.save(self.cache_dir / 'spec.json'))
+        self.assertEqual(restored.digest(), spec.digest())
+
+        # 默认缓存目录固定在项目根目录下
+        root = Path(__file__).resolve().parents[2]
+        self.assertEqual(codegen.DEFAULT_CACHE_DIR.resolve(), root / 'results' / 'codegen')
+
+    def test_solver_accepts_generated_model(self):
+        """测试生成的模型可直接交给 ADM1Solver，结果与 ADM1Model 一致"""
+        from modelgen import adm1_spec
+        from parameters.parameter_manager import ADM1ParameterManager
+        from solvers.ode_solver import ADM1Solver
+
+        model, y0 = ADM1ParameterManager().create_model('food_waste')
+        generated = adm1_spec(model.parameters).compile(cache_dir=self.cache_dir)
+        params = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8, 'max_step': 0.5,
+                  'jacobian': 'analytic'}
+        reference = ADM1Solver(params).solve(model, (0, 5), y0)
+        result = ADM1Solver(params).solve(generated, (0, 5), y0)
+        self.assertTrue(result['success'])
+        np.testing.assert_allclose(result['states'][:, -1], reference['states'][:, -1],
+                                   rtol=1e-5, atol=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# tests/unit/test_monte_carlo.py
+"""
+参数分布、流式分位数与蒙特卡洛引擎单元测试
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+SMALL_RUN = dict(horizon=5.0, step=1 / 12, batch_size=16, min_members=32, max_members=96)
+
+
+class TestStreamingQuantiles(unittest.TestCase):
+    """P²流式分位数单元测试"""
+
+    def test_matches_exact_quantiles(self):
+        """测试多数据流的P²估计接近精确分位数，均值/标准差精确"""
+        from uncertainty.quantiles import StreamingQuantiles
+
+        rng = np.random.default_rng(0)
+        X = np.column_stack([rng.normal(size=4000), rng.lognormal(size=4000), rng.random(4000)])
+        estimator = StreamingQuantiles((0.05, 0.5, 0.95), (3,))
+        for start in range(0, len(X), 64):
+            estimator.update(X[start:start + 64])
+        exact = np.quantile(X, (0.05, 0.5, 0.95), axis=0)
+        spread = exact[2] - exact[0]
+        self.assertTrue(np.all(np.abs(estimator.quantiles() - exact) < 0.02 * spread))
+        np.testing.assert_allclose(estimator.mean, X.mean(axis=0))
+        np.testing.assert_allclose(estimator.std, X.std(axis=0, ddof=1))
+
+    def test_few_samples_exact(self):
+        """测试样本少于5个时返回精确分位数"""
+        from uncertainty.quantiles import StreamingQuantiles
+
+        estimator = StreamingQuantiles((0.5,))
+        estimator.update([3.0, 1.0, 2.0])
+        self.assertEqual(estimator.quantiles()[0], 2.0)
+        with self.assertRaises(ValueError):
+            StreamingQuantiles((0.0, 0.5))
+
+
+class TestParameterDistributions(unittest.TestCase):
+    """参数分布映射单元测试"""
+
+    def test_distribution_mappings(self):
+        """测试各分布的区间含义与单位立方体映射可逆"""
+        from parameters.sampling import ParameterRange
+
+        u = np.linspace(0.01, 0.99, 99)
+        for shape in ('uniform', 'loguniform', 'triangular', 'normal', 'lognormal'):
+            r = ParameterRange('k_m_ac', 7.0, 5.0, 10.0, shape)
+            x = r.from_unit(u)
+            self.assertTrue(np.all(np.diff(x) > 0))
+            np.testing.assert_allclose(r.to_unit(x), u, atol=1e-9)
+        normal = ParameterRange('k_m_ac', 7.0, 5.0, 9.0, 'normal')
+        np.testing.assert_allclose(normal.from_unit([0.025, 0.5, 0.975]), [5.0, 7.0, 9.0])
+        lognormal = ParameterRange('k_m_ac', 7.0, 5.0, 20.0, 'lognormal')
+        self.assertAlmostEqual(float(lognormal.from_unit(0.5)), 10.0)
+        triangular = ParameterRange('k_m_ac', 6.0, 5.0, 10.0, 'triangular')
+        self.assertAlmostEqual(float(triangular.from_unit(0.2)), 6.0)
+        with self.assertRaises(ValueError):
+            ParameterRange('k_m_ac', 7.0, 5.0, 10.0, 'beta')
+
+    def test_preset_overrides(self):
+        """测试按参数覆盖分布、范围，并包含金属参数块"""
+        from parameters.sampling import ParameterSpace
+
+        space = ParameterSpace.from_preset(
+            'food_waste', ('kinetic_parameters', 'metal_parameters'), distribution='lognormal',
+            overrides={'KI_NH3': {'distribution': 'uniform', 'lower': 0.001, 'upper': 0.003},
+                       'k_m_ac': {'distribution': 'triangular', 'spread': 0.5}})
+        ranges = {r.name: r for r in space.ranges}
+        self.assertIn('k_precip_fes', ranges)
+        self.assertEqual(ranges['KI_nh3'].distribution, 'uniform')
+        self.assertEqual((ranges['KI_nh3'].lower, ranges['KI_nh3'].upper), (0.001, 0.003))
+        self.assertAlmostEqual(ranges['k_m_ac'].upper, 10.5)
+        self.assertEqual(ranges['k_m_su'].distribution, 'lognormal')
+        with self.assertRaises(KeyError):
+            ParameterSpace.from_preset('food_waste', overrides={'KI_Fe': {}})
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """蒙特卡洛引擎单元测试"""
+
+    def test_batched_members_match_single_runs(self):
+        """测试按列批量积分与逐个成员积分一致"""
+        from uncertainty.monte_carlo import MonteCarlo, simulate_members
+
+        mc = MonteCarlo.from_preset('food_waste', **SMALL_RUN)
+        X = mc.space.sample(4, seed=3)
+        batch = simulate_members(mc.space, X, mc.y0, mc.times, mc.step)
+        for j in range(4):
+            single = simulate_members(mc.space, X[j:j + 1], mc.y0, mc.times, mc.step)
+            np.testing.assert_allclose(batch['methane'][j], single['methane'][0], rtol=1e-10)
+
+    def test_early_stopping_and_bands(self):
+        """测试分位数收敛后提前停止，置信带有序且单调"""
+        from uncertainty.monte_carlo import MonteCarlo
+
+        result = MonteCarlo.from_preset('food_waste', tol=0.05, **SMALL_RUN).run()
+        self.assertTrue(result.converged)
+        self.assertLess(result.n_members, SMALL_RUN['max_members'])
+        self.assertGreaterEqual(result.n_members, SMALL_RUN['min_members'])
+        self.assertEqual(result.bands.shape, (3, len(result.times)))
+        self.assertTrue(np.all(np.diff(result.bands, axis=0) >= 0))
+        self.assertTrue(np.all(np.diff(result.band(0.5)) > 0))
+        self.assertAlmostEqual(result.summary['methane']['p50'], result.band(0.5)[-1])
+
+        strict = MonteCarlo.from_preset('food_waste', tol=1e-9, **SMALL_RUN).run()
+        self.assertFalse(strict.converged)
+        self.assertEqual(strict.n_members, SMALL_RUN['max_members'])
+
+    def test_config_file(self):
+        """测试从分布配置文件构建并保存结果"""
+        from uncertainty.monte_carlo import MonteCarlo
+
+        config = {'preset': 'food_waste', 'blocks': ['kinetic_parameters'],
+                  'distribution': 'triangular', 'parameters': {'k_m_ac': {'spread': 0.5}}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'distributions.json'
+            path.write_text(json.dumps(config), encoding='utf-8')
+            mc = MonteCarlo.from_config(path, **SMALL_RUN)
+            self.assertNotIn('k_precip_fes', mc.space.names)
+            result = mc.run()
+            saved = json.loads(result.save(Path(tmp) / 'result.json').read_text(encoding='utf-8'))
+        self.assertEqual(saved['n_members'], result.n_members)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'bad.json'
+            path.write_text(json.dumps({'samples': 10}), encoding='utf-8')
+            with self.assertRaises(ValueError):
+                MonteCarlo.from_config(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
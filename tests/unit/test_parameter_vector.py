@@ -0,0 +1,99 @@
+# tests/unit/test_parameter_vector.py
+"""
+编译参数向量单元测试
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from dataclasses import fields, replace
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestParameterVector(unittest.TestCase):
+    """参数向量单元测试"""
+
+    def test_layout_matches_dataclass(self):
+        """测试字段顺序与 ADM1Parameters 一致，往返转换无损"""
+        from core.adm1_model import ADM1Parameters
+        from core.parameter_vector import P_KI_NH3, PARAMETER_NAMES, ParameterVector
+
+        self.assertEqual(PARAMETER_NAMES, tuple(f.name for f in fields(ADM1Parameters)))
+        params = ADM1Parameters(KI_nh3=0.002)
+        vector = ParameterVector.from_parameters(params)
+        self.assertEqual(vector[P_KI_NH3], 0.002)
+        self.assertEqual(vector['KI_nh3'], 0.002)
+        self.assertEqual(vector.to_parameters(), params)
+
+    def test_frozen_and_hashable(self):
+        """测试只读、按内容哈希与比较"""
+        from core.parameter_vector import ParameterVector
+
+        a = ParameterVector.from_preset('food_waste')
+        b = ParameterVector.from_preset('food_waste')
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(a.digest(), b.digest())
+        self.assertEqual(len({a: 1, b: 2}), 1)
+        with self.assertRaises(ValueError):
+            a.values[0] = 1.0
+        c = a.replace(k_m_ac=9.0)
+        self.assertNotEqual(a, c)
+        self.assertEqual(c['k_m_ac'], 9.0)
+        with self.assertRaises(KeyError):
+            a.replace(KI_Fe=1.0)
+        with self.assertRaises(ValueError):
+            ParameterVector(np.zeros(3))
+
+    def test_stacked_vectors_match_single_models(self):
+        """测试堆叠的参数矩阵按列批量求值与逐个模型一致"""
+        from core.adm1_model import ADM1Model, ADM1Parameters
+        from core.parameter_vector import ParameterVector
+
+        singles = [ParameterVector.from_parameters(ADM1Parameters(k_m_ac=k, KI_nh3=ki))
+                   for k, ki in ((6.0, 0.001), (8.0, 0.002), (10.0, 0.003))]
+        batch = ParameterVector.stack(singles)
+        self.assertEqual(batch.values.shape, (len(singles[0]), 3))
+        self.assertEqual(batch.column(1), singles[1])
+
+        model = ADM1Model(batch)
+        self.assertEqual(list(model.parameters.k_m_ac), [6.0, 8.0, 10.0])
+        y = model.initial_conditions
+        Y = np.repeat(y[:, None], 3, axis=1)
+        rates, J = model.biochemical_reactions(0.0, Y), model.jacobian(0.0, Y)
+        for j, vector in enumerate(singles):
+            single = ADM1Model(vector)
+            np.testing.assert_allclose(rates[:, j], single.biochemical_reactions(0.0, y))
+            np.testing.assert_allclose(J[:, :, j], single.jacobian(0.0, y))
+
+    def test_reassigning_parameters_recompiles(self):
+        """测试重新赋值 parameters 时参数向量随之更新"""
+        from core.adm1_model import ADM1Model
+
+        model = ADM1Model()
+        y = model.initial_conditions
+        before = model.biochemical_reactions(0.0, y)
+        model.parameters = replace(model.parameters, k_m_su=2 * model.parameters.k_m_su)
+        after = model.biochemical_reactions(0.0, y)
+        self.assertAlmostEqual(after[0], 2 * before[0])
+
+    def test_import_as_src_package(self):
+        """测试在只有项目根目录的干净进程中通过 src.core.adm1_model 导入"""
+        project_root = Path(__file__).resolve().parents[2]
+        code = ("from src.core.adm1_model import ADM1Model; m = ADM1Model(); "
+                "print(m.biochemical_reactions(0.0, m.initial_conditions).shape)")
+        result = subprocess.run([sys.executable, '-c', code], cwd=project_root,
+                                capture_output=True, text=True,
+                                env={k: v for k, v in os.environ.items() if k != 'PYTHONPATH'})
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('(29,)', result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
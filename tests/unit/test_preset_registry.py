@@ -0,0 +1,131 @@
+# tests/unit/test_preset_registry.py
+"""
+预设注册表单元测试
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+def write_json(path, data, mtime_offset=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    # 显式推进修改时间，避免文件系统时间精度导致变化未被发现
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+class TestPresetRegistry(unittest.TestCase):
+    """预设注册表单元测试"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.library = self.root / 'presets.json'
+        self.variants = self.root / 'presets'
+        self.variants.mkdir()
+        write_json(self.library, {
+            'base': {'description': 'base',
+                     'kinetic_parameters': {'k_m_ac': 7.0, 'K_S_ac': 0.16, 'KI_NH3': 0.002},
+                     'initial_conditions': {'S_ac': 3.0}},
+            'other': {'kinetic_parameters': {'k_m_ac': 9.0}},
+        })
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def registry(self):
+        from parameters.preset_registry import PresetRegistry
+        return PresetRegistry([self.library, self.variants], check_interval=0.0)
+
+    def test_compiled_presets(self):
+        """测试预设编译为参数向量和初始状态，别名参数生效"""
+        registry = self.registry()
+        self.assertEqual(registry.names(), ['base', 'other'])
+        base = registry.get('base')
+        self.assertEqual(base.parameter_vector['k_m_ac'], 7.0)
+        self.assertEqual(base.parameter_vector['KI_nh3'], 0.002)
+        self.assertEqual(base.initial_state[6], 3.0)
+        self.assertFalse(base.initial_state.flags.writeable)
+        params = base.create_parameters()
+        params.k_m_ac = 1.0
+        self.assertEqual(registry.get('base').parameter_vector['k_m_ac'], 7.0)
+        with self.assertRaises(KeyError):
+            registry.get('missing')
+
+    def test_inheritance(self):
+        """测试 extends 继承：参数块逐键覆盖，继承链与错误预设"""
+        write_json(self.variants / 'plant.json', {
+            'plant_a': {'extends': 'base', 'kinetic_parameters': {'k_m_ac': 6.0}},
+            'plant_b': {'extends': 'plant_a', 'initial_conditions': {'S_ac': 1.0}},
+            'orphan': {'extends': 'nowhere'},
+            'loop_1': {'extends': 'loop_2'},
+            'loop_2': {'extends': 'loop_1'},
+        })
+        registry = self.registry()
+        plant_b = registry.get('plant_b')
+        self.assertEqual(plant_b.parents, ('plant_a', 'base'))
+        self.assertEqual(plant_b.parameter_vector['k_m_ac'], 6.0)
+        self.assertEqual(plant_b.parameter_vector['K_S_ac'], 0.16)
+        self.assertEqual(plant_b.initial_state[6], 1.0)
+        self.assertEqual(plant_b.description, 'base')
+        self.assertEqual(set(registry.errors()), {'orphan', 'loop_1', 'loop_2'})
+        with self.assertRaises(KeyError):
+            registry.get('loop_1')
+
+    def test_hot_reload_recompiles_changed_entries(self):
+        """测试修改时间变化后只重新编译内容变化的预设及其派生预设"""
+        write_json(self.variants / 'plant.json',
+                   {'plant_a': {'extends': 'base', 'kinetic_parameters': {'k_m_su': 20.0}}})
+        registry = self.registry()
+        other = registry.get('other')
+        self.assertEqual(registry.refresh(), [])
+
+        write_json(self.library, {
+            'base': {'kinetic_parameters': {'k_m_ac': 5.0}},
+            'other': {'kinetic_parameters': {'k_m_ac': 9.0}},
+        }, mtime_offset=10 ** 9)
+        self.assertEqual(sorted(registry.refresh()), ['base', 'plant_a'])
+        self.assertIs(registry.get('other'), other)
+        self.assertEqual(registry.get('plant_a').parameter_vector['k_m_ac'], 5.0)
+
+        write_json(self.variants / 'extra.json', {'extra': {'extends': 'other'}})
+        self.assertEqual(registry.refresh(), ['extra'])
+        (self.variants / 'plant.json').unlink()
+        self.assertEqual(registry.refresh(), ['plant_a'])
+        self.assertNotIn('plant_a', registry)
+
+    def test_manager_shares_registry(self):
+        """测试参数管理器共享进程级注册表，接口行为不变"""
+        from parameters.parameter_manager import ADM1ParameterManager
+        from parameters.preset_registry import get_preset_registry
+
+        first, second = ADM1ParameterManager(), ADM1ParameterManager()
+        self.assertIs(first.registry, second.registry)
+        self.assertIs(first.registry, get_preset_registry())
+
+        manager = ADM1ParameterManager(str(self.library))
+        self.assertEqual(manager.list_available_presets(), ['base', 'other'])
+        model, y0 = manager.create_model('base')
+        self.assertEqual(model.parameters.k_m_ac, 7.0)
+        np.testing.assert_array_equal(y0, manager.create_initial_conditions('base', model))
+        y0[0] = -1.0
+        self.assertNotEqual(manager.create_model('base')[1][0], -1.0)
+        preset = manager.get_preset('base')
+        preset['kinetic_parameters']['k_m_ac'] = 0.0
+        self.assertEqual(manager.get_preset('base')['kinetic_parameters']['k_m_ac'], 7.0)
+        self.assertIsNone(manager.get_preset('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# tests/unit/test_preset_validation.py
+"""
+预设校验单元测试
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+BASE = {
+    'kinetic_parameters': {'k_m_ac': 7.0, 'K_S_ac': 0.16, 'Y_ac': 0.06,
+                           'KI_h2_fa': 5e-6, 'KI_h2_c4': 1e-5, 'KI_h2_pro': 3.5e-6},
+    'metal_parameters': {'k_edta_fe': 1.2e5},
+    'initial_conditions': {'S_ac': 3.0, 'S_h2': 1e-4},
+}
+
+
+def with_changes(block, **values):
+    data = json.loads(json.dumps(BASE))
+    data.setdefault(block, {}).update(values)
+    return data
+
+
+class TestPresetValidation(unittest.TestCase):
+    """预设校验单元测试"""
+
+    def fields(self, report, severity):
+        return {issue.field for issue in report.issues if issue.severity == severity}
+
+    def test_schema_checks(self):
+        """测试取值范围、类型、单位与未知名称"""
+        from parameters.preset_validation import validate_preset
+
+        self.assertTrue(validate_preset('base', BASE).ok)
+        report = validate_preset('bad', with_changes('kinetic_parameters', Y_ac=1.2, K_S_ac=-0.1,
+                                                     k_m_su='fast', kmac=1.0))
+        self.assertEqual(self.fields(report, 'error'),
+                         {'kinetic_parameters.Y_ac', 'kinetic_parameters.K_S_ac',
+                          'kinetic_parameters.k_m_su'})
+        self.assertIn('kinetic_parameters.kmac', self.fields(report, 'warning'))
+
+        units = dict(BASE, units={'K_S_ac': 'kgCOD/m³'})
+        self.assertFalse(validate_preset('units', units).ok)
+        negative = with_changes('initial_conditions', S_su=-1.0, X_c=5.0)
+        report = validate_preset('negative', negative)
+        self.assertEqual(self.fields(report, 'error'), {'initial_conditions.S_su'})
+        self.assertIn('initial_conditions.X_c', self.fields(report, 'info'))
+
+    def test_numerical_checks(self):
+        """测试刚性与极端氢抑制比值在积分前被标记"""
+        from parameters.preset_registry import compile_preset
+        from parameters.preset_validation import validate_preset
+
+        def numerics(data):
+            return validate_preset('p', data, compile_preset('p', Path('.'), data))
+
+        report = numerics(BASE)
+        self.assertEqual(report.warnings, [])
+        self.assertGreater(report.metrics['fastest_rate'], 0.0)
+
+        extreme = with_changes('kinetic_parameters', KI_h2_fa=1e-9, KI_h2_c4=1e-2)
+        self.assertTrue({'KI_h2', 'KI_h2_fa'} <= self.fields(numerics(extreme), 'warning'))
+        stiff = with_changes('metal_parameters', k_edta_fe=1e12)
+        report = numerics(stiff)
+        self.assertIn('jacobian', self.fields(report, 'warning'))
+        self.assertGreater(report.metrics['fastest_rate'], 1e6)
+
+    def test_verdicts_are_cached(self):
+        """测试相同内容只校验一次，返回的结论互不影响"""
+        from parameters import preset_validation
+
+        data = with_changes('kinetic_parameters', k_m_ac=7.5)
+        first = preset_validation.validate_preset('a', data)
+        count = len(preset_validation._verdicts)
+        second = preset_validation.validate_preset('b', json.loads(json.dumps(data)))
+        self.assertEqual(len(preset_validation._verdicts), count)
+        self.assertEqual(second.preset, 'b')
+        second.issues.append(None)
+        self.assertNotEqual(len(first.issues), len(second.issues))
+
+    def test_registry_and_lint(self):
+        """测试注册表加载时附带结论，lint 对错误预设返回非零退出码"""
+        from parameters.preset_registry import PresetRegistry, get_preset_registry
+        from parameters.preset_validation import lint_presets
+
+        registry = get_preset_registry()
+        for name in registry.names():
+            self.assertTrue(registry.get(name).report.ok, name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(lint_presets(registry), 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'presets.json'
+            path.write_text(json.dumps({
+                'good': BASE,
+                'bad': {'extends': 'good', 'kinetic_parameters': {'Y_ac': 1.5}},
+            }), encoding='utf-8')
+            bad_registry = PresetRegistry([path], check_interval=0.0)
+            self.assertFalse(dict(bad_registry.items())['bad'].report.ok)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(lint_presets(bad_registry), 1)
+            self.assertIn('kinetic_parameters.Y_ac', output.getvalue())
+
+    def test_invalid_preset_rejected(self):
+        """测试校验有错误的预设在创建模型时被拒绝，可配置为只记录日志"""
+        from parameters.parameter_manager import ADM1ParameterManager
+        from parameters.preset_registry import PresetRegistry
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'presets.json'
+            path.write_text(json.dumps({
+                'good': BASE,
+                'bad': {'extends': 'good', 'kinetic_parameters': {'Y_ac': 1.5}},
+            }), encoding='utf-8')
+            manager = ADM1ParameterManager(str(path))
+            model, _ = manager.create_model('good')
+            with self.assertRaises(KeyError) as context:
+                manager.create_model('bad')
+            self.assertIn('kinetic_parameters.Y_ac', str(context.exception))
+            self.assertIsNone(manager.get_preset('bad'))
+
+            lenient = PresetRegistry([path], check_interval=0.0, reject_invalid=False)
+            self.assertFalse(lenient.get('bad').report.ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/unit/test_profiler.py
+"""
+性能剖析单元测试 - 报告文件与耗时归类
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestRunProfiler(unittest.TestCase):
+    """性能剖析单元测试"""
+
+    def test_classify_file(self):
+        """测试源文件路径归类"""
+        from utils.profiler import classify_file
+
+        self.assertEqual(classify_file('/repo/src/core/adm1_model.py'), 'model')
+        self.assertEqual(classify_file('/site-packages/scipy/integrate/_ivp/bdf.py'), 'solver')
+        self.assertEqual(classify_file('C:\\repo\\src\\parameters\\parameter_manager.py'),
+                         'parameters')
+        self.assertEqual(classify_file('/site-packages/matplotlib/figure.py'), 'plotting')
+        self.assertIsNone(classify_file('/site-packages/numpy/core/numeric.py'))
+
+    def test_profile_solve_writes_reports(self):
+        """测试剖析求解过程并写出排序报告和collapsed栈文件"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+        from utils.profiler import RunProfiler
+
+        model = ADM1Model()
+        solver = ADM1Solver()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with RunProfiler('unit', output_dir=tmpdir, sample_interval=0.001) as profiler:
+                for _ in range(3):
+                    solver.solve(model, (0, 10))
+
+            self.assertTrue(profiler.report_path.exists())
+            report = profiler.report_path.read_text(encoding='utf-8')
+            self.assertIn('耗时归类', report)
+            self.assertIn('cumulative', report)
+
+            lines = profiler.collapsed_path.read_text(encoding='utf-8').splitlines()
+            self.assertTrue(lines)
+            stack, count = lines[0].rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+            self.assertIn(';', stack)
+
+        breakdown = profiler.category_breakdown()
+        self.assertAlmostEqual(sum(breakdown.values()), 1.0)
+        self.assertIn('solver', breakdown)
+
+    def test_invalid_mode(self):
+        """测试未知剖析模式"""
+        from utils.profiler import RunProfiler
+
+        with self.assertRaises(ValueError):
+            RunProfiler(mode='perf')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/unit/test_result_store.py
+"""
+ResultStore单元测试 - 分块存储与按需读取
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestResultStore(unittest.TestCase):
+    """ResultStore单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.model = ADM1Model()
+        n_vars = len(self.model.state_variables)
+        self.time = np.linspace(0, 10, 1001)
+        self.states = np.arange(n_vars)[:, None] + self.time[None, :]
+        self.results = {
+            'time': self.time,
+            'states': self.states,
+            'success': True,
+            'message': 'ok',
+            'nfev': 10,
+            'njev': 2,
+            'model': self.model,
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_with_chunks(self):
+        """测试跨块完整读取"""
+        from storage.result_store import ResultStore
+
+        store = ResultStore(self.tmpdir.name, chunk_size=128)
+        run_path = store.save(self.results, preset_name='food_waste')
+        run = store.open(run_path.name)
+
+        self.assertEqual(len(run.chunks), 8)
+        self.assertEqual(run.metadata['preset_name'], 'food_waste')
+        self.assertEqual(run.metadata['solver_stats']['nfev'], 10)
+        self.assertTrue(run.metadata['parameters_hash'])
+
+        time, states = run.load_states()
+        np.testing.assert_array_equal(time, self.time)
+        np.testing.assert_array_equal(states, self.states)
+
+    def test_variable_time_window(self):
+        """测试单变量时间窗口读取"""
+        from storage.result_store import ResultStore
+
+        store = ResultStore(self.tmpdir.name, chunk_size=100)
+        run = store.open(store.save(self.results).name)
+
+        time, values = run.load_variable('S_ch4', t_start=2.0, t_end=3.0)
+        mask = (self.time >= 2.0) & (self.time <= 3.0)
+        idx = self.model.variable_index['S_ch4']
+        np.testing.assert_array_equal(time, self.time[mask])
+        np.testing.assert_array_equal(values, self.states[idx, mask])
+        self.assertEqual(len(run._select_chunks(2.0, 3.0)), 2)
+
+        with self.assertRaises(KeyError):
+            run.load_variable('X_unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests/unit/test_streaming.py
+"""
+流式求解单元测试 - 写入、增量读取与结果一致性
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestStreaming(unittest.TestCase):
+    """流式求解单元测试"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'run.bin'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_incremental_reader(self):
+        """测试读取端只返回完整的新记录"""
+        from storage.stream_writer import StreamWriter, StreamReader
+
+        writer = StreamWriter(self.path, ['a', 'b'])
+        reader = StreamReader(self.path)
+        writer.append(0.0, np.array([1.0, 2.0]))
+        time, states = reader.read_new()
+        np.testing.assert_array_equal(time, [0.0])
+        np.testing.assert_array_equal(states[:, 0], [1.0, 2.0])
+
+        writer.append(1.0, np.array([3.0, 4.0]))
+        writer.close()
+        chunks = list(reader.follow(poll_interval=0.01, timeout=1.0))
+        self.assertEqual(len(chunks), 1)
+        np.testing.assert_array_equal(chunks[0][0], [1.0])
+        self.assertTrue(reader.finished)
+
+    def test_streaming_matches_solve(self):
+        """测试流式求解与常规求解的轨迹一致"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+        from storage.stream_writer import StreamReader
+
+        model = ADM1Model()
+        solver = ADM1Solver()
+        reference = solver.solve(model, (0, 2))
+        streamed = solver.solve_streaming(model, (0, 2), self.path, output_interval=0.5)
+
+        self.assertTrue(streamed['success'])
+        self.assertEqual(streamed['states'].shape, (len(model.state_variables), 1))
+
+        time, states = StreamReader(self.path).read_all()
+        np.testing.assert_allclose(time, [0.0, 0.5, 1.0, 1.5, 2.0])
+        np.testing.assert_allclose(states[:, -1], reference['states'][:, -1], rtol=1e-6, atol=1e-8)
+
+    def test_uneven_grid_ends_at_final_time(self):
+        """测试区间不能被输出间隔整除时最后一点为结束时刻"""
+        from core.adm1_model import ADM1Model
+        from solvers.ode_solver import ADM1Solver
+        from storage.stream_writer import StreamReader
+
+        model = ADM1Model()
+        solver = ADM1Solver()
+        streamed = solver.solve_streaming(model, (0, 10), self.path, output_interval=3.0)
+        self.assertTrue(streamed['success'])
+        time, states = StreamReader(self.path).read_all()
+        np.testing.assert_allclose(time, [0.0, 3.0, 6.0, 9.0, 10.0])
+        np.testing.assert_allclose(states[:, -1], streamed['states'][:, 0], rtol=1e-6, atol=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# tests/unit/test_surrogate.py
+"""
+参数空间采样与代理模型单元测试
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+NAMES = ('k_m_ac', 'K_S_ac', 'k_m_h2')
+
+
+class TestParameterSpace(unittest.TestCase):
+    """参数空间单元测试"""
+
+    def test_sampling_and_mapping(self):
+        """测试拟随机样本落在范围内、对数映射可逆、预设命名映射"""
+        from parameters.sampling import ParameterSpace
+
+        space = ParameterSpace.from_preset('food_waste', spread=0.5)
+        self.assertIn('KI_nh3', space.names)
+        self.assertNotIn('KI_Fe', space.names)          # 模型中不存在的预设参数
+        for method in ('sobol', 'lhs', 'random'):
+            X = space.sample(16, method, seed=0)
+            self.assertEqual(X.shape, (16, space.dim))
+            self.assertTrue(np.all(space.contains(X)))
+            np.testing.assert_allclose(space.from_unit(space.to_unit(X)), X, rtol=1e-12)
+        nominal = space.vector({})
+        np.testing.assert_allclose(nominal, space.nominal)
+        self.assertFalse(space.contains(space.vector({'KI_NH3': 1.0})[None, :])[0])
+        with self.assertRaises(KeyError):
+            space.vector({'unknown': 1.0})
+        with self.assertRaises(ValueError):
+            space.sample(4, 'grid')
+
+    def test_batch_parameters_match_single(self):
+        """测试数组字段参数的批量求值与逐组求值一致"""
+        from core.adm1_model import ADM1Model
+        from parameters.sampling import ParameterSpace
+
+        space = ParameterSpace.from_preset('food_waste', names=NAMES)
+        X = space.sample(4, seed=1)
+        batch = ADM1Model(space.batch_parameters(X))
+        Y = np.repeat(batch.initial_conditions[:, None], 4, axis=1)
+        rates = batch.biochemical_reactions(0.0, Y)
+        J = batch.jacobian(0.0, Y)
+        for j in range(4):
+            single = ADM1Model(space.parameters(X[j]))
+            y = single.initial_conditions
+            np.testing.assert_allclose(rates[:, j], single.biochemical_reactions(0.0, y))
+            np.testing.assert_allclose(J[:, :, j], single.jacobian(0.0, y))
+
+
+class TestSurrogateModel(unittest.TestCase):
+    """代理模型单元测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        from surrogate.emulator import SurrogateModel
+
+        cls.surrogate = SurrogateModel.train('food_waste', n_samples=32, n_validation=8,
+                                             names=NAMES, horizon=20.0, step=1 / 12, seed=0)
+
+    def full_model(self, x):
+        from surrogate.emulator import simulate_outputs
+
+        s = self.surrogate
+        return simulate_outputs(s.space, x[None, :], s.y0, s.horizon, s.step)
+
+    def test_gaussian_process_interpolates(self):
+        """测试高斯过程在训练点附近插值且标准差很小"""
+        from surrogate.gaussian_process import GaussianProcess
+
+        rng = np.random.default_rng(0)
+        X = rng.random((30, 2))
+        y = np.sin(3 * X[:, 0]) + X[:, 1] ** 2
+        gp = GaussianProcess().fit(X, y, seed=0)
+        mean, std = gp.predict(X)
+        np.testing.assert_allclose(mean, y, atol=1e-3)
+        self.assertLess(std.max(), 1e-2)
+        X_test = rng.random((50, 2))
+        error = gp.predict(X_test, return_std=False) - (np.sin(3 * X_test[:, 0]) + X_test[:, 1] ** 2)
+        self.assertLess(np.sqrt(np.mean(error ** 2)), 0.01)
+
+    def test_in_domain_prediction(self):
+        """测试训练范围内由代理模型回答，与完整模型吻合"""
+        x = self.surrogate.space.vector({'k_m_ac': 7.5, 'K_S_ac': 0.15})
+        prediction = self.surrogate.predict({'k_m_ac': 7.5, 'K_S_ac': 0.15})
+        self.assertEqual(prediction.source, 'surrogate')
+        self.assertTrue(prediction.in_domain)
+        reference = self.full_model(x)
+        for name, value in prediction.values.items():
+            self.assertAlmostEqual(value, reference[name][0],
+                                   delta=0.01 * abs(reference[name][0]) + 4 * prediction.std[name])
+        self.assertLess(self.surrogate.validation.relative_rmse['methane'], 0.01)
+
+    def test_vector_query(self):
+        """测试按取值向量查询与按参数字典查询一致"""
+        space = self.surrogate.space
+        by_vector = self.surrogate.predict(space.vector({}))
+        by_dict = self.surrogate.predict()
+        self.assertEqual(by_vector.source, by_dict.source)
+        for name in by_dict.values:
+            self.assertAlmostEqual(by_vector.values[name], by_dict.values[name], places=12)
+
+    def test_out_of_domain_falls_back(self):
+        """测试超出训练范围时回退到完整模型"""
+        values = {'k_m_ac': 20.0}
+        prediction = self.surrogate.predict(values)
+        self.assertEqual(prediction.source, 'model')
+        self.assertFalse(prediction.in_domain)
+        reference = self.full_model(self.surrogate.space.vector(values))
+        self.assertAlmostEqual(prediction['methane'], reference['methane'][0])
+        extrapolated = self.surrogate.predict(values, allow_fallback=False)
+        self.assertEqual(extrapolated.source, 'surrogate')
+
+    def test_save_and_load(self):
+        """测试保存与加载后预测一致"""
+        from surrogate.emulator import SurrogateModel
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.surrogate.save(Path(tmp) / 'surrogate.npz')
+            loaded = SurrogateModel.load(path)
+        query = {'k_m_h2': 33.0}
+        original, restored = self.surrogate.predict(query), loaded.predict(query)
+        for name in original.values:
+            self.assertAlmostEqual(original.values[name], restored.values[name], places=10)
+            self.assertAlmostEqual(original.std[name], restored.std[name], places=10)
+        self.assertEqual(loaded.space.names, self.surrogate.space.names)
+        self.assertEqual(loaded.validation.n_samples, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# tests/unit/test_tolerances.py
+"""
+逐变量容差与状态缩放单元测试
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+src_path = Path(__file__).resolve().parents[2] / 'src'
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+
+class TestTolerances(unittest.TestCase):
+    """逐变量容差与状态缩放单元测试"""
+
+    def setUp(self):
+        from core.adm1_model import ADM1Model
+        self.model = ADM1Model()
+
+    def test_auto_atol_follows_magnitudes(self):
+        """测试atol按典型量级和单位生成"""
+        from solvers.tolerances import auto_atol
+
+        atol = auto_atol(self.model)
+        index = self.model.variable_index
+        self.assertEqual(atol.shape, (len(self.model.state_variables),))
+        self.assertTrue(np.all(atol > 0))
+        # 氢的容差比颗粒性组分小若干个数量级
+        self.assertLess(atol[index['S_h2']], 1e-8)
+        self.assertGreater(atol[index['X_ch']], 1e3 * atol[index['S_h2']])
+        # 初始为零的金属变量取同单位变量的量级
+        self.assertGreater(atol[index['S_FeEDTA']], 0)
+        self.assertEqual(self.model.state_units['S_Fe2'], 'mol/m³')
+
+    def test_transforms_round_trip(self):
+        """测试缩放/对数变换的正反变换"""
+        from solvers.tolerances import auto_atol, create_transform
+
+        atol = auto_atol(self.model)
+        y = self.model.initial_conditions
+        for kind in ('scale', 'log'):
+            transform = create_transform(kind, self.model, atol)
+            np.testing.assert_allclose(transform.inverse(transform.forward(y)), y, atol=1e-15)
+            stacked = np.column_stack([y, y])
+            np.testing.assert_allclose(transform.inverse(transform.forward(stacked)), stacked,
+                                       atol=1e-15)
+
+    def test_solve_with_auto_atol_and_scaling(self):
+        """测试各求解形式结果与默认设置一致"""
+        from solvers.ode_solver import ADM1Solver
+
+        base = {'method': 'BDF', 'rtol': 1e-6, 'atol': 1e-8, 'max_step': 0.1, 'first_step': 0.01}
+        reference = ADM1Solver(base).solve(self.model, (0, 10))
+        for scaling in (None, 'scale', 'log'):
+            params = dict(base, atol='auto', scaling=scaling)
+            results = ADM1Solver(params).solve(self.model, (0, 10))
+            self.assertTrue(results['success'], scaling)
+            np.testing.assert_allclose(results['states'][:, -1], reference['states'][:, -1],
+                                       rtol=1e-3, atol=1e-3)
+
+    def test_c4_uptake_without_substrate(self):
+        """测试S_va=S_bu=0时C4消耗项有限"""
+        y = self.model.initial_conditions.copy()
+        y[self.model.variable_index['S_va']] = 0.0
+        y[self.model.variable_index['S_bu']] = 0.0
+        self.assertTrue(np.all(np.isfinite(self.model.biochemical_reactions(0.0, y))))
+        self.assertTrue(np.all(np.isfinite(self.model.jacobian(0.0, y))))
+
+
+if __name__ == '__main__':
+    unittest.main()